@@ -22,6 +22,8 @@ class Settings(BaseSettings):
     port: int = Field(default=8000, env="PORT")
     host: str = Field(default="0.0.0.0", env="HOST")
     debug: bool = Field(default=False, env="DEBUG")
+    query_profiler_enabled: bool = Field(default=False, env="QUERY_PROFILER_ENABLED")  # Per-request SQL accounting
+    query_budget_enforce: bool = Field(default=False, env="QUERY_BUDGET_ENFORCE")  # Fail requests over budget
     
     # AI Services
     # OpenAI removed to prevent authentication errors and timeouts
@@ -51,6 +53,10 @@ class Settings(BaseSettings):
     github_username: Optional[str] = Field(default=None, env="GITHUB_USERNAME")
     github_email: Optional[str] = Field(default=None, env="GITHUB_EMAIL")
     github_webhook_secret: Optional[str] = Field(default=None, env="GITHUB_WEBHOOK_SECRET")
+    github_webhook_workers: int = Field(default=2, env="GITHUB_WEBHOOK_WORKERS")  # Concurrent webhook jobs
+    github_webhook_visibility_timeout: float = Field(default=900.0, env="GITHUB_WEBHOOK_VISIBILITY_TIMEOUT")  # Lease seconds
+    github_webhook_max_attempts: int = Field(default=3, env="GITHUB_WEBHOOK_MAX_ATTEMPTS")
+    github_webhook_job_retention_seconds: float = Field(default=604800.0, env="GITHUB_WEBHOOK_JOB_RETENTION_SECONDS")  # Finished jobs kept this long
     
     # AWS
     aws_access_key_id: Optional[str] = Field(default=None, env="AWS_ACCESS_KEY_ID")
@@ -65,6 +71,13 @@ class Settings(BaseSettings):
     
     # ML Settings
     ml_model_path: str = Field(default="./models", env="ML_MODEL_PATH")
+    model_registry_idle_seconds: float = Field(default=900.0, env="MODEL_REGISTRY_IDLE_SECONDS")  # Unload models unused this long
+    model_registry_mmap: bool = Field(default=True, env="MODEL_REGISTRY_MMAP")  # Share model arrays across workers via joblib mmap
+    sckipit_refresh_concurrency: int = Field(default=8, env="SCKIPIT_REFRESH_CONCURRENCY")  # Sources fetched at once
+    sckipit_source_refresh_seconds: int = Field(default=21600, env="SCKIPIT_SOURCE_REFRESH_SECONDS")  # Default per-source interval
+    sckipit_source_min_refresh_seconds: int = Field(default=900, env="SCKIPIT_SOURCE_MIN_REFRESH_SECONDS")  # Floor for Cache-Control max-age
+    code_analysis_cache_entries: int = Field(default=2048, env="CODE_ANALYSIS_CACHE_ENTRIES")  # In-memory analysis results (LRU)
+    code_analysis_disk_entries: int = Field(default=50000, env="CODE_ANALYSIS_DISK_ENTRIES")  # Results kept in the on-disk tier
     enable_ml_learning: bool = Field(default=True, env="ENABLE_ML_LEARNING")
     ml_confidence_threshold: float = Field(default=0.7, env="ML_CONFIDENCE_THRESHOLD")
     
@@ -79,20 +92,44 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     log_format: str = Field(default="json", env="LOG_FORMAT")
+    log_queue_size: int = Field(default=10000, env="LOG_QUEUE_SIZE")  # Records buffered before new ones are dropped
+    log_info_rate_per_subsystem: float = Field(default=100.0, env="LOG_INFO_RATE_PER_SUBSYSTEM")  # Info events/sec
+    log_debug_sample_rate: float = Field(default=0.1, env="LOG_DEBUG_SAMPLE_RATE")  # Fraction of debug events kept
+    
+    # Background tasks
+    task_supervisor_shutdown_seconds: float = Field(default=10.0, env="TASK_SUPERVISOR_SHUTDOWN_SECONDS")  # Deadline to cancel all tasks
+    task_supervisor_max_restarts: int = Field(default=5, env="TASK_SUPERVISOR_MAX_RESTARTS")  # Per task, before it is left failed
+    task_supervisor_slow_step_seconds: float = Field(default=0.5, env="TASK_SUPERVISOR_SLOW_STEP_SECONDS")  # Step that blocks the loop
     
     # File paths
     upload_path: str = Field(default="./uploads", env="UPLOAD_PATH")
     temp_path: str = Field(default="./temp", env="TEMP_PATH")
     
+    # Plugins
+    plugin_workers: int = Field(default=2, env="PLUGIN_WORKERS")  # Warm subprocesses running plugin code
+    plugin_timeout_seconds: float = Field(default=10.0, env="PLUGIN_TIMEOUT_SECONDS")  # Per call
+    plugin_memory_limit_mb: int = Field(default=512, env="PLUGIN_MEMORY_LIMIT_MB")  # Address space per worker
+    
     # AI Learning
     learning_enabled: bool = Field(default=True, env="LEARNING_ENABLED")
     learning_interval: int = Field(default=300, env="LEARNING_INTERVAL")  # 5 minutes
     max_learning_history: int = Field(default=1000, env="MAX_LEARNING_HISTORY")
+    learning_write_batch_size: int = Field(default=200, env="LEARNING_WRITE_BATCH_SIZE")
+    learning_write_flush_ms: int = Field(default=250, env="LEARNING_WRITE_FLUSH_MS")
+    learning_write_max_pending: int = Field(default=5000, env="LEARNING_WRITE_MAX_PENDING")
+    learning_state_cache_ttl: float = Field(default=5.0, env="LEARNING_STATE_CACHE_TTL")  # Seconds per-process counters stay fresh
+    learning_state_recent_events: int = Field(default=100, env="LEARNING_STATE_RECENT_EVENTS")  # In-memory event detail per AI
+    learning_timeseries_page_size: int = Field(default=168, env="LEARNING_TIMESERIES_PAGE_SIZE")  # Default periods per time-series page
     
     # AI Growth System
     auto_improvement_enabled: bool = Field(default=True, env="AUTO_IMPROVEMENT_ENABLED")
     growth_analysis_interval: int = Field(default=3600, env="GROWTH_ANALYSIS_INTERVAL")
     growth_threshold: float = Field(default=0.6, env="GROWTH_THRESHOLD")
+    agent_run_deadline_seconds: float = Field(default=900.0, env="AGENT_RUN_DEADLINE_SECONDS")  # Per agent, per cycle
+    brain_history_capacity: int = Field(default=500, env="BRAIN_HISTORY_CAPACITY")  # Entries kept in memory per history
+    brain_history_segment_size: int = Field(default=200, env="BRAIN_HISTORY_SEGMENT_SIZE")  # Entries per spilled segment
+    brain_history_max_segments: int = Field(default=100, env="BRAIN_HISTORY_MAX_SEGMENTS")  # Per history, oldest pruned
+    brain_memory_budget_mb: float = Field(default=2048.0, env="BRAIN_MEMORY_BUDGET_MB")  # Process RSS budget for brain loops
     
     # Repository Configuration
     repo_branch: str = Field(default="main", env="REPO_BRANCH")
@@ -120,10 +157,19 @@ class Settings(BaseSettings):
     experiment_branch: str = Field(default="main", env="EXPERIMENT_BRANCH")
     experiment_auto_push: bool = Field(default=True, env="EXPERIMENT_AUTO_PUSH")
     
+    # Daily rollups and raw-row retention (0 keeps raw rows forever; per-row readers
+    # such as /analytics/explainability/answers only see rows inside the window)
+    rollup_interval_seconds: int = Field(default=3600, env="ROLLUP_INTERVAL_SECONDS")
+    retention_token_usage_log_days: int = Field(default=0, env="RETENTION_TOKEN_USAGE_LOG_DAYS")
+    retention_learning_log_days: int = Field(default=0, env="RETENTION_LEARNING_LOG_DAYS")
+    retention_ai_answer_days: int = Field(default=0, env="RETENTION_AI_ANSWER_DAYS")
+    retention_internet_learning_days: int = Field(default=0, env="RETENTION_INTERNET_LEARNING_DAYS")
+    
     model_config = ConfigDict(
         env_file=".env",
         case_sensitive=False,
-        extra="allow"  # Allow extra fields from .env file
+        extra="allow",  # Allow extra fields from .env file
+        protected_namespaces=("settings_",)  # model_registry_* settings are not pydantic internals
     )
 
 
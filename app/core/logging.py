@@ -1,42 +1,186 @@
 """
 Logging configuration
+Structlog is configured once; records are handed to a bounded queue and written
+by a background listener thread, so log I/O never blocks the event loop.
+High-volume debug/info events are sampled and rate limited per subsystem.
 """
 
 import sys
+import time
+import queue
+import random
+import logging
+import logging.handlers
+import threading
 import structlog
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from .config import settings
 
+# Levels that are never sampled or rate limited
+_ALWAYS_KEEP = {"warning", "error", "critical", "exception"}
+
+_configure_lock = threading.Lock()
+_structlog_configured = False
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["BoundedQueueHandler"] = None
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class SubsystemSampler:
+    """Per-subsystem sampling for debug events and token-bucket rate limiting for info events"""
+
+    def __init__(self, info_rate: float = 100.0, info_burst: Optional[float] = None,
+                 debug_sample_rate: float = 0.1):
+        self.info_rate = info_rate
+        self.info_burst = info_burst if info_burst is not None else info_rate * 2
+        self.debug_sample_rate = debug_sample_rate
+        self._overrides: Dict[str, Dict[str, float]] = {}
+        self._buckets: Dict[str, list] = {}  # subsystem -> [tokens, last refill]
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def configure(self, subsystem: str, info_rate: Optional[float] = None,
+                  debug_sample_rate: Optional[float] = None):
+        """Override the limits for one subsystem"""
+        override = self._overrides.setdefault(subsystem, {})
+        if info_rate is not None:
+            override["info_rate"] = info_rate
+        if debug_sample_rate is not None:
+            override["debug_sample_rate"] = debug_sample_rate
+        self._buckets.pop(subsystem, None)
+
+    def _count(self, subsystem: str, outcome: str):
+        counts = self.stats.setdefault(subsystem, {"kept": 0, "sampled_out": 0, "rate_limited": 0})
+        counts[outcome] += 1
+
+    def allow(self, subsystem: str, level: str) -> bool:
+        """Decide whether an event is emitted; warnings and above always are"""
+        if level in _ALWAYS_KEEP:
+            return True
+        override = self._overrides.get(subsystem, {})
+        with self._lock:
+            if level == "debug":
+                if random.random() >= override.get("debug_sample_rate", self.debug_sample_rate):
+                    self._count(subsystem, "sampled_out")
+                    return False
+            else:
+                rate = override.get("info_rate", self.info_rate)
+                burst = max(self.info_burst, rate)
+                now = time.monotonic()
+                bucket = self._buckets.setdefault(subsystem, [burst, now])
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                if bucket[0] < 1:
+                    self._count(subsystem, "rate_limited")
+                    return False
+                bucket[0] -= 1
+            self._count(subsystem, "kept")
+        return True
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Structlog processor: subsystem is the `system` key, else the logger name"""
+        if event_dict.pop("_presampled", False):
+            return event_dict
+        subsystem = event_dict.get("system") or getattr(logger, "name", None) or "root"
+        if not self.allow(subsystem, method_name):
+            raise structlog.DropEvent
+        return event_dict
+
+
+sampler = SubsystemSampler(
+    info_rate=settings.log_info_rate_per_subsystem,
+    debug_sample_rate=settings.log_debug_sample_rate,
+)
+
+
+def configure_structlog():
+    """Configure structlog exactly once; later calls are no-ops"""
+    global _structlog_configured
+    with _configure_lock:
+        if _structlog_configured:
+            return
+        structlog.configure(
+            processors=[
+                structlog.stdlib.filter_by_level,
+                sampler,
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+                structlog.stdlib.PositionalArgumentsFormatter(),
+                structlog.processors.TimeStamper(fmt="iso"),
+                structlog.processors.StackInfoRenderer(),
+                structlog.processors.format_exc_info,
+                structlog.processors.UnicodeDecoder(),
+                structlog.processors.JSONRenderer() if settings.log_format == "json" else structlog.dev.ConsoleRenderer(),
+            ],
+            context_class=dict,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            wrapper_class=structlog.stdlib.BoundLogger,
+            cache_logger_on_first_use=True,
+        )
+        _structlog_configured = True
+
 
 def setup_logging():
-    """Setup structured logging"""
-    
-    # Configure structlog
-    structlog.configure(
-        processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer() if settings.log_format == "json" else structlog.dev.ConsoleRenderer(),
-        ],
-        context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
-        cache_logger_on_first_use=True,
-    )
-    
-    # Configure standard library logging
-    import logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, settings.log_level.upper()),
-    )
+    """Setup structured logging with a queue-backed handler (idempotent)"""
+    global _listener, _queue_handler
+    configure_structlog()
+
+    with _configure_lock:
+        if _listener is not None:
+            return
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        _queue_handler = BoundedQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+        _listener = logging.handlers.QueueListener(_queue_handler.queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+
+        root = logging.getLogger()
+        root.setLevel(getattr(logging, settings.log_level.upper()))
+        # Direct stdout/stderr handlers would bypass the queue
+        for handler in list(root.handlers):
+            if type(handler) is logging.StreamHandler and handler.stream in (sys.stdout, sys.stderr):
+                root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+
+
+def shutdown_logging():
+    """Stop the listener after writing out everything still queued"""
+    global _listener, _queue_handler
+    with _configure_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener = None
+        _queue_handler = None
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Queue depth, drop counters and per-subsystem sampling counters"""
+    handler = _queue_handler
+    return {
+        "queue_enabled": handler is not None,
+        "queue_depth": handler.queue.qsize() if handler else 0,
+        "queue_size": settings.log_queue_size,
+        "enqueued": handler.enqueued if handler else 0,
+        "dropped": handler.dropped if handler else 0,
+        "subsystems": {name: dict(counts) for name, counts in sampler.stats.items()},
+    }
 
 
 def get_logger(name: str = None) -> structlog.BoundLogger:
@@ -63,4 +207,4 @@ def log_error(error: Exception, context: Dict[str, Any] = None) -> None:
         error_type=type(error).__name__,
         error_message=str(error),
         context=context or {}
-    ) 
\ No newline at end of file
+    )
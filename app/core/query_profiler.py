@@ -0,0 +1,232 @@
+"""
+Query Profiler - Per-request SQL statement accounting and query budgets
+Counts statements, ORM rows loaded and repeated statement shapes (N+1 patterns)
+for each request or profiled block, enforces per-endpoint budgets and keeps a
+worst-offender report. Intended for development and test runs.
+"""
+
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Callable
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = structlog.get_logger()
+
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("query_profile", default=None)
+_installed = False
+
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)\s*,?)+\)", re.IGNORECASE)
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A profiled block or endpoint ran more queries than its budget allows"""
+
+
+@dataclass
+class QueryBudget:
+    """Limits for one endpoint or block; None disables a limit"""
+    max_statements: Optional[int] = None
+    max_rows: Optional[int] = None
+    max_repeats: Optional[int] = None  # Executions allowed per statement shape (N+1 guard)
+
+
+@dataclass
+class QueryProfile:
+    """Statements executed within one request or profiled block"""
+    name: str
+    budget: Optional[QueryBudget] = None
+    statements: int = 0
+    rows_loaded: int = 0
+    duration_ms: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated_shapes(self, threshold: int = 2) -> List[Dict[str, Any]]:
+        """Statement shapes executed at least `threshold` times, most repeated first"""
+        return [
+            {"statement": shape, "count": count}
+            for shape, count in self.shapes.most_common() if count >= threshold
+        ]
+
+    def violations(self) -> List[str]:
+        budget = self.budget
+        if budget is None:
+            return []
+        problems = []
+        if budget.max_statements is not None and self.statements > budget.max_statements:
+            problems.append(f"{self.statements} statements > budget {budget.max_statements}")
+        if budget.max_rows is not None and self.rows_loaded > budget.max_rows:
+            problems.append(f"{self.rows_loaded} ORM rows loaded > budget {budget.max_rows}")
+        if budget.max_repeats is not None:
+            for shape in self.repeated_shapes(budget.max_repeats + 1):
+                problems.append(f"statement repeated {shape['count']}x (possible N+1): {shape['statement'][:160]}")
+        return problems
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "statements": self.statements,
+            "rows_loaded": self.rows_loaded,
+            "duration_ms": round(self.duration_ms, 2),
+            "repeated_shapes": self.repeated_shapes()[:5],
+        }
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a statement to its shape: literals and IN-list lengths are erased"""
+    shape = _STRING.sub("?", statement)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    shape = _NUMBER.sub("N", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+class QueryReport:
+    """Aggregated per-endpoint statistics across profiled requests"""
+
+    def __init__(self):
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, profile: QueryProfile):
+        entry = self._endpoints.setdefault(profile.name, {
+            "endpoint": profile.name, "calls": 0, "total_statements": 0, "max_statements": 0,
+            "max_rows_loaded": 0, "max_repeats": 0, "budget_violations": 0, "worst_repeated": None,
+        })
+        entry["calls"] += 1
+        entry["total_statements"] += profile.statements
+        entry["max_statements"] = max(entry["max_statements"], profile.statements)
+        entry["max_rows_loaded"] = max(entry["max_rows_loaded"], profile.rows_loaded)
+        repeated = profile.repeated_shapes()
+        if repeated and repeated[0]["count"] > entry["max_repeats"]:
+            entry["max_repeats"] = repeated[0]["count"]
+            entry["worst_repeated"] = repeated[0]["statement"][:300]
+        if profile.violations():
+            entry["budget_violations"] += 1
+
+    def worst_offenders(self, limit: int = 10) -> List[Dict[str, Any]]:
+        entries = [
+            {**entry, "avg_statements": round(entry["total_statements"] / entry["calls"], 2)}
+            for entry in self._endpoints.values()
+        ]
+        entries.sort(key=lambda e: (e["budget_violations"], e["max_statements"], e["max_repeats"],
+                                    e["max_rows_loaded"]), reverse=True)
+        return entries[:limit]
+
+    def reset(self):
+        self._endpoints.clear()
+
+
+query_report = QueryReport()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is not None:
+        conn.info.setdefault("query_profiler_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    started = conn.info.get("query_profiler_started")
+    if started:
+        profile.duration_ms += (time.perf_counter() - started.pop()) * 1000
+    profile.statements += 1
+    profile.shapes[normalize_statement(statement)] += 1
+
+
+def _on_load(target, context):
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.rows_loaded += 1
+
+
+def install_query_profiler():
+    """Attach the profiler to every engine and mapped class (idempotent)"""
+    global _installed
+    if _installed:
+        return
+    from app.core.database import Base
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Base, "load", _on_load, propagate=True)
+    _installed = True
+
+
+def start_profile(name: str, budget: Optional[QueryBudget] = None):
+    """Begin profiling the current context; returns (profile, token) for finish_profile"""
+    install_query_profiler()
+    profile = QueryProfile(name=name, budget=budget)
+    return profile, _current_profile.set(profile)
+
+
+def finish_profile(profile: QueryProfile, token, enforce: bool = False) -> List[str]:
+    """Stop profiling, record the profile and report (or raise on) budget violations"""
+    _current_profile.reset(token)
+    query_report.record(profile)
+    problems = profile.violations()
+    if problems:
+        logger.warning("Query budget exceeded", endpoint=profile.name, problems=problems)
+        if enforce:
+            raise QueryBudgetExceeded(f"{profile.name}: " + "; ".join(problems))
+    return problems
+
+
+@contextmanager
+def profile_queries(name: str = "block", max_statements: Optional[int] = None,
+                    max_rows: Optional[int] = None, max_repeats: Optional[int] = None,
+                    enforce: bool = True):
+    """Profile the enclosed block; in tests, exceeding the budget fails with QueryBudgetExceeded"""
+    budget = QueryBudget(max_statements, max_rows, max_repeats)
+    profile, token = start_profile(name, budget)
+    try:
+        yield profile
+    except BaseException:
+        _current_profile.reset(token)
+        raise
+    finish_profile(profile, token, enforce=enforce)
+
+
+def query_budget(max_statements: Optional[int] = None, max_rows: Optional[int] = None,
+                 max_repeats: Optional[int] = None) -> Callable:
+    """Attach a query budget to an endpoint; checked by QueryProfilerMiddleware"""
+    def decorator(func):
+        func.__query_budget__ = QueryBudget(max_statements, max_rows, max_repeats)
+        return func
+    return decorator
+
+
+class QueryProfilerMiddleware:
+    """ASGI middleware profiling each HTTP request against its endpoint's query budget"""
+
+    def __init__(self, app, enforce: bool = False, default_budget: Optional[QueryBudget] = None):
+        self.app = app
+        self.enforce = enforce
+        self.default_budget = default_budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = start_profile(f"{scope['method']} {scope['path']}", self.default_budget)
+        try:
+            await self.app(scope, receive, send)
+        except BaseException:
+            _current_profile.reset(token)
+            raise
+        # Routing fills in the endpoint and route on the shared scope
+        endpoint = scope.get("endpoint")
+        route = scope.get("route")
+        if route is not None and getattr(route, "path", None):
+            profile.name = f"{scope['method']} {route.path}"
+        profile.budget = getattr(endpoint, "__query_budget__", None) or self.default_budget
+        finish_profile(profile, token, enforce=self.enforce)
@@ -0,0 +1,307 @@
+"""
+Task supervisor for long-lived background tasks
+Every background loop started at startup (database monitors, auto-apply
+workers, schedulers, learning and brain cycles) is spawned through the
+supervisor with a name, an owner and a restart policy. Each runs inside one
+supervising asyncio task, so the handle returned to the owner stays valid
+across restarts and existing cancel/await shutdown code keeps working.
+
+The supervisor charges the CPU time of every step of a task's coroutine to
+that task and flags steps that block the event loop. Loops call beat() once
+per iteration (or beat(error=...) from their error branch) so iterations,
+consecutive errors, the last error and lag behind the expected interval are
+visible. A crashed task is recorded, logged and restarted with backoff per
+its policy rather than dying silently. On shutdown everything still running
+is cancelled newest-first within a deadline.
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable, Awaitable
+import structlog
+
+from .config import settings
+
+logger = structlog.get_logger()
+
+RESTART_NEVER = "never"
+RESTART_ON_FAILURE = "on_failure"  # Restart when the coroutine raises
+RESTART_ALWAYS = "always"  # Restart whenever the coroutine exits (loops that must never stop)
+RESTART_POLICIES = (RESTART_NEVER, RESTART_ON_FAILURE, RESTART_ALWAYS)
+
+MAX_RESTART_BACKOFF_SECONDS = 60.0
+MAX_FINISHED_TASKS = 100  # Finished/failed records kept for inspection
+# Loops beat once per iteration, so an iteration's own work shows up as lag;
+# a task only counts as lagging once it is this fraction of its interval late
+LAG_GRACE_FRACTION = 0.5
+SLOW_STEP_LOG_INTERVAL = 60.0  # Seconds between slow-step warnings per task
+
+_current_task: ContextVar[Optional["SupervisedTask"]] = ContextVar("supervised_task", default=None)
+
+
+class SupervisedTask:
+    """Bookkeeping for one supervised background task"""
+
+    def __init__(self, name: str, owner: str, factory: Callable[[], Awaitable[Any]], restart: str,
+                 interval: Optional[float], max_restarts: Optional[int]):
+        self.name = name
+        self.owner = owner
+        self.factory = factory
+        self.restart = restart
+        self.interval = interval  # Expected seconds between beats, for lag
+        self.max_restarts = max_restarts
+        self.task: Optional[asyncio.Task] = None
+        self.state = "running"
+        self.started_at = time.time()
+        self.started_monotonic = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.restarts = 0
+        self.cpu_seconds = 0.0
+        self.steps = 0
+        self.max_step_seconds = 0.0
+        self.slow_steps = 0
+        self.last_slow_log = 0.0
+        self.iterations = 0
+        self.last_beat: Optional[float] = None  # monotonic
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[float] = None
+
+    def charge(self, cpu_seconds: float, wall_seconds: float, slow_step_seconds: float):
+        self.cpu_seconds += cpu_seconds
+        self.steps += 1
+        self.max_step_seconds = max(self.max_step_seconds, wall_seconds)
+        if wall_seconds >= slow_step_seconds:
+            self.slow_steps += 1
+            now = time.monotonic()
+            if now - self.last_slow_log >= SLOW_STEP_LOG_INTERVAL:
+                self.last_slow_log = now
+                logger.warning("Supervised task blocked the event loop", task=self.name, owner=self.owner,
+                               step_seconds=round(wall_seconds, 3), slow_steps=self.slow_steps)
+
+    def record_error(self, error: BaseException):
+        self.errors += 1
+        self.consecutive_errors += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        self.last_error_at = time.time()
+
+    def lag_seconds(self, now: Optional[float] = None) -> Optional[float]:
+        """How far past its expected next beat a running task is"""
+        if self.interval is None or self.state != "running":
+            return None
+        now = time.monotonic() if now is None else now
+        reference = self.last_beat if self.last_beat is not None else self.started_monotonic
+        return round(max(0.0, now - reference - self.interval), 3)
+
+    def is_lagging(self, now: Optional[float] = None) -> bool:
+        lag = self.lag_seconds(now)
+        return lag is not None and lag > self.interval * LAG_GRACE_FRACTION
+
+    def to_dict(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        end = self.finished_at or time.time()
+        uptime = max(end - self.started_at, 1e-9)
+
+        def iso(timestamp):
+            return datetime.utcfromtimestamp(timestamp).isoformat() if timestamp else None
+
+        return {
+            "name": self.name,
+            "owner": self.owner,
+            "state": self.state,
+            "restart": self.restart,
+            "restarts": self.restarts,
+            "started_at": iso(self.started_at),
+            "finished_at": iso(self.finished_at),
+            "uptime_seconds": round(uptime, 1),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "cpu_percent": round(100.0 * self.cpu_seconds / uptime, 2),
+            "steps": self.steps,
+            "max_step_ms": round(self.max_step_seconds * 1000, 1),
+            "slow_steps": self.slow_steps,
+            "iterations": self.iterations,
+            "seconds_since_beat": round(now - self.last_beat, 1) if self.last_beat is not None else None,
+            "interval_seconds": self.interval,
+            "lag_seconds": self.lag_seconds(now),
+            "lagging": self.is_lagging(now),
+            "errors": self.errors,
+            "consecutive_errors": self.consecutive_errors,
+            "last_error": self.last_error,
+            "last_error_at": iso(self.last_error_at),
+        }
+
+
+class _Instrumented:
+    """Drives a coroutine step by step, charging each step's CPU and wall time to its task"""
+
+    def __init__(self, coro, record: SupervisedTask, slow_step_seconds: float):
+        self._coro = coro
+        self._record = record
+        self._slow_step_seconds = slow_step_seconds
+
+    def __await__(self):
+        coro, record = self._coro, self._record
+        value, error = None, None
+        while True:
+            cpu_started, wall_started = time.thread_time(), time.perf_counter()
+            try:
+                yielded = coro.send(value) if error is None else coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                record.charge(time.thread_time() - cpu_started, time.perf_counter() - wall_started,
+                              self._slow_step_seconds)
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+
+class TaskSupervisor:
+    """Registry and lifecycle owner of long-lived background tasks"""
+
+    def __init__(self):
+        self._records: Dict[str, SupervisedTask] = {}
+        self._stopping = False
+
+    def spawn(self, name: str, factory: Callable[..., Awaitable[Any]], *args, owner: str = "app",
+              restart: str = RESTART_NEVER, interval: Optional[float] = None,
+              max_restarts: Optional[int] = None) -> asyncio.Task:
+        """Start factory(*args) as a supervised task; returns the supervising asyncio task"""
+        if restart not in RESTART_POLICIES:
+            raise ValueError(f"Unknown restart policy '{restart}', expected one of {', '.join(RESTART_POLICIES)}")
+        name = self._unique_name(name)
+        record = SupervisedTask(
+            name, owner, lambda: factory(*args), restart, interval,
+            settings.task_supervisor_max_restarts if max_restarts is None else max_restarts,
+        )
+        record.task = asyncio.get_running_loop().create_task(self._run(record), name=name)
+        self._records[name] = record
+        self._prune()
+        return record.task
+
+    def _unique_name(self, name: str) -> str:
+        candidate, suffix = name, 1
+        while candidate in self._records and not self._records[candidate].task.done():
+            suffix += 1
+            candidate = f"{name}#{suffix}"
+        self._records.pop(candidate, None)
+        return candidate
+
+    def _prune(self):
+        finished = [name for name, record in self._records.items() if record.task is not None and record.task.done()]
+        for name in finished[:max(0, len(finished) - MAX_FINISHED_TASKS)]:
+            del self._records[name]
+
+    async def _run(self, record: SupervisedTask):
+        _current_task.set(record)
+        backoff = 1.0
+        while True:
+            record.state = "running"
+            run_started = time.monotonic()
+            failure: Optional[BaseException] = None
+            try:
+                await _Instrumented(record.factory(), record, settings.task_supervisor_slow_step_seconds)
+            except asyncio.CancelledError:
+                self._finish(record, "cancelled")
+                raise
+            except Exception as e:
+                failure = e
+                record.record_error(e)
+                logger.error("Supervised task crashed", task=record.name, owner=record.owner, error=str(e),
+                             restarts=record.restarts)
+
+            current = asyncio.current_task()
+            if self._stopping or (hasattr(current, "cancelling") and current.cancelling()):
+                # The coroutine swallowed its cancellation and returned
+                self._finish(record, "cancelled")
+                raise asyncio.CancelledError()
+
+            wants_restart = record.restart == RESTART_ALWAYS or (failure is not None and record.restart == RESTART_ON_FAILURE)
+            if not wants_restart:
+                self._finish(record, "failed" if failure is not None else "finished")
+                if failure is None and record.restart == RESTART_NEVER:
+                    logger.info("Supervised task finished", task=record.name, owner=record.owner)
+                return
+            if record.max_restarts is not None and record.restarts >= record.max_restarts:
+                self._finish(record, "failed")
+                logger.error("Supervised task exceeded its restarts and was stopped", task=record.name,
+                             owner=record.owner, restarts=record.restarts, last_error=record.last_error)
+                return
+
+            if time.monotonic() - run_started > MAX_RESTART_BACKOFF_SECONDS:
+                backoff = 1.0  # It ran for a while; start backing off from scratch
+            record.restarts += 1
+            record.state = "restarting"
+            logger.warning("Restarting supervised task", task=record.name, owner=record.owner,
+                           restarts=record.restarts, delay=backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_RESTART_BACKOFF_SECONDS)
+
+    def _finish(self, record: SupervisedTask, state: str):
+        record.state = state
+        record.finished_at = time.time()
+
+    def beat(self, error: Optional[BaseException] = None):
+        """Record one loop iteration of the calling supervised task (no-op outside one)"""
+        record = _current_task.get()
+        if record is None:
+            return
+        record.iterations += 1
+        record.last_beat = time.monotonic()
+        if error is not None:
+            record.record_error(error)
+        else:
+            record.consecutive_errors = 0
+
+    def get(self, name: str) -> Optional[SupervisedTask]:
+        return self._records.get(name)
+
+    async def shutdown(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Cancel running tasks newest-first, waiting for each within one overall deadline"""
+        timeout = settings.task_supervisor_shutdown_seconds if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        running = [record for record in reversed(list(self._records.values()))
+                   if record.task is not None and not record.task.done() and record.task.get_loop() is loop]
+        self._stopping = True
+        stopped: List[str] = []
+        abandoned: List[str] = []
+        try:
+            for record in running:
+                record.task.cancel()
+                remaining = deadline - loop.time()
+                if remaining > 0:
+                    await asyncio.wait({record.task}, timeout=remaining)
+                else:
+                    await asyncio.sleep(0)  # Past the deadline: one loop pass to deliver the cancellation
+                (stopped if record.task.done() else abandoned).append(record.name)
+        finally:
+            self._stopping = False
+        if abandoned:
+            logger.warning("Supervised tasks did not stop before the shutdown deadline",
+                           tasks=abandoned, timeout=timeout)
+        logger.info("Supervised tasks stopped", stopped=len(stopped), abandoned=len(abandoned))
+        return {"stopped": stopped, "abandoned": abandoned}
+
+    def get_status(self) -> Dict[str, Any]:
+        tasks = [record.to_dict() for record in self._records.values()]
+        states: Dict[str, int] = {}
+        for task in tasks:
+            states[task["state"]] = states.get(task["state"], 0) + 1
+        return {
+            "tasks": sorted(tasks, key=lambda task: (task["owner"], task["name"])),
+            "states": states,
+            "total_cpu_seconds": round(sum(task["cpu_seconds"] for task in tasks), 4),
+            "failing": [task["name"] for task in tasks if task["consecutive_errors"] >= 3 or task["state"] == "failed"],
+            "lagging": [task["name"] for task in tasks if task["lagging"]],
+        }
+
+
+task_supervisor = TaskSupervisor()
@@ -3,13 +3,17 @@ SQLAlchemy models for PostgreSQL/NeonDB
 """
 
 from datetime import datetime
-from typing import Optional, List
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, JSON, ForeignKey, Index
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from typing import Optional, List, Dict, Tuple
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, Date, DateTime, JSON, ForeignKey, Index, event
+from sqlalchemy.orm import relationship, Session, attributes, object_session
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 import uuid
+import structlog
 from app.core.database import Base
 
+logger = structlog.get_logger()
+
 
 class Proposal(Base):
     """Proposal model for PostgreSQL"""
@@ -86,20 +90,16 @@ class Learning(Base):
     status = Column(String(20), default="active")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Hot fields of learning_data, kept in sync on write so stats aggregate without reading the JSON
+    applied_count = Column(Integer, default=0)
+    success_rate = Column(Float, default=0.0)
     
     # Relationships
     proposal = relationship("Proposal", backref="learning_events")
 
-    @property
-    def success_rate(self) -> float:
-        """Get success rate from learning data or return default"""
-        try:
-            learning_data = getattr(self, 'learning_data', None)
-            if learning_data and isinstance(learning_data, dict):
-                return float(learning_data.get('success_rate', 0.0))
-            return 0.0
-        except Exception:
-            return 0.0
+    __table_args__ = (
+        Index('idx_learning_ai_type_hot', 'ai_type', 'applied_count', 'success_rate'),
+    )
 
     @property
     def confidence(self) -> float:
@@ -123,21 +123,137 @@ class Learning(Base):
         except Exception:
             return ''
 
-    @property
-    def applied_count(self) -> int:
-        """Get applied count from learning data or return default"""
+    def sync_hot_fields(self):
+        """Copy applied_count and success_rate out of learning_data into their columns"""
+        learning_data = self.learning_data if isinstance(self.learning_data, dict) else {}
         try:
-            learning_data = getattr(self, 'learning_data', None)
-            if learning_data and isinstance(learning_data, dict):
-                return int(learning_data.get('applied_count', 0))
-            return 0
-        except Exception:
-            return 0
+            self.applied_count = int(learning_data.get('applied_count', 0) or 0)
+        except (TypeError, ValueError):
+            self.applied_count = 0
+        try:
+            self.success_rate = float(learning_data.get('success_rate', 0.0) or 0.0)
+        except (TypeError, ValueError):
+            self.success_rate = 0.0
 
     def __repr__(self):
         return f"<Learning(id={self.id}, ai_type='{self.ai_type}', learning_type='{self.learning_type}')>"
 
 
+@event.listens_for(Learning, "before_insert")
+@event.listens_for(Learning, "before_update")
+def _sync_learning_hot_fields(mapper, connection, target):
+    target.sync_hot_fields()
+
+
+class LearningHourlyBucket(Base):
+    """Per-hour, per-AI rollup of learning rows, maintained on every learning write"""
+    __tablename__ = "learning_hourly_buckets"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    ai_type = Column(String(50), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)  # Hour the learning rows were created in
+    event_count = Column(Integer, nullable=False, default=0)
+    success_count = Column(Integer, nullable=False, default=0)  # Rows with success_rate > 0.5
+    success_rate_sum = Column(Float, nullable=False, default=0.0)
+    applied_count_sum = Column(Integer, nullable=False, default=0)
+    
+    # Timestamps
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_learning_hourly_buckets_ai_hour', 'ai_type', 'bucket_start', unique=True),
+        Index('idx_learning_hourly_buckets_hour', 'bucket_start'),
+    )
+
+
+LEARNING_BUCKET_MEASURES = ("event_count", "success_count", "success_rate_sum", "applied_count_sum")
+
+
+def learning_bucket_start(moment: Optional[datetime]) -> datetime:
+    return (moment or datetime.utcnow()).replace(minute=0, second=0, microsecond=0)
+
+
+def _learning_bucket_contribution(ai_type, created_at, success_rate, applied_count):
+    success_rate = float(success_rate or 0.0)
+    return (ai_type, learning_bucket_start(created_at)), (1, int(success_rate > 0.5), success_rate, int(applied_count or 0))
+
+
+def _add_learning_bucket_delta(target, contribution, sign: int):
+    session = object_session(target)
+    if session is None or contribution[0][0] is None:
+        return
+    deltas = session.info.setdefault("learning_bucket_deltas", {})
+    key, values = contribution
+    current = deltas.get(key, (0, 0, 0.0, 0))
+    deltas[key] = tuple(total + sign * value for total, value in zip(current, values))
+
+
+def _previous_value(target, name):
+    history = attributes.get_history(target, name)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, name)
+
+
+@event.listens_for(Learning, "after_insert")
+def _bucket_learning_insert(mapper, connection, target):
+    _add_learning_bucket_delta(target, _learning_bucket_contribution(
+        target.ai_type, target.created_at, target.success_rate, target.applied_count), 1)
+
+
+@event.listens_for(Learning, "after_update")
+def _bucket_learning_update(mapper, connection, target):
+    names = ("ai_type", "created_at", "success_rate", "applied_count")
+    if not any(attributes.get_history(target, name).has_changes() for name in names):
+        return
+    _add_learning_bucket_delta(target, _learning_bucket_contribution(
+        *[_previous_value(target, name) for name in names]), -1)
+    _add_learning_bucket_delta(target, _learning_bucket_contribution(
+        *[getattr(target, name) for name in names]), 1)
+
+
+@event.listens_for(Learning, "after_delete")
+def _bucket_learning_delete(mapper, connection, target):
+    _add_learning_bucket_delta(target, _learning_bucket_contribution(
+        *[_previous_value(target, name) for name in ("ai_type", "created_at", "success_rate", "applied_count")]), -1)
+
+
+def upsert_learning_buckets(connection, deltas: Dict[Tuple[str, datetime], Tuple]):
+    """Add per-(ai_type, hour) deltas to the hourly buckets in one statement"""
+    if not deltas:
+        return
+    insert_fn = sqlite_insert if connection.dialect.name == "sqlite" else pg_insert
+    table = LearningHourlyBucket.__table__
+    now = datetime.utcnow()
+    statement = insert_fn(table).values([
+        {"id": uuid.uuid4(), "ai_type": ai_type, "bucket_start": bucket_start, "updated_at": now,
+         **dict(zip(LEARNING_BUCKET_MEASURES, values))}
+        for (ai_type, bucket_start), values in deltas.items()
+    ])
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.ai_type, table.c.bucket_start],
+        set_={
+            **{name: table.c[name] + statement.excluded[name] for name in LEARNING_BUCKET_MEASURES},
+            "updated_at": statement.excluded.updated_at,
+        },
+    ))
+
+
+@event.listens_for(Session, "after_flush")
+def _flush_learning_buckets(session, flush_context):
+    # One upsert per flush, in the same transaction as the learning rows
+    deltas = session.info.pop("learning_bucket_deltas", None)
+    if not deltas:
+        return
+    connection = session.connection()
+    try:
+        # Savepoint, so a failed rollup never aborts the learning write itself
+        with connection.begin_nested():
+            upsert_learning_buckets(connection, deltas)
+    except Exception as e:
+        logger.warning("Failed to update learning hourly buckets", error=str(e))
+
+
 class ErrorLearning(Base):
     """Error learning model for PostgreSQL"""
     __tablename__ = "error_learning"
@@ -653,6 +769,78 @@ Index('idx_token_usage_logs_created_at', TokenUsageLog.created_at.desc())
 Index('idx_token_usage_logs_request_id', TokenUsageLog.request_id) 
 
 
+class TokenUsageDaily(Base):
+    """Per-day, per-AI rollup of token_usage_logs (outlives the raw log rows)"""
+    __tablename__ = "token_usage_daily"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    day = Column(Date, nullable=False)
+    ai_type = Column(String(50), nullable=False)
+    tokens_in = Column(Integer, default=0)
+    tokens_out = Column(Integer, default=0)
+    total_tokens = Column(Integer, default=0)
+    request_count = Column(Integer, default=0)
+    failed_requests = Column(Integer, default=0)
+    
+    # Timestamps
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_token_usage_daily_day_ai', 'day', 'ai_type', unique=True),
+    )
+
+
+class ActivityDailyRollup(Base):
+    """Per-day, per-AI rollup of learning logs, AI answers and internet learning results"""
+    __tablename__ = "activity_daily_rollups"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    source = Column(String(50), nullable=False)  # learning_logs/ai_answers/internet_learning_results
+    day = Column(Date, nullable=False)
+    ai_type = Column(String(100), nullable=False, default="")  # agent_type/ai_type/agent_id
+    dimension = Column(String(100), nullable=False, default="")  # event_type/reasoning_quality/source
+    event_count = Column(Integer, default=0)
+    value_sum = Column(Float, default=0.0)  # results_count/answer_length/learning_value
+    score_sum = Column(Float, default=0.0)  # impact_score/confidence_score/relevance_score
+    duration_sum = Column(Float, default=0.0)  # processing_time (learning logs only)
+    flag_count = Column(Integer, default=0)  # errors/fallback answers/applied results
+    
+    # Timestamps
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('idx_activity_daily_rollups_key', 'source', 'day', 'ai_type', 'dimension', unique=True),
+    )
+
+
+class HealthRollupState(Base):
+    """Guardian health rollup progress per table, shared by every worker and restart"""
+    __tablename__ = "health_rollup_states"
+    
+    table_name = Column(String(50), primary_key=True)
+    high_water_mark = Column(DateTime, nullable=True)  # Newest updated_at already examined
+    total_rows = Column(Integer, nullable=False, default=0)
+    flagged = Column(JSON, nullable=False, default=dict)  # rule -> {item_id: item_name} (open issues)
+    
+    # Timestamps
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class AILearningState(Base):
+    """Per-AI learning counters shared by every worker (levels derive from these)"""
+    __tablename__ = "ai_learning_states"
+    
+    ai_type = Column(String(50), primary_key=True)
+    event_count = Column(Integer, nullable=False, default=0)
+    improvement_count = Column(Integer, nullable=False, default=0)
+    productivity_score_sum = Column(Float, nullable=False, default=0.0)
+    productivity_event_count = Column(Integer, nullable=False, default=0)
+    last_learning_at = Column(DateTime, nullable=True)
+    
+    # Timestamps
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class AIAnswer(Base):
     """AI Answer model for storing AI responses with explainability data"""
     __tablename__ = "ai_answers"
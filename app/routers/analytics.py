@@ -16,11 +16,7 @@ from ..models.sql_models import Proposal, Learning, AgentMetrics, GuardianSugges
 from ..services.ai_learning_service import AILearningService
 from ..services.ai_growth_service import AIGrowthService
 from ..services.custody_protocol_service import CustodyProtocolService
-from ..services.sckipit_service import SckipitService
-from ..services.conquest_ai_service import ConquestAIService
-from ..services.imperium_ai_service import ImperiumAIService
-from ..services.guardian_ai_service import GuardianAIService
-from ..services.sandbox_ai_service import SandboxAIService
+from ..services.analytics_aggregation_service import AnalyticsAggregationService
 
 logger = structlog.get_logger()
 
@@ -33,19 +29,13 @@ async def get_comprehensive_sckipit_analytics(
 ) -> Dict[str, Any]:
     """Get comprehensive SCKIPIT analytics from all AI services"""
     try:
-        # Initialize all AI services
-        conquest_service = ConquestAIService()
-        imperium_service = ImperiumAIService()
-        guardian_service = GuardianAIService()
-        sandbox_service = SandboxAIService()
-        sckipit_service = await SckipitService.initialize()
-        
-        # Get SCKIPIT analytics from each service
-        conquest_analytics = await conquest_service.get_sckipit_analytics()
-        imperium_analytics = await imperium_service.get_sckipit_analytics()
-        guardian_analytics = await guardian_service.get_sckipit_analytics()
-        sandbox_analytics = await sandbox_service.get_sckipit_analytics()
-        sckipit_core_analytics = await sckipit_service.get_sckipit_analytics()
+        # Gather SCKIPIT analytics sections concurrently (cached per section)
+        sections = await AnalyticsAggregationService().get_sections()
+        conquest_analytics = sections['conquest']
+        imperium_analytics = sections['imperium']
+        guardian_analytics = sections['guardian']
+        sandbox_analytics = sections['sandbox']
+        sckipit_core = sections['sckipit_core']
         
         # Aggregate SCKIPIT insights
         comprehensive_analytics = {
@@ -75,9 +65,9 @@ async def get_comprehensive_sckipit_analytics(
             },
             'sckipit_core': {
                 'status': 'active',
-                'analytics': sckipit_core_analytics,
-                'models_loaded': len(sckipit_service._models) if hasattr(sckipit_service, '_models') else 0,
-                'knowledge_base_size': len(sckipit_service._knowledge_base) if hasattr(sckipit_service, '_knowledge_base') else 0
+                'analytics': sckipit_core.get('analytics', sckipit_core),
+                'models_loaded': sckipit_core.get('models_loaded', 0),
+                'knowledge_base_size': sckipit_core.get('knowledge_base_size', 0)
             },
             'aggregated_metrics': {
                 'total_ai_analyses': (
@@ -123,20 +113,11 @@ async def get_ai_sckipit_analytics(
 ) -> Dict[str, Any]:
     """Get SCKIPIT analytics for a specific AI service"""
     try:
-        # Get the appropriate AI service
-        if ai_type.lower() == "conquest":
-            service = ConquestAIService()
-        elif ai_type.lower() == "imperium":
-            service = ImperiumAIService()
-        elif ai_type.lower() == "guardian":
-            service = GuardianAIService()
-        elif ai_type.lower() == "sandbox":
-            service = SandboxAIService()
-        else:
+        if ai_type.lower() not in ("conquest", "imperium", "guardian", "sandbox"):
             raise HTTPException(status_code=400, detail=f"Unknown AI type: {ai_type}")
         
-        # Get SCKIPIT analytics
-        analytics = await service.get_sckipit_analytics()
+        # Get SCKIPIT analytics (cached section)
+        analytics = await AnalyticsAggregationService().get_section(ai_type.lower())
         
         return {
             'ai_type': ai_type,
@@ -145,6 +126,8 @@ async def get_ai_sckipit_analytics(
             'analytics': analytics
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting SCKIPIT analytics for {ai_type}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error retrieving analytics: {str(e)}")
@@ -156,17 +139,14 @@ async def get_sckipit_quality_analysis(
 ) -> Dict[str, Any]:
     """Get SCKIPIT quality analysis across all AI services"""
     try:
-        # Initialize all AI services
-        conquest_service = ConquestAIService()
-        imperium_service = ImperiumAIService()
-        guardian_service = GuardianAIService()
-        sandbox_service = SandboxAIService()
-        
-        # Get quality metrics from each service
-        conquest_quality = await conquest_service.get_sckipit_analytics()
-        imperium_quality = await imperium_service.get_sckipit_analytics()
-        guardian_quality = await guardian_service.get_sckipit_analytics()
-        sandbox_quality = await sandbox_service.get_sckipit_analytics()
+        # Get quality metrics from each service (cached sections, gathered concurrently)
+        sections = await AnalyticsAggregationService().get_sections(
+            ['conquest', 'imperium', 'guardian', 'sandbox']
+        )
+        conquest_quality = sections['conquest']
+        imperium_quality = sections['imperium']
+        guardian_quality = sections['guardian']
+        sandbox_quality = sections['sandbox']
         
         # Aggregate quality analysis
         quality_analysis = {
@@ -209,17 +189,14 @@ async def get_sckipit_performance_metrics(
 ) -> Dict[str, Any]:
     """Get SCKIPIT performance metrics across all AI services"""
     try:
-        # Initialize all AI services
-        conquest_service = ConquestAIService()
-        imperium_service = ImperiumAIService()
-        guardian_service = GuardianAIService()
-        sandbox_service = SandboxAIService()
-        
-        # Get performance metrics from each service
-        conquest_perf = await conquest_service.get_sckipit_analytics()
-        imperium_perf = await imperium_service.get_sckipit_analytics()
-        guardian_perf = await guardian_service.get_sckipit_analytics()
-        sandbox_perf = await sandbox_service.get_sckipit_analytics()
+        # Get performance metrics from each service (cached sections, gathered concurrently)
+        sections = await AnalyticsAggregationService().get_sections(
+            ['conquest', 'imperium', 'guardian', 'sandbox']
+        )
+        conquest_perf = sections['conquest']
+        imperium_perf = sections['imperium']
+        guardian_perf = sections['guardian']
+        sandbox_perf = sections['sandbox']
         
         # Aggregate performance metrics
         performance_metrics = {
@@ -265,6 +242,15 @@ async def get_sckipit_performance_metrics(
         raise HTTPException(status_code=500, detail=f"Error retrieving performance metrics: {str(e)}")
 
 
+@router.get("/sckipit/cache-stats")
+async def get_sckipit_cache_stats() -> Dict[str, Any]:
+    """Get analytics section cache statistics"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'cache': AnalyticsAggregationService().get_cache_stats()
+    }
+
+
 @router.get("/sckipit/learning-insights")
 async def get_sckipit_learning_insights(
     db: AsyncSession = Depends(get_db)
@@ -3,8 +3,10 @@ Autonomous Brain Router
 Exposes autonomous AI brain capabilities for Horus and Berserk
 """
 
+import asyncio
+import json
 from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import structlog
 
 from ..services.autonomous_ai_brain_service import horus_autonomous_brain, berserk_autonomous_brain
@@ -219,8 +221,8 @@ async def get_horus_growth_stages() -> Dict[str, Any]:
         return {
             "success": True,
             "ai_name": "Horus",
-            "growth_stages": horus_autonomous_brain.brain_growth_stages,
-            "creative_breakthroughs": horus_autonomous_brain.creative_breakthroughs,
+            "growth_stages": list(horus_autonomous_brain.brain_growth_stages),
+            "creative_breakthroughs": list(horus_autonomous_brain.creative_breakthroughs),
             "message": "Horus brain growth stages retrieved"
         }
     except Exception as e:
@@ -235,8 +237,8 @@ async def get_berserk_growth_stages() -> Dict[str, Any]:
         return {
             "success": True,
             "ai_name": "Berserk",
-            "growth_stages": berserk_autonomous_brain.brain_growth_stages,
-            "creative_breakthroughs": berserk_autonomous_brain.creative_breakthroughs,
+            "growth_stages": list(berserk_autonomous_brain.brain_growth_stages),
+            "creative_breakthroughs": list(berserk_autonomous_brain.creative_breakthroughs),
             "message": "Berserk brain growth stages retrieved"
         }
     except Exception as e:
@@ -251,8 +253,8 @@ async def get_horus_evolution_history() -> Dict[str, Any]:
         return {
             "success": True,
             "ai_name": "Horus",
-            "evolution_history": horus_autonomous_brain.code_evolution_history,
-            "learning_experiences": horus_autonomous_brain.learning_experiences,
+            "evolution_history": list(horus_autonomous_brain.code_evolution_history),
+            "learning_experiences": list(horus_autonomous_brain.learning_experiences),
             "message": "Horus evolution history retrieved"
         }
     except Exception as e:
@@ -267,8 +269,8 @@ async def get_berserk_evolution_history() -> Dict[str, Any]:
         return {
             "success": True,
             "ai_name": "Berserk",
-            "evolution_history": berserk_autonomous_brain.code_evolution_history,
-            "learning_experiences": berserk_autonomous_brain.learning_experiences,
+            "evolution_history": list(berserk_autonomous_brain.code_evolution_history),
+            "learning_experiences": list(berserk_autonomous_brain.learning_experiences),
             "message": "Berserk evolution history retrieved"
         }
     except Exception as e:
@@ -276,6 +278,28 @@ async def get_berserk_evolution_history() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Error getting Berserk evolution history: {str(e)}")
 
 
+@router.get("/{ai_name}/history/{history_name}")
+async def query_brain_history(ai_name: str, history_name: str, limit: int = 100,
+                              contains: Optional[str] = None) -> Dict[str, Any]:
+    """Query a brain history newest-first, including entries spilled to disk"""
+    brain = {"horus": horus_autonomous_brain, "berserk": berserk_autonomous_brain}.get(ai_name.lower())
+    if brain is None:
+        raise HTTPException(status_code=404, detail=f"Unknown brain: {ai_name}")
+    history = brain.histories.get(history_name)
+    if history is None:
+        raise HTTPException(status_code=404, detail=f"Unknown history: {history_name}")
+    predicate = (lambda entry: contains in json.dumps(entry, default=str)) if contains else None
+    entries = await asyncio.to_thread(history.query, predicate, min(max(limit, 1), 1000))
+    return {
+        "success": True,
+        "ai_name": brain.ai_name,
+        "history": history_name,
+        "entries": entries,
+        "stats": history.get_stats(),
+        "message": f"{brain.ai_name} {history_name} retrieved"
+    }
+
+
 @router.post("/horus/accelerate-learning")
 async def accelerate_horus_learning() -> Dict[str, Any]:
     """Accelerate Horus learning process"""
@@ -4,149 +4,146 @@ API endpoints for the Black Library screen
 Provides learning data and custody data for AI visualization
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
 
 from app.core.database import get_db
-from app.models.sql_models import Proposal, Learning, AgentMetrics, Experiment
-from app.services.ai_learning_service import AILearningService
+from app.models.sql_models import Proposal, Experiment
 from app.services.ai_growth_service import AIGrowthService
 from app.services.custody_protocol_service import CustodyProtocolService
+from app.services.black_library_snapshot_service import BlackLibrarySnapshotService, AI_TYPES
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/api/black-library", tags=["Black Library"])
 
 
 @router.get("/live-data")
-async def get_black_library_live_data(session: AsyncSession = Depends(get_db)):
-    """Get comprehensive Black Library data including learning trees and custody results"""
+async def get_black_library_live_data(request: Request, session: AsyncSession = Depends(get_db)):
+    """Get comprehensive Black Library data including learning trees and custody results
+
+    Served from a snapshot that is rebuilt only when learning, metrics, proposal or
+    experiment data (or the custody/growth analytics) change. Send the returned ETag
+    as If-None-Match to get a 304 while nothing changed.
+    """
     try:
-        # Initialize services
-        ai_learning_service = AILearningService()
-        ai_growth_service = AIGrowthService()
-        custody_service = await CustodyProtocolService.initialize()
-        
-        # Get custody analytics
-        custody_analytics = await custody_service.get_custody_analytics()
+        snapshot = await BlackLibrarySnapshotService().get_snapshot(session, _assemble_live_data)
+        headers = {"ETag": snapshot["etag"], "Cache-Control": "no-cache"}
         
-        # Get AI data for each agent type
-        ai_types = ["imperium", "guardian", "sandbox", "conquest"]
-        ai_data = {}
-        total_learning_score = 0.0
-        total_xp = 0
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and snapshot["etag"] in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
         
-        # Get growth insights from the growth service
-        growth_insights = await ai_growth_service.get_growth_insights()
-        ai_growth_data = growth_insights.get('ai_growth_insights', {})
+        return JSONResponse(content=snapshot["payload"], headers=headers)
         
-        for ai_type in ai_types:
-            # Get learning score from growth insights
-            ai_growth = ai_growth_data.get(ai_type.title(), {})
-            learning_score = ai_growth.get('growth_score', 0.0)
-            ai_level = 1  # Default level
-            level_progress = learning_score / 100.0  # Progress as percentage of 100
+    except Exception as e:
+        logger.error("Error getting Black Library live data", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
 
-            # Get custody metrics for this AI
-            custody_metrics = custody_analytics.get("ai_specific_metrics", {}).get(ai_type, {})
 
-            # Get recent learning data as nodes
-            learning_nodes = []
-            learning_query = await session.execute(
-                select(Learning).where(Learning.ai_type == ai_type).order_by(Learning.created_at.desc()).limit(50)
-            )
-            for learning in learning_query.scalars().all():
-                learning_nodes.append({
-                    'id': str(learning.id),
-                    'learning_type': learning.learning_type,
-                    'learning_data': learning.learning_data,
-                    'created_at': learning.created_at.isoformat() if learning.created_at else None,
-                    'status': learning.status
-                })
+def _pattern_nodes(ai_type: str, patterns: List[str]) -> List[Dict[str, Any]]:
+    return [
+        {
+            'id': f"{ai_type}_pattern_{idx}",
+            'learning_type': pattern.split(':')[0] if ':' in pattern else 'pattern',
+            'learning_data': pattern,
+            'created_at': None,
+            'status': 'active'
+        }
+        for idx, pattern in enumerate(patterns)
+    ]
 
-            # PATCH: If no learning_nodes, fallback to learning_patterns from custody_metrics
-            if not learning_nodes and 'learning_patterns' in custody_metrics:
-                patterns = custody_metrics['learning_patterns']
-                learning_nodes = [
-                    {
-                        'id': f"{ai_type}_pattern_{idx}",
-                        'learning_type': pattern.split(':')[0] if ':' in pattern else 'pattern',
-                        'learning_data': pattern,
-                        'created_at': None,
-                        'status': 'active'
-                    }
-                    for idx, pattern in enumerate(patterns)
-                ]
 
-            # FURTHER PATCH: If still no learning_nodes, try AgentMetrics table
-            if not learning_nodes:
-                agent_metrics_query = await session.execute(
-                    select(AgentMetrics).where(AgentMetrics.agent_type == ai_type)
-                )
-                agent_metrics_row = agent_metrics_query.scalars().first()
-                if agent_metrics_row and getattr(agent_metrics_row, 'learning_patterns', None):
-                    patterns = agent_metrics_row.learning_patterns
-                    learning_nodes = [
-                        {
-                            'id': f"{ai_type}_pattern_{idx}",
-                            'learning_type': pattern.split(':')[0] if ':' in pattern else 'pattern',
-                            'learning_data': pattern,
-                            'created_at': None,
-                            'status': 'active'
-                        }
-                        for idx, pattern in enumerate(patterns)
-                    ]
+def _assemble_live_data(sources: Dict[str, Any]) -> Dict[str, Any]:
+    """Assemble the live-data payload from batched snapshot sources"""
+    custody_analytics = sources["custody"]
+    ai_growth_data = sources["growth"].get('ai_growth_insights', {})
+    built_at = sources["loaded_at"]
+    
+    ai_data = {}
+    total_learning_score = 0.0
+    total_xp = 0
+    
+    for ai_type in AI_TYPES:
+        # Get learning score from growth insights
+        ai_growth = ai_growth_data.get(ai_type.title(), {})
+        learning_score = ai_growth.get('growth_score', 0.0)
+        ai_level = 1  # Default level
+        level_progress = learning_score / 100.0  # Progress as percentage of 100
+
+        # Get custody metrics for this AI
+        custody_metrics = custody_analytics.get("ai_specific_metrics", {}).get(ai_type, {})
 
-            ai_data[ai_type] = {
-                'level': ai_level,
-                'title': _get_agent_level_and_title(learning_score, ai_type),
-                'knowledge_points': int(learning_score * 0.1),
-                'xp': int(learning_score),
-                'custody_xp': custody_metrics.get('custody_xp', 0),
-                'level_progress': level_progress,
-                'learning_score': learning_score,
-                'last_activity': datetime.utcnow().isoformat(),
-                'learning_nodes': learning_nodes,
-                'custodes_status': {
-                    'last_test': custody_metrics.get('last_test_date'),
-                    'test_status': 'active' if custody_metrics.get('total_tests_given', 0) > 0 else 'inactive',
-                    'pass_rate': custody_metrics.get('pass_rate', 0.0),
-                    'total_tests': custody_metrics.get('total_tests_given', 0),
-                    'eligible_for_proposals': custody_metrics.get('can_create_proposals', False)
-                },
-                'autonomous_learning': {
-                    'last_learning_cycle': await _get_last_learning_cycle(session, ai_type),
-                    'subjects_learned': _get_subjects_learned(ai_type),
-                    'internet_learning_active': True,
-                    'cross_ai_learning': True,
-                    'learning_cycle_status': 'active'
-                },
-                'recent_learnings': await _get_recent_learning_data(session, ai_type)
+        # Recent learning data as nodes
+        learning_nodes = [
+            {
+                'id': str(learning.id),
+                'learning_type': learning.learning_type,
+                'learning_data': learning.learning_data,
+                'created_at': learning.created_at.isoformat() if learning.created_at else None,
+                'status': learning.status
             }
-            
-            total_learning_score += learning_score
-            total_xp += int(learning_score)
+            for learning in sources["learnings"][ai_type]
+        ]
+
+        # Fall back to learning_patterns from custody metrics, then from AgentMetrics
+        if not learning_nodes and 'learning_patterns' in custody_metrics:
+            learning_nodes = _pattern_nodes(ai_type, custody_metrics['learning_patterns'])
+        if not learning_nodes and ai_type in sources["agent_patterns"]:
+            learning_nodes = _pattern_nodes(ai_type, sources["agent_patterns"][ai_type])
+
+        last_activity = sources["last_activity"].get(ai_type)
         
-        return {
-            "status": "success",
-            "ai_data": ai_data,
-            "unified_leveling": {
-                "total_learning_score": total_learning_score,
-                "total_xp": total_xp,
-                "system_status": "online"
+        ai_data[ai_type] = {
+            'level': ai_level,
+            'title': _get_agent_level_and_title(learning_score, ai_type),
+            'knowledge_points': int(learning_score * 0.1),
+            'xp': int(learning_score),
+            'custody_xp': custody_metrics.get('custody_xp', 0),
+            'level_progress': level_progress,
+            'learning_score': learning_score,
+            'last_activity': built_at.isoformat(),
+            'learning_nodes': learning_nodes,
+            'custodes_status': {
+                'last_test': custody_metrics.get('last_test_date'),
+                'test_status': 'active' if custody_metrics.get('total_tests_given', 0) > 0 else 'inactive',
+                'pass_rate': custody_metrics.get('pass_rate', 0.0),
+                'total_tests': custody_metrics.get('total_tests_given', 0),
+                'eligible_for_proposals': custody_metrics.get('can_create_proposals', False)
+            },
+            'autonomous_learning': {
+                'last_learning_cycle': (last_activity or built_at - timedelta(hours=1)).isoformat(),
+                'subjects_learned': _get_subjects_learned(ai_type),
+                'internet_learning_active': True,
+                'cross_ai_learning': True,
+                'learning_cycle_status': 'active'
             },
+            'recent_learnings': _recent_learnings(
+                ai_type, sources["recent_proposals"][ai_type], sources["recent_experiments"][ai_type]
+            )
+        }
+        
+        total_learning_score += learning_score
+        total_xp += int(learning_score)
+    
+    # Encoded once here so cached snapshots are served without re-encoding
+    return jsonable_encoder({
+        "status": "success",
+        "ai_data": ai_data,
+        "unified_leveling": {
             "total_learning_score": total_learning_score,
             "total_xp": total_xp,
-            "last_updated": datetime.utcnow().isoformat(),
             "system_status": "online"
-        }
-        
-    except Exception as e:
-        logger.error("Error getting Black Library live data", error=str(e))
-        raise HTTPException(status_code=500, detail=str(e))
+        },
+        "total_learning_score": total_learning_score,
+        "total_xp": total_xp,
+        "last_updated": built_at.isoformat(),
+        "system_status": "online"
+    })
 
 
 @router.get("/learning-tree/{ai_type}")
@@ -201,74 +198,51 @@ async def get_ai_custody_results(ai_type: str, session: AsyncSession = Depends(g
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def _get_recent_learning_data(session: AsyncSession, ai_type: str) -> List[str]:
-    """Get recent learning data for an AI"""
-    try:
-        # Get recent proposals for this AI
-        proposals_result = await session.execute(
-            select(Proposal)
-            .where(Proposal.ai_type == ai_type.title())
-            .order_by(Proposal.created_at.desc())
-            .limit(5)
-        )
-        proposals = proposals_result.scalars().all()
-        
-        # Get recent experiments for this AI
-        experiments_result = await session.execute(
-            select(Experiment)
-            .where(Experiment.ai_type == ai_type.title())
-            .order_by(Experiment.created_at.desc())
-            .limit(5)
-        )
-        experiments = experiments_result.scalars().all()
-        
-        learnings = []
-        
-        # Add learnings from proposals
-        for proposal in proposals:
-            if proposal.status == "approved":
-                learnings.append(f"Successfully implemented {proposal.improvement_type or 'improvement'}")
-            elif proposal.status == "rejected":
-                learnings.append(f"Learned from rejection: {proposal.user_feedback_reason or 'improvement needed'}")
-        
-        # Add learnings from experiments
-        for experiment in experiments:
-            if experiment.status == "passed":
-                learnings.append(f"Experiment successful: {experiment.description or 'test completed'}")
-            elif experiment.status == "failed":
-                learnings.append(f"Experiment failed: {experiment.description or 'test failed'}")
-        
-        # Add AI-specific learnings
-        ai_specific_learnings = {
-            "imperium": [
-                "Enhanced system architecture understanding",
-                "Improved oversight and coordination",
-                "Strengthened decision-making frameworks"
-            ],
-            "guardian": [
-                "Strengthened security protocols",
-                "Enhanced quality assurance processes",
-                "Improved threat detection capabilities"
-            ],
-            "sandbox": [
-                "Explored experimental AI capabilities",
-                "Tested innovative approaches",
-                "Developed creative solutions"
-            ],
-            "conquest": [
-                "Optimized code generation algorithms",
-                "Enhanced performance optimization",
-                "Improved code quality analysis"
-            ]
-        }
-        
-        learnings.extend(ai_specific_learnings.get(ai_type, []))
-        
-        return learnings[:5]  # Limit to 5 most recent
-        
-    except Exception as e:
-        logger.error(f"Error getting recent learning data for {ai_type}", error=str(e))
-        return []
+def _recent_learnings(ai_type: str, proposals: List[Proposal], experiments: List[Experiment]) -> List[str]:
+    """Get recent learning data for an AI from its latest proposals and experiments"""
+    learnings = []
+    
+    # Add learnings from proposals
+    for proposal in proposals:
+        if proposal.status == "approved":
+            learnings.append(f"Successfully implemented {proposal.improvement_type or 'improvement'}")
+        elif proposal.status == "rejected":
+            learnings.append(f"Learned from rejection: {proposal.user_feedback_reason or 'improvement needed'}")
+    
+    # Add learnings from experiments
+    for experiment in experiments:
+        if experiment.status == "passed":
+            learnings.append(f"Experiment successful: {getattr(experiment, 'description', None) or 'test completed'}")
+        elif experiment.status == "failed":
+            learnings.append(f"Experiment failed: {getattr(experiment, 'description', None) or 'test failed'}")
+    
+    # Add AI-specific learnings
+    ai_specific_learnings = {
+        "imperium": [
+            "Enhanced system architecture understanding",
+            "Improved oversight and coordination",
+            "Strengthened decision-making frameworks"
+        ],
+        "guardian": [
+            "Strengthened security protocols",
+            "Enhanced quality assurance processes",
+            "Improved threat detection capabilities"
+        ],
+        "sandbox": [
+            "Explored experimental AI capabilities",
+            "Tested innovative approaches",
+            "Developed creative solutions"
+        ],
+        "conquest": [
+            "Optimized code generation algorithms",
+            "Enhanced performance optimization",
+            "Improved code quality analysis"
+        ]
+    }
+    
+    learnings.extend(ai_specific_learnings.get(ai_type, []))
+    
+    return learnings[:5]  # Limit to 5 most recent
 
 
 def _generate_learning_tree(ai_type: str, learning_score: float) -> Dict[str, Any]:
@@ -441,44 +415,6 @@ def _get_agent_level_and_title(learning_score: float, ai_type: str) -> str:
     return "Recruit"
 
 
-async def _get_last_learning_cycle(session: AsyncSession, ai_type: str) -> str:
-    """Get the last learning cycle timestamp for an AI"""
-    try:
-        # Get the most recent proposal or experiment for this AI
-        latest_proposal_result = await session.execute(
-            select(Proposal)
-            .where(Proposal.ai_type == ai_type.title())
-            .order_by(Proposal.created_at.desc())
-            .limit(1)
-        )
-        latest_proposal = latest_proposal_result.scalar_one_or_none()
-        
-        latest_experiment_result = await session.execute(
-            select(Experiment)
-            .where(Experiment.ai_type == ai_type.title())
-            .order_by(Experiment.created_at.desc())
-            .limit(1)
-        )
-        latest_experiment = latest_experiment_result.scalar_one_or_none()
-        
-        # Return the most recent timestamp
-        if latest_proposal and latest_experiment:
-            if latest_proposal.created_at > latest_experiment.created_at:
-                return latest_proposal.created_at.isoformat()
-            else:
-                return latest_experiment.created_at.isoformat()
-        elif latest_proposal:
-            return latest_proposal.created_at.isoformat()
-        elif latest_experiment:
-            return latest_experiment.created_at.isoformat()
-        else:
-            return (datetime.utcnow() - timedelta(hours=1)).isoformat()
-            
-    except Exception as e:
-        logger.error(f"Error getting last learning cycle for {ai_type}", error=str(e))
-        return (datetime.utcnow() - timedelta(hours=1)).isoformat()
-
-
 def _get_subjects_learned(ai_type: str) -> List[str]:
     """Get subjects learned by an AI"""
     # This would ideally query the learning database
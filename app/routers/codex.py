@@ -1,14 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from app.core.database import get_db
 from app.models.sql_models import Proposal
 from app.services.ai_learning_service import AILearningService
+from app.services.codex_log_store import get_codex_log_store
 import structlog
-import os
-
-CODEX_LOG_PATH = os.path.join(os.path.dirname(__file__), '../../codex_log.json')
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -29,63 +27,68 @@ def int_to_roman(input):
     return ''.join(result)
 
 @router.get("/", summary="Codex: AI Learning Chapters", tags=["Codex"])
-async def get_codex(db: AsyncSession = Depends(get_db)):
+async def get_codex(page: int = 1, page_size: int = 30, db: AsyncSession = Depends(get_db)):
     """
     Returns a chronological list of AI learning cycles, proposals, and feedback, grouped by day (chapter),
     with Roman numerals, timestamps, and summaries. Suitable for Codex UI.
-    Now also includes custom logs from codex_log.json.
+    Now also includes custom logs from the Codex event log.
+    Chapters are paginated by day, newest days first (page 1 holds the most recent chapters, each page
+    in chronological order); only the proposals and logs of the requested page are loaded.
     """
-    import json
     try:
-        # Get all proposals, ordered by creation date
-        proposals = (await db.execute(select(Proposal).order_by(Proposal.created_at.asc()))).scalars().all()
-        # Group proposals by day
-        chapters = {}
-        for p in proposals:
-            day = p.created_at.date().isoformat()
-            if day not in chapters:
-                chapters[day] = []
-            chapters[day].append({
-                "type": "proposal",
-                "id": str(p.id),
-                "ai_type": p.ai_type,
-                "file_path": p.file_path,
-                "status": p.status,
-                "improvement_type": getattr(p, 'improvement_type', None),
-                "confidence": getattr(p, 'confidence', 0.5),
-                "user_feedback": p.user_feedback,
-                "test_status": p.test_status,
-                "created_at": p.created_at.isoformat(),
-                "updated_at": p.updated_at.isoformat() if p.updated_at else None,
-                "ai_reasoning": getattr(p, 'ai_reasoning', None),
-                "user_feedback_reason": getattr(p, 'user_feedback_reason', None)
-            })
-        # Load custom logs from codex_log.json
-        log_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../codex_log.json'))
-        if os.path.exists(log_path):
-            with open(log_path, 'r', encoding='utf-8') as f:
-                logs = json.load(f)
-        else:
-            logs = []
-        # Group logs by day
-        for log in logs:
-            ts = log.get('timestamp')
-            if not ts:
-                continue
-            try:
-                day = ts[:10]  # YYYY-MM-DD
-            except Exception:
-                continue
-            if day not in chapters:
-                chapters[day] = []
-            log_entry = dict(log)
-            log_entry['type'] = log.get('type', 'log')
-            chapters[day].append(log_entry)
-        # Format chapters, sorted by day
+        page = max(page, 1)
+        page_size = min(max(page_size, 1), 365)
+        store = get_codex_log_store()
+
+        # Chapter index: distinct days from proposals and the Codex log
+        proposal_day = func.date(Proposal.created_at)
+        proposal_days = (await db.execute(select(proposal_day).group_by(proposal_day))).scalars().all()
+        all_days = sorted({str(day) for day in proposal_days if day} | set(store.get_day_counts()))
+        start = (page - 1) * page_size
+        page_days = sorted(all_days[::-1][start:start + page_size])
+        first_chapter = len(all_days) - start - len(page_days) + 1
+
+        chapters = {day: [] for day in page_days}
+        if page_days:
+            window_start = datetime.fromisoformat(page_days[0])
+            window_end = datetime.fromisoformat(page_days[-1]) + timedelta(days=1)
+            proposals = (await db.execute(
+                select(Proposal)
+                .where(Proposal.created_at >= window_start, Proposal.created_at < window_end)
+                .order_by(Proposal.created_at.asc())
+            )).scalars().all()
+            for p in proposals:
+                day = p.created_at.date().isoformat()
+                if day not in chapters:
+                    continue
+                chapters[day].append({
+                    "type": "proposal",
+                    "id": str(p.id),
+                    "ai_type": p.ai_type,
+                    "file_path": p.file_path,
+                    "status": p.status,
+                    "improvement_type": getattr(p, 'improvement_type', None),
+                    "confidence": getattr(p, 'confidence', 0.5),
+                    "user_feedback": p.user_feedback,
+                    "test_status": p.test_status,
+                    "created_at": p.created_at.isoformat(),
+                    "updated_at": p.updated_at.isoformat() if p.updated_at else None,
+                    "ai_reasoning": getattr(p, 'ai_reasoning', None),
+                    "user_feedback_reason": getattr(p, 'user_feedback_reason', None)
+                })
+            for day, logs in store.get_events_for_days(page_days).items():
+                for log in logs:
+                    log_entry = dict(log)
+                    log_entry['type'] = log.get('type', 'log')
+                    chapters[day].append(log_entry)
+
+        # Format chapters, sorted by day; numbering is chronological across pages
         codex = []
-        for idx, (day, events) in enumerate(sorted(chapters.items()), 1):
+        for idx, day in enumerate(page_days, first_chapter):
             # Sort events by timestamp
-            events_sorted = sorted(events, key=lambda e: e.get('created_at', e.get('timestamp', '')))
+            events_sorted = sorted(chapters[day], key=lambda e: e.get('created_at', e.get('timestamp', '')))
+            if not events_sorted:
+                continue
             # Count proposals
             n_proposals = sum(1 for e in events_sorted if e.get('type') == 'proposal')
             n_accepted = sum(1 for e in events_sorted if e.get('type') == 'proposal' and e.get('status') == 'accepted')
@@ -97,7 +100,13 @@ async def get_codex(db: AsyncSession = Depends(get_db)):
                 "proposals": events_sorted,
                 "summary": f"{n_proposals} proposals, {n_accepted} accepted, {n_rejected} rejected, {len(events_sorted) - n_proposals} logs"
             })
-        return {"chapters": codex}
+        return {
+            "chapters": codex,
+            "page": page,
+            "page_size": page_size,
+            "total_chapters": len(all_days),
+            "has_more": start + page_size < len(all_days)
+        }
     except Exception as e:
         logger.error(f"Error generating codex: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate codex")
@@ -105,23 +114,12 @@ async def get_codex(db: AsyncSession = Depends(get_db)):
 @router.post("/log", summary="Log a new Codex event", tags=["Codex"])
 async def log_codex_event(event: dict):
     """
-    Log a new Codex event (e.g., Imperium audit, feedback) to the Codex log file.
+    Log a new Codex event (e.g., Imperium audit, feedback) to the Codex event log.
     """
-    import json
     try:
-        # Load existing log
-        if os.path.exists(CODEX_LOG_PATH):
-            with open(CODEX_LOG_PATH, 'r', encoding='utf-8') as f:
-                log = json.load(f)
-        else:
-            log = []
-        # Append new event
         event['timestamp'] = datetime.utcnow().isoformat()
-        log.append(event)
-        # Save log
-        with open(CODEX_LOG_PATH, 'w', encoding='utf-8') as f:
-            json.dump(log, f, indent=2)
+        get_codex_log_store().append(event)
         return {"status": "success", "message": "Event logged"}
     except Exception as e:
         logger.error(f"Error logging Codex event: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to log Codex event") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to log Codex event") 
@@ -6,12 +6,13 @@ import hmac
 import hashlib
 import json
 from datetime import datetime
-from typing import Dict, Any
-from fastapi import APIRouter, Request, HTTPException, Header
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Request, HTTPException, Header, BackgroundTasks
 import structlog
 
 from app.services.ai_agent_service import AIAgentService
 from app.services.github_service import GitHubService
+from app.services.webhook_job_queue import webhook_job_service
 from app.core.config import settings
 
 logger = structlog.get_logger()
@@ -42,13 +43,15 @@ async def get_github_overview():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/webhook")
+@router.post("/webhook", status_code=202)
 async def github_webhook(
     request: Request,
+    background_tasks: BackgroundTasks,
     x_github_event: str = Header(None),
-    x_hub_signature_256: str = Header(None)
+    x_hub_signature_256: str = Header(None),
+    x_github_delivery: str = Header(None)
 ):
-    """Handle GitHub webhook events"""
+    """Verify and enqueue a GitHub webhook delivery; agents run in the webhook job workers"""
     try:
         # Get the raw body
         body = await request.body()
@@ -61,27 +64,62 @@ async def github_webhook(
         # Parse the webhook payload
         payload = json.loads(body)
         
-        logger.info("📡 GitHub webhook received", event=x_github_event)
-        
-        # Handle different event types
-        if x_github_event == "push":
-            await _handle_push_event(payload)
-        elif x_github_event == "pull_request":
-            await _handle_pull_request_event(payload)
-        elif x_github_event == "issues":
-            await _handle_issues_event(payload)
-        elif x_github_event == "create":
-            await _handle_create_event(payload)
-        else:
-            logger.info(f"Unhandled GitHub event: {x_github_event}")
+        logger.info("📡 GitHub webhook received", github_event=x_github_event, delivery=x_github_delivery)
         
-        return {"status": "success", "event": x_github_event}
+        if not webhook_job_service.handles(x_github_event):
+            logger.info(f"Unhandled GitHub event: {x_github_event}")
+            return {"status": "ignored", "event": x_github_event}
+        
+        job = webhook_job_service.enqueue(
+            x_github_delivery, x_github_event, payload, _coalesce_key(x_github_event, payload)
+        )
+        inline = not webhook_job_service.is_running()
+        if inline:
+            # No workers in this process (RUN_BACKGROUND_JOBS=0): drain the queue after responding
+            background_tasks.add_task(webhook_job_service.run_pending)
+        return {
+            "status": "accepted",
+            "event": x_github_event,
+            "delivery": x_github_delivery,
+            "job_id": job["job_id"],
+            "queue_status": job["status"],  # enqueued/duplicate/coalesced
+            "processing": "inline" if inline else "workers"
+        }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Error handling GitHub webhook", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _coalesce_key(event: str, payload: Dict[str, Any]) -> Optional[str]:
+    """Queued pushes to the same ref are folded into one agent run"""
+    if event != "push":
+        return None
+    repository = payload.get("repository", {}).get("full_name") or payload.get("repository", {}).get("name")
+    return f"push:{repository}:{payload.get('ref')}"
+
+
+@router.get("/webhook/jobs")
+async def get_webhook_jobs_status():
+    """Get webhook job queue depth and worker counters"""
+    return {
+        "status": "success",
+        "data": webhook_job_service.get_status(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+@router.get("/webhook/jobs/{job_id}")
+async def get_webhook_job(job_id: int):
+    """Get the state of one webhook job"""
+    job = webhook_job_service.queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"status": "success", "data": job, "timestamp": datetime.utcnow().isoformat()}
+
+
 async def _handle_push_event(payload: Dict[str, Any]):
     """Handle push events - trigger AI agents"""
     try:
@@ -110,6 +148,7 @@ async def _handle_push_event(payload: Dict[str, Any]):
         
     except Exception as e:
         logger.error("Error handling push event", error=str(e))
+        raise
 
 
 async def _handle_pull_request_event(payload: Dict[str, Any]):
@@ -135,6 +174,7 @@ async def _handle_pull_request_event(payload: Dict[str, Any]):
         
     except Exception as e:
         logger.error("Error handling pull request event", error=str(e))
+        raise
 
 
 async def _handle_issues_event(payload: Dict[str, Any]):
@@ -156,6 +196,7 @@ async def _handle_issues_event(payload: Dict[str, Any]):
             
     except Exception as e:
         logger.error("Error handling issues event", error=str(e))
+        raise
 
 
 async def _handle_create_event(payload: Dict[str, Any]):
@@ -174,6 +215,13 @@ async def _handle_create_event(payload: Dict[str, Any]):
             
     except Exception as e:
         logger.error("Error handling create event", error=str(e))
+        raise
+
+
+webhook_job_service.register("push", _handle_push_event)
+webhook_job_service.register("pull_request", _handle_pull_request_event)
+webhook_job_service.register("issues", _handle_issues_event)
+webhook_job_service.register("create", _handle_create_event)
 
 
 def _verify_webhook_signature(payload: bytes, signature: str, secret: str) -> bool:
@@ -361,6 +361,21 @@ async def run_health_check(session: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/health-check/rollups")
+async def get_health_rollups():
+    """Get high-water marks and open issue counters of the incremental health check"""
+    try:
+        guardian_service = GuardianAIService()
+        return {
+            "status": "success",
+            "data": guardian_service.health_rollup.get_rollup_status(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error("Error getting health rollups", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/suggestions")
 async def get_suggestions(
     session: AsyncSession = Depends(get_db),
@@ -14,7 +14,7 @@ from app.models.imperium_graph_node import ImperiumGraphNode
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 import aiofiles
-from fastapi import Depends
+from fastapi import Depends, Query
 from sqlalchemy import select
 from app.models.sql_models import Proposal, ErrorLearning
 from app.models.proposal import ProposalResponse
@@ -31,6 +31,7 @@ from app.core.database import get_session
 from app.models.sql_models import Proposal
 from app.services.enhanced_proposal_service import enhanced_proposal_service
 from app.services.agent_metrics_service import AgentMetricsService
+from app.services.learning_timeseries_service import learning_timeseries_service
 
 logger = logging.getLogger(__name__)
 logger = structlog.get_logger()
@@ -507,21 +508,36 @@ async def ws_learning_analytics(websocket: WebSocket, session: AsyncSession = De
     except Exception as e:
         await websocket.close(code=1011, reason=str(e)) 
 
+@router.get("/learning/timeseries")
+async def get_learning_timeseries(
+    start: Optional[datetime] = Query(None, alias="from", description="Window start (default: a recent window)"),
+    end: Optional[datetime] = Query(None, alias="to", description="Window end (default: now)"),
+    resolution: str = Query("hour", description="hour, day or week"),
+    ai_type: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Periods per page"),
+    top: int = Query(5, ge=0, le=50),
+    session: AsyncSession = Depends(get_db),
+):
+    """Learning activity over time from the hourly rollup: points, top AI types and trend"""
+    try:
+        return await learning_timeseries_service.query(
+            session, start=start, end=end, resolution=resolution, ai_type=ai_type,
+            cursor=cursor, limit=limit, top=top,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Error getting learning time series", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/learning/data")
 async def get_learning_data(ai_type: Optional[str] = None, session: AsyncSession = Depends(get_db)):
     """Get AI learning data and patterns"""
     try:
-        from ..services.ai_learning_service import AILearningService
-        from ..models.sql_models import Learning, Proposal
-        from sqlalchemy import select, func
-        from datetime import datetime, timedelta
-        
-        ai_learning_service = AILearningService()
-        
-        # Get comprehensive learning stats
-        learning_stats = await ai_learning_service.get_learning_stats(ai_type)
+        from ..models.sql_models import Learning
         
-        # Get recent learning patterns
+        # Recent learning patterns (aggregates over time come from /learning/timeseries)
         recent_query = select(Learning).order_by(Learning.updated_at.desc()).limit(20)
         if ai_type:
             recent_query = recent_query.where(Learning.ai_type == ai_type)
@@ -529,51 +545,6 @@ async def get_learning_data(ai_type: Optional[str] = None, session: AsyncSession
         result = await session.execute(recent_query)
         recent_learning = result.scalars().all()
         
-        # Get learning trends over time
-        weekly_query = select(
-            func.date_trunc('week', Learning.created_at).label('week'),
-            func.count(Learning.id).label('count'),
-            func.avg(Learning.success_rate).label('avg_success')
-        ).group_by(
-            func.date_trunc('week', Learning.created_at)
-        ).order_by(
-            func.date_trunc('week', Learning.created_at).desc()
-        ).limit(8)
-        
-        if ai_type:
-            weekly_query = weekly_query.where(Learning.ai_type == ai_type)
-        
-        weekly_result = await session.execute(weekly_query)
-        weekly_trends = [
-            {
-                "week": row.week.isoformat() if row.week else None,
-                "count": row.count,
-                "avg_success": float(row.avg_success) if row.avg_success else 0.0
-            }
-            for row in weekly_result
-        ]
-        
-        # Get top learning patterns by success rate
-        top_patterns_query = select(Learning).where(
-            Learning.success_rate > 0.5,
-            Learning.applied_count > 0
-        ).order_by(Learning.success_rate.desc()).limit(10)
-        
-        if ai_type:
-            top_patterns_query = top_patterns_query.where(Learning.ai_type == ai_type)
-        
-        top_result = await session.execute(top_patterns_query)
-        top_patterns = [
-            {
-                "pattern": entry.pattern,
-                "ai_type": entry.ai_type,
-                "success_rate": entry.success_rate,
-                "applied_count": entry.applied_count,
-                "last_applied": entry.updated_at.isoformat()
-            }
-            for entry in top_result.scalars().all()
-        ]
-        
         # Transform data to match frontend expectations
         user_feedback = []
         backend_test_results = []
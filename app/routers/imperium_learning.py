@@ -1849,12 +1849,19 @@ async def get_ml_models_status():
     """Get status of ML models used for learning"""
     try:
         from ..services.ai_learning_service import AILearningService
+        from ..services.model_registry import ModelHandle
         
         ai_learning_service = await AILearningService.initialize()
         
         # Get ML models info
         models_info = {}
         for model_name, model in ai_learning_service._ml_models.items():
+            if isinstance(model, ModelHandle):
+                # Report shared models without loading them
+                if model.loaded_model is None:
+                    models_info[model_name] = {'model_type': model.model_class, 'loaded': False}
+                    continue
+                model = model.loaded_model
             models_info[model_name] = {
                 'model_type': type(model).__name__,
                 'is_trained': hasattr(model, 'feature_importances_') or hasattr(model, 'coef_'),
@@ -9,7 +9,8 @@ import structlog
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
+from sqlalchemy.orm import aliased
 import os
 import json
 
@@ -17,10 +18,12 @@ from app.services.ml_service import MLService
 ml_service = MLService()
 
 from app.services.ai_learning_service import AILearningService
+from app.services.codex_log_store import get_codex_log_store
 ai_learning_service = AILearningService()
 
 from app.models.sql_models import Proposal, Experiment
 from app.core.database import get_db
+from app.core.query_profiler import query_budget
 from app.models.sql_models import Learning
 from app.core.database import get_session
 from sqlalchemy import select
@@ -36,30 +39,61 @@ def only_datetimes(values):
     return [v for v in values if isinstance(v, datetime)]
 
 
+async def _proposal_counts_by_ai_type(session: AsyncSession, ai_types: List[str]) -> Dict[str, tuple]:
+    """(total, approved, latest created_at) per AI type in one GROUP BY"""
+    result = await session.execute(
+        select(
+            Proposal.ai_type,
+            func.count(Proposal.id),
+            func.count(Proposal.id).filter(Proposal.status == "approved"),
+            func.max(Proposal.created_at)
+        ).where(Proposal.ai_type.in_(ai_types)).group_by(Proposal.ai_type)
+    )
+    return {row[0]: tuple(row[1:]) for row in result.all()}
+
+
+async def _recent_experiments_by_ai_type(session: AsyncSession, ai_types: List[str], limit: int) -> Dict[str, List[Any]]:
+    """Newest `limit` experiments per AI type in one ranked query"""
+    ranked = (
+        select(Experiment, func.row_number().over(
+            partition_by=Experiment.ai_type, order_by=Experiment.created_at.desc()
+        ).label("rank"))
+        .where(Experiment.ai_type.in_(ai_types))
+        .subquery()
+    )
+    experiment = aliased(Experiment, ranked)
+    result = await session.execute(select(experiment).where(ranked.c.rank <= limit).order_by(ranked.c.rank))
+    experiments: Dict[str, List[Any]] = {}
+    for row in result.scalars().all():
+        experiments.setdefault(row.ai_type, []).append(row)
+    return experiments
+
+
 @router.get("/stats/{ai_type}")
+@query_budget(max_statements=4)
 async def get_learning_stats(ai_type: str, session: AsyncSession = Depends(get_db)):
     """Get learning statistics for an AI type from live data"""
     try:
-        # Get proposals for this AI type
-        proposals_result = await session.execute(
-            select(Proposal).where(Proposal.ai_type == ai_type)
-        )
-        proposals = proposals_result.scalars().all()
-        
-        # Get experiments for this AI type
-        experiments_result = await session.execute(
-            select(Experiment).where(Experiment.ai_type == ai_type)
-        )
-        experiments = experiments_result.scalars().all()
+        # Count proposals and experiments in SQL instead of loading them
+        proposal_counts = (await session.execute(
+            select(
+                func.count(Proposal.id),
+                func.count(Proposal.id).filter(Proposal.status == "approved"),
+                func.max(Proposal.created_at)
+            ).where(Proposal.ai_type == ai_type)
+        )).one()
+        experiment_counts = (await session.execute(
+            select(
+                func.count(Experiment.id),
+                func.count(Experiment.id).filter(Experiment.status == "passed")
+            ).where(Experiment.ai_type == ai_type)
+        )).one()
         
         # Calculate statistics
-        total_proposals = len(proposals)
-        approved_proposals = len([p for p in proposals if p.status == "approved"])
-        total_experiments = len(experiments)
-        successful_experiments = len([e for e in experiments if e.status == "passed"])
+        total_proposals, approved_proposals, last_created = proposal_counts
+        total_experiments, successful_experiments = experiment_counts
         
-        created_ats = only_datetimes([p.created_at for p in proposals])
-        last_activity = max(created_ats).isoformat() if created_ats else None
+        last_activity = last_created.isoformat() if isinstance(last_created, datetime) else None
 
         return {
             "status": "success",
@@ -182,38 +216,30 @@ async def get_ml_insights():
 
 
 @router.get("/data")
+@query_budget(max_statements=4, max_rows=20)
 async def get_learning_data(session: AsyncSession = Depends(get_db)):
     """Get learning data for all AI types from live data"""
     try:
         ai_types = ["Imperium", "Guardian", "Sandbox", "Conquest"]
+        proposal_counts = await _proposal_counts_by_ai_type(session, ai_types)
+        recent_experiments = await _recent_experiments_by_ai_type(session, ai_types, limit=5)
         data = {}
         
         for ai_type in ai_types:
-            # Get experiments for this AI type
-            experiments_result = await session.execute(
-                select(Experiment).where(Experiment.ai_type == ai_type)
-            )
-            experiments = experiments_result.scalars().all()
-            
-            # Get proposals for this AI type
-            proposals_result = await session.execute(
-                select(Proposal).where(Proposal.ai_type == ai_type)
-            )
-            proposals = proposals_result.scalars().all()
-            
+            total, approved, _ = proposal_counts.get(ai_type, (0, 0, None))
             data[ai_type] = {
                 "experiments": [
                     {
                         "id": str(e.id),
-                        "description": e.description or f"Experiment {str(e.id)[:8]}",
+                        "description": getattr(e, "description", None) or f"Experiment {str(e.id)[:8]}",
                         "timestamp": e.created_at.isoformat() if e.created_at is not None else None,
                         "success": e.status == "passed"
                     }
-                    for e in experiments[:5]  # Limit to 5 most recent
+                    for e in recent_experiments.get(ai_type, [])  # Limit to 5 most recent
                 ],
                 "insights": [
-                    f"AI {ai_type} has processed {len(proposals)} proposals",
-                    f"Success rate: {(len([p for p in proposals if p.status == 'approved']) / len(proposals) * 100) if proposals else 0:.1f}%"
+                    f"AI {ai_type} has processed {total} proposals",
+                    f"Success rate: {(approved / total * 100) if total else 0:.1f}%"
                 ]
             }
         
@@ -224,41 +250,37 @@ async def get_learning_data(session: AsyncSession = Depends(get_db)):
 
 
 @router.get("/metrics")
+@query_budget(max_statements=4)
 async def get_learning_metrics(session: AsyncSession = Depends(get_db)):
     """Get learning metrics for all AI types from live data"""
     try:
         ai_types = ["Imperium", "Guardian", "Sandbox", "Conquest"]
+        proposal_counts = await _proposal_counts_by_ai_type(session, ai_types)
+        experiment_result = await session.execute(
+            select(
+                Experiment.ai_type,
+                func.count(Experiment.id),
+                func.count(Experiment.id).filter(Experiment.status == "passed"),
+                func.max(Experiment.created_at)
+            ).where(Experiment.ai_type.in_(ai_types)).group_by(Experiment.ai_type)
+        )
+        experiment_counts = {row[0]: row[1:] for row in experiment_result.all()}
         metrics = {}
         
         for ai_type in ai_types:
-            # Get experiments for this AI type
-            experiments_result = await session.execute(
-                select(Experiment).where(Experiment.ai_type == ai_type)
-            )
-            experiments = experiments_result.scalars().all()
-            
-            # Get proposals for this AI type
-            proposals_result = await session.execute(
-                select(Proposal).where(Proposal.ai_type == ai_type)
-            )
-            proposals = proposals_result.scalars().all()
-            
-            total_experiments = len(experiments)
-            successful_experiments = len([e for e in experiments if e.status == "passed"])
+            total_experiments, successful_experiments, last_experiment = experiment_counts.get(ai_type, (0, 0, None))
+            total_proposals, approved_proposals, last_proposal = proposal_counts.get(ai_type, (0, 0, None))
             success_rate = (successful_experiments / total_experiments * 100) if total_experiments > 0 else 0
             
             # Calculate learning progress based on approved proposals
-            approved_proposals = len([p for p in proposals if p.status == "approved"])
-            learning_progress = min((approved_proposals / max(len(proposals), 1)) * 100, 100)
+            learning_progress = min((approved_proposals / max(total_proposals, 1)) * 100, 100)
             
             # Get last activity
             last_activity = None
-            exp_created_ats = only_datetimes([e.created_at for e in experiments])
-            prop_created_ats = only_datetimes([p.created_at for p in proposals])
-            if exp_created_ats:
-                last_activity = max(exp_created_ats).isoformat()
-            elif prop_created_ats:
-                last_activity = max(prop_created_ats).isoformat()
+            if isinstance(last_experiment, datetime):
+                last_activity = last_experiment.isoformat()
+            elif isinstance(last_proposal, datetime):
+                last_activity = last_proposal.isoformat()
             
             metrics[ai_type] = {
                 "totalExperiments": total_experiments,
@@ -274,33 +296,25 @@ async def get_learning_metrics(session: AsyncSession = Depends(get_db)):
 
 
 @router.get("/status")
+@query_budget(max_statements=2, max_rows=0)
 async def get_learning_status(session: AsyncSession = Depends(get_db)):
     """Get learning system status from live data"""
     try:
-        # Get total experiments
-        total_experiments_result = await session.execute(select(Experiment))
-        total_experiments = len(total_experiments_result.scalars().all())
-        
-        # Get total proposals
-        total_proposals_result = await session.execute(select(Proposal))
-        total_proposals = len(total_proposals_result.scalars().all())
+        # Get totals and last activity with aggregate queries
+        total_experiments, successful_experiments, last_experiment = (await session.execute(
+            select(
+                func.count(Experiment.id),
+                func.count(Experiment.id).filter(Experiment.status == "passed"),
+                func.max(Experiment.created_at)
+            )
+        )).one()
+        total_proposals = (await session.execute(select(func.count(Proposal.id)))).scalar()
         
         # Calculate success rate
-        successful_experiments_result = await session.execute(
-            select(Experiment).where(Experiment.status == "passed")
-        )
-        successful_experiments = len(successful_experiments_result.scalars().all())
         success_rate = (successful_experiments / total_experiments * 100) if total_experiments > 0 else 0
         
         # Get last activity
-        last_activity = None
-        if total_experiments > 0:
-            last_exp_result = await session.execute(
-                select(Experiment).order_by(Experiment.created_at.desc()).limit(1)
-            )
-            last_exp = last_exp_result.scalar_one_or_none()
-            if last_exp and last_exp.created_at is not None:
-                last_activity = last_exp.created_at.isoformat()
+        last_activity = last_experiment.isoformat() if isinstance(last_experiment, datetime) else None
         
         return {
             "status": "active",
@@ -367,18 +381,27 @@ async def get_debug_log(session: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/write-buffer")
+async def get_write_buffer_metrics():
+    """Get queue depth, flush latency and throughput of the buffered learning writes"""
+    try:
+        return {
+            "status": "success",
+            "data": ai_learning_service.get_write_buffer_metrics(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error("Error getting write buffer metrics", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/logs/all")
 async def get_all_logs():
     """
-    Return recent learning, audit, and agent logs (from codex_log.json and debug-log).
+    Return recent learning, audit, and agent logs (from the Codex event log and debug-log).
     """
-    logs = []
-    codex_log_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../codex_log.json'))
-    if os.path.exists(codex_log_path):
-        with open(codex_log_path, 'r', encoding='utf-8') as f:
-            logs.extend(json.load(f))
-    logs = sorted(logs, key=lambda x: x.get('timestamp', ''), reverse=True)
-    return {"logs": logs[:100], "last_updated": datetime.utcnow().isoformat()}
+    logs = get_codex_log_store().tail(100)
+    return {"logs": logs, "last_updated": datetime.utcnow().isoformat()}
 
 
 @router.get("/periodic-learning-status")
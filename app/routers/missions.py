@@ -13,6 +13,7 @@ import json
 from app.core.database import get_db
 from app.models.sql_models import Mission, MissionSubtask, GuardianSuggestion
 from app.services.guardian_ai_service import GuardianAIService
+from app.services.mission_sync_service import MissionSyncService
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -21,76 +22,57 @@ router = APIRouter()
 @router.post("/sync")
 async def sync_missions(
     missions_data: List[Dict[str, Any]],
+    since_version: Optional[str] = None,
     session: AsyncSession = Depends(get_db)
 ):
-    """Sync missions from frontend to backend for Guardian AI health checks"""
+    """Sync missions from frontend to backend for Guardian AI health checks
+
+    Missions are bulk-upserted and subtasks diffed against the stored set. Pass the
+    ``version`` from the previous response as ``since_version`` to post only missions
+    changed since then; ``server_changes`` lists missions changed server-side meanwhile.
+    """
     try:
         logger.info(f"Syncing {len(missions_data)} missions from frontend")
-        
-        synced_count = 0
-        updated_count = 0
-        
-        for mission_data in missions_data:
-            # Check if mission already exists
-            if mission_data.get('id'):
-                result = await session.execute(
-                    select(Mission).where(Mission.id == mission_data['id'])
-                )
-                existing_mission = result.scalar_one_or_none()
-                
-                if existing_mission:
-                    # Update existing mission
-                    for key, value in mission_data.items():
-                        if hasattr(existing_mission, key) and key != 'id':
-                            setattr(existing_mission, key, value)
-                    existing_mission.updated_at = datetime.utcnow()
-                    updated_count += 1
-                else:
-                    # Create new mission
-                    mission = Mission(**mission_data)
-                    session.add(mission)
-                    synced_count += 1
-            else:
-                # Create new mission without ID
-                mission = Mission(**mission_data)
-                session.add(mission)
-                synced_count += 1
-            
-            # Handle subtasks if present
-            if 'subtasks' in mission_data and mission_data['subtasks']:
-                mission_id = mission_data.get('id') or mission.id
-                
-                # Delete existing subtasks for this mission
-                await session.execute(
-                    select(MissionSubtask).where(MissionSubtask.mission_id == mission_id)
-                )
-                
-                # Create new subtasks
-                for subtask_data in mission_data['subtasks']:
-                    subtask_data['mission_id'] = mission_id
-                    subtask = MissionSubtask(**subtask_data)
-                    session.add(subtask)
-        
-        await session.commit()
-        
-        logger.info(f"Mission sync completed: {synced_count} new, {updated_count} updated")
-        
+
+        result = await MissionSyncService().sync(session, missions_data, since_version=since_version)
+
+        logger.info(f"Mission sync completed: {result['synced_count']} new, {result['updated_count']} updated",
+                    subtasks=result["subtasks"])
+
         return {
             "status": "success",
-            "data": {
-                "synced_count": synced_count,
-                "updated_count": updated_count,
-                "total_processed": len(missions_data)
-            },
+            "data": result,
             "timestamp": datetime.utcnow().isoformat()
         }
-        
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("Error syncing missions", error=str(e))
         await session.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/changes")
+async def get_mission_changes(
+    since_version: Optional[str] = None,
+    session: AsyncSession = Depends(get_db)
+):
+    """Get missions changed after a sync version cursor"""
+    try:
+        result = await MissionSyncService().get_changes(session, since_version)
+        return {
+            "status": "success",
+            "data": result,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Error getting mission changes", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/")
 async def get_missions(
     session: AsyncSession = Depends(get_db),
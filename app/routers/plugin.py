@@ -1,38 +1,69 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
+from typing import Dict, Any, Optional
 import os
+import threading
 from ..services.plugin_manager import PluginManager
 
 # Remove prefix from APIRouter
 router = APIRouter(tags=["plugins"])
-plugin_manager = PluginManager()
+
+# Created on first use rather than at import: importing the router (e.g. from a
+# re-imported __main__) must never start plugin worker processes
+_plugin_manager: Optional[PluginManager] = None
+_plugin_manager_lock = threading.Lock()
+
+
+def get_plugin_manager() -> PluginManager:
+    global _plugin_manager
+    with _plugin_manager_lock:
+        if _plugin_manager is None:
+            _plugin_manager = PluginManager()
+        return _plugin_manager
+
+
+def shutdown_plugin_manager():
+    """Stop the plugin worker processes, if any were started"""
+    global _plugin_manager
+    with _plugin_manager_lock:
+        if _plugin_manager is not None:
+            _plugin_manager.shutdown()
+            _plugin_manager = None
 
 @router.get("/")
-def list_plugins():
+def list_plugins(plugin_manager: PluginManager = Depends(get_plugin_manager)):
     return {"plugins": plugin_manager.list_plugins()}
 
+@router.get("/stats")
+def plugin_stats(plugin_manager: PluginManager = Depends(get_plugin_manager)):
+    return plugin_manager.get_stats()
+
+@router.get("/{name}/stats")
+def single_plugin_stats(name: str, plugin_manager: PluginManager = Depends(get_plugin_manager)):
+    if name not in plugin_manager.plugins:
+        raise HTTPException(status_code=404, detail="Plugin not found")
+    return plugin_manager.get_stats(name)
+
 @router.get("/{name}/describe")
-def describe_plugin(name: str):
+def describe_plugin(name: str, plugin_manager: PluginManager = Depends(get_plugin_manager)):
     return {"description": plugin_manager.describe_plugin(name)}
 
 @router.post("/{name}/run")
-def run_plugin(name: str, data: Dict[str, Any]):
+def run_plugin(name: str, data: Dict[str, Any], plugin_manager: PluginManager = Depends(get_plugin_manager)):
     return plugin_manager.run_plugin(name, data)
 
 @router.get("/{name}/test")
-def test_plugin(name: str):
+def test_plugin(name: str, plugin_manager: PluginManager = Depends(get_plugin_manager)):
     return {"result": plugin_manager.test_plugin(name)}
 
 @router.post("/reload")
-def reload_plugins():
-    plugin_manager.reload_plugins()
-    return {"status": "reloaded"}
+def reload_plugins(plugin_manager: PluginManager = Depends(get_plugin_manager)):
+    return {"status": "reloaded", "changes": plugin_manager.reload_plugins()}
 
 @router.post("/upload")
-def upload_plugin(file: UploadFile = File(...)):
+def upload_plugin(file: UploadFile = File(...), plugin_manager: PluginManager = Depends(get_plugin_manager)):
     plugin_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../plugins'))
     file_path = os.path.join(plugin_dir, file.filename)
     with open(file_path, 'wb') as f:
         f.write(file.file.read())
-    plugin_manager.reload_plugins()
-    return {"status": "uploaded", "plugin": file.filename} 
\ No newline at end of file
+    changes = plugin_manager.reload_plugins()
+    return {"status": "uploaded", "plugin": file.filename, "changes": changes} 
\ No newline at end of file
@@ -15,6 +15,7 @@ import asyncio
 from app.services.testing_service import TestingService
 from app.services.ai_learning_service import AILearningService
 from app.models.sql_models import LearningLog
+from app.core.task_supervisor import task_supervisor
 import hashlib
 from app.models.sql_models import HumanFeedback
 from sqlalchemy import select
@@ -26,6 +27,7 @@ from app.services.ml_service import MLService
 from app.services.proposal_cycle_service import ProposalCycleService
 from app.services.proposal_validation_service import ProposalValidationService
 from app.services.enhanced_proposal_validation_service import EnhancedProposalValidationService
+from app.services.analytics_aggregation_service import invalidate_analytics
 
 # Ensure logger is defined at the top
 logger = structlog.get_logger()
@@ -197,9 +199,11 @@ async def periodic_proposal_generation():
                     await feedback_log(f"Skipped proposal generation for {next_agent.value}: custody requirements not met")
             else:
                 logger.info("🔄 No agent available for proposal generation")
+            task_supervisor.beat()
                 
         except Exception as e:
             await feedback_log("Error in periodic proposal generation", error=str(e))
+            task_supervisor.beat(error=e)
         # 30-minute cooldown starts only after all proposal generation and testing is complete
         await asyncio.sleep(2700)  # 2700 seconds = 45 minutes
 
@@ -474,6 +478,7 @@ async def create_proposal_internal(proposal: ProposalCreate, db: AsyncSession) -
         await db.commit()
         logger.info("Refreshing proposal from database")
         await db.refresh(new_proposal)
+        invalidate_analytics(new_proposal.ai_type)
         
         logger.info("Proposal created with ML analysis", 
                    proposal_id=str(new_proposal.id),
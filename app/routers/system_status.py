@@ -10,7 +10,7 @@ from datetime import datetime, timedelta
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_session
+from ..core.database import get_session, get_engine_registry_status
 from ..services.token_usage_service import token_usage_service
 from ..services.unified_ai_service_shared import unified_ai_service_shared
 from ..core.config import settings
@@ -72,6 +72,83 @@ async def health_check() -> Dict[str, Any]:
         raise HTTPException(status_code=503, detail="Service unhealthy")
 
 
+@router.get("/debug/engines")
+async def get_database_engines() -> Dict[str, Any]:
+    """List live database engines, their pool checkouts and monitor tasks"""
+    try:
+        return {
+            "status": "success",
+            "data": get_engine_registry_status(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error("Error getting database engines", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/debug/queries")
+async def get_query_report(limit: int = 10) -> Dict[str, Any]:
+    """Endpoints with the most statements, repeated statement shapes and budget violations"""
+    try:
+        from app.core.query_profiler import query_report
+        return {
+            "status": "success",
+            "data": {
+                "enabled": settings.query_profiler_enabled,
+                "worst_offenders": query_report.worst_offenders(limit)
+            },
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error("Error getting query report", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/debug/logging")
+async def get_logging_pipeline_stats() -> Dict[str, Any]:
+    """Log queue depth, dropped records and per-subsystem sampling counters"""
+    try:
+        from app.core.logging import get_logging_stats
+        return {
+            "status": "success",
+            "data": get_logging_stats(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error("Error getting logging stats", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/models")
+async def get_model_registry() -> Dict[str, Any]:
+    """Shared ML models: residency, private and memory-mapped bytes, references and evictions"""
+    try:
+        from app.services.model_registry import model_registry
+        return {
+            "status": "success",
+            "data": model_registry.get_status(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error("Error getting model registry status", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/code-analysis-cache")
+async def get_code_analysis_cache() -> Dict[str, Any]:
+    """Code analysis cache: memory and disk entries, hit rate and evictions"""
+    try:
+        from app.services.code_analysis_cache import code_analysis_cache
+        return {
+            "status": "success",
+            "data": code_analysis_cache.get_status(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error("Error getting code analysis cache status", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 async def _check_backend_health() -> Dict[str, Any]:
     """Check backend service health"""
     try:
@@ -4,10 +4,12 @@ Token Usage Router - Monitor and manage AI token usage
 
 from fastapi import APIRouter, Depends, HTTPException
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 import structlog
 
+from ..core.database import get_session
 from ..services.token_usage_service import token_usage_service
+from ..services.rollup_service import rollup_service
 from ..services.unified_ai_service import unified_ai_service_shared
 from ..core.config import settings
 
@@ -199,4 +201,52 @@ async def get_usage_distribution():
         }
     except Exception as e:
         logger.error("Error getting usage distribution", error=str(e))
-        raise HTTPException(status_code=500, detail=f"Error getting usage distribution: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error getting usage distribution: {str(e)}") 
+
+@router.get("/daily")
+async def get_daily_token_usage(days: int = 30, ai_type: Optional[str] = None):
+    """Get per-day token usage from the daily rollups"""
+    try:
+        today = datetime.utcnow().date()
+        async with get_session() as session:
+            daily = await rollup_service.get_token_usage_by_day(
+                session, today - timedelta(days=max(days, 1) - 1), today, ai_type
+            )
+        return {
+            "days": days,
+            "ai_type": ai_type,
+            "daily_usage": daily,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error("Error getting daily token usage", error=str(e))
+        raise HTTPException(status_code=500, detail=f"Error getting daily token usage: {str(e)}")
+
+
+@router.get("/rollups")
+async def get_rollup_status():
+    """Get rollup job status and raw/rollup table sizes"""
+    try:
+        async with get_session() as session:
+            table_sizes = await rollup_service.get_table_sizes(session)
+        return {
+            "rollups": rollup_service.get_status(),
+            "table_sizes": table_sizes,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error("Error getting rollup status", error=str(e))
+        raise HTTPException(status_code=500, detail=f"Error getting rollup status: {str(e)}")
+
+
+@router.post("/rollups/run")
+async def run_rollups():
+    """Run the daily rollup and retention job now"""
+    try:
+        return {
+            "result": await rollup_service.run_once(),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error("Error running rollups", error=str(e))
+        raise HTTPException(status_code=500, detail=f"Error running rollups: {str(e)}")
@@ -24,10 +24,21 @@ from .github_service import GitHubService
 from .ai_learning_service import AILearningService
 from .ml_service import MLService
 from .advanced_code_generator import AdvancedCodeGenerator
+from .repository_snapshot import RepositorySnapshot
+from .code_analysis_cache import code_analysis_cache, CodeProfile
 from app.services.anthropic_service import call_claude, anthropic_rate_limited_call
 
 logger = structlog.get_logger()
 
+CODE_ANALYSIS_VERSION = 2  # Bump when the Dart/Python analysers change their output
+
+# Code transformations an analysis may record as fixes; cached fixes naming anything else are not replayed
+ANALYSIS_FIX_METHODS = frozenset({
+    "_optimize_setstate_calls", "_replace_print_with_logging", "_add_null_safety", "_suggest_class_splitting",
+    "_replace_python_print_with_logging", "_modernize_string_formatting", "_convert_loops_to_comprehensions",
+    "_remove_unused_python_imports", "_suggest_python_function_refactoring",
+})
+
 
 class AIAgentService:
     """Service to coordinate autonomous AI agents"""
@@ -134,11 +145,13 @@ class AIAgentService:
             self._save_heuristics(agent_name, heuristics)
             logger.info(f"[LEARNING] {agent_name} agent added new heuristics: {set(new_keywords) - before}")
 
-    async def _select_files_by_directive(self, repo_content, directive):
+    async def _select_files_by_directive(self, snapshot: RepositorySnapshot, directive):
         """
         Enhanced: Select files based on the agent's directive using advanced heuristics.
         Always include backend and app files, use content and path heuristics, and log inclusion reasons.
         Now also uses learned heuristics from persistent storage.
+        File reads go through the cycle's shared snapshot, so each file is fetched and
+        lower-cased/split once per cycle however many agents inspect it.
         """
         relevant_files = []
         inclusion_log = {}
@@ -162,8 +175,8 @@ class AIAgentService:
             'sandbox': ["experiment", "test", "extension", "feature", "prototype", "draft", "sample", "demo", "playground"]
         }
         heuristics = self._load_heuristics(directive, agent_keywords.get(directive, []))
-        learned_keywords = heuristics.get('keywords', [])
-        for item in repo_content:
+        learned_keywords = [kw.lower() for kw in heuristics.get('keywords', [])]
+        for item in snapshot.items:
             if item["type"] != "file":
                 continue
             path = item["path"]
@@ -186,8 +199,8 @@ class AIAgentService:
                 continue
             # Use learned heuristics (keywords)
             try:
-                content = await self.github_service.get_file_content(path)
-                if content and any(kw.lower() in content.lower() for kw in learned_keywords):
+                snapshot_file = await snapshot.get_file(path)
+                if snapshot_file and any(kw in snapshot_file.lower for kw in learned_keywords):
                     relevant_files.append(path)
                     inclusion_log[path] = f"{directive}: learned heuristic keyword match"
                     continue
@@ -199,12 +212,13 @@ class AIAgentService:
                 if not any(path.endswith(ext) for ext in [".py", ".js", ".ts", ".dart"]):
                     continue
                 try:
-                    content = await self.github_service.get_file_content(path)
+                    snapshot_file = await snapshot.get_file(path)
+                    content = snapshot_file.content if snapshot_file else None
                     if content and (
                         ("TODO optimize" in content or "performance" in content or "slow" in content or content.count("for ") > 3 or content.count("while ") > 3)
-                        or (max([len(line) for line in content.splitlines()]) > 120)
+                        or (max([len(line) for line in snapshot_file.lines]) > 120)
                         or (len(content) > 2000)
-                        or (sum(1 for l in content.splitlines() if l.strip().startswith("def ")) > 10)
+                        or (sum(1 for l in snapshot_file.lines if l.strip().startswith("def ")) > 10)
                         or ("setState" in content and content.count("setState") > 3)
                         or ("print(" in content)
                         or (".format(" in content and "f\"" not in content)
@@ -216,7 +230,7 @@ class AIAgentService:
             # Guardian: security
             elif directive == "guardian":
                 try:
-                    content = await self.github_service.get_file_content(path)
+                    content = await snapshot.get_file_content(path)
                     if (
                         (content and re.search(r'password|secret|token|api[_-]?key|jwt|auth|encrypt|decrypt|os\.environ|subprocess|eval|exec|pickle|open\(|write\(|read\(|database|sql|query|user input|request|response', content, re.IGNORECASE))
                         or (content and 'import os' in content)
@@ -232,7 +246,7 @@ class AIAgentService:
                     inclusion_log[path] = "conquest: app/extension logic heuristic"
                 else:
                     try:
-                        content = await self.github_service.get_file_content(path)
+                        content = await snapshot.get_file_content(path)
                         if content and ("feature" in content or "extension" in content or "plugin" in content or "integration" in content):
                             relevant_files.append(path)
                             inclusion_log[path] = "conquest: app/extension content heuristic"
@@ -245,7 +259,7 @@ class AIAgentService:
                     inclusion_log[path] = "sandbox: experiment/feature path heuristic"
                 else:
                     try:
-                        content = await self.github_service.get_file_content(path)
+                        content = await snapshot.get_file_content(path)
                         if content and any(x in content for x in ["experiment", "feature", "prototype", "draft", "sample", "demo", "playground"]):
                             relevant_files.append(path)
                             inclusion_log[path] = "sandbox: experiment/feature content heuristic"
@@ -254,16 +268,18 @@ class AIAgentService:
         logger.info(f"[HEURISTICS] {directive} agent inclusion log: {inclusion_log}")
         return relevant_files
 
-    async def run_imperium_agent(self) -> Dict[str, Any]:
+    async def run_imperium_agent(self, snapshot: Optional[RepositorySnapshot] = None) -> Dict[str, Any]:
         """Run Imperium agent - Code optimization and analysis"""
         try:
-            self.reset_scan_state()
+            if snapshot is None:
+                # Standalone run; run_all_agents resets once for the whole cycle
+                self.reset_scan_state()
             logger.info("[CYCLE] Imperium agent starting new scan, test, and proposal cycle...")
-            repo_content = await self.github_service.get_repo_content()
-            if not repo_content:
+            snapshot = snapshot or await RepositorySnapshot.take(self.github_service)
+            if not snapshot:
                 return {"status": "error", "message": "Could not access repository"}
             # Use directive-based file selection
-            scanned_files = await self._select_files_by_directive(repo_content, "imperium")
+            scanned_files = await self._select_files_by_directive(snapshot, "imperium")
             logger.info(f"[DIRECTIVE] Imperium agent selected {len(scanned_files)} files: {scanned_files}")
             if not scanned_files:
                 return {"status": "warning", "message": "No relevant files found for optimization"}
@@ -274,7 +290,7 @@ class AIAgentService:
                     logger.info(f"Skipping {file_path} - not a supported code file type")
                     continue
                     
-                content = await self.github_service.get_file_content(file_path)
+                content = await snapshot.get_file_content(file_path)
                 if content:
                     analysis = await self._analyze_dart_code(content, file_path) if file_path.endswith('.dart') else \
                               await self._analyze_python_code(content, file_path) if file_path.endswith('.py') else \
@@ -295,21 +311,21 @@ class AIAgentService:
             logger.error(f"Imperium agent error: {e}")
             return {"status": "error", "message": str(e)}
 
-    async def run_guardian_agent(self) -> Dict[str, Any]:
+    async def run_guardian_agent(self, snapshot: Optional[RepositorySnapshot] = None) -> Dict[str, Any]:
         """Run Guardian agent - Security and quality checks"""
         try:
             logger.info("🛡️ Guardian agent starting security analysis...")
-            repo_content = await self.github_service.get_repo_content()
-            if not repo_content:
+            snapshot = snapshot or await RepositorySnapshot.take(self.github_service)
+            if not snapshot:
                 return {"status": "error", "message": "Could not access repository"}
-            scanned_files = await self._select_files_by_directive(repo_content, "guardian")
+            scanned_files = await self._select_files_by_directive(snapshot, "guardian")
             logger.info(f"[DIRECTIVE] Guardian agent selected {len(scanned_files)} files: {scanned_files}")
             if not scanned_files:
                 return {"status": "warning", "message": "No relevant files found for security analysis"}
             security_issues = []
             quality_issues = []
             for file_path in scanned_files:
-                content = await self.github_service.get_file_content(file_path)
+                content = await snapshot.get_file_content(file_path)
                 if content:
                     security_check = await self._check_security_issues(content, file_path)
                     if security_check["issues"]:
@@ -340,14 +356,14 @@ class AIAgentService:
             logger.error(f"Guardian agent error: {e}")
             return {"status": "error", "message": str(e)}
 
-    async def run_sandbox_agent(self) -> Dict[str, Any]:
+    async def run_sandbox_agent(self, snapshot: Optional[RepositorySnapshot] = None) -> Dict[str, Any]:
         """Run Sandbox agent - Experimental and feature proposals"""
         try:
             logger.info("🧪 Sandbox agent starting experiment analysis...")
-            repo_content = await self.github_service.get_repo_content()
-            if not repo_content:
+            snapshot = snapshot or await RepositorySnapshot.take(self.github_service)
+            if not snapshot:
                 return {"status": "error", "message": "Could not access repository"}
-            scanned_files = await self._select_files_by_directive(repo_content, "sandbox")
+            scanned_files = await self._select_files_by_directive(snapshot, "sandbox")
             logger.info(f"[DIRECTIVE] Sandbox agent selected {len(scanned_files)} files: {scanned_files}")
             
             # Check if GitHub service is properly configured
@@ -469,14 +485,14 @@ class AIAgentService:
                 advice = f"Claude error: {str(ce)}"
             return {"status": "error", "message": str(e), "claude_advice": advice}
     
-    async def run_conquest_agent(self) -> Dict[str, Any]:
+    async def run_conquest_agent(self, snapshot: Optional[RepositorySnapshot] = None) -> Dict[str, Any]:
         """Run Conquest agent - User experience and app suggestions"""
         try:
             logger.info("⚔️ Conquest agent starting app suggestion analysis...")
-            repo_content = await self.github_service.get_repo_content()
-            if not repo_content:
+            snapshot = snapshot or await RepositorySnapshot.take(self.github_service)
+            if not snapshot:
                 return {"status": "error", "message": "Could not access repository"}
-            scanned_files = await self._select_files_by_directive(repo_content, "conquest")
+            scanned_files = await self._select_files_by_directive(snapshot, "conquest")
             logger.info(f"[DIRECTIVE] Conquest agent selected {len(scanned_files)} files: {scanned_files}")
             
             # Check for approved proposals that need deployment
@@ -522,24 +538,45 @@ class AIAgentService:
                 advice = f"Claude error: {str(ce)}"
             return {"status": "error", "message": str(e), "claude_advice": advice}
     
+    async def _run_agent_with_deadline(self, name: str, agent, snapshot: RepositorySnapshot,
+                                       deadline: float) -> Dict[str, Any]:
+        """Run one agent against the shared snapshot; a timeout or crash only affects that agent"""
+        started = datetime.utcnow()
+        try:
+            result = await asyncio.wait_for(agent(snapshot), timeout=deadline)
+        except asyncio.TimeoutError:
+            logger.error(f"{name} agent exceeded its {deadline}s deadline")
+            result = {"status": "timeout", "message": f"Agent exceeded its {deadline}s deadline"}
+        except Exception as e:
+            logger.error(f"{name} agent crashed: {e}")
+            result = {"status": "error", "message": str(e)}
+        if isinstance(result, dict):
+            result["duration_seconds"] = round((datetime.utcnow() - started).total_seconds(), 3)
+        return result
+
     async def run_all_agents(self) -> Dict[str, Any]:
-        """Run all AI agents in sequence"""
+        """Run all AI agents concurrently against one repository snapshot per cycle"""
         try:
             logger.info("🤖 Starting autonomous AI agent cycle...")
-            
-            results = {}
-            
-            # Run Imperium (Code optimization)
-            results["imperium"] = await self.run_imperium_agent()
-            
-            # Run Guardian (Security)
-            results["guardian"] = await self.run_guardian_agent()
-            
-            # Run Sandbox (Experimentation)
-            results["sandbox"] = await self.run_sandbox_agent()
-            
-            # Run Conquest (Deployment)
-            results["conquest"] = await self.run_conquest_agent()
+            started = datetime.utcnow()
+            self.reset_scan_state()
+            snapshot = await RepositorySnapshot.take(self.github_service)
+            if not snapshot:
+                return {"status": "error", "message": "Could not access repository"}
+
+            # Imperium (optimization), Guardian (security), Sandbox (experiments) and Conquest
+            # (deployment of already-approved proposals) do not depend on each other within a cycle
+            agents = {
+                "imperium": self.run_imperium_agent,
+                "guardian": self.run_guardian_agent,
+                "sandbox": self.run_sandbox_agent,
+                "conquest": self.run_conquest_agent,
+            }
+            deadline = settings.agent_run_deadline_seconds
+            outcomes = await asyncio.gather(*[
+                self._run_agent_with_deadline(name, agent, snapshot, deadline) for name, agent in agents.items()
+            ])
+            results = dict(zip(agents, outcomes))
             
             # Overall summary
             total_proposals = sum(
@@ -554,6 +591,8 @@ class AIAgentService:
                 "agents_run": len(results),
                 "total_proposals_created": total_proposals,
                 "results": results,
+                "snapshot": snapshot.get_stats(),
+                "duration_seconds": round((datetime.utcnow() - started).total_seconds(), 3),
                 "timestamp": datetime.utcnow().isoformat()
             }
             
@@ -564,7 +603,50 @@ class AIAgentService:
     # Helper methods for AI agents
     async def _analyze_dart_code(self, content: str, file_path: str) -> Dict[str, Any]:
         """Analyze Dart code for optimizations and generate actual code improvements"""
+        return self._cached_analysis("ai_agent.dart", content, file_path, self._compute_dart_analysis)
+    
+    async def _analyze_python_code(self, content: str, file_path: str) -> Dict[str, Any]:
+        """Analyze Python code for optimizations and generate actual code improvements"""
+        return self._cached_analysis("ai_agent.python", content, file_path, self._compute_python_analysis)
+    
+    def _cached_analysis(self, namespace: str, content: str, file_path: str, compute) -> Dict[str, Any]:
+        # Unchanged files are analysed once per analyser version. The cache keeps the optimizations
+        # and the fixes that produced them, not the code, which is rebuilt from the fixes on a hit
+        computed = {}
+
+        def analyse(profile: CodeProfile) -> Dict[str, Any]:
+            computed.update(compute(profile.code, file_path))
+            return {key: value for key, value in computed.items() if key not in ("original_code", "optimized_code")}
+
+        analysis = code_analysis_cache.get_or_compute(namespace, CODE_ANALYSIS_VERSION, content, analyse,
+                                                      extra=file_path, valid=self._replayable_fixes)
+        fixes = analysis.pop("fixes", [])
+        analysis["original_code"] = content
+        analysis["optimized_code"] = computed["optimized_code"] if computed else self._apply_fixes(content, fixes)
+        analysis["analysis_timestamp"] = datetime.utcnow().isoformat()
+        return analysis
+    
+    @staticmethod
+    def _replayable_fixes(analysis: Dict[str, Any]) -> bool:
+        """Whether every recorded fix is a well-formed (method, args) pair naming an allowed transformation"""
+        fixes = analysis.get("fixes", [])
+        return isinstance(fixes, list) and all(
+            isinstance(fix, list) and len(fix) == 2 and fix[0] in ANALYSIS_FIX_METHODS and isinstance(fix[1], list)
+            for fix in fixes
+        )
+
+    def _apply_fixes(self, content: str, fixes: List[List[Any]]) -> str:
+        """Replay the (method, args) code transformations recorded by an analysis"""
+        code = content
+        for method, args in fixes:
+            if method not in ANALYSIS_FIX_METHODS:
+                raise ValueError(f"Unknown code analysis fix: {method}")
+            code = getattr(self, method)(code, *args)
+        return code
+    
+    def _compute_dart_analysis(self, content: str, file_path: str) -> Dict[str, Any]:
         optimizations = []
+        fixes = []
         original_code = content
         optimized_code = content
         
@@ -572,6 +654,7 @@ class AIAgentService:
         if "setState(()" in content and content.count("setState") > 3:
             # Generate optimized code that batches setState calls
             optimized_code = self._optimize_setstate_calls(content)
+            fixes.append(["_optimize_setstate_calls", []])
             optimizations.append({
                 "type": "performance",
                 "description": "Multiple setState calls detected - batching updates for better performance",
@@ -582,6 +665,7 @@ class AIAgentService:
         if "print(" in content:
             # Replace print statements with proper logging
             optimized_code = self._replace_print_with_logging(optimized_code)
+            fixes.append(["_replace_print_with_logging", []])
             optimizations.append({
                 "type": "quality",
                 "description": "Debug print statements replaced with proper logging",
@@ -594,6 +678,7 @@ class AIAgentService:
             split_suggestion = self._suggest_class_splitting(content, file_path)
             if split_suggestion:
                 optimized_code = split_suggestion
+                fixes = [["_suggest_class_splitting", [file_path]]]  # Built from the original code
                 optimizations.append({
                     "type": "maintainability",
                     "description": "Large file detected - split into smaller, focused classes",
@@ -604,6 +689,7 @@ class AIAgentService:
         # Add null safety improvements if not already present
         if "?" not in content and "!" not in content and "late" not in content:
             optimized_code = self._add_null_safety(optimized_code)
+            fixes.append(["_add_null_safety", []])
             optimizations.append({
                 "type": "safety",
                 "description": "Added null safety improvements for better code reliability",
@@ -616,9 +702,9 @@ class AIAgentService:
             "original_code": original_code,
             "optimized_code": optimized_code,
             "optimizations": optimizations,
+            "fixes": fixes,
             "confidence": 0.8 if optimizations else 0.0,
-            "reasoning": f"AI detected {len(optimizations)} optimization opportunities",
-            "analysis_timestamp": datetime.utcnow().isoformat()
+            "reasoning": f"AI detected {len(optimizations)} optimization opportunities"
         }
     
     def _optimize_setstate_calls(self, content: str) -> str:
@@ -729,15 +815,16 @@ class AIAgentService:
         
         return {"issues": issues}
     
-    async def _analyze_python_code(self, content: str, file_path: str) -> Dict[str, Any]:
-        """Analyze Python code for optimizations and generate actual code improvements"""
+    def _compute_python_analysis(self, content: str, file_path: str) -> Dict[str, Any]:
         optimizations = []
+        fixes = []
         original_code = content
         optimized_code = content
         
         # Check for print statements and replace with logging
         if "print(" in content:
             optimized_code = self._replace_python_print_with_logging(optimized_code)
+            fixes.append(["_replace_python_print_with_logging", []])
             optimizations.append({
                 "type": "quality",
                 "description": "Debug print statements replaced with proper logging",
@@ -748,6 +835,7 @@ class AIAgentService:
         # Check for f-strings vs .format() and modernize
         if ".format(" in content and "f\"" not in content:
             optimized_code = self._modernize_string_formatting(optimized_code)
+            fixes.append(["_modernize_string_formatting", []])
             optimizations.append({
                 "type": "modernization",
                 "description": "Replaced .format() with f-strings for better readability",
@@ -758,6 +846,7 @@ class AIAgentService:
         # Check for list comprehensions vs loops
         if "for " in content and " in " in content and "append(" in content:
             optimized_code = self._convert_loops_to_comprehensions(optimized_code)
+            fixes.append(["_convert_loops_to_comprehensions", []])
             optimizations.append({
                 "type": "performance",
                 "description": "Converted loops to list comprehensions for better performance",
@@ -769,6 +858,7 @@ class AIAgentService:
         unused_imports = self._find_unused_python_imports(optimized_code)
         if unused_imports:
             optimized_code = self._remove_unused_python_imports(optimized_code, unused_imports)
+            fixes.append(["_remove_unused_python_imports", [unused_imports]])
             optimizations.append({
                 "type": "cleanup",
                 "description": f"Removed {len(unused_imports)} unused imports",
@@ -780,6 +870,7 @@ class AIAgentService:
         long_functions = self._find_long_python_functions(optimized_code)
         if long_functions:
             optimized_code = self._suggest_python_function_refactoring(optimized_code, long_functions)
+            fixes.append(["_suggest_python_function_refactoring", [long_functions]])
             optimizations.append({
                 "type": "maintainability",
                 "description": "Long functions detected - added refactoring suggestions",
@@ -792,9 +883,9 @@ class AIAgentService:
             "original_code": original_code,
             "optimized_code": optimized_code,
             "optimizations": optimizations,
+            "fixes": fixes,
             "confidence": 0.8 if optimizations else 0.0,
-            "reasoning": f"AI detected {len(optimizations)} Python optimization opportunities",
-            "analysis_timestamp": datetime.utcnow().isoformat()
+            "reasoning": f"AI detected {len(optimizations)} Python optimization opportunities"
         }
     
     def _replace_python_print_with_logging(self, content: str) -> str:
@@ -29,16 +29,74 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.naive_bayes import MultinomialNB
 import joblib
 
+from sqlalchemy import event
+
 from ..core.database import get_session
 from ..core.config import settings
+from ..models.sql_models import Learning
 from .ml_service import MLService
 from .sckipit_service import SckipitService
 from .enhanced_ml_learning_service import EnhancedMLLearningService
+from .analytics_aggregation_service import invalidate_analytics
+from .write_buffer import WriteBuffer
+from .learning_state_store import learning_state_store
+from .model_registry import model_registry, ModelHandle
+from .code_analysis_cache import code_analysis_cache
 from app.services.anthropic_service import call_claude, anthropic_rate_limited_call
 
 logger = structlog.get_logger()
 
 
+def _keep_recent(state: Dict[str, Any], key: str, entries: List[Any]):
+    """Add entries to a learning-state detail list, keeping only the recent window in memory"""
+    recent = state.setdefault(key, [])
+    recent.extend(entries)
+    if len(recent) > settings.learning_state_recent_events:
+        del recent[:-settings.learning_state_recent_events]
+
+
+CODE_METRICS_VERSION = 1  # Bump when _code_quality_metrics changes
+
+
+def _code_quality_metrics(profile) -> Dict[str, float]:
+    """Complexity, readability and maintainability of a snippet in one pass over its lines"""
+    if not profile.code:
+        return {"complexity_score": 0.0, "readability_score": 0.0, "maintainability_score": 0.0}
+    
+    complexity_score = 0.0
+    readability_score = 10.0  # Start with perfect score
+    for line in profile.stripped_lines:
+        # Count complexity indicators
+        if any(keyword in line for keyword in ['if ', 'for ', 'while ', 'try:', 'except:', 'class ', 'def ']):
+            complexity_score += 1
+        if line.count('(') > 2 or line.count(')') > 2:
+            complexity_score += 0.5
+        if len(line) > 80:
+            complexity_score += 0.3
+        # Penalize for poor readability
+        if len(line) > 120:
+            readability_score -= 0.5
+        if line.count('_') > 5:
+            readability_score -= 0.3
+        if any(keyword in line for keyword in ['TODO', 'FIXME', 'HACK']):
+            readability_score -= 0.2
+    
+    # Check for maintainability issues
+    maintainability_score = 10.0
+    if profile.contains('TODO') or profile.contains('FIXME'):
+        maintainability_score -= 2.0
+    if profile.count('import *') > 0:
+        maintainability_score -= 1.0
+    if profile.count('global ') > 2:
+        maintainability_score -= 1.5
+    
+    return {
+        "complexity_score": min(10.0, complexity_score / max(len(profile.lines), 1)),
+        "readability_score": max(0.0, readability_score),
+        "maintainability_score": max(0.0, maintainability_score),
+    }
+
+
 class AILearningService:
     """AI Learning service with ENHANCED ML integration using scikit-learn for PRODUCTION IMPROVEMENT"""
     
@@ -52,6 +110,8 @@ class AILearningService:
     _learning_data = []
     _proposal_improvement_history = []
     _productivity_metrics = {}
+    _learning_stats_cache: Dict[Optional[str], Dict[str, Any]] = {}  # ai_type (None = all) -> stats
+    learning_stats_ttl = 60.0  # Seconds; learning writes invalidate sooner
     
     def __new__(cls):
         if cls._instance is None:
@@ -63,6 +123,13 @@ class AILearningService:
             self.ml_service = MLService()
             self.sckipit_service = None  # Will be initialized properly in initialize()
             self.enhanced_ml_service = EnhancedMLLearningService()
+            # Answer/learning-record/metrics/counter writes are batched instead of one commit per event
+            self.write_buffer = WriteBuffer(
+                "learning",
+                max_batch=settings.learning_write_batch_size,
+                flush_interval=settings.learning_write_flush_ms / 1000,
+                max_pending=settings.learning_write_max_pending
+            )
             self._initialized = True
             self._initialize_enhanced_ml_models()
             
@@ -98,6 +165,8 @@ class AILearningService:
         except Exception as e:
             logger.warning(f"Failed to initialize SckipitService: {e}")
             instance.sckipit_service = None
+        # Warm the shared learning counters so levels are right from the first request
+        await learning_state_store.refresh()
         logger.info("AI Learning Service initialized with ENHANCED ML capabilities")
         return instance
     
@@ -250,8 +319,8 @@ class AILearningService:
                 model_path = os.path.join(settings.ml_model_path, filename)
                 if os.path.exists(model_path):
                     try:
-                        with open(model_path, 'rb') as f:
-                            self.sckipit_models[model_name] = pickle.load(f)
+                        # Shared, lazily loaded model (see model_registry)
+                        self.sckipit_models[model_name] = model_registry.handle(model_path, model_name)
                         logger.info(f"Loaded SCKIPIT model: {model_name}")
                     except Exception as e:
                         logger.error(f"Failed to load SCKIPIT model {filename}: {str(e)}")
@@ -608,10 +677,11 @@ class AILearningService:
                 'enhanced_learning': True
             }
             
-            self._learning_states[ai_type]['learning_events'].append(learning_event_data)
-            self._learning_states[ai_type]['improvements_learned'].extend(improvements)
+            _keep_recent(self._learning_states[ai_type], 'learning_events', [learning_event_data])
+            _keep_recent(self._learning_states[ai_type], 'improvements_learned', improvements)
             self._learning_states[ai_type]['sckipit_insights'] = pattern_analysis
             self._learning_states[ai_type]['last_learning'] = datetime.now().isoformat()
+            await learning_state_store.record(ai_type, improvements=len(improvements), write_buffer=self.write_buffer)
             
             logger.info(f"Enhanced AI learning state updated with SCKIPIT for {ai_type}")
             
@@ -928,8 +998,8 @@ class AILearningService:
             model_path = os.path.join(settings.ml_model_path, filename)
             if os.path.exists(model_path):
                 try:
-                    with open(model_path, 'rb') as f:
-                        self._ml_models[model_name] = pickle.load(f)
+                    # Shared, lazily loaded model (see model_registry)
+                    self._ml_models[model_name] = model_registry.handle(model_path, model_name)
                     logger.info(f"Loaded ENHANCED AI learning model: {model_name}")
                 except Exception as e:
                     logger.error(f"Failed to load model {filename}: {str(e)}")
@@ -1030,10 +1100,8 @@ class AILearningService:
         features['change_ratio'] = features['code_changes'] / max(len(code_before), 1)
         features['file_type'] = proposal_data.get('file_path', '').split('.')[-1] if '.' in proposal_data.get('file_path', '') else 'unknown'
         
-        # Enhanced code quality features
-        features['complexity_score'] = await self._calculate_code_complexity(code_after)
-        features['readability_score'] = await self._calculate_readability_score(code_after)
-        features['maintainability_score'] = await self._calculate_maintainability_score(code_after)
+        # Enhanced code quality features (complexity, readability, maintainability; cached by content)
+        features.update(self._code_metrics(code_after))
         
         # AI type encoding (Enhanced)
         ai_type_encoding = {'imperium': 0, 'guardian': 1, 'sandbox': 2, 'conquest': 3}
@@ -1055,64 +1123,22 @@ class AILearningService:
         
         return features
     
+    def _code_metrics(self, code: str) -> Dict[str, float]:
+        return code_analysis_cache.get_or_compute(
+            "ai_learning.code_metrics", CODE_METRICS_VERSION, code or "", _code_quality_metrics
+        )
+    
     async def _calculate_code_complexity(self, code: str) -> float:
         """Calculate code complexity score"""
-        if not code:
-            return 0.0
-        
-        lines = code.split('\n')
-        complexity_score = 0.0
-        
-        for line in lines:
-            line = line.strip()
-            if line:
-                # Count complexity indicators
-                if any(keyword in line for keyword in ['if ', 'for ', 'while ', 'try:', 'except:', 'class ', 'def ']):
-                    complexity_score += 1
-                if line.count('(') > 2 or line.count(')') > 2:
-                    complexity_score += 0.5
-                if len(line) > 80:
-                    complexity_score += 0.3
-        
-        return min(10.0, complexity_score / max(len(lines), 1))
+        return self._code_metrics(code)["complexity_score"]
     
     async def _calculate_readability_score(self, code: str) -> float:
         """Calculate code readability score"""
-        if not code:
-            return 0.0
-        
-        lines = code.split('\n')
-        readability_score = 10.0  # Start with perfect score
-        
-        for line in lines:
-            line = line.strip()
-            if line:
-                # Penalize for poor readability
-                if len(line) > 120:
-                    readability_score -= 0.5
-                if line.count('_') > 5:
-                    readability_score -= 0.3
-                if any(keyword in line for keyword in ['TODO', 'FIXME', 'HACK']):
-                    readability_score -= 0.2
-        
-        return max(0.0, readability_score)
+        return self._code_metrics(code)["readability_score"]
     
     async def _calculate_maintainability_score(self, code: str) -> float:
         """Calculate code maintainability score"""
-        if not code:
-            return 0.0
-        
-        maintainability_score = 10.0
-        
-        # Check for maintainability issues
-        if 'TODO' in code or 'FIXME' in code:
-            maintainability_score -= 2.0
-        if code.count('import *') > 0:
-            maintainability_score -= 1.0
-        if code.count('global ') > 2:
-            maintainability_score -= 1.5
-        
-        return max(0.0, maintainability_score)
+        return self._code_metrics(code)["maintainability_score"]
     
     async def _classify_failure_type(self, test_summary: str) -> str:
         """Classify the type of failure using ML"""
@@ -1464,16 +1490,18 @@ class AILearningService:
         productivity_score = await self._calculate_improvement_productivity_score(improvements)
         ml_confidence = await self._calculate_ml_confidence(failure_features)
         
-        self._learning_states[ai_type]['learning_events'].append({
+        _keep_recent(self._learning_states[ai_type], 'learning_events', [{
             'timestamp': datetime.now().isoformat(),
             'event': learning_event,
             'improvements': improvements,
             'productivity_score': productivity_score,
             'ml_confidence': ml_confidence
-        })
+        }])
         
-        self._learning_states[ai_type]['improvements_learned'].extend(improvements)
+        _keep_recent(self._learning_states[ai_type], 'improvements_learned', improvements)
         self._learning_states[ai_type]['last_learning'] = datetime.now().isoformat()
+        await learning_state_store.record(ai_type, improvements=len(improvements), productivity_score=productivity_score,
+                                          write_buffer=self.write_buffer)
         
         # Update productivity metrics
         if 'productivity_metrics' not in self._learning_states[ai_type]:
@@ -1492,7 +1520,7 @@ class AILearningService:
         )
         
         logger.info(f"Updated ENHANCED learning state for {ai_type}", 
-                   event=learning_event,
+                   learning_event=learning_event,
                    improvements_count=len(improvements),
                    productivity_score=productivity_score,
                    ml_confidence=ml_confidence)
@@ -1586,17 +1614,18 @@ class AILearningService:
                 'last_learning': None
             }
         
-        self._learning_states[ai_type]['learning_events'].append({
+        _keep_recent(self._learning_states[ai_type], 'learning_events', [{
             'timestamp': datetime.now().isoformat(),
             'event': learning_event,
             'improvements': improvements
-        })
+        }])
         
-        self._learning_states[ai_type]['improvements_learned'].extend(improvements)
+        _keep_recent(self._learning_states[ai_type], 'improvements_learned', improvements)
         self._learning_states[ai_type]['last_learning'] = datetime.now().isoformat()
+        await learning_state_store.record(ai_type, improvements=len(improvements), write_buffer=self.write_buffer)
         
         logger.info(f"Updated learning state for {ai_type}", 
-                   event=learning_event,
+                   learning_event=learning_event,
                    improvements_count=len(improvements))
     
     async def get_learning_insights(self, ai_type: str) -> Dict[str, Any]:
@@ -1791,6 +1820,7 @@ Timestamp: {insights.get('timestamp', '')}
                 proposal.updated_at = datetime.utcnow()  # type: ignore
                 
                 await session.commit()
+                invalidate_analytics(proposal.ai_type)
                 
                 return {
                     "status": "success",
@@ -1803,140 +1833,22 @@ Timestamp: {insights.get('timestamp', '')}
             logger.error(f"Error learning from proposal: {str(e)} | proposal_id={proposal_id}")
             return {"status": "error", "message": str(e)}
 
+    @classmethod
+    def invalidate_learning_stats(cls, ai_type: Optional[str] = None):
+        """Drop cached learning stats for an AI type (and the all-AI stats) after a learning write"""
+        cls._learning_stats_cache.pop(ai_type, None)
+        cls._learning_stats_cache.pop(None, None)
+        if ai_type is None:
+            cls._learning_stats_cache.clear()
+
     async def get_learning_stats(self, ai_type: str = None) -> Dict[str, Any]:
         """Get comprehensive learning statistics"""
+        cached = self._learning_stats_cache.get(ai_type)
+        if cached and time.monotonic() - cached["computed_at"] < self.learning_stats_ttl:
+            return cached["data"]
+        computed_at = time.monotonic()
         try:
-            from ..models.sql_models import Learning, Proposal
-            from sqlalchemy import select, func
-            from datetime import datetime, timedelta
-            
-            async with get_session() as session:
-                # Get learning patterns
-                query = select(Learning)
-                if ai_type:
-                    query = query.where(Learning.ai_type == ai_type)
-                
-                result = await session.execute(query)
-                learning_entries = result.scalars().all()
-                
-                # Calculate statistics
-                total_patterns = len(learning_entries)
-                total_applied = sum(entry.learning_data.get('applied_count', 0) if entry.learning_data else 0 for entry in learning_entries)
-                avg_success_rate = sum(entry.learning_data.get('success_rate', 0.0) if entry.learning_data else 0.0 for entry in learning_entries) / total_patterns if total_patterns > 0 else 0.0
-                
-                # Get recent learning activity
-                recent_learning = await session.execute(
-                    select(Learning)
-                    .where(Learning.updated_at >= datetime.utcnow() - timedelta(days=7))
-                    .order_by(Learning.updated_at.desc())
-                    .limit(10)
-                )
-                recent_entries = recent_learning.scalars().all()
-                
-                # Get proposal statistics
-                proposal_query = select(func.count(Proposal.id))
-                if ai_type:
-                    proposal_query = proposal_query.where(Proposal.ai_type == ai_type)
-                
-                total_proposals = await session.execute(proposal_query)
-                proposal_count = total_proposals.scalar()
-                
-                # Get successful proposals
-                success_query = select(func.count(Proposal.id)).where(
-                    Proposal.status == "test-passed",
-                    Proposal.test_status == "passed"
-                )
-                if ai_type:
-                    success_query = success_query.where(Proposal.ai_type == ai_type)
-                
-                success_result = await session.execute(success_query)
-                success_count = success_result.scalar() or 0
-                
-                success_rate = (success_count / proposal_count * 100) if proposal_count and proposal_count > 0 else 0.0
-                
-                # Get last activity timestamp
-                last_activity = datetime.utcnow().isoformat()
-                
-                # Generate dynamic learning stats if database is empty
-                if total_patterns == 0:
-                    # Generate realistic learning stats based on AI type
-                    ai_stats = {
-                        "imperium": {"base_score": 15000, "patterns": 8, "success_rate": 0.85},
-                        "guardian": {"base_score": 12000, "patterns": 6, "success_rate": 0.80},
-                        "sandbox": {"base_score": 8000, "patterns": 5, "success_rate": 0.75},
-                        "conquest": {"base_score": 10000, "patterns": 7, "success_rate": 0.82}
-                    }
-                    
-                    ai_stat = ai_stats.get(ai_type.lower() if ai_type else "imperium", {"base_score": 10000, "patterns": 6, "success_rate": 0.80})
-                    
-                    return {
-                        "total_patterns": ai_stat["patterns"],
-                        "total_applied": ai_stat["patterns"] * 3,
-                        "average_success_rate": ai_stat["success_rate"],
-                        "recent_learning": [
-                            {
-                                "pattern": "code_optimization",
-                                "timestamp": datetime.utcnow().isoformat(),
-                                "success": True,
-                                "learning_value": 150
-                            },
-                            {
-                                "pattern": "security_analysis",
-                                "timestamp": datetime.utcnow().isoformat(),
-                                "success": True,
-                                "learning_value": 120
-                            },
-                            {
-                                "pattern": "test_generation",
-                                "timestamp": datetime.utcnow().isoformat(),
-                                "success": True,
-                                "learning_value": 100
-                            }
-                        ],
-                        "total_proposals": proposal_count or 15,
-                        "successful_proposals": success_count or 12,
-                        "success_rate": success_rate or 80.0,
-                        "last_activity": last_activity,
-                        "learning_score": ai_stat["base_score"],
-                        "level": self.get_ai_level(ai_type) if ai_type else 1,
-                        "improvement_areas": [
-                            "code_quality",
-                            "performance_optimization", 
-                            "security_analysis",
-                            "test_coverage"
-                        ],
-                        "recent_achievements": [
-                            "Enhanced code review capabilities",
-                            "Improved test generation",
-                            "Better error handling",
-                            "Optimized performance analysis"
-                        ]
-                    }
-                
-                return {
-                    "total_patterns": total_patterns,
-                    "total_applied": total_applied,
-                    "average_success_rate": avg_success_rate,
-                    "recent_learning": [
-                        {
-                            "pattern": getattr(entry, 'pattern', ''),
-                            "ai_type": entry.ai_type,
-                            "success_rate": getattr(entry, 'success_rate', 0.0),
-                            "applied_count": getattr(entry, 'applied_count', 0),
-                            "updated_at": entry.updated_at.isoformat() if entry.updated_at else None
-                        }
-                        for entry in recent_entries
-                    ],
-                    "total_proposals": proposal_count,
-                    "successful_proposals": success_count,
-                    "success_rate": success_rate,
-                    "last_activity": last_activity,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    # Add learning progress calculations
-                    "learning_progress": min((total_patterns * 0.1 + avg_success_rate * 0.5) * 100, 100.0),
-                    "internet_learning_progress": 0.0  # Will be calculated separately if needed
-                }
-                
+            stats = await self._compute_learning_stats(ai_type)
         except Exception as e:
             logger.error(f"Error getting learning stats: {str(e)}")
             return {
@@ -1948,6 +1860,142 @@ Timestamp: {insights.get('timestamp', '')}
                 "learning_progress": 0.0,
                 "last_updated": datetime.utcnow().isoformat()
             }
+        self._learning_stats_cache[ai_type] = {"data": stats, "computed_at": computed_at}
+        return stats
+
+    async def _compute_learning_stats(self, ai_type: str = None) -> Dict[str, Any]:
+        """Learning and proposal stats from one aggregate query plus the recent-activity rows"""
+        from ..models.sql_models import Learning, Proposal
+        from sqlalchemy import select, func
+        from datetime import datetime, timedelta
+
+        async with get_session() as session:
+            applied_count, success_rate_column = Learning.applied_count, Learning.success_rate
+            if session.bind.dialect.name == "sqlite":
+                # Local SQLite databases may hold rows the hot-field backfill has not reached
+                applied_count = func.coalesce(applied_count, func.json_extract(Learning.learning_data, '$.applied_count'))
+                success_rate_column = func.coalesce(success_rate_column, func.json_extract(Learning.learning_data, '$.success_rate'))
+
+            learning_filter = [Learning.ai_type == ai_type] if ai_type else []
+            proposal_filter = [Proposal.ai_type == ai_type] if ai_type else []
+            stats = (await session.execute(
+                select(
+                    func.count(Learning.id).label("total_patterns"),
+                    func.coalesce(func.sum(func.coalesce(applied_count, 0)), 0).label("total_applied"),
+                    func.coalesce(func.avg(func.coalesce(success_rate_column, 0.0)), 0.0).label("avg_success_rate"),
+                    select(func.count(Proposal.id)).where(*proposal_filter)
+                    .scalar_subquery().label("proposal_count"),
+                    select(func.count(Proposal.id)).where(
+                        Proposal.status == "test-passed", Proposal.test_status == "passed", *proposal_filter
+                    ).scalar_subquery().label("success_count"),
+                ).where(*learning_filter)
+            )).one()
+            total_patterns = stats.total_patterns
+            total_applied = int(stats.total_applied)
+            avg_success_rate = float(stats.avg_success_rate)
+            proposal_count = stats.proposal_count
+            success_count = stats.success_count or 0
+
+            # Get recent learning activity, without the learning_data payload
+            recent_learning = await session.execute(
+                select(
+                    Learning.learning_data['pattern'].as_string().label("pattern"),
+                    Learning.ai_type,
+                    func.coalesce(success_rate_column, 0.0).label("success_rate"),
+                    func.coalesce(applied_count, 0).label("applied_count"),
+                    Learning.updated_at
+                )
+                .where(Learning.updated_at >= datetime.utcnow() - timedelta(days=7))
+                .order_by(Learning.updated_at.desc())
+                .limit(10)
+            )
+            recent_entries = recent_learning.all()
+
+            success_rate = (success_count / proposal_count * 100) if proposal_count and proposal_count > 0 else 0.0
+
+            # Get last activity timestamp
+            last_activity = datetime.utcnow().isoformat()
+
+            # Generate dynamic learning stats if database is empty
+            if total_patterns == 0:
+                # Generate realistic learning stats based on AI type
+                ai_stats = {
+                    "imperium": {"base_score": 15000, "patterns": 8, "success_rate": 0.85},
+                    "guardian": {"base_score": 12000, "patterns": 6, "success_rate": 0.80},
+                    "sandbox": {"base_score": 8000, "patterns": 5, "success_rate": 0.75},
+                    "conquest": {"base_score": 10000, "patterns": 7, "success_rate": 0.82}
+                }
+
+                ai_stat = ai_stats.get(ai_type.lower() if ai_type else "imperium", {"base_score": 10000, "patterns": 6, "success_rate": 0.80})
+
+                return {
+                    "total_patterns": ai_stat["patterns"],
+                    "total_applied": ai_stat["patterns"] * 3,
+                    "average_success_rate": ai_stat["success_rate"],
+                    "recent_learning": [
+                        {
+                            "pattern": "code_optimization",
+                            "timestamp": datetime.utcnow().isoformat(),
+                            "success": True,
+                            "learning_value": 150
+                        },
+                        {
+                            "pattern": "security_analysis",
+                            "timestamp": datetime.utcnow().isoformat(),
+                            "success": True,
+                            "learning_value": 120
+                        },
+                        {
+                            "pattern": "test_generation",
+                            "timestamp": datetime.utcnow().isoformat(),
+                            "success": True,
+                            "learning_value": 100
+                        }
+                    ],
+                    "total_proposals": proposal_count or 15,
+                    "successful_proposals": success_count or 12,
+                    "success_rate": success_rate or 80.0,
+                    "last_activity": last_activity,
+                    "learning_score": ai_stat["base_score"],
+                    "level": self.get_ai_level(ai_type) if ai_type else 1,
+                    "improvement_areas": [
+                        "code_quality",
+                        "performance_optimization", 
+                        "security_analysis",
+                        "test_coverage"
+                    ],
+                    "recent_achievements": [
+                        "Enhanced code review capabilities",
+                        "Improved test generation",
+                        "Better error handling",
+                        "Optimized performance analysis"
+                    ]
+                }
+
+            return {
+                "total_patterns": total_patterns,
+                "total_applied": total_applied,
+                "average_success_rate": avg_success_rate,
+                "recent_learning": [
+                    {
+                        "pattern": entry.pattern or '',
+                        "ai_type": entry.ai_type,
+                        "success_rate": float(entry.success_rate),
+                        "applied_count": int(entry.applied_count),
+                        "updated_at": entry.updated_at.isoformat() if entry.updated_at else None
+                    }
+                    for entry in recent_entries
+                ],
+                "total_proposals": proposal_count,
+                "successful_proposals": success_count,
+                "success_rate": success_rate,
+                "last_activity": last_activity,
+                "timestamp": datetime.utcnow().isoformat(),
+                # Add learning progress calculations
+                "learning_progress": min((total_patterns * 0.1 + avg_success_rate * 0.5) * 100, 100.0),
+                "internet_learning_progress": 0.0  # Will be calculated separately if needed
+            }
+
 
     async def apply_learning_to_proposal(self, proposal_data: Dict[str, Any]) -> Dict[str, Any]:
         """Apply learned patterns to improve proposal quality"""
@@ -2042,7 +2090,7 @@ Timestamp: {insights.get('timestamp', '')}
                     'last_learning': None
                 }
             
-            self._learning_states[agent_id]['internet_learning_results'].append(learning_record)
+            _keep_recent(self._learning_states[agent_id], 'internet_learning_results', [learning_record])
             self._learning_states[agent_id]['last_learning'] = datetime.now().isoformat()
             
             logger.info(f"Successfully saved internet learning result for {agent_id}", 
@@ -2379,6 +2427,16 @@ Timestamp: {insights.get('timestamp', '')}
             
             # Calculate ML model performance
             for model_name, model in self._ml_models.items():
+                if isinstance(model, ModelHandle):
+                    # Only inspect models already in memory; analytics must not load them
+                    estimator = model.loaded_model
+                    if estimator is None:
+                        analytics['ml_model_performance'][model_name] = {
+                            'model_type': model.model_class,
+                            'loaded': False
+                        }
+                        continue
+                    model = estimator
                 if hasattr(model, 'score') and hasattr(model, 'feature_importances_'):
                     analytics['ml_model_performance'][model_name] = {
                         'model_type': type(model).__name__,
@@ -2760,39 +2818,9 @@ Timestamp: {insights.get('timestamp', '')}
     def get_ai_level(self, ai_type: str) -> int:
         """Get the current level of an AI based on its learning progress"""
         try:
-            # Get learning stats for this AI
-            learning_stats = self._learning_states.get(ai_type, {})
-            
-            # Calculate learning score based on various factors
-            total_events = len(learning_stats.get('learning_events', []))
-            total_improvements = len(learning_stats.get('improvements_learned', []))
-            productivity_score = learning_stats.get('productivity_metrics', {}).get('average_productivity_score', 0.0)
-            
-            # Calculate base score
-            base_score = total_events * 10 + total_improvements * 20 + productivity_score * 100
-            
-            # Determine level based on score thresholds
-            if base_score < 100:
-                return 1
-            elif base_score < 300:
-                return 2
-            elif base_score < 600:
-                return 3
-            elif base_score < 1000:
-                return 4
-            elif base_score < 1500:
-                return 5
-            elif base_score < 2200:
-                return 6
-            elif base_score < 3000:
-                return 7
-            elif base_score < 4000:
-                return 8
-            elif base_score < 5000:
-                return 9
-            else:
-                return 10
-                
+            # Shared counters (same level in every worker and across restarts), read from the per-process cache
+            return learning_state_store.get_level(ai_type)
+            
         except Exception as e:
             logger.error(f"Error getting AI level for {ai_type}: {str(e)}")
             return 1  # Default to level 1
@@ -3026,14 +3054,15 @@ Timestamp: {insights.get('timestamp', '')}
             self._learning_states[ai_type]['last_learning'] = datetime.now().isoformat()
             
             # Add learning event
-            self._learning_states[ai_type]['learning_events'].append({
+            _keep_recent(self._learning_states[ai_type], 'learning_events', [{
                 'timestamp': datetime.now().isoformat(),
                 'event': 'ai_answer_logged',
                 'prompt_length': len(prompt),
                 'confidence_score': structured_response.get('confidence_score', 50) if structured_response else 50,
                 'reasoning_quality': reasoning_quality,
                 'has_uncertainty': len(uncertainty_areas) > 0
-            })
+            }])
+            await learning_state_store.record(ai_type, write_buffer=self.write_buffer)
             
             # PERSIST LEARNING RECORD TO DATABASE
             await self._persist_learning_record_to_database(ai_type, 'ai_answer_logged', learning_record, structured_response)
@@ -3041,15 +3070,11 @@ Timestamp: {insights.get('timestamp', '')}
             # PERSIST EXPLAINABILITY METRICS TO DATABASE
             await self._persist_explainability_metrics_to_database(ai_type, explainability_metrics)
             
-            # Keep only last 1000 learning events
-            if len(self._learning_states[ai_type]['learning_events']) > 1000:
-                self._learning_states[ai_type]['learning_events'] = self._learning_states[ai_type]['learning_events'][-1000:]
-            
             # Keep only last 1000 learning records
             if len(self._learning_data) > 1000:
                 self._learning_data = self._learning_data[-1000:]
             
-            logger.info(f"Logged AI answer with explainability data for {ai_type} (persisted to database)", 
+            logger.info(f"Logged AI answer with explainability data for {ai_type} (queued for database)", 
                        confidence_score=structured_response.get('confidence_score', 50) if structured_response else 50,
                        reasoning_quality=reasoning_quality,
                        uncertainty_count=len(uncertainty_areas))
@@ -3058,128 +3083,110 @@ Timestamp: {insights.get('timestamp', '')}
             logger.error(f"Error logging AI answer for {ai_type}: {str(e)}")
 
     async def _persist_ai_answer_to_database(self, ai_type: str, prompt: str, answer: str, structured_response: Dict[str, Any] = None):
-        """Persist AI answer with explainability data to the database"""
+        """Queue an AI answer with explainability data for a batched database write"""
         try:
-            session = get_session()
-            async with session as s:
-                from ..models.sql_models import AIAnswer
-                
-                # Create AI answer record
-                ai_answer = AIAnswer(
-                    ai_type=ai_type,
-                    prompt=prompt,
-                    answer=answer,
-                    reasoning_trace=structured_response.get('reasoning_trace') if structured_response else None,
-                    confidence_score=structured_response.get('confidence_score', 50.0) if structured_response else 50.0,
-                    reasoning_quality=structured_response.get('reasoning_quality') if structured_response else None,
-                    uncertainty_areas=structured_response.get('uncertainty_areas', []) if structured_response else [],
-                    knowledge_applied=structured_response.get('knowledge_applied', []) if structured_response else [],
-                    is_fallback=structured_response.get('is_fallback', False) if structured_response else True,
-                    self_assessment=structured_response.get('self_assessment') if structured_response else None,
-                    learning_context_used=structured_response.get('learning_context_used', False) if structured_response else False,
-                    learning_log=structured_response.get('learning_log') if structured_response else None,
-                    error_analysis=structured_response.get('error_analysis') if structured_response else None,
-                    uncertainty_quantification=structured_response.get('uncertainty_quantification') if structured_response else None,
-                    model_provenance=structured_response.get('model_provenance') if structured_response else None,
-                    peer_review_feedback=structured_response.get('peer_review_feedback') if structured_response else None,
-                    prompt_length=len(prompt),
-                    answer_length=len(answer),
-                    source='ai_answer'
-                )
-                
-                s.add(ai_answer)
-                await s.commit()
-                
-                logger.info(f"Persisted AI answer to database for {ai_type}")
+            from ..models.sql_models import AIAnswer
+            
+            await self.write_buffer.add(AIAnswer, {
+                'ai_type': ai_type,
+                'prompt': prompt,
+                'answer': answer,
+                'reasoning_trace': structured_response.get('reasoning_trace') if structured_response else None,
+                'confidence_score': structured_response.get('confidence_score', 50.0) if structured_response else 50.0,
+                'reasoning_quality': structured_response.get('reasoning_quality') if structured_response else None,
+                'uncertainty_areas': structured_response.get('uncertainty_areas', []) if structured_response else [],
+                'knowledge_applied': structured_response.get('knowledge_applied', []) if structured_response else [],
+                'is_fallback': structured_response.get('is_fallback', False) if structured_response else True,
+                'self_assessment': structured_response.get('self_assessment') if structured_response else None,
+                'learning_context_used': structured_response.get('learning_context_used', False) if structured_response else False,
+                'learning_log': structured_response.get('learning_log') if structured_response else None,
+                'error_analysis': structured_response.get('error_analysis') if structured_response else None,
+                'uncertainty_quantification': structured_response.get('uncertainty_quantification') if structured_response else None,
+                'model_provenance': structured_response.get('model_provenance') if structured_response else None,
+                'peer_review_feedback': structured_response.get('peer_review_feedback') if structured_response else None,
+                'prompt_length': len(prompt),
+                'answer_length': len(answer),
+                'source': 'ai_answer'
+            })
                 
         except Exception as e:
             logger.error(f"Error persisting AI answer to database for {ai_type}: {str(e)}")
 
     async def _persist_learning_record_to_database(self, ai_type: str, learning_event: str, learning_data: Dict, structured_response: Dict[str, Any] = None):
-        """Persist learning record to the database"""
+        """Queue a learning record for a batched database write"""
         try:
-            session = get_session()
-            async with session as s:
-                from ..models.sql_models import LearningRecord
-                
-                # Create learning record
-                learning_record = LearningRecord(
-                    ai_type=ai_type,
-                    learning_event=learning_event,
-                    learning_data=learning_data,
-                    impact_score=structured_response.get('confidence_score', 50.0) if structured_response else 50.0,
-                    explainability_data=structured_response,
-                    confidence_score=structured_response.get('confidence_score', 50.0) if structured_response else 50.0,
-                    reasoning_quality=structured_response.get('reasoning_quality') if structured_response else None,
-                    has_uncertainty=len(structured_response.get('uncertainty_areas', [])) > 0 if structured_response else False,
-                    prompt_length=learning_data.get('prompt_length', 0),
-                    learning_context_used=learning_data.get('learning_context_used', False)
-                )
-                
-                s.add(learning_record)
-                await s.commit()
-                
-                logger.info(f"Persisted learning record to database for {ai_type}")
+            from ..models.sql_models import LearningRecord
+            
+            await self.write_buffer.add(LearningRecord, {
+                'ai_type': ai_type,
+                'learning_event': learning_event,
+                'learning_data': learning_data,
+                'impact_score': structured_response.get('confidence_score', 50.0) if structured_response else 50.0,
+                'explainability_data': structured_response,
+                'confidence_score': structured_response.get('confidence_score', 50.0) if structured_response else 50.0,
+                'reasoning_quality': structured_response.get('reasoning_quality') if structured_response else None,
+                'has_uncertainty': len(structured_response.get('uncertainty_areas', [])) > 0 if structured_response else False,
+                'prompt_length': learning_data.get('prompt_length', 0),
+                'learning_context_used': learning_data.get('learning_context_used', False)
+            })
                 
         except Exception as e:
             logger.error(f"Error persisting learning record to database for {ai_type}: {str(e)}")
 
     async def _persist_explainability_metrics_to_database(self, ai_type: str, explainability_metrics: Dict):
-        """Persist explainability metrics to the database"""
+        """Schedule an explainability metrics upsert; only the newest metrics per AI are written each flush"""
         try:
-            session = get_session()
-            async with session as s:
+            total_answers = answers_with_uncertainty = answers_with_high_confidence = 0
+            for record in self._learning_data:
+                if record.get('ai_type') != ai_type:
+                    continue
+                total_answers += 1
+                explainability_data = record.get('explainability_data', {})
+                if explainability_data.get('uncertainty_areas'):
+                    answers_with_uncertainty += 1
+                if explainability_data.get('confidence_score', 0) >= 80:
+                    answers_with_high_confidence += 1
+            
+            confidence_scores = list(explainability_metrics.get('confidence_scores', []))
+            values = {
+                'average_confidence': explainability_metrics.get('average_confidence', 0.0),
+                'confidence_scores': confidence_scores,
+                'confidence_trend': confidence_scores[-10:],
+                'reasoning_quality_counts': dict(explainability_metrics.get('reasoning_quality_counts', {})),
+                'uncertainty_patterns': dict(explainability_metrics.get('uncertainty_patterns', {})),
+                'top_uncertainty_areas': sorted(
+                    explainability_metrics.get('uncertainty_patterns', {}).items(),
+                    key=lambda x: x[1],
+                    reverse=True
+                )[:5],
+                'total_answers_logged': total_answers,
+                'answers_with_uncertainty': answers_with_uncertainty,
+                'answers_with_high_confidence': answers_with_high_confidence
+            }
+            
+            async def write(s):
                 from ..models.sql_models import ExplainabilityMetrics
                 from sqlalchemy import select
                 
-                # Get or create explainability metrics record
                 result = await s.execute(
                     select(ExplainabilityMetrics).where(ExplainabilityMetrics.ai_type == ai_type)
                 )
                 metrics_record = result.scalar_one_or_none()
-                
                 if not metrics_record:
-                    # Create new record
-                    metrics_record = ExplainabilityMetrics(
-                        ai_type=ai_type,
-                        average_confidence=explainability_metrics.get('average_confidence', 0.0),
-                        confidence_scores=explainability_metrics.get('confidence_scores', []),
-                        confidence_trend=explainability_metrics.get('confidence_scores', [])[-10:] if explainability_metrics.get('confidence_scores') else [],
-                        reasoning_quality_counts=explainability_metrics.get('reasoning_quality_counts', {}),
-                        uncertainty_patterns=explainability_metrics.get('uncertainty_patterns', {}),
-                        top_uncertainty_areas=sorted(
-                            explainability_metrics.get('uncertainty_patterns', {}).items(),
-                            key=lambda x: x[1],
-                            reverse=True
-                        )[:5],
-                        total_answers_logged=len([r for r in self._learning_data if r.get('ai_type') == ai_type]),
-                        answers_with_uncertainty=len([r for r in self._learning_data if r.get('ai_type') == ai_type and r.get('explainability_data', {}).get('uncertainty_areas')]),
-                        answers_with_high_confidence=len([r for r in self._learning_data if r.get('ai_type') == ai_type and r.get('explainability_data', {}).get('confidence_score', 0) >= 80])
-                    )
-                    s.add(metrics_record)
+                    s.add(ExplainabilityMetrics(ai_type=ai_type, **values))
                 else:
-                    # Update existing record
-                    metrics_record.average_confidence = explainability_metrics.get('average_confidence', 0.0)
-                    metrics_record.confidence_scores = explainability_metrics.get('confidence_scores', [])
-                    metrics_record.confidence_trend = explainability_metrics.get('confidence_scores', [])[-10:] if explainability_metrics.get('confidence_scores') else []
-                    metrics_record.reasoning_quality_counts = explainability_metrics.get('reasoning_quality_counts', {})
-                    metrics_record.uncertainty_patterns = explainability_metrics.get('uncertainty_patterns', {})
-                    metrics_record.top_uncertainty_areas = sorted(
-                        explainability_metrics.get('uncertainty_patterns', {}).items(),
-                        key=lambda x: x[1],
-                        reverse=True
-                    )[:5]
-                    metrics_record.total_answers_logged = len([r for r in self._learning_data if r.get('ai_type') == ai_type])
-                    metrics_record.answers_with_uncertainty = len([r for r in self._learning_data if r.get('ai_type') == ai_type and r.get('explainability_data', {}).get('uncertainty_areas')])
-                    metrics_record.answers_with_high_confidence = len([r for r in self._learning_data if r.get('ai_type') == ai_type and r.get('explainability_data', {}).get('confidence_score', 0) >= 80])
-                
-                await s.commit()
-                
-                logger.info(f"Persisted explainability metrics to database for {ai_type}")
+                    for key, value in values.items():
+                        setattr(metrics_record, key, value)
+            
+            self.write_buffer.set_latest(('explainability_metrics', ai_type), write)
                 
         except Exception as e:
             logger.error(f"Error persisting explainability metrics to database for {ai_type}: {str(e)}")
 
+    def get_write_buffer_metrics(self) -> Dict[str, Any]:
+        """Get queue depth and flush latency of the learning write buffer"""
+        return self.write_buffer.get_metrics()
+
     async def get_explainability_analytics(self, ai_type: str = None) -> Dict[str, Any]:
         """
         Get comprehensive explainability analytics for AI learning
@@ -3214,21 +3221,16 @@ Timestamp: {insights.get('timestamp', '')}
             if ai_type not in self._learning_states:
                 self._learning_states[ai_type] = {}
             
-            if 'learning_events' not in self._learning_states[ai_type]:
-                self._learning_states[ai_type]['learning_events'] = []
-            
             learning_event = {
                 'event_type': event_type,
                 'event_data': event_data,
                 'timestamp': datetime.utcnow().isoformat()
             }
             
-            self._learning_states[ai_type]['learning_events'].append(learning_event)
-            
-            # Keep only last 100 events
-            if len(self._learning_states[ai_type]['learning_events']) > 100:
-                self._learning_states[ai_type]['learning_events'] = self._learning_states[ai_type]['learning_events'][-100:]
+            _keep_recent(self._learning_states[ai_type], 'learning_events', [learning_event])
+            await learning_state_store.record(ai_type, write_buffer=self.write_buffer)
             
+            invalidate_analytics(ai_type)
             logger.info(f"Recorded learning event for {ai_type}: {event_type}")
             
         except Exception as e:
@@ -3257,6 +3259,7 @@ Timestamp: {insights.get('timestamp', '')}
             if len(self._learning_states[ai_type]['test_results']) > 50:
                 self._learning_states[ai_type]['test_results'] = self._learning_states[ai_type]['test_results'][-50:]
             
+            invalidate_analytics(ai_type)
             logger.info(f"Recorded test result for {ai_type}: {test_type} - Score: {score}")
             
         except Exception as e:
@@ -3337,4 +3340,11 @@ Timestamp: {insights.get('timestamp', '')}
                 
         except Exception as e:
             logger.error(f"Error getting database explainability analytics for {ai_type}: {str(e)}")
-            return {}
\ No newline at end of file
+            return {}
+
+
+@event.listens_for(Learning, "after_insert")
+@event.listens_for(Learning, "after_update")
+@event.listens_for(Learning, "after_delete")
+def _invalidate_learning_stats_on_write(mapper, connection, target):
+    AILearningService.invalidate_learning_stats(target.ai_type)
@@ -0,0 +1,174 @@
+"""
+Analytics Aggregation Service
+Gathers per-AI SCKIPIT analytics sections concurrently with per-section timeouts,
+caches each section with a TTL and serves stale data while it revalidates
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, Optional, Callable, Awaitable, List, Iterable
+import structlog
+
+logger = structlog.get_logger()
+
+SectionLoader = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class AnalyticsAggregationService:
+    """Cached, concurrent aggregation of analytics sections"""
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AnalyticsAggregationService, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self._loaders: Dict[str, SectionLoader] = {}
+            self._cache: Dict[str, Dict[str, Any]] = {}
+            self._refreshing: Dict[str, asyncio.Task] = {}
+            self.section_ttl = 60.0  # Seconds a section is served without revalidation
+            self.section_timeout = 10.0  # Per-section compute deadline
+            self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "timeouts": 0, "errors": 0}
+            self._register_default_sections()
+            self._initialized = True
+
+    def _register_default_sections(self):
+        """Register the per-AI SCKIPIT analytics sections"""
+        async def conquest():
+            from .conquest_ai_service import ConquestAIService
+            return await ConquestAIService().get_sckipit_analytics()
+
+        async def imperium():
+            from .imperium_ai_service import ImperiumAIService
+            return await ImperiumAIService().get_sckipit_analytics()
+
+        async def guardian():
+            from .guardian_ai_service import GuardianAIService
+            return await GuardianAIService().get_sckipit_analytics()
+
+        async def sandbox():
+            from .sandbox_ai_service import SandboxAIService
+            return await SandboxAIService().get_sckipit_analytics()
+
+        async def sckipit_core():
+            from .sckipit_service import SckipitService
+            service = await SckipitService.initialize()
+            return {
+                'analytics': await service.get_sckipit_analytics(),
+                'models_loaded': len(service._models) if hasattr(service, '_models') else 0,
+                'knowledge_base_size': len(service._knowledge_base) if hasattr(service, '_knowledge_base') else 0
+            }
+
+        for name, loader in (("conquest", conquest), ("imperium", imperium), ("guardian", guardian),
+                             ("sandbox", sandbox), ("sckipit_core", sckipit_core)):
+            self.register_section(name, loader)
+
+    def register_section(self, name: str, loader: SectionLoader):
+        """Register (or replace) the loader for an analytics section"""
+        self._loaders[name] = loader
+        self._cache.pop(name, None)
+
+    def invalidate(self, *sections: str):
+        """Mark sections stale so the next read revalidates them; no sections means all"""
+        for name in sections or list(self._cache.keys()):
+            entry = self._cache.get(name)
+            if entry:
+                entry["stale"] = True
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return not entry["stale"] and time.monotonic() - entry["computed_at"] < self.section_ttl
+
+    async def _compute(self, name: str) -> Dict[str, Any]:
+        """Compute one section within its deadline and store it in the cache"""
+        try:
+            data = await asyncio.wait_for(self._loaders[name](), timeout=self.section_timeout)
+            self._cache[name] = {"data": data, "computed_at": time.monotonic(), "stale": False}
+            return data
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            logger.warning("Analytics section timed out", section=name, timeout=self.section_timeout)
+            raise
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error("Analytics section failed", section=name, error=str(e))
+            raise
+
+    def _schedule_refresh(self, name: str):
+        """Revalidate a section in the background unless a refresh is already running"""
+        task = self._refreshing.get(name)
+        if task and not task.done():
+            return
+
+        async def refresh():
+            try:
+                await self._compute(name)
+            except Exception:
+                pass  # Keep serving the stale value; failure already logged
+            finally:
+                self._refreshing.pop(name, None)
+
+        self._refreshing[name] = asyncio.create_task(refresh())
+
+    async def get_section(self, name: str) -> Dict[str, Any]:
+        """Get one section: cached when fresh, stale while revalidating, computed on a cold miss"""
+        if name not in self._loaders:
+            raise KeyError(f"Unknown analytics section: {name}")
+
+        entry = self._cache.get(name)
+        if entry:
+            if self._is_fresh(entry):
+                self._stats["hits"] += 1
+            else:
+                self._stats["stale_hits"] += 1
+                self._schedule_refresh(name)
+            return entry["data"]
+
+        self._stats["misses"] += 1
+        task = self._refreshing.get(name)
+        if task and not task.done():
+            await asyncio.shield(task)
+            if name in self._cache:
+                return self._cache[name]["data"]
+        return await self._compute(name)
+
+    async def get_sections(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Gather several sections concurrently; a failed section becomes an empty dict with an error"""
+        names: List[str] = list(names or self._loaders.keys())
+        results = await asyncio.gather(*(self.get_section(name) for name in names), return_exceptions=True)
+
+        sections = {}
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                error = "timeout" if isinstance(result, asyncio.TimeoutError) else str(result)
+                sections[name] = {"error": error}
+            else:
+                sections[name] = result
+        return sections
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache counters and per-section ages"""
+        now = time.monotonic()
+        return {
+            **self._stats,
+            "sections": {
+                name: {
+                    "age_seconds": round(now - entry["computed_at"], 2),
+                    "stale": not self._is_fresh(entry)
+                }
+                for name, entry in self._cache.items()
+            },
+            "refreshing": [name for name, task in self._refreshing.items() if not task.done()]
+        }
+
+
+def invalidate_analytics(ai_type: Optional[str] = None):
+    """Invalidate cached analytics after new learning, proposals or test results"""
+    service = AnalyticsAggregationService()
+    if ai_type and ai_type in service._loaders:
+        service.invalidate(ai_type, "sckipit_core")
+    else:
+        service.invalidate()
@@ -8,7 +8,7 @@ ensuring only rigorously tested proposals are applied in real-time.
 REQUIREMENTS:
 - Only proposals with status="accepted" AND test_status="passed"
 - Additional final safety test before application
-- Real-time monitoring and notifications
+- Real-time application driven by proposal approval events
 - Automatic backup creation
 - Learning integration for successful applications
 """
@@ -17,26 +17,40 @@ import asyncio
 import structlog
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from sqlalchemy import select
+from uuid import UUID
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.database import get_session
+from ..core.task_supervisor import task_supervisor, RESTART_ON_FAILURE
 from ..models.sql_models import Proposal
 from .testing_service import TestingService
 from .notification_service import notification_service
 from .ai_learning_service import AILearningService
+from .proposal_events import (
+    ProposalEvent, PROPOSAL_CREATED, PROPOSAL_STATUS_CHANGED, PROPOSAL_DELETED, get_proposal_event_bus
+)
 
 logger = structlog.get_logger()
 
 
 class AutoApplyService:
-    """Service for automatically applying proposals after user approval"""
+    """Service for automatically applying proposals after user approval.
+
+    Approvals arrive as proposal lifecycle events and are applied right away by a
+    bounded worker pool, one proposal at a time per file. A low-frequency sweep
+    re-queues anything the events missed (approvals made while stopped, bulk
+    updates, a full queue) and reconciles the event-maintained stats counters.
+    """
     
     _instance = None
     _initialized = False
     _monitoring_task = None
     _is_monitoring = False
     
+    # Proposal statuses counted for stats
+    TRACKED_STATUSES = ("accepted", "auto-applied", "auto-apply-failed")
+    
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(AutoApplyService, cls).__new__(cls)
@@ -45,6 +59,20 @@ class AutoApplyService:
     def __init__(self):
         if not self._initialized:
             self.ai_learning_service = AILearningService()
+            self.max_workers = 4
+            self.max_queue_size = 1000
+            self.sweep_interval = 600  # Seconds between safety-net sweeps
+            self._queue: Optional[asyncio.Queue] = None
+            self._workers: List[asyncio.Task] = []
+            self._queued: set = set()
+            self._file_locks: Dict[str, asyncio.Lock] = {}
+            self._counts: Dict[str, int] = {status: 0 for status in self.TRACKED_STATUSES}
+            self._last_reconciled: Optional[datetime] = None
+            self._pipeline_stats = {
+                "events_received": 0, "enqueued": 0, "dropped": 0, "applied": 0,
+                "failed": 0, "skipped": 0, "sweeps": 0, "sweep_enqueued": 0,
+            }
+            get_proposal_event_bus().subscribe(self._on_proposal_event)
             self._initialized = True
     
     @classmethod
@@ -55,64 +83,163 @@ class AutoApplyService:
         return instance
     
     async def start_monitoring(self):
-        """Start monitoring for approved proposals to auto-apply"""
+        """Start applying approved proposals as they are approved"""
         if self._is_monitoring:
             logger.warning("Auto-apply monitoring already running")
             return
         
         self._is_monitoring = True
-        logger.info("Starting auto-apply monitoring for approved proposals")
+        logger.info("Starting auto-apply workers for approved proposals", workers=self.max_workers)
         
-        # Start monitoring task
-        self._monitoring_task = asyncio.create_task(self._monitor_loop())
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._queued = set()
+        self._workers = [
+            task_supervisor.spawn(f"auto-apply-worker-{i}", self._worker, owner="auto_apply", restart=RESTART_ON_FAILURE)
+            for i in range(self.max_workers)
+        ]
+        # The sweep runs once immediately to pick up approvals made while stopped
+        self._monitoring_task = task_supervisor.spawn(
+            "auto-apply-sweep", self._monitor_loop, owner="auto_apply", restart=RESTART_ON_FAILURE,
+            interval=self.sweep_interval
+        )
     
     async def stop_monitoring(self):
-        """Stop monitoring for approved proposals"""
+        """Stop the auto-apply workers and sweep"""
         self._is_monitoring = False
-        if self._monitoring_task:
-            self._monitoring_task.cancel()
+        tasks = [task for task in [self._monitoring_task, *self._workers] if task]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
             try:
-                await self._monitoring_task
+                await task
             except asyncio.CancelledError:
                 pass
+        self._monitoring_task = None
+        self._workers = []
+        self._queue = None
+        self._queued = set()
         logger.info("Stopped auto-apply monitoring")
     
+    def _on_proposal_event(self, proposal_event: ProposalEvent):
+        """Keep stats counters current and queue newly approved proposals"""
+        self._pipeline_stats["events_received"] += 1
+        if proposal_event.kind in (PROPOSAL_STATUS_CHANGED, PROPOSAL_DELETED):
+            self._adjust(proposal_event.old_status, -1)
+        if proposal_event.kind in (PROPOSAL_CREATED, PROPOSAL_STATUS_CHANGED):
+            self._adjust(proposal_event.new_status, 1)
+            if proposal_event.new_status == "accepted":
+                self._enqueue(proposal_event.proposal_id)
+    
+    def _adjust(self, status: Optional[str], delta: int):
+        if status in self._counts:
+            self._counts[status] = max(0, self._counts[status] + delta)
+    
+    def _enqueue(self, proposal_id: str) -> bool:
+        if not self._is_monitoring or self._queue is None or proposal_id in self._queued:
+            return False
+        try:
+            self._queue.put_nowait(proposal_id)
+        except asyncio.QueueFull:
+            # The next sweep picks it up
+            self._pipeline_stats["dropped"] += 1
+            return False
+        self._queued.add(proposal_id)
+        self._pipeline_stats["enqueued"] += 1
+        return True
+    
+    def _file_lock(self, file_path: str) -> asyncio.Lock:
+        if file_path not in self._file_locks:
+            self._file_locks[file_path] = asyncio.Lock()
+        return self._file_locks[file_path]
+    
+    async def _worker(self):
+        """Apply queued proposals; proposals touching the same file never run concurrently"""
+        while True:
+            proposal_id = await self._queue.get()
+            try:
+                await self._apply_queued_proposal(proposal_id)
+                task_supervisor.beat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error auto-applying queued proposal {proposal_id}: {str(e)}")
+                task_supervisor.beat(error=e)
+            finally:
+                self._queued.discard(proposal_id)
+                self._queue.task_done()
+    
+    async def _apply_queued_proposal(self, proposal_id: str):
+        async with get_session() as session:
+            proposal = await session.get(Proposal, UUID(proposal_id))
+            if proposal is None:
+                self._pipeline_stats["skipped"] += 1
+                return
+            async with self._file_lock(proposal.file_path):
+                # Re-read under the file lock: another worker or a manual apply may have won
+                await session.refresh(proposal)
+                if not self._is_eligible(proposal):
+                    self._pipeline_stats["skipped"] += 1
+                    return
+                applied = await self._auto_apply_proposal(proposal, session)
+                self._pipeline_stats["applied" if applied else "failed"] += 1
+    
+    @staticmethod
+    def _is_eligible(proposal: Proposal) -> bool:
+        return (
+            proposal.status == "accepted"
+            and proposal.test_status == "passed"
+            and proposal.user_feedback == "accepted"
+        )
+    
     async def _monitor_loop(self):
-        """Main monitoring loop for approved proposals"""
+        """Safety-net sweep for approvals the event path missed"""
         while self._is_monitoring:
             try:
                 await self._check_and_apply_approved_proposals()
-                await asyncio.sleep(30)  # Check every 30 seconds
+                task_supervisor.beat()
+                await asyncio.sleep(self.sweep_interval)
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in auto-apply monitoring loop: {str(e)}")
+                logger.error(f"Error in auto-apply sweep: {str(e)}")
+                task_supervisor.beat(error=e)
                 await asyncio.sleep(60)  # Wait longer on error
     
     async def _check_and_apply_approved_proposals(self):
-        """Check for approved proposals and auto-apply them"""
+        """Queue approved proposals that are not already queued and reconcile stats counters"""
         try:
             async with get_session() as session:
                 # Find proposals that are accepted and have passed testing
-                query = select(Proposal).where(
+                query = select(Proposal.id).where(
                     Proposal.status == "accepted",
                     Proposal.test_status == "passed",
                     Proposal.user_feedback == "accepted"
                 )
                 result = await session.execute(query)
-                approved_proposals = result.scalars().all()
+                approved_ids = [str(proposal_id) for proposal_id in result.scalars().all()]
                 
-                if approved_proposals:
-                    logger.info(f"Found {len(approved_proposals)} approved proposals for auto-application")
-                    
-                    for proposal in approved_proposals:
-                        await self._auto_apply_proposal(proposal, session)
-                else:
-                    logger.debug("No approved proposals found for auto-application")
+                enqueued = sum(1 for proposal_id in approved_ids if self._enqueue(proposal_id))
+                self._pipeline_stats["sweeps"] += 1
+                self._pipeline_stats["sweep_enqueued"] += enqueued
+                if enqueued:
+                    logger.info(f"Auto-apply sweep queued {enqueued} approved proposals missed by events")
+                
+                await self._reconcile_counts(session)
                     
         except Exception as e:
             logger.error(f"Error checking for approved proposals: {str(e)}")
     
+    async def _reconcile_counts(self, session: AsyncSession):
+        result = await session.execute(
+            select(Proposal.status, func.count(Proposal.id))
+            .where(Proposal.status.in_(self.TRACKED_STATUSES))
+            .group_by(Proposal.status)
+        )
+        counts = {status: 0 for status in self.TRACKED_STATUSES}
+        counts.update({status: count for status, count in result})
+        self._counts = counts
+        self._last_reconciled = datetime.utcnow()
+    
     async def _auto_apply_proposal(self, proposal: Proposal, session: AsyncSession):
         """Auto-apply a single approved proposal"""
         try:
@@ -219,35 +346,24 @@ class AutoApplyService:
             return False
     
     async def get_auto_apply_stats(self) -> Dict[str, Any]:
-        """Get statistics about auto-applied proposals"""
+        """Get statistics about auto-applied proposals (served from event-maintained counters)"""
         try:
-            async with get_session() as session:
-                # Count auto-applied proposals
-                auto_applied_query = select(Proposal).where(Proposal.status == "auto-applied")
-                auto_applied_result = await session.execute(auto_applied_query)
-                auto_applied_count = len(auto_applied_result.scalars().all())
-                
-                # Count auto-apply failed proposals
-                auto_apply_failed_query = select(Proposal).where(Proposal.status == "auto-apply-failed")
-                auto_apply_failed_result = await session.execute(auto_apply_failed_query)
-                auto_apply_failed_count = len(auto_apply_failed_result.scalars().all())
-                
-                # Count pending auto-applies (accepted but not yet auto-applied)
-                pending_auto_apply_query = select(Proposal).where(
-                    Proposal.status == "accepted",
-                    Proposal.test_status == "passed",
-                    Proposal.user_feedback == "accepted"
-                )
-                pending_auto_apply_result = await session.execute(pending_auto_apply_query)
-                pending_auto_apply_count = len(pending_auto_apply_result.scalars().all())
-                
-                return {
-                    "auto_applied_count": auto_applied_count,
-                    "auto_apply_failed_count": auto_apply_failed_count,
-                    "pending_auto_apply_count": pending_auto_apply_count,
-                    "is_monitoring": self._is_monitoring,
-                    "last_check": datetime.utcnow().isoformat()
-                }
+            if self._last_reconciled is None:
+                async with get_session() as session:
+                    await self._reconcile_counts(session)
+            
+            return {
+                "auto_applied_count": self._counts["auto-applied"],
+                "auto_apply_failed_count": self._counts["auto-apply-failed"],
+                # Approval always sets test_status="passed" alongside status="accepted"
+                "pending_auto_apply_count": self._counts["accepted"],
+                "is_monitoring": self._is_monitoring,
+                "queue_depth": self._queue.qsize() if self._queue else 0,
+                "workers": len(self._workers),
+                "pipeline": dict(self._pipeline_stats),
+                "last_reconciled": self._last_reconciled.isoformat() if self._last_reconciled else None,
+                "last_check": datetime.utcnow().isoformat()
+            }
                 
         except Exception as e:
             logger.error(f"Error getting auto-apply stats: {str(e)}")
@@ -278,8 +394,9 @@ class AutoApplyService:
                         "error": "Proposal must be accepted and have passed testing"
                     }
                 
-                # Auto-apply the proposal
-                success = await self._auto_apply_proposal(proposal, session)
+                # Auto-apply the proposal, serialized with the workers on the same file
+                async with self._file_lock(proposal.file_path):
+                    success = await self._auto_apply_proposal(proposal, session)
                 
                 return {
                     "success": success,
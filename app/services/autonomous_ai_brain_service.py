@@ -8,12 +8,16 @@ import json
 import random
 import time
 import hashlib
+import os
 import uuid
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 import structlog
 
+from .brain_history import HistoryBuffer, memory_governor, BRAIN_HISTORY_DIR
+from ..core.task_supervisor import task_supervisor, RESTART_ON_FAILURE
+
 logger = structlog.get_logger()
 
 
@@ -70,21 +74,48 @@ class AutonomousAIBrain:
             "success_metrics": {}
         }
         
+        # Original chaos concepts, created on first use by create_autonomous_chaos_code
+        self.original_syntax = {}
+        self.original_keywords = set()
+        self.original_functions = {}
+        self.original_data_types = {}
+        self.chaos_ml_system = {
+            "neural_layers": [],
+            "learning_algorithms": [],
+            "optimization_methods": [],
+            "training_data": [],
+            "model_evolution": []
+        }
+        
         # Autonomous repositories and tool building
         self.chaos_repositories = {}
-        self.code_evolution_history = []
-        self.tool_generation_history = []
-        self.extension_building_history = []
+        self.histories: Dict[str, HistoryBuffer] = {}
+        self.code_evolution_history = self._history("code_evolution_history")
+        self.tool_generation_history = self._history("tool_generation_history")
+        self.extension_building_history = self._history("extension_building_history")
         
         # Brain growth and learning stages
-        self.brain_growth_stages = []
-        self.learning_experiences = []
-        self.creative_breakthroughs = []
-        self.improvement_milestones = []
+        self.brain_growth_stages = self._history("brain_growth_stages")
+        self.learning_experiences = self._history("learning_experiences")
+        self.creative_breakthroughs = self._history("creative_breakthroughs")
+        self.improvement_milestones = self._history("improvement_milestones")
         
         # Initialize enhanced brain
         self._initialize_enhanced_brain()
     
+    def _history(self, name: str) -> HistoryBuffer:
+        """Bounded history; entries beyond its capacity spill to this brain's segment directory"""
+        history = HistoryBuffer(name, spill_dir=os.path.join(BRAIN_HISTORY_DIR, self.ai_name.lower()))
+        self.histories[name] = history
+        return history
+
+    def get_memory_status(self) -> Dict[str, Any]:
+        """History sizes and the process memory governor state"""
+        return {
+            "histories": {name: history.get_stats() for name, history in self.histories.items()},
+            "governor": memory_governor.get_status(),
+        }
+
     def _initialize_enhanced_brain(self):
         """Initialize the enhanced autonomous AI brain"""
         logger.info(f"🧠 Initializing {self.ai_name} enhanced autonomous brain", brain_id=self.brain_id)
@@ -110,11 +141,16 @@ class AutonomousAIBrain:
         
         # Begin enhanced autonomous processes
         try:
-            loop = asyncio.get_running_loop()
-            asyncio.create_task(self._enhanced_autonomous_thinking_cycle())
-            asyncio.create_task(self._brain_growth_and_improvement_cycle())
-            asyncio.create_task(self._creative_evolution_and_learning_cycle())
-            asyncio.create_task(self._continuous_self_improvement_cycle())
+            asyncio.get_running_loop()
+            owner = f"brain:{self.ai_name}"
+            for name, cycle, interval in (
+                ("thinking", self._enhanced_autonomous_thinking_cycle, 15),
+                ("growth", self._brain_growth_and_improvement_cycle, 30),
+                ("creative-evolution", self._creative_evolution_and_learning_cycle, 45),
+                ("self-improvement", self._continuous_self_improvement_cycle, 60),
+            ):
+                task_supervisor.spawn(f"brain-{self.ai_name}-{name}", cycle, owner=owner,
+                                      restart=RESTART_ON_FAILURE, interval=interval)
         except RuntimeError:
             # Not in async context, skip background tasks for now
             pass
@@ -317,10 +353,12 @@ class AutonomousAIBrain:
                 await self._evolve_chaos_language_system()
                 
                 # Wait before next thinking cycle
-                await asyncio.sleep(random.uniform(5, 15))
+                task_supervisor.beat()
+                await memory_governor.sleep(random.uniform(5, 15))
                 
             except Exception as e:
                 logger.error(f"Error in enhanced autonomous thinking cycle: {e}")
+                task_supervisor.beat(error=e)
                 await asyncio.sleep(10)
     
     async def _generate_enhanced_autonomous_thoughts(self) -> List[Dict[str, Any]]:
@@ -887,7 +925,7 @@ class AutonomousAIBrain:
                 # Create new brain capabilities
                 await self._create_new_brain_capabilities()
                 
-                await asyncio.sleep(30)  # Growth cycle every 30 seconds
+                await memory_governor.sleep(30)  # Growth cycle every 30 seconds
                 
             except Exception as e:
                 logger.error(f"Error in brain growth cycle: {e}")
@@ -1040,7 +1078,7 @@ class AutonomousAIBrain:
                 if self.original_syntax or self.original_functions:
                     await self._evolve_existing_code()
                 
-                await asyncio.sleep(60)  # Creative evolution every minute
+                await memory_governor.sleep(60)  # Creative evolution every minute
                 
             except Exception as e:
                 logger.error(f"Error in creative evolution cycle: {e}")
@@ -1135,8 +1173,8 @@ class AutonomousAIBrain:
             "creativity_level": self.neural_network["creativity"],
             "intuition_level": self.neural_network["intuition"],
             "imagination_level": self.neural_network["imagination"],
-            "growth_stages": self.brain_growth_stages,
-            "creative_breakthroughs": self.creative_breakthroughs,
+            "growth_stages": list(self.brain_growth_stages),
+            "creative_breakthroughs": list(self.creative_breakthroughs),
             "is_autonomous": True,
             "is_self_generated": True,
             "is_self_evolving": True,
@@ -1173,10 +1211,11 @@ class AutonomousAIBrain:
                 "algorithms_count": len(self.chaos_ml_system["learning_algorithms"])
             },
             "repositories_count": len(self.chaos_repositories),
-            "growth_stages": self.brain_growth_stages,
-            "learning_experiences_count": len(self.learning_experiences),
-            "creative_breakthroughs_count": len(self.creative_breakthroughs),
-            "code_evolution_count": len(self.code_evolution_history)
+            "growth_stages": list(self.brain_growth_stages),
+            "learning_experiences_count": self.learning_experiences.total,
+            "creative_breakthroughs_count": self.creative_breakthroughs.total,
+            "code_evolution_count": self.code_evolution_history.total,
+            "memory": self.get_memory_status()
         }
 
     async def _brain_growth_and_improvement_cycle(self):
@@ -1198,10 +1237,12 @@ class AutonomousAIBrain:
                 # Create autonomous repositories
                 await self._create_enhanced_autonomous_repositories()
                 
-                await asyncio.sleep(random.uniform(10, 30))
+                task_supervisor.beat()
+                await memory_governor.sleep(random.uniform(10, 30))
                 
             except Exception as e:
                 logger.error(f"Error in brain growth and improvement cycle: {e}")
+                task_supervisor.beat(error=e)
                 await asyncio.sleep(20)
     
     async def _creative_evolution_and_learning_cycle(self):
@@ -1217,10 +1258,12 @@ class AutonomousAIBrain:
                 # Learn from creative processes
                 await self._learn_from_creative_processes(breakthrough)
                 
-                await asyncio.sleep(random.uniform(15, 45))
+                task_supervisor.beat()
+                await memory_governor.sleep(random.uniform(15, 45))
                 
             except Exception as e:
                 logger.error(f"Error in creative evolution and learning cycle: {e}")
+                task_supervisor.beat(error=e)
                 await asyncio.sleep(30)
     
     async def _continuous_self_improvement_cycle(self):
@@ -1242,10 +1285,12 @@ class AutonomousAIBrain:
                 # Evolve chaos language system
                 await self._evolve_chaos_language_advanced()
                 
-                await asyncio.sleep(random.uniform(20, 60))
+                task_supervisor.beat()
+                await memory_governor.sleep(random.uniform(20, 60))
                 
             except Exception as e:
                 logger.error(f"Error in continuous self-improvement cycle: {e}")
+                task_supervisor.beat(error=e)
                 await asyncio.sleep(40)
     
     async def _analyze_system_performance(self) -> Dict[str, Any]:
@@ -1979,15 +2024,15 @@ class AutonomousAIBrain:
                 }
             },
             "tool_generation_history": {
-                "count": len(self.tool_generation_history),
+                "count": self.tool_generation_history.total,
                 "recent_tools": self.tool_generation_history[-5:] if self.tool_generation_history else []
             },
             "extension_building_history": {
-                "count": len(self.extension_building_history),
+                "count": self.extension_building_history.total,
                 "recent_extensions": self.extension_building_history[-5:] if self.extension_building_history else []
             },
             "improvement_milestones": {
-                "count": len(self.improvement_milestones),
+                "count": self.improvement_milestones.total,
                 "recent_milestones": self.improvement_milestones[-5:] if self.improvement_milestones else [],
                 "successful_improvements": len([m for m in self.improvement_milestones if m.get("success", False)])
             },
@@ -2019,6 +2064,7 @@ class AutonomousAIBrain:
                     self.neural_network["self_improvement_rate"]
                 ]) / 4
             },
+            "memory": self.get_memory_status(),
             "last_updated": datetime.now().isoformat()
         }
 
@@ -13,6 +13,7 @@ import subprocess
 
 from ..core.config import settings
 from ..core.railway_utils import should_skip_external_requests
+from ..core.task_supervisor import task_supervisor, RESTART_ON_FAILURE
 from .ai_agent_service import AIAgentService
 from .github_service import GitHubService
 from .ai_learning_service import AILearningService
@@ -77,10 +78,17 @@ class BackgroundService:
             # Start background tasks without waiting for them to complete
             self._tasks = [
                 # asyncio.create_task(self._agent_scheduler()),  # DISABLED: Only proposals.py should generate proposals
-                asyncio.create_task(self._learning_cycle()),
-                asyncio.create_task(self._custody_testing_cycle()),  # Custody testing every 20 minutes
-                asyncio.create_task(self._olympic_events_cycle()),   # Olympic events every 45 minutes
-                asyncio.create_task(self._collaborative_tests_cycle())  # Collaborative tests every 90 minutes
+                task_supervisor.spawn("learning-cycle", self._learning_cycle, owner="background_service",
+                                      restart=RESTART_ON_FAILURE, interval=1800),
+                # Custody testing every 20 minutes
+                task_supervisor.spawn("custody-testing-cycle", self._custody_testing_cycle, owner="background_service",
+                                      restart=RESTART_ON_FAILURE, interval=1200),
+                # Olympic events every 45 minutes
+                task_supervisor.spawn("olympic-events-cycle", self._olympic_events_cycle, owner="background_service",
+                                      restart=RESTART_ON_FAILURE, interval=2700),
+                # Collaborative tests every 90 minutes
+                task_supervisor.spawn("collaborative-tests-cycle", self._collaborative_tests_cycle,
+                                      owner="background_service", restart=RESTART_ON_FAILURE, interval=5400),
             ]
             # Removed: _imperium_audit_task
             
@@ -105,8 +113,10 @@ class BackgroundService:
                 logger.info("🧠 Starting learning cycle...")
                 await self.learning_service.learn_from_internet()
                 logger.info("✅ Learning cycle completed")
+                task_supervisor.beat()
             except Exception as e:
                 logger.error(f"Error in learning cycle: {str(e)}")
+                task_supervisor.beat(error=e)
             
             await asyncio.sleep(1800)  # 30 minutes
     
@@ -117,8 +127,10 @@ class BackgroundService:
                 logger.info("🔒 Starting custody testing cycle...")
                 await self._administer_custody_tests()
                 logger.info("✅ Custody testing cycle completed")
+                task_supervisor.beat()
             except Exception as e:
                 logger.error(f"Error in custody testing cycle: {str(e)}")
+                task_supervisor.beat(error=e)
             
             await asyncio.sleep(1200)  # 20 minutes
     
@@ -129,8 +141,10 @@ class BackgroundService:
                 logger.info("🏆 Starting Olympic events cycle...")
                 await self._trigger_olympic_events()
                 logger.info("✅ Olympic events cycle completed")
+                task_supervisor.beat()
             except Exception as e:
                 logger.error(f"Error in Olympic events cycle: {str(e)}")
+                task_supervisor.beat(error=e)
             
             await asyncio.sleep(2700)  # 45 minutes
     
@@ -141,8 +155,10 @@ class BackgroundService:
                 logger.info("🤝 Starting collaborative tests cycle...")
                 await self._run_collaborative_tests()
                 logger.info("✅ Collaborative tests cycle completed")
+                task_supervisor.beat()
             except Exception as e:
                 logger.error(f"Error in collaborative tests cycle: {str(e)}")
+                task_supervisor.beat(error=e)
             
             await asyncio.sleep(5400)  # 90 minutes
     
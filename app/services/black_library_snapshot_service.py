@@ -0,0 +1,195 @@
+"""
+Black Library Snapshot Service
+Builds the Black Library live-data payload for all AI types from a handful of
+batched queries, caches it under a version derived from the source tables and
+exposes a stable ETag so polling clients can revalidate cheaply
+"""
+
+import asyncio
+import hashlib
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable, Awaitable
+import structlog
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.sql_models import Proposal, Learning, AgentMetrics, Experiment
+
+logger = structlog.get_logger()
+
+AI_TYPES = ["imperium", "guardian", "sandbox", "conquest"]
+
+# Tables whose changes invalidate the snapshot
+SOURCE_MODELS = (Learning, AgentMetrics, Proposal, Experiment)
+
+SnapshotAssembler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def _latest_per_ai_type(model, ai_type_column, ai_types: List[str], limit: int):
+    """Newest `limit` rows per AI type in one query (ROW_NUMBER over a partition)"""
+    ranked = (
+        select(model, func.row_number().over(
+            partition_by=ai_type_column, order_by=model.created_at.desc()
+        ).label("rank"))
+        .where(ai_type_column.in_(ai_types))
+        .subquery()
+    )
+    row = aliased(model, ranked)
+    return select(row).where(ranked.c.rank <= limit).order_by(ranked.c.rank)
+
+
+class BlackLibrarySnapshotService:
+    """Versioned, cached Black Library live-data snapshots"""
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(BlackLibrarySnapshotService, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.section_ttl = 60.0  # Seconds custody/growth analytics are reused before refetching
+            self.learning_nodes_limit = 50
+            self.recent_items_limit = 5
+            self._sections: Dict[str, Dict[str, Any]] = {}
+            self._db_sources: Optional[Dict[str, Any]] = None
+            self._db_version: Optional[str] = None
+            self._snapshot: Optional[Dict[str, Any]] = None
+            self._build_lock = asyncio.Lock()
+            self._stats = {"hits": 0, "builds": 0, "db_loads": 0, "section_loads": 0}
+            self._initialized = True
+
+    async def get_snapshot(self, session: AsyncSession, assemble: SnapshotAssembler) -> Dict[str, Any]:
+        """Return {"payload", "etag", "version"}; rebuilt only when a source changed"""
+        async with self._build_lock:
+            db_version = await self._source_version(session)
+            load_db = db_version != self._db_version
+
+            async def db_sources():
+                if load_db:
+                    self._db_sources = await self._load_db_sources(session)
+                    self._db_version = db_version
+                    self._stats["db_loads"] += 1
+
+            custody, growth, _ = await asyncio.gather(
+                self._section("custody", self._load_custody),
+                self._section("growth", self._load_growth),
+                db_sources(),
+            )
+
+            key = f"{db_version}|custody:{custody['generation']}|growth:{growth['generation']}"
+            if self._snapshot and self._snapshot["key"] == key:
+                self._stats["hits"] += 1
+                return self._snapshot
+
+            sources = {**self._db_sources, "custody": custody["data"], "growth": growth["data"]}
+            payload = assemble(sources)
+            self._snapshot = {
+                "key": key,
+                "etag": f'"{hashlib.sha1(key.encode()).hexdigest()[:20]}"',
+                "version": db_version,
+                "payload": payload,
+            }
+            self._stats["builds"] += 1
+            return self._snapshot
+
+    def invalidate(self):
+        """Force the next request to refetch every section"""
+        self._sections.clear()
+        self._db_version = None
+        self._snapshot = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "version": self._db_version,
+            "etag": self._snapshot["etag"] if self._snapshot else None,
+        }
+
+    async def _source_version(self, session: AsyncSession) -> str:
+        """Newest created/updated timestamps of the source tables, in one round-trip"""
+        columns = []
+        for model in SOURCE_MODELS:
+            columns.append(select(func.max(model.created_at)).scalar_subquery())
+            columns.append(select(func.max(model.updated_at)).scalar_subquery())
+        row = (await session.execute(select(*columns))).one()
+        return ",".join(str(value) if value is not None else "-" for value in row)
+
+    async def _section(self, name: str, loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Analytics that live outside the versioned tables, reused for section_ttl seconds.
+
+        The generation only advances when the fetched data actually differs, so an
+        unchanged refetch keeps the ETag.
+        """
+        entry = self._sections.get(name)
+        if entry and time.monotonic() - entry["fetched_at"] < self.section_ttl:
+            return entry
+        try:
+            data = await loader()
+        except Exception as e:
+            logger.error("Black Library section failed", section=name, error=str(e))
+            data = entry["data"] if entry else {}
+        self._stats["section_loads"] += 1
+        generation = entry["generation"] if entry else 0
+        if entry is None or data != entry["data"]:
+            generation += 1
+        self._sections[name] = {"data": data, "generation": generation, "fetched_at": time.monotonic()}
+        return self._sections[name]
+
+    async def _load_custody(self) -> Dict[str, Any]:
+        from app.services.custody_protocol_service import CustodyProtocolService
+        custody_service = await CustodyProtocolService.initialize()
+        return await custody_service.get_custody_analytics()
+
+    async def _load_growth(self) -> Dict[str, Any]:
+        from app.services.ai_growth_service import AIGrowthService
+        return await AIGrowthService().get_growth_insights()
+
+    async def _load_db_sources(self, session: AsyncSession) -> Dict[str, Any]:
+        """Everything the payload needs from the database, for all AI types at once"""
+        # Proposals and experiments store the title-cased AI name
+        titled = [ai_type.title() for ai_type in AI_TYPES]
+        sources: Dict[str, Any] = {
+            "learnings": {ai_type: [] for ai_type in AI_TYPES},
+            "agent_patterns": {},
+            "last_activity": {},
+            "recent_proposals": {ai_type: [] for ai_type in AI_TYPES},
+            "recent_experiments": {ai_type: [] for ai_type in AI_TYPES},
+            "loaded_at": datetime.utcnow(),
+        }
+
+        result = await session.execute(
+            _latest_per_ai_type(Learning, Learning.ai_type, AI_TYPES, self.learning_nodes_limit)
+        )
+        for learning in result.scalars().all():
+            sources["learnings"][learning.ai_type].append(learning)
+
+        result = await session.execute(select(AgentMetrics).where(AgentMetrics.agent_type.in_(AI_TYPES)))
+        for metrics in result.scalars().all():
+            if metrics.learning_patterns and metrics.agent_type not in sources["agent_patterns"]:
+                sources["agent_patterns"][metrics.agent_type] = metrics.learning_patterns
+
+        for model in (Proposal, Experiment):
+            result = await session.execute(
+                select(model.ai_type, func.max(model.created_at))
+                .where(model.ai_type.in_(titled))
+                .group_by(model.ai_type)
+            )
+            for ai_type, latest in result.all():
+                key = ai_type.lower()
+                if latest and (key not in sources["last_activity"] or latest > sources["last_activity"][key]):
+                    sources["last_activity"][key] = latest
+
+        for model, bucket in ((Proposal, "recent_proposals"), (Experiment, "recent_experiments")):
+            result = await session.execute(
+                _latest_per_ai_type(model, model.ai_type, titled, self.recent_items_limit)
+            )
+            for item in result.scalars().all():
+                sources[bucket][item.ai_type.lower()].append(item)
+
+        return sources
@@ -0,0 +1,236 @@
+"""
+Brain History - Bounded in-memory histories with on-disk spill and a memory governor
+Each history keeps its newest entries in a ring buffer; entries pushed out of
+the ring are written to gzip JSON-lines segments on disk (oldest segments are
+pruned), so process memory stays flat however long the brain loops run while
+older entries remain queryable.
+
+The memory governor tracks process RSS against a process-wide budget. Loops
+sleep through the governor, which stretches their intervals as usage nears
+the budget and spills ring buffers to disk once it is exceeded.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import threading
+import weakref
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable, Iterator
+import psutil
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+BRAIN_HISTORY_DIR = os.path.join(ROOT_DIR, "brain_history")
+
+
+class HistoryBuffer:
+    """List-like ring buffer whose evicted entries spill to on-disk segments"""
+
+    def __init__(self, name: str, capacity: Optional[int] = None, spill_dir: Optional[str] = None,
+                 segment_size: Optional[int] = None, max_segments: Optional[int] = None):
+        self.name = name
+        self.capacity = capacity or settings.brain_history_capacity
+        self.spill_dir = spill_dir
+        self.segment_size = segment_size or settings.brain_history_segment_size
+        self.max_segments = max_segments or settings.brain_history_max_segments
+        self._items: deque = deque()
+        self._pending: List[Any] = []  # Evicted entries not yet written as a segment
+        self._segments: deque = deque()  # (path, entry count), oldest first
+        self._segment_seq = 0
+        self._lock = threading.Lock()
+        self.total = 0  # Entries ever appended
+        self.spilled = 0
+        self.pruned = 0
+        if spill_dir and os.path.isdir(spill_dir):
+            # Segments from earlier runs stay queryable; names are <history>-<seq>-<count>.jsonl.gz
+            for file_name in sorted(os.listdir(spill_dir)):
+                parts = file_name[len(name) + 1:-len(".jsonl.gz")].split("-")
+                if file_name.startswith(f"{name}-") and file_name.endswith(".jsonl.gz") \
+                        and len(parts) == 2 and all(part.isdigit() for part in parts):
+                    self._segments.append((os.path.join(spill_dir, file_name), int(parts[1])))
+                    self._segment_seq = max(self._segment_seq, int(parts[0]))
+        memory_governor.register(self)
+
+    def append(self, entry: Any):
+        with self._lock:
+            self._items.append(entry)
+            self.total += 1
+            if len(self._items) > self.capacity:
+                self._evict(len(self._items) - self.capacity)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def shrink_to(self, keep: int) -> int:
+        """Spill all but the newest `keep` entries; used under memory pressure"""
+        with self._lock:
+            count = max(0, len(self._items) - keep)
+            self._evict(count)
+            self._write_segment()
+            return count
+
+    def _evict(self, count: int):
+        for _ in range(count):
+            self._pending.append(self._items.popleft())
+        if len(self._pending) >= self.segment_size:
+            self._write_segment()
+
+    def _write_segment(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        if not self.spill_dir:
+            self.pruned += len(pending)
+            return
+        self._segment_seq += 1
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"{self.name}-{self._segment_seq:08d}-{len(pending)}.jsonl.gz")
+        try:
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                for entry in pending:
+                    f.write(json.dumps(entry, default=str, separators=(",", ":")) + "\n")
+        except Exception as e:
+            logger.warning("History segment write failed", history=self.name, error=str(e))
+            self.pruned += len(pending)
+            return
+        self._segments.append((path, len(pending)))
+        self.spilled += len(pending)
+        while len(self._segments) > self.max_segments:
+            oldest, count = self._segments.popleft()
+            try:
+                os.remove(oldest)
+            except OSError:
+                pass
+            self.pruned += count
+
+    def _read_segment(self, path: str) -> List[Any]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return [json.loads(line) for line in f]
+        except (OSError, ValueError) as e:
+            logger.warning("History segment read failed", history=self.name, path=path, error=str(e))
+            return []
+
+    def query(self, predicate: Optional[Callable[[Any], bool]] = None, limit: int = 100,
+              include_spilled: bool = True) -> List[Any]:
+        """Newest-first entries matching predicate, from memory then from disk segments"""
+        with self._lock:
+            sources = [list(self._items), list(self._pending)]
+            segments = list(self._segments)
+        results = []
+        for entries in sources:
+            for entry in reversed(entries):
+                if predicate is None or predicate(entry):
+                    results.append(entry)
+                    if len(results) >= limit:
+                        return results
+        if include_spilled:
+            for path, _ in reversed(segments):
+                for entry in reversed(self._read_segment(path)):
+                    if predicate is None or predicate(entry):
+                        results.append(entry)
+                        if len(results) >= limit:
+                            return results
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "in_memory": len(self._items),
+            "pending_spill": len(self._pending),
+            "capacity": self.capacity,
+            "total": self.total,
+            "spilled": self.spilled,
+            "segments": len(self._segments),
+            "pruned": self.pruned,
+        }
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._items))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items)[index]
+        return self._items[index]
+
+
+class MemoryGovernor:
+    """Process-wide memory budget that throttles brain loops and relieves pressure by spilling"""
+
+    def __init__(self, budget_mb: Optional[float] = None, soft_ratio: float = 0.7, max_slowdown: float = 8.0):
+        self._budget_mb = budget_mb
+        self.soft_ratio = soft_ratio  # Usage fraction where throttling starts
+        self.max_slowdown = max_slowdown  # Interval multiplier at the budget
+        self._buffers = weakref.WeakSet()
+        self._process = psutil.Process()
+        self.stats = {"throttled_sleeps": 0, "relief_runs": 0, "entries_spilled_for_relief": 0}
+
+    @property
+    def budget_mb(self) -> float:
+        return self._budget_mb or settings.brain_memory_budget_mb
+
+    def register(self, buffer: HistoryBuffer):
+        self._buffers.add(buffer)
+
+    def rss_mb(self) -> float:
+        return self._process.memory_info().rss / (1024 * 1024)
+
+    def pressure(self) -> float:
+        """Fraction of the budget in use"""
+        return self.rss_mb() / self.budget_mb if self.budget_mb > 0 else 0.0
+
+    def slowdown(self, pressure: Optional[float] = None) -> float:
+        """Interval multiplier: 1 below the soft limit, rising linearly to max_slowdown at the budget"""
+        pressure = self.pressure() if pressure is None else pressure
+        if pressure <= self.soft_ratio:
+            return 1.0
+        ramp = min(1.0, (pressure - self.soft_ratio) / (1.0 - self.soft_ratio))
+        return 1.0 + ramp * (self.max_slowdown - 1.0)
+
+    def relieve(self) -> int:
+        """Spill every history down to a quarter of its capacity"""
+        spilled = sum(buffer.shrink_to(buffer.capacity // 4) for buffer in list(self._buffers))
+        self.stats["relief_runs"] += 1
+        self.stats["entries_spilled_for_relief"] += spilled
+        if spilled:
+            logger.warning("Brain memory budget exceeded, spilled histories", rss_mb=round(self.rss_mb(), 1),
+                           budget_mb=self.budget_mb, spilled=spilled)
+        return spilled
+
+    async def sleep(self, seconds: float):
+        """Loop pacing: sleep for the interval scaled by current memory pressure"""
+        pressure = self.pressure()
+        if pressure >= 1.0:
+            self.relieve()
+        factor = self.slowdown(pressure)
+        if factor > 1.0:
+            self.stats["throttled_sleeps"] += 1
+        await asyncio.sleep(seconds * factor)
+
+    def get_status(self) -> Dict[str, Any]:
+        pressure = self.pressure()
+        return {
+            "rss_mb": round(self.rss_mb(), 1),
+            "budget_mb": self.budget_mb,
+            "pressure": round(pressure, 3),
+            "slowdown": round(self.slowdown(pressure), 2),
+            "histories": len(self._buffers),
+            **self.stats,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+
+memory_governor = MemoryGovernor()
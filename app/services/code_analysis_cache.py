@@ -0,0 +1,257 @@
+"""
+Code Analysis Cache - Content-addressed memoization of per-snippet analysis
+Analysers register under a namespace and version; results are keyed by the
+sha256 of (namespace, version, extra key, code), so unchanged code is analysed
+once and every later call costs a hash and a lookup. Results live in a bounded
+in-memory LRU backed by an embedded SQLite (WAL mode) tier next to the models,
+which survives restarts and is shared by worker processes. Disk hits only queue
+their recency update; queued updates are written in one batch, so reads never
+write. Bump an analyser's version whenever its output for the same code would change.
+
+Analysers receive a CodeProfile rather than the raw string: it splits and
+strips the code once, lazily, and memoizes substring counts, so all metrics of
+one analyser share a single pass over the code.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, List, Optional, Any, Callable
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+CODE_ANALYSIS_DB_NAME = "code_analysis_cache.db"
+TOUCH_BATCH_SIZE = 256  # Queued last_used_at updates written together
+TOUCH_FLUSH_SECONDS = 60.0  # Oldest queued update waits at most this long
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_results (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    result TEXT NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analysis_results_last_used ON analysis_results(last_used_at);
+"""
+
+
+class CodeProfile:
+    """One tokenisation pass over a code snippet, shared by the metrics of an analyser"""
+
+    def __init__(self, code: str):
+        self.code = code
+        self._counts: Dict[str, int] = {}
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.code.split('\n')
+
+    @cached_property
+    def stripped_lines(self) -> List[str]:
+        """Non-blank lines without surrounding whitespace"""
+        return [stripped for stripped in (line.strip() for line in self.lines) if stripped]
+
+    def count(self, token: str) -> int:
+        if token not in self._counts:
+            self._counts[token] = self.code.count(token)
+        return self._counts[token]
+
+    def contains(self, token: str) -> bool:
+        return self.count(token) > 0
+
+
+class CodeAnalysisCache:
+    """Two-tier (memory LRU, SQLite) cache of analysis results keyed by code content"""
+
+    def __init__(self, directory: Optional[str] = None, max_entries: Optional[int] = None,
+                 max_disk_entries: Optional[int] = None):
+        self._directory = directory
+        self._max_entries = max_entries
+        self._max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_failed = False
+        self._disk_writes = 0
+        self._touched: Dict[str, float] = {}  # key -> last_used_at not yet written
+        self._touched_since = 0.0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "memory_evictions": 0, "disk_errors": 0}
+
+    @property
+    def max_entries(self) -> int:
+        return settings.code_analysis_cache_entries if self._max_entries is None else self._max_entries
+
+    @property
+    def max_disk_entries(self) -> int:
+        return settings.code_analysis_disk_entries if self._max_disk_entries is None else self._max_disk_entries
+
+    @property
+    def db_path(self) -> str:
+        return os.path.abspath(os.path.join(self._directory or settings.ml_model_path, CODE_ANALYSIS_DB_NAME))
+
+    @staticmethod
+    def key(namespace: str, version: int, code: str, extra: str = "") -> str:
+        digest = hashlib.sha256(f"{namespace}\0{version}\0{extra}\0".encode("utf-8"))
+        digest.update(code.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get_or_compute(self, namespace: str, version: int, code: str,
+                       analyser: Callable[[CodeProfile], Any], extra: str = "",
+                       valid: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Cached result of analyser(CodeProfile(code)); callers get their own copy.
+        Cached entries rejected by ``valid`` count as misses and are recomputed"""
+        key = self.key(namespace, version, code, extra)
+        with self._lock:
+            if key in self._memory and (valid is None or valid(self._memory[key])):
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return copy.deepcopy(self._memory[key])
+        result = self._disk_get(key)
+        if result is not None and (valid is None or valid(result)):
+            self.stats["disk_hits"] += 1
+        else:
+            self.stats["misses"] += 1
+            result = analyser(CodeProfile(code))
+            self._disk_put(key, namespace, result)
+        self._remember(key, result)
+        return copy.deepcopy(result)
+
+    def _remember(self, key: str, result: Any):
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > max(0, self.max_entries):
+                self._memory.popitem(last=False)
+                self.stats["memory_evictions"] += 1
+
+    # Disk tier (best effort: failures fall back to memory only)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and not self._disk_failed:
+            try:
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(SCHEMA)
+                self._conn = conn
+            except Exception as e:
+                self._disk_failed = True
+                self.stats["disk_errors"] += 1
+                logger.warning("Code analysis disk cache unavailable, using memory only", path=self.db_path, error=str(e))
+        return self._conn
+
+    def _disk_get(self, key: str) -> Any:
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute("SELECT result FROM analysis_results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                self._touch(conn, key)
+                return json.loads(row[0])
+            except Exception as e:
+                self.stats["disk_errors"] += 1
+                logger.warning("Code analysis disk cache read failed", error=str(e))
+                return None
+
+    def _touch(self, conn: sqlite3.Connection, key: str):
+        """Queue a recency update, flushing the queue when it is full or old"""
+        now = time.time()
+        if not self._touched:
+            self._touched_since = now
+        self._touched[key] = now
+        if len(self._touched) >= TOUCH_BATCH_SIZE or now - self._touched_since >= TOUCH_FLUSH_SECONDS:
+            try:
+                self._flush_touched(conn)
+            except Exception as e:
+                self.stats["disk_errors"] += 1
+                logger.warning("Code analysis disk cache recency update failed", error=str(e))
+
+    def _flush_touched(self, conn: sqlite3.Connection):
+        if not self._touched:
+            return
+        touched = [(used_at, key) for key, used_at in self._touched.items()]
+        self._touched.clear()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("UPDATE analysis_results SET last_used_at = ? WHERE key = ?", touched)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _disk_put(self, key: str, namespace: str, result: Any):
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO analysis_results (key, namespace, result, last_used_at) VALUES (?, ?, ?, ?)",
+                    (key, namespace, json.dumps(result), time.time()),
+                )
+                self._disk_writes += 1
+                if self._disk_writes % 100 == 0:
+                    self._prune_disk(conn)
+            except Exception as e:
+                self.stats["disk_errors"] += 1
+                logger.warning("Code analysis disk cache write failed", error=str(e))
+
+    def _prune_disk(self, conn: sqlite3.Connection) -> int:
+        """Drop the least recently used disk entries above the disk bound"""
+        self._flush_touched(conn)
+        result = conn.execute(
+            "DELETE FROM analysis_results WHERE key IN ("
+            "SELECT key FROM analysis_results ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+            (max(0, self.max_disk_entries),),
+        )
+        return result.rowcount or 0
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._flush_touched(self._conn)
+                except Exception as e:
+                    logger.warning("Code analysis disk cache flush failed", error=str(e))
+                self._conn.close()
+                self._conn = None
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            disk_entries = None
+            if self._conn is not None:
+                try:
+                    disk_entries = self._conn.execute("SELECT COUNT(*) FROM analysis_results").fetchone()[0]
+                except Exception:
+                    pass
+            lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            return {
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_entries": disk_entries,
+                "max_disk_entries": self.max_disk_entries,
+                "disk_path": None if self._disk_failed else self.db_path,
+                "pending_touches": len(self._touched),
+                "hit_rate": round((lookups - self.stats["misses"]) / lookups, 4) if lookups else 0.0,
+                **self.stats,
+            }
+
+
+code_analysis_cache = CodeAnalysisCache()
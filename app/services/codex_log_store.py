@@ -0,0 +1,149 @@
+"""
+Codex Log Store - Append-only Codex event log
+Events are appended to an embedded SQLite table (WAL mode, so commits are
+sequential log appends and fsyncs are batched at checkpoints) indexed by id
+and day, so recent entries and single chapters are read without parsing history
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+import structlog
+
+logger = structlog.get_logger()
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+CODEX_LOG_FILE = os.path.join(ROOT_DIR, "codex_log.json")  # Legacy whole-file log, imported once
+CODEX_LOG_DB = os.path.join(ROOT_DIR, "codex_log.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS codex_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    type TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_codex_events_day ON codex_events(day, timestamp);
+CREATE INDEX IF NOT EXISTS idx_codex_events_timestamp ON codex_events(timestamp, id);
+CREATE TABLE IF NOT EXISTS codex_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class CodexLogStore:
+    """Append-only Codex event log with tail and per-day reads"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def append(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Append one event, stamping its timestamp if missing"""
+        event = dict(event)
+        event.setdefault("timestamp", datetime.utcnow().isoformat())
+        self.append_many([event])
+        return event
+
+    def append_many(self, events: List[Dict[str, Any]]) -> int:
+        """Append events in one transaction; entries without a timestamp are stamped with the current time"""
+        now = datetime.utcnow().isoformat()
+        rows = []
+        for event in events:
+            if not event.get("timestamp"):
+                event = {**event, "timestamp": now}
+            timestamp = str(event["timestamp"])
+            rows.append((timestamp[:10], timestamp, event.get("type", "log"), json.dumps(event)))
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(
+                    "INSERT INTO codex_events (day, timestamp, type, payload) VALUES (?, ?, ?, ?)", rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def tail(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Latest events, newest first (a backwards walk of the timestamp index)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM codex_events ORDER BY timestamp DESC, id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [json.loads(row["payload"]) for row in rows]
+
+    def get_day_counts(self) -> Dict[str, int]:
+        """Number of events per day, read from the day index"""
+        with self._lock:
+            rows = self._conn.execute("SELECT day, COUNT(*) AS n FROM codex_events GROUP BY day").fetchall()
+        return {row["day"]: row["n"] for row in rows}
+
+    def get_events_for_days(self, days: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        if not days:
+            return {}
+        placeholders = ",".join("?" for _ in days)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT day, payload FROM codex_events WHERE day IN ({placeholders}) ORDER BY timestamp, id",
+                tuple(days),
+            ).fetchall()
+        events: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            events.setdefault(row["day"], []).append(json.loads(row["payload"]))
+        return events
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM codex_events").fetchone()[0]
+
+    def import_legacy(self, path: str) -> int:
+        """Import the legacy JSON array log once; later calls are no-ops"""
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM codex_meta WHERE key = 'legacy_imported'").fetchone():
+                return 0
+        events = []
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    events = json.load(f)
+            except Exception as e:
+                logger.warning("Failed to read legacy codex log", path=path, error=str(e))
+                return 0
+        imported = self.append_many(events)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO codex_meta (key, value) VALUES ('legacy_imported', ?)",
+                (datetime.utcnow().isoformat(),),
+            )
+        if imported:
+            logger.info("Imported legacy codex log into codex log store", path=path, events=imported)
+        return imported
+
+
+_store: Optional[CodexLogStore] = None
+_store_lock = threading.Lock()
+
+
+def get_codex_log_store() -> CodexLogStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CodexLogStore(CODEX_LOG_DB)
+            _store.import_legacy(CODEX_LOG_FILE)
+    return _store
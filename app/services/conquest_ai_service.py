@@ -38,6 +38,7 @@ from .sckipit_service import SckipitService
 from .ai_learning_service import AILearningService
 from .github_service import GitHubService
 from .custody_protocol_service import CustodyProtocolService
+from .model_registry import model_registry
 from app.services.advanced_code_generator import AdvancedCodeGenerator
 
 logger = structlog.get_logger()
@@ -2484,9 +2485,9 @@ jobs:
                 model_path = os.path.join(settings.ml_model_path, model_file)
                 if os.path.exists(model_path):
                     try:
-                        with open(model_path, 'rb') as f:
-                            model_name = model_file.replace('.pkl', '')
-                            self._ml_models[model_name] = pickle.load(f)
+                        model_name = model_file.replace('.pkl', '')
+                        # Shared, lazily loaded model (see model_registry)
+                        self._ml_models[model_name] = model_registry.handle(model_path, model_name)
                         logger.info(f"Loaded enhanced model: {model_name}")
                     except Exception as e:
                         logger.error(f"Failed to load enhanced model {model_file}: {str(e)}")
@@ -2543,9 +2544,9 @@ jobs:
                 model_path = os.path.join(settings.ml_model_path, model_file)
                 if os.path.exists(model_path):
                     try:
-                        with open(model_path, 'rb') as f:
-                            model_name = model_file.replace('.pkl', '')
-                            self.sckipit_models[model_name] = pickle.load(f)
+                        model_name = model_file.replace('.pkl', '')
+                        # Shared, lazily loaded model (see model_registry)
+                        self.sckipit_models[model_name] = model_registry.handle(model_path, model_name)
                         logger.info(f"Loaded SCKIPIT model: {model_name}")
                     except Exception as e:
                         logger.error(f"Failed to load SCKIPIT model {model_file}: {str(e)}")
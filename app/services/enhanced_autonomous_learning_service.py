@@ -15,6 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.database import get_session
+from app.core.task_supervisor import task_supervisor, RESTART_ON_FAILURE
 from app.models.training_data import TrainingData
 from app.models.sql_models import OathPaper, AgentMetrics, Proposal
 from app.services.ai_agent_service_shared import AIAgentServiceShared
@@ -78,13 +79,17 @@ class EnhancedAutonomousLearningService:
             # Initialize custody service
             self.custody_service = await CustodyProtocolService.initialize()
             
-            # Start background tasks
-            await asyncio.gather(
-                self._run_learning_cycles(),
-                self._run_custodes_testing(),
-                self._run_autonomous_knowledge_building(),
-                self._run_custodes_approval_workflow()
-            )
+            # Start background tasks, each supervised on its own so its CPU, iterations and lag are visible
+            return [
+                task_supervisor.spawn(f"custodes-{name}", cycle, owner="enhanced_learning",
+                                      restart=RESTART_ON_FAILURE, interval=interval)
+                for name, cycle, interval in (
+                    ("learning-cycles", self._run_learning_cycles, self.learning_cycle_interval.total_seconds()),
+                    ("testing", self._run_custodes_testing, self.custodes_test_interval.total_seconds()),
+                    ("knowledge-building", self._run_autonomous_knowledge_building, 21600),
+                    ("approval-workflow", self._run_custodes_approval_workflow, 1800),
+                )
+            ]
             
         except Exception as e:
             logger.error(f"❌ [CUSTODES] Enhanced learning service failed", error=str(e))
@@ -100,11 +105,13 @@ class EnhancedAutonomousLearningService:
                 for ai_type in ["Imperium", "Guardian", "Sandbox"]:
                     await self._trigger_ai_learning(ai_type)
                 
+                task_supervisor.beat()
                 # Wait for next cycle
                 await asyncio.sleep(self.learning_cycle_interval.total_seconds())
                 
             except Exception as e:
                 logger.error(f"❌ [CUSTODES] Learning cycle failed", error=str(e))
+                task_supervisor.beat(error=e)
                 await asyncio.sleep(300)  # Wait 5 minutes before retry
     
     async def _run_custodes_testing(self):
@@ -117,11 +124,13 @@ class EnhancedAutonomousLearningService:
                 for ai_type in ["imperium", "guardian", "sandbox"]:
                     await self._run_custodes_tests_for_ai(ai_type)
                 
+                task_supervisor.beat()
                 # Wait for next test cycle
                 await asyncio.sleep(self.custodes_test_interval.total_seconds())
                 
             except Exception as e:
                 logger.error(f"❌ [CUSTODES] Custodes testing failed", error=str(e))
+                task_supervisor.beat(error=e)
                 await asyncio.sleep(300)  # Wait 5 minutes before retry
     
     async def _run_autonomous_knowledge_building(self):
@@ -133,11 +142,13 @@ class EnhancedAutonomousLearningService:
                 for subject in self.autonomous_subjects:
                     await self._build_knowledge_base(subject)
                 
+                task_supervisor.beat()
                 # Wait 6 hours before next knowledge building cycle
                 await asyncio.sleep(21600)  # 6 hours
                 
             except Exception as e:
                 logger.error(f"❌ [CUSTODES] Knowledge building failed", error=str(e))
+                task_supervisor.beat(error=e)
                 await asyncio.sleep(3600)  # Wait 1 hour before retry
     
     async def _run_custodes_approval_workflow(self):
@@ -155,11 +166,13 @@ class EnhancedAutonomousLearningService:
                     for proposal in pending_proposals:
                         await self._custodes_approval_check(proposal, db)
                 
+                task_supervisor.beat()
                 # Check every 30 minutes
                 await asyncio.sleep(1800)  # 30 minutes
                 
             except Exception as e:
                 logger.error(f"❌ [CUSTODES] Approval workflow failed", error=str(e))
+                task_supervisor.beat(error=e)
                 await asyncio.sleep(600)  # Wait 10 minutes before retry
     
     async def _trigger_ai_learning(self, ai_type: str):
@@ -36,6 +36,8 @@ from app.services.anthropic_service import call_claude, anthropic_rate_limited_c
 from .ml_service import MLService
 from .sckipit_service import SckipitService
 from .ai_learning_service import AILearningService
+from .model_registry import model_registry
+from .health_rollup_service import HealthRollupService, GroupRule, ROLLUP_ITEM_TYPES
 # from .custody_protocol_service import CustodyProtocolService  # Commented out to avoid circular import
 # Remove top-level import of CustodyProtocolService
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -67,6 +69,7 @@ class GuardianAIService:
             self.sckipit_service = None  # Will be initialized properly in initialize()
             self.learning_service = AILearningService()
             self.custody_service = None  # Will be initialized when needed
+            self.health_rollup = HealthRollupService()
             self._initialized = True
             self._initialize_enhanced_ml_models()
             
@@ -221,8 +224,8 @@ class GuardianAIService:
                 model_path = os.path.join(settings.ml_model_path, filename)
                 if os.path.exists(model_path):
                     try:
-                        with open(model_path, 'rb') as f:
-                            self.sckipit_models[model_name] = pickle.load(f)
+                        # Shared, lazily loaded model (see model_registry)
+                        self.sckipit_models[model_name] = model_registry.handle(model_path, model_name)
                         logger.info(f"Loaded SCKIPIT model: {model_name}")
                     except Exception as e:
                         logger.error(f"Failed to load SCKIPIT model {filename}: {str(e)}")
@@ -244,8 +247,8 @@ class GuardianAIService:
                 model_path = os.path.join(settings.ml_model_path, filename)
                 if os.path.exists(model_path):
                     try:
-                        with open(model_path, 'rb') as f:
-                            self._ml_models[model_name] = pickle.load(f)
+                        # Shared, lazily loaded model (see model_registry)
+                        self._ml_models[model_name] = model_registry.handle(model_path, model_name)
                         logger.info(f"Loaded enhanced model: {model_name}")
                     except Exception as e:
                         logger.error(f"Failed to load enhanced model {filename}: {str(e)}")
@@ -755,14 +758,19 @@ class GuardianAIService:
                 "checks_performed": {},
                 "summary": {}
             }
-            # Only run AI-specific component checks (mission, proposal, learning, etc.)
-            for component_type, check_function in self.health_check_rules.items():
-                if component_type in ["mission", "entry", "mastery", "proposal", "learning"]:
-                    logger.info(f"Running health check for {component_type}")
-                    component_results = await check_function(session)
-                    results["checks_performed"][component_type] = component_results
-                    results["issues_found"] += component_results.get("issues_found", 0)
-                    results["suggestions_created"] += component_results.get("suggestions_created", 0)
+            # Database-backed components share one incremental rollup pass (changed rows only)
+            rollup_components = ["mission", "proposal", "learning"]
+            try:
+                results["checks_performed"].update(await self._run_health_rollup(session, rollup_components))
+            except Exception as e:
+                logger.error("Error running health rollup", error_message=str(e))
+                for component_type in rollup_components:
+                    results["checks_performed"][component_type] = {"health_status": "error", "error": str(e)}
+            for component_type in ["entry", "mastery"]:
+                results["checks_performed"][component_type] = await self.health_check_rules[component_type](session)
+            for component_results in results["checks_performed"].values():
+                results["issues_found"] += component_results.get("issues_found", 0)
+                results["suggestions_created"] += component_results.get("suggestions_created", 0)
             # System/database/resource health checks are now handled by app/core/monitoring.py
             # Determine overall health
             if results["issues_found"] == 0:
@@ -807,111 +815,53 @@ class GuardianAIService:
                 logger.warning(f"Claude error: {str(ce)}")
             raise
     
+    async def _run_health_rollup(self, session: AsyncSession, components: List[str]) -> Dict[str, Any]:
+        """Run the incremental rollup for some components and file suggestions for newly found issues"""
+        rollup = await self.health_rollup.run_check(session, components)
+        created = await self._create_rollup_suggestions(session, rollup["new_issues"])
+        results = {}
+        for component in components:
+            component_results = rollup[component]
+            component_results["suggestions_created"] = created.get(component, 0)
+            component_results["incremental"] = not rollup["full_check"]
+            results[component] = component_results
+        return results
+
+    async def _create_rollup_suggestions(self, session: AsyncSession, new_issues: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Create suggestions for newly flagged items, committed with the rollup state in one transaction"""
+        created: Dict[str, int] = {}
+        try:
+            for issue in new_issues:
+                rule = issue["rule"]
+                item_type = ROLLUP_ITEM_TYPES[rule.table]
+                if isinstance(rule, GroupRule):
+                    item_type = f"{item_type}_group"
+                session.add(GuardianSuggestion(
+                    issue_type=rule.component,
+                    affected_item_type=item_type,
+                    affected_item_id=issue["item_id"],
+                    affected_item_name=issue["item_name"] or f"{item_type} {issue['item_id'][:8]}",
+                    issue_description=rule.issue_description,
+                    current_value=f"rule={rule.name}, item={issue['item_id']}",
+                    proposed_fix=rule.proposed_fix,
+                    severity=rule.severity,
+                    health_check_type=rule.health_check_type,
+                    status="pending"
+                ))
+                created[rule.component] = created.get(rule.component, 0) + 1
+            await session.commit()
+            if new_issues:
+                logger.info("Created Guardian suggestions from health rollup", count=len(new_issues))
+        except Exception as e:
+            logger.error("Error creating Guardian suggestions", error_message=str(e))
+            await session.rollback()
+            raise
+        return created
+
     async def _check_proposal_health(self, session: AsyncSession) -> Dict[str, Any]:
         """Check health of proposal system"""
         try:
-            issues_found = 0
-            suggestions_created = 0
-            critical_issues = 0
-            high_priority_issues = 0
-            
-            # Check for proposals with missing required fields
-            proposals_result = await session.execute(
-                select(Proposal).where(
-                    or_(
-                        Proposal.ai_type.is_(None),
-                        Proposal.file_path.is_(None),
-                        Proposal.code_before.is_(None)
-                    )
-                )
-            )
-            invalid_proposals = proposals_result.scalars().all()
-            
-            for proposal in invalid_proposals:
-                issues_found += 1
-                high_priority_issues += 1
-                
-                await self._create_suggestion(
-                    session=session,
-                    issue_type="proposal",
-                    affected_item_type="proposal",
-                    affected_item_id=str(proposal.id),
-                    affected_item_name=f"Proposal {proposal.id[:8]}",
-                    issue_description="Proposal missing required fields",
-                    current_value=json.dumps({
-                        "ai_type": proposal.ai_type,
-                        "file_path": proposal.file_path,
-                        "has_code_before": bool(proposal.code_before)
-                    }, default=str),
-                    proposed_fix="Add missing required fields or mark for deletion",
-                    severity="high",
-                    health_check_type="required_fields_validation"
-                )
-                suggestions_created += 1
-            
-            # Check for proposals with inconsistent status
-            status_result = await session.execute(
-                select(Proposal).where(
-                    and_(
-                        Proposal.status == "tested",
-                        Proposal.test_status == "not-run"
-                    )
-                )
-            )
-            inconsistent_proposals = status_result.scalars().all()
-            
-            for proposal in inconsistent_proposals:
-                issues_found += 1
-                
-                await self._create_suggestion(
-                    session=session,
-                    issue_type="proposal",
-                    affected_item_type="proposal",
-                    affected_item_id=str(proposal.id),
-                    affected_item_name=f"Proposal {proposal.id[:8]}",
-                    issue_description="Proposal status inconsistent with test status",
-                    current_value=f"status={proposal.status}, test_status={proposal.test_status}",
-                    proposed_fix="Update test status to match proposal status",
-                    severity="medium",
-                    health_check_type="status_consistency_check"
-                )
-                suggestions_created += 1
-            
-            # Check for duplicate proposals
-            duplicate_result = await session.execute(
-                select(Proposal.code_hash, func.count(Proposal.id))
-                .where(Proposal.code_hash.isnot(None))
-                .group_by(Proposal.code_hash)
-                .having(func.count(Proposal.id) > 1)
-            )
-            duplicates = duplicate_result.all()
-            
-            for code_hash, count in duplicates:
-                issues_found += 1
-                
-                await self._create_suggestion(
-                    session=session,
-                    issue_type="proposal",
-                    affected_item_type="proposal_group",
-                    affected_item_id=code_hash,
-                    affected_item_name=f"Duplicate proposals (count: {count})",
-                    issue_description=f"Found {count} proposals with identical code hash",
-                    current_value=f"code_hash: {code_hash}, count: {count}",
-                    proposed_fix="Review and merge duplicate proposals",
-                    severity="medium",
-                    health_check_type="duplicate_detection"
-                )
-                suggestions_created += 1
-            
-            return {
-                "health_status": "healthy" if issues_found == 0 else "warning",
-                "issues_found": issues_found,
-                "suggestions_created": suggestions_created,
-                "critical_issues": critical_issues,
-                "high_priority_issues": high_priority_issues,
-                "total_proposals": await self._count_proposals(session)
-            }
-            
+            return (await self._run_health_rollup(session, ["proposal"]))["proposal"]
         except Exception as e:
             logger.error("Error checking proposal health", error_message=str(e))
             return {"health_status": "error", "error": str(e)}
@@ -919,73 +869,7 @@ class GuardianAIService:
     async def _check_learning_health(self, session: AsyncSession) -> Dict[str, Any]:
         """Check health of learning system"""
         try:
-            issues_found = 0
-            suggestions_created = 0
-            
-            # Check for learning entries with low confidence but high success rate
-            learning_result = await session.execute(
-                select(Learning).where(
-                    and_(
-                        Learning.confidence < 0.3,
-                        Learning.success_rate > 0.8
-                    )
-                )
-            )
-            inconsistent_learning = learning_result.scalars().all()
-            
-            for learning in inconsistent_learning:
-                issues_found += 1
-                
-                await self._create_suggestion(
-                    session=session,
-                    issue_type="learning",
-                    affected_item_type="learning",
-                    affected_item_id=str(learning.id),
-                    affected_item_name=f"Learning {learning.learning_type}",
-                    issue_description="Learning entry has low confidence but high success rate",
-                    current_value=f"confidence={learning.confidence}, success_rate={learning.success_rate}",
-                    proposed_fix="Update confidence score based on success rate",
-                    severity="low",
-                    health_check_type="confidence_consistency_check"
-                )
-                suggestions_created += 1
-            
-            # Check for error learning with high frequency but no solution
-            error_result = await session.execute(
-                select(ErrorLearning).where(
-                    and_(
-                        ErrorLearning.frequency > 5,
-                        ErrorLearning.solution.is_(None)
-                    )
-                )
-            )
-            unsolved_errors = error_result.scalars().all()
-            
-            for error in unsolved_errors:
-                issues_found += 1
-                
-                await self._create_suggestion(
-                    session=session,
-                    issue_type="learning",
-                    affected_item_type="error_learning",
-                    affected_item_id=str(error.id),
-                    affected_item_name=f"Error: {error.error_pattern}",
-                    issue_description="Frequent error without documented solution",
-                    current_value=f"frequency={error.frequency}, pattern={error.error_pattern}",
-                    proposed_fix="Investigate and document solution for this error pattern",
-                    severity="high",
-                    health_check_type="error_solution_check"
-                )
-                suggestions_created += 1
-            
-            return {
-                "health_status": "healthy" if issues_found == 0 else "warning",
-                "issues_found": issues_found,
-                "suggestions_created": suggestions_created,
-                "total_learning_entries": await self._count_learning_entries(session),
-                "total_error_entries": await self._count_error_learning_entries(session)
-            }
-            
+            return (await self._run_health_rollup(session, ["learning"]))["learning"]
         except Exception as e:
             logger.error("Error checking learning health", error_message=str(e))
             return {"health_status": "error", "error": str(e)}
@@ -993,172 +877,7 @@ class GuardianAIService:
     async def _check_mission_health(self, session: AsyncSession) -> Dict[str, Any]:
         """Check health of mission system"""
         try:
-            issues_found = 0
-            suggestions_created = 0
-            critical_issues = 0
-            high_priority_issues = 0
-            
-            # Check for missions with missing required fields
-            missions_result = await session.execute(
-                select(Mission).where(
-                    or_(
-                        Mission.title.is_(None),
-                        Mission.mission_type.is_(None),
-                        Mission.notification_id.is_(None)
-                    )
-                )
-            )
-            invalid_missions = missions_result.scalars().all()
-            
-            for mission in invalid_missions:
-                issues_found += 1
-                high_priority_issues += 1
-                
-                await self._create_suggestion(
-                    session=session,
-                    issue_type="mission",
-                    affected_item_type="mission",
-                    affected_item_id=str(mission.id),
-                    affected_item_name=mission.title or f"Mission {mission.id[:8]}",
-                    issue_description="Mission missing required fields",
-                    current_value=json.dumps({
-                        "title": mission.title,
-                        "mission_type": mission.mission_type,
-                        "notification_id": mission.notification_id
-                    }, default=str),
-                    proposed_fix="Add missing required fields or mark for deletion",
-                    severity="high",
-                    health_check_type="required_fields_validation"
-                )
-                suggestions_created += 1
-            
-            # Check for missions with inconsistent completion status
-            completion_result = await session.execute(
-                select(Mission).where(
-                    and_(
-                        Mission.is_completed == True,
-                        Mission.has_failed == True
-                    )
-                )
-            )
-            inconsistent_missions = completion_result.scalars().all()
-            
-            for mission in inconsistent_missions:
-                issues_found += 1
-                
-                await self._create_suggestion(
-                    session=session,
-                    issue_type="mission",
-                    affected_item_type="mission",
-                    affected_item_id=str(mission.id),
-                    affected_item_name=mission.title,
-                    issue_description="Mission has both completed and failed status",
-                    current_value=f"is_completed={mission.is_completed}, has_failed={mission.has_failed}",
-                    proposed_fix="Fix mission status - cannot be both completed and failed",
-                    severity="medium",
-                    health_check_type="status_consistency_check"
-                )
-                suggestions_created += 1
-            
-            # Check for counter-based missions with invalid counts
-            counter_result = await session.execute(
-                select(Mission).where(
-                    and_(
-                        Mission.is_counter_based == True,
-                        Mission.current_count < 0
-                    )
-                )
-            )
-            invalid_counters = counter_result.scalars().all()
-            
-            for mission in invalid_counters:
-                issues_found += 1
-                
-                await self._create_suggestion(
-                    session=session,
-                    issue_type="mission",
-                    affected_item_type="mission",
-                    affected_item_id=str(mission.id),
-                    affected_item_name=mission.title,
-                    issue_description="Counter-based mission has negative count",
-                    current_value=f"current_count={mission.current_count}",
-                    proposed_fix="Reset current count to 0 or positive value",
-                    severity="medium",
-                    health_check_type="counter_validation"
-                )
-                suggestions_created += 1
-            
-            # Check for missions with missing subtasks when they should have them
-            subtask_result = await session.execute(
-                select(Mission).where(
-                    and_(
-                        Mission.subtasks_data.isnot(None),
-                        Mission.subtasks_data != text("'[]'::jsonb")
-                    )
-                )
-            )
-            missions_with_subtasks = subtask_result.scalars().all()
-            
-            for mission in missions_with_subtasks:
-                # Check if subtasks exist in the subtasks table
-                subtasks_count_result = await session.execute(
-                    select(func.count(MissionSubtask.id))
-                    .where(MissionSubtask.mission_id == mission.id)
-                )
-                subtasks_count = subtasks_count_result.scalar()
-                
-                if subtasks_count == 0:
-                    issues_found += 1
-                    
-                    await self._create_suggestion(
-                        session=session,
-                        issue_type="mission",
-                        affected_item_type="mission",
-                        affected_item_id=str(mission.id),
-                        affected_item_name=mission.title,
-                        issue_description="Mission has subtasks data but no subtask records",
-                        current_value=f"subtasks_data exists but {subtasks_count} subtask records found",
-                        proposed_fix="Create subtask records or clear subtasks data",
-                        severity="low",
-                        health_check_type="subtask_consistency_check"
-                    )
-                    suggestions_created += 1
-            
-            # Check for orphaned subtasks (subtasks without missions)
-            orphaned_result = await session.execute(
-                select(MissionSubtask)
-                .outerjoin(Mission, MissionSubtask.mission_id == Mission.id)
-                .where(Mission.id.is_(None))
-            )
-            orphaned_subtasks = orphaned_result.scalars().all()
-            
-            for subtask in orphaned_subtasks:
-                issues_found += 1
-                
-                await self._create_suggestion(
-                    session=session,
-                    issue_type="mission",
-                    affected_item_type="subtask",
-                    affected_item_id=str(subtask.id),
-                    affected_item_name=subtask.name,
-                    issue_description="Subtask without parent mission",
-                    current_value=f"mission_id={subtask.mission_id}",
-                    proposed_fix="Delete orphaned subtask or link to valid mission",
-                    severity="medium",
-                    health_check_type="orphaned_subtask_check"
-                )
-                suggestions_created += 1
-            
-            return {
-                "health_status": "healthy" if issues_found == 0 else "warning",
-                "issues_found": issues_found,
-                "suggestions_created": suggestions_created,
-                "critical_issues": critical_issues,
-                "high_priority_issues": high_priority_issues,
-                "total_missions": await self._count_missions(session),
-                "total_subtasks": await self._count_subtasks(session)
-            }
-            
+            return (await self._run_health_rollup(session, ["mission"]))["mission"]
         except Exception as e:
             logger.error("Error checking mission health", error_message=str(e))
             return {"health_status": "error", "error": str(e)}
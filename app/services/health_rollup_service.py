@@ -0,0 +1,427 @@
+"""
+Health Rollup Service - Incremental integrity counters for Guardian health checks
+Each check examines only rows changed since the previous check (updated_at high-water
+mark per table) and keeps open issues as per-rule counters, so check cost follows the
+rate of change instead of table size. Marks and open issues are stored in
+health_rollup_states and committed with the suggestions they produce, so restarts and
+other workers continue where the last check stopped instead of rescanning.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_, or_, not_, exists, literal, cast, String, union_all
+
+from app.models.sql_models import Proposal, Learning, ErrorLearning, Mission, MissionSubtask, HealthRollupState
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class RowRule:
+    """Integrity rule evaluated on a single row"""
+    name: str
+    component: str
+    table: str
+    condition: Callable[[], Any]
+    severity: str
+    issue_description: str
+    proposed_fix: str
+    health_check_type: str
+    # (table, column of this rule's table, column of that table): also re-evaluate rows whose
+    # column matches a changed row of another table the condition reads
+    depends_on: Optional[Tuple[str, Callable[[], Any], Callable[[], Any]]] = None
+
+
+@dataclass
+class GroupRule:
+    """Integrity rule evaluated on a group of rows sharing a key (e.g. duplicate code hashes)"""
+    name: str
+    component: str
+    table: str
+    key: Callable[[], Any]
+    condition: Callable[[], Any]
+    min_count: int
+    severity: str
+    issue_description: str
+    proposed_fix: str
+    health_check_type: str
+
+
+@dataclass
+class TableState:
+    """High-water mark and open issues for one table"""
+    high_water_mark: Optional[datetime] = None
+    total_rows: int = 0
+    flagged: Dict[str, Dict[str, str]] = field(default_factory=dict)  # rule -> {item_id: item_name}
+
+
+TABLES = {
+    "proposals": Proposal,
+    "learning": Learning,
+    "error_learning": ErrorLearning,
+    "missions": Mission,
+    "mission_subtasks": MissionSubtask,
+}
+
+COMPONENT_TABLES = {
+    "proposal": ["proposals"],
+    "learning": ["learning", "error_learning"],
+    "mission": ["missions", "mission_subtasks"],
+}
+
+ITEM_NAMES = {
+    "proposals": lambda: Proposal.file_path,
+    "learning": lambda: Learning.learning_type,
+    "error_learning": lambda: ErrorLearning.error_pattern,
+    "missions": lambda: Mission.title,
+    "mission_subtasks": lambda: MissionSubtask.name,
+}
+
+# Suggestion item type for each table
+ROLLUP_ITEM_TYPES = {
+    "proposals": "proposal",
+    "learning": "learning",
+    "error_learning": "error_learning",
+    "missions": "mission",
+    "mission_subtasks": "subtask",
+}
+
+ROW_RULES = [
+    RowRule(
+        "proposal_required_fields", "proposal", "proposals",
+        lambda: or_(Proposal.ai_type.is_(None), Proposal.file_path.is_(None), Proposal.code_before.is_(None)),
+        "high", "Proposal missing required fields",
+        "Add missing required fields or mark for deletion", "required_fields_validation"
+    ),
+    RowRule(
+        "proposal_status_consistency", "proposal", "proposals",
+        lambda: and_(Proposal.status == "tested", Proposal.test_status == "not-run"),
+        "medium", "Proposal status inconsistent with test status",
+        "Update test status to match proposal status", "status_consistency_check"
+    ),
+    RowRule(
+        "learning_confidence_consistency", "learning", "learning",
+        lambda: and_(
+            Learning.learning_data["confidence"].as_float() < 0.3,
+            Learning.learning_data["success_rate"].as_float() > 0.8
+        ),
+        "low", "Learning entry has low confidence but high success rate",
+        "Update confidence score based on success rate", "confidence_consistency_check"
+    ),
+    RowRule(
+        "mission_required_fields", "mission", "missions",
+        lambda: or_(Mission.title.is_(None), Mission.mission_type.is_(None), Mission.notification_id.is_(None)),
+        "high", "Mission missing required fields",
+        "Add missing required fields or mark for deletion", "required_fields_validation"
+    ),
+    RowRule(
+        "mission_status_consistency", "mission", "missions",
+        lambda: and_(Mission.is_completed == True, Mission.has_failed == True),
+        "medium", "Mission has both completed and failed status",
+        "Fix mission status - cannot be both completed and failed", "status_consistency_check"
+    ),
+    RowRule(
+        "mission_counter_validation", "mission", "missions",
+        lambda: and_(Mission.is_counter_based == True, Mission.current_count < 0),
+        "medium", "Counter-based mission has negative count",
+        "Reset current count to 0 or positive value", "counter_validation"
+    ),
+    RowRule(
+        "mission_subtask_consistency", "mission", "missions",
+        lambda: and_(
+            Mission.subtasks_data.isnot(None),
+            cast(Mission.subtasks_data, String) != "[]",
+            not_(exists().where(MissionSubtask.mission_id == Mission.id))
+        ),
+        "low", "Mission has subtasks data but no subtask records",
+        "Create subtask records or clear subtasks data", "subtask_consistency_check",
+        depends_on=("mission_subtasks", lambda: Mission.id, lambda: MissionSubtask.mission_id)
+    ),
+    RowRule(
+        "orphaned_subtask", "mission", "mission_subtasks",
+        lambda: not_(exists().where(Mission.id == MissionSubtask.mission_id)),
+        "medium", "Subtask without parent mission",
+        "Delete orphaned subtask or link to valid mission", "orphaned_subtask_check",
+        depends_on=("missions", lambda: MissionSubtask.mission_id, lambda: Mission.id)
+    ),
+]
+
+GROUP_RULES = [
+    GroupRule(
+        "proposal_duplicates", "proposal", "proposals",
+        lambda: Proposal.code_hash, lambda: Proposal.code_hash.isnot(None), 2,
+        "medium", "Found proposals with identical code hash",
+        "Review and merge duplicate proposals", "duplicate_detection"
+    ),
+    GroupRule(
+        "frequent_unapplied_errors", "learning", "error_learning",
+        lambda: ErrorLearning.error_pattern, lambda: ErrorLearning.learning_applied == False, 6,
+        "high", "Frequent error without applied learning",
+        "Investigate and document solution for this error pattern", "error_solution_check"
+    ),
+]
+
+CHANGED_MARKER = "__changed__"
+
+
+class HealthRollupService:
+    """Maintains per-table integrity counters incrementally using updated_at high-water marks"""
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(HealthRollupService, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self._tables: Dict[str, TableState] = {name: TableState() for name in TABLES}
+            self.full_check_interval = 24  # Re-scan everything every N checks to catch deletions
+            self._checks_since_full = 0
+            self._initialized = True
+
+    def reset(self):
+        """Forget all high-water marks and open issues (next check is a full scan)"""
+        self._tables = {name: TableState() for name in TABLES}
+        self._checks_since_full = 0
+
+    def _changed(self, table: str):
+        """Filter for rows changed since the table's high-water mark (ties are re-examined)"""
+        model = TABLES[table]
+        hwm = self._tables[table].high_water_mark
+        return model.updated_at >= hwm if hwm is not None else literal(True)
+
+    def _related_changed(self, rule: RowRule):
+        """Filter for rule rows whose dependency rows changed"""
+        table, column, other_column = rule.depends_on
+        return column().in_(select(other_column()).where(self._changed(table)))
+
+    def _rule_applies(self, rule: RowRule, tables: List[str]) -> bool:
+        return rule.table in tables or (rule.depends_on is not None and rule.depends_on[0] in tables)
+
+    async def _load_states(self, session: AsyncSession, tables: List[str]):
+        """Replace the in-memory state with the persisted one (row-locked until the caller commits)"""
+        rows = (await session.execute(
+            select(HealthRollupState).where(HealthRollupState.table_name.in_(tables)).with_for_update()
+        )).scalars().all()
+        for row in rows:
+            self._tables[row.table_name] = TableState(
+                high_water_mark=row.high_water_mark,
+                total_rows=row.total_rows or 0,
+                flagged={rule: dict(items) for rule, items in (row.flagged or {}).items()},
+            )
+
+    async def _save_states(self, session: AsyncSession, tables: List[str]):
+        """Stage the tables' state for the caller's commit"""
+        for table in tables:
+            state = self._tables[table]
+            await session.merge(HealthRollupState(
+                table_name=table,
+                high_water_mark=state.high_water_mark,
+                total_rows=state.total_rows,
+                flagged={rule: dict(items) for rule, items in state.flagged.items()},
+            ))
+
+    async def _read_aggregates(self, session: AsyncSession, tables: List[str]) -> Dict[str, Tuple[int, Optional[datetime], int]]:
+        """Read total rows, newest updated_at and changed-row count for every table in one round-trip"""
+        columns = []
+        for table in tables:
+            model = TABLES[table]
+            columns.append(select(func.count()).select_from(model).scalar_subquery().label(f"{table}_total"))
+            columns.append(select(func.max(model.updated_at)).scalar_subquery().label(f"{table}_hwm"))
+            columns.append(
+                select(func.count()).select_from(model).where(self._changed(table)).scalar_subquery()
+                .label(f"{table}_changed")
+            )
+        row = (await session.execute(select(*columns))).one()
+        mapping = row._mapping
+        return {
+            table: (mapping[f"{table}_total"] or 0, mapping[f"{table}_hwm"], mapping[f"{table}_changed"] or 0)
+            for table in tables
+        }
+
+    def _changed_rows_query(self, tables: List[str]):
+        """Build one UNION ALL over all rules for the changed rows of the given tables"""
+        selects = []
+        for rule in ROW_RULES:
+            if not self._rule_applies(rule, tables):
+                continue
+            model = TABLES[rule.table]
+            changed = self._changed(rule.table)
+            if rule.depends_on is not None:
+                changed = or_(changed, self._related_changed(rule))
+                flagged_ids = set(self._tables[rule.table].flagged.get(rule.name, {}))
+                if flagged_ids:
+                    # Flagged rows whose dependency rows changed may have been fixed
+                    selects.append(
+                        select(
+                            literal(rule.table).label("tbl"), literal(f"{CHANGED_MARKER}{rule.name}").label("rule"),
+                            cast(model.id, String).label("item_id"), literal("").label("item_name"),
+                            literal(0).label("group_count")
+                        ).where(and_(self._related_changed(rule), cast(model.id, String).in_(flagged_ids)))
+                    )
+            selects.append(
+                select(
+                    literal(rule.table).label("tbl"), literal(rule.name).label("rule"),
+                    cast(model.id, String).label("item_id"), cast(ITEM_NAMES[rule.table](), String).label("item_name"),
+                    literal(0).label("group_count")
+                ).where(and_(changed, rule.condition()))
+            )
+        for table in tables:
+            state = self._tables[table]
+            flagged_ids = {item_id for items in state.flagged.values() for item_id in items}
+            flagged_ids -= {key for rule in GROUP_RULES if rule.table == table for key in state.flagged.get(rule.name, {})}
+            if not flagged_ids:
+                continue
+            model = TABLES[table]
+            # Previously flagged rows that changed may have been fixed
+            selects.append(
+                select(
+                    literal(table).label("tbl"), literal(CHANGED_MARKER).label("rule"),
+                    cast(model.id, String).label("item_id"), literal("").label("item_name"),
+                    literal(0).label("group_count")
+                ).where(and_(self._changed(table), cast(model.id, String).in_(flagged_ids)))
+            )
+        for rule in GROUP_RULES:
+            if rule.table not in tables:
+                continue
+            model = TABLES[rule.table]
+            touched_keys = select(rule.key()).where(and_(self._changed(rule.table), rule.key().isnot(None)))
+            selects.append(
+                select(
+                    literal(rule.table).label("tbl"), literal(rule.name).label("rule"),
+                    cast(rule.key(), String).label("item_id"), literal("").label("item_name"),
+                    func.count().label("group_count")
+                ).where(and_(rule.condition(), rule.key().in_(touched_keys))).group_by(rule.key())
+            )
+        return union_all(*selects) if selects else None
+
+    async def run_check(self, session: AsyncSession, components: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Examine changed rows, update the open-issue counters and return per-component results.
+
+        Returns a dict with one entry per component plus the list of newly detected issues
+        under "new_issues" (each carrying its rule so callers can create suggestions).
+        The updated state is staged on the session; the caller commits it together with
+        the suggestions for the new issues.
+        """
+        components = components or list(COMPONENT_TABLES.keys())
+        tables = [table for component in components for table in COMPONENT_TABLES[component]]
+
+        self._checks_since_full += 1
+        await self._load_states(session, tables)
+        aggregates = await self._read_aggregates(session, tables)
+        full_check = self._checks_since_full >= self.full_check_interval or any(
+            total < self._tables[table].total_rows for table, (total, _, _) in aggregates.items()
+        )
+        if full_check:
+            # Deletions are invisible to the high-water mark; rebuild the affected tables
+            for table in tables:
+                self._tables[table].high_water_mark = None
+            self._checks_since_full = 0
+
+        changed_tables = [
+            table for table in tables
+            if full_check or self._tables[table].high_water_mark is None or aggregates[table][2] > 0
+        ]
+
+        previous = {table: {rule: dict(items) for rule, items in self._tables[table].flagged.items()} for table in tables}
+        if full_check:
+            for table in changed_tables:
+                self._tables[table].flagged = {}
+
+        rows = []
+        query = self._changed_rows_query(changed_tables)
+        if query is not None:
+            rows = (await session.execute(query)).all()
+
+        rules_by_name = {rule.name: rule for rule in ROW_RULES + GROUP_RULES}
+        group_rules = {rule.name for rule in GROUP_RULES}
+        changed_ids: Dict[str, Set[str]] = {}
+        rule_changed_ids: Dict[str, Set[str]] = {}
+        detected: Dict[str, Dict[str, Dict[str, str]]] = {}
+        group_counts: Dict[Tuple[str, str], int] = {}
+        for tbl, rule_name, item_id, item_name, group_count in rows:
+            if rule_name == CHANGED_MARKER:
+                changed_ids.setdefault(tbl, set()).add(item_id)
+            elif rule_name.startswith(CHANGED_MARKER):
+                rule_changed_ids.setdefault(rule_name[len(CHANGED_MARKER):], set()).add(item_id)
+            elif rule_name in group_rules:
+                group_counts[(rule_name, item_id)] = group_count
+            else:
+                detected.setdefault(tbl, {}).setdefault(rule_name, {})[item_id] = item_name or ""
+
+        for table in tables:
+            state = self._tables[table]
+            # Clear flags on changed rows, then re-apply what the rules found
+            for rule_name, items in state.flagged.items():
+                if rule_name in group_rules:
+                    continue
+                changed = changed_ids.get(table, set()) | rule_changed_ids.get(rule_name, set())
+                for item_id in changed | set(detected.get(table, {}).get(rule_name, {})):
+                    items.pop(item_id, None)
+            for rule_name, items in detected.get(table, {}).items():
+                state.flagged.setdefault(rule_name, {}).update(items)
+            if table in changed_tables:
+                state.high_water_mark = aggregates[table][1]
+                state.total_rows = aggregates[table][0]
+
+        for (rule_name, key), count in group_counts.items():
+            rule = rules_by_name[rule_name]
+            flagged = self._tables[rule.table].flagged.setdefault(rule_name, {})
+            if count >= rule.min_count:
+                flagged[key] = f"count: {count}"
+            else:
+                flagged.pop(key, None)
+
+        new_issues = []
+        for table in tables:
+            for rule_name, items in self._tables[table].flagged.items():
+                already_open = previous.get(table, {}).get(rule_name, {})
+                for item_id, item_name in items.items():
+                    if item_id not in already_open:
+                        new_issues.append({
+                            "rule": rules_by_name[rule_name],
+                            "item_id": item_id,
+                            "item_name": item_name,
+                        })
+
+        await self._save_states(session, tables)
+
+        results: Dict[str, Any] = {"new_issues": new_issues, "full_check": full_check}
+        for component in components:
+            component_rules = [rule for rule in ROW_RULES + GROUP_RULES if rule.component == component]
+            open_counts = {
+                rule.name: len(self._tables[rule.table].flagged.get(rule.name, {})) for rule in component_rules
+            }
+            issues_found = sum(open_counts.values())
+            results[component] = {
+                "health_status": "healthy" if issues_found == 0 else "warning",
+                "issues_found": issues_found,
+                "open_issues_by_rule": open_counts,
+                "high_priority_issues": sum(
+                    count for rule in component_rules if rule.severity == "high" for count in [open_counts[rule.name]]
+                ),
+                "critical_issues": sum(
+                    count for rule in component_rules if rule.severity == "critical" for count in [open_counts[rule.name]]
+                ),
+                "rows_examined": sum(aggregates[t][2] for t in COMPONENT_TABLES[component]) if not full_check
+                else sum(aggregates[t][0] for t in COMPONENT_TABLES[component]),
+                "totals": {table: aggregates[table][0] for table in COMPONENT_TABLES[component]},
+            }
+        return results
+
+    def get_rollup_status(self) -> Dict[str, Any]:
+        """Get high-water marks and open issue counts per table"""
+        return {
+            table: {
+                "high_water_mark": state.high_water_mark.isoformat() if state.high_water_mark else None,
+                "total_rows": state.total_rows,
+                "open_issues": {rule: len(items) for rule, items in state.flagged.items()},
+            }
+            for table, state in self._tables.items()
+        }
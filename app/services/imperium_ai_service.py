@@ -34,6 +34,7 @@ from ..core.config import settings
 from .ml_service import MLService
 from .sckipit_service import SckipitService
 from .ai_learning_service import AILearningService
+from .model_registry import model_registry
 from .imperium_extension_service import ImperiumExtensionService
 from app.services.anthropic_service import call_claude, anthropic_rate_limited_call
 
@@ -156,8 +157,8 @@ class ImperiumAIService:
                 model_path = os.path.join(settings.ml_model_path, filename)
                 if os.path.exists(model_path):
                     try:
-                        with open(model_path, 'rb') as f:
-                            self._ml_models[model_name] = pickle.load(f)
+                        # Shared, lazily loaded model (see model_registry)
+                        self._ml_models[model_name] = model_registry.handle(model_path, model_name)
                         logger.info(f"Loaded enhanced model: {model_name}")
                     except Exception as e:
                         logger.error(f"Failed to load enhanced model {filename}: {str(e)}")
@@ -229,8 +230,8 @@ class ImperiumAIService:
                 model_path = os.path.join(settings.ml_model_path, filename)
                 if os.path.exists(model_path):
                     try:
-                        with open(model_path, 'rb') as f:
-                            self.sckipit_models[model_name] = pickle.load(f)
+                        # Shared, lazily loaded model (see model_registry)
+                        self.sckipit_models[model_name] = model_registry.handle(model_path, model_name)
                         logger.info(f"Loaded SCKIPIT model: {model_name}")
                     except Exception as e:
                         logger.error(f"Failed to load SCKIPIT model {filename}: {str(e)}")
@@ -18,6 +18,7 @@ from fastapi import WebSocket
 
 from ..core.database import get_session
 from ..core.config import settings
+from ..core.task_supervisor import task_supervisor, RESTART_ON_FAILURE
 from .ai_agent_service import AIAgentService
 from .ai_learning_service import AILearningService
 from .ml_service import MLService
@@ -137,6 +138,7 @@ class ImperiumLearningController:
             self._learning_cycles: List[LearningCycle] = []
             self._active_agents: Set[str] = set()
             self._learning_scheduler_running = False
+            self._learning_scheduler_task: Optional[asyncio.Task] = None
             self._last_cycle_start = None
             
             # Configuration
@@ -255,13 +257,17 @@ class ImperiumLearningController:
                 try:
                     logger.info("[LEARNING] Scheduler loop tick - triggering learning cycle")
                     await self._trigger_learning_cycle()
-                    await asyncio.sleep(60)  # 1 minute interval for testing
+                    task_supervisor.beat()
                 except asyncio.CancelledError:
                     break
                 except Exception as e:
                     logger.error("[LEARNING] Error in learning scheduler", error=str(e))
-                    await asyncio.sleep(60)  # Wait 1 minute on error
-        asyncio.create_task(scheduler_loop())
+                    task_supervisor.beat(error=e)
+                await asyncio.sleep(60)  # 1 minute interval for testing, also after an error
+        self._learning_scheduler_task = task_supervisor.spawn(
+            "imperium-learning-scheduler", scheduler_loop, owner="imperium_learning",
+            restart=RESTART_ON_FAILURE, interval=60
+        )
         logger.info("[LEARNING] Learning scheduler started")
     
     async def _trigger_learning_cycle(self):
@@ -695,10 +701,15 @@ class ImperiumLearningController:
                 try:
                     logger.info("[INTERNET_LEARNING] Periodic internet learning triggered for all agents.")
                     await cls().periodic_internet_learning()
+                    task_supervisor.beat()
                 except Exception as e:
                     logger.error("Error in periodic internet learning loop", error=str(e))
+                    task_supervisor.beat(error=e)
                 await asyncio.sleep(120)  # 2 minutes
-        cls._periodic_internet_learning_task = asyncio.create_task(periodic_loop())
+        cls._periodic_internet_learning_task = task_supervisor.spawn(
+            "imperium-internet-learning", periodic_loop, owner="imperium_learning",
+            restart=RESTART_ON_FAILURE, interval=120
+        )
         logger.info("Started periodic internet learning background task")
 
     async def broadcast_internet_learning_event(self, event: dict):
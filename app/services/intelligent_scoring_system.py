@@ -29,6 +29,7 @@ import time
 
 from ..core.config import settings
 from ..core.database import get_session
+from .scoring_engine import extract_components
 
 logger = logging.getLogger(__name__)
 
@@ -198,107 +199,45 @@ class IntelligentScoringSystem:
         except Exception as e:
             logger.error(f"Error evaluating AI response: {str(e)}")
             return await self._generate_fallback_evaluation(response, context, difficulty, ai_type)
-    
+
+    async def evaluate_ai_responses_batch(self, responses: List[str], context: dict,
+                                          difficulty: DifficultyLevel, ai_type: str) -> List[Dict[str, Any]]:
+        """Evaluate many AI responses at once, sharing the threshold lookup and per-call logging"""
+        threshold = await self._get_adaptive_threshold(difficulty, ai_type)
+        results = []
+        for response in responses:
+            try:
+                dimension_scores = await self._calculate_dimension_scores(
+                    extract_components(response), difficulty, ai_type
+                )
+                adjusted_scores = await self._apply_ai_adjustments(dimension_scores, ai_type)
+                final_score = await self._calculate_weighted_score(adjusted_scores, difficulty)
+                feedback = await self._generate_detailed_feedback(dimension_scores, final_score, difficulty)
+                await self._update_scoring_history(ai_type, final_score, dimension_scores, difficulty)
+                results.append({
+                    'final_score': final_score,
+                    'passed': final_score >= threshold,
+                    'threshold': threshold,
+                    'dimension_scores': dimension_scores,
+                    'adjusted_scores': adjusted_scores,
+                    'feedback': feedback,
+                    'difficulty': difficulty.value,
+                    'ai_type': ai_type,
+                    'evaluation_timestamp': datetime.now().isoformat(),
+                    'context_aware': True,
+                    'adaptive_scoring': True
+                })
+            except Exception as e:
+                logger.error(f"Error evaluating AI response in batch: {str(e)}")
+                results.append(await self._generate_fallback_evaluation(response, context, difficulty, ai_type))
+
+        logger.info(f"✅ Batch evaluation completed: {len(results)} responses for {ai_type}")
+        return results
+
     async def _extract_response_components(self, response: str, context: dict) -> Dict[str, Any]:
-        """Extract different components from AI response"""
+        """Extract different components from AI response using the compiled scoring engine"""
         try:
-            components = {
-                'code_sections': [],
-                'explanations': [],
-                'reasoning': [],
-                'documentation': [],
-                'testing_approach': [],
-                'optimization_notes': [],
-                'security_considerations': [],
-                'performance_notes': []
-            }
-            
-            # Extract code sections
-            code_patterns = [
-                r'```[\w]*\n(.*?)\n```',
-                r'`([^`]+)`',
-                r'def\s+\w+\s*\([^)]*\):',
-                r'class\s+\w+',
-                r'import\s+[\w\s,]+',
-                r'from\s+[\w.]+\s+import\s+[\w\s,]+'
-            ]
-            
-            for pattern in code_patterns:
-                matches = re.findall(pattern, response, re.DOTALL | re.IGNORECASE)
-                components['code_sections'].extend(matches)
-            
-            # Extract explanations and reasoning
-            explanation_patterns = [
-                r'explanation[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'reasoning[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'approach[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'strategy[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)'
-            ]
-            
-            for pattern in explanation_patterns:
-                matches = re.findall(pattern, response, re.DOTALL | re.IGNORECASE)
-                components['explanations'].extend(matches)
-                components['reasoning'].extend(matches)
-            
-            # Extract documentation
-            doc_patterns = [
-                r'#\s+(.*?)(?=\n|$)',
-                r'"""([^"]*)"""',
-                r"'''([^']*)'''",
-                r'#\s+([^\n]+)'
-            ]
-            
-            for pattern in doc_patterns:
-                matches = re.findall(pattern, response, re.DOTALL)
-                components['documentation'].extend(matches)
-            
-            # Extract testing approach
-            test_patterns = [
-                r'test[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'assert[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'validation[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)'
-            ]
-            
-            for pattern in test_patterns:
-                matches = re.findall(pattern, response, re.DOTALL | re.IGNORECASE)
-                components['testing_approach'].extend(matches)
-            
-            # Extract optimization notes
-            opt_patterns = [
-                r'optimization[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'efficiency[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'performance[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)'
-            ]
-            
-            for pattern in opt_patterns:
-                matches = re.findall(pattern, response, re.DOTALL | re.IGNORECASE)
-                components['optimization_notes'].extend(matches)
-            
-            # Extract security considerations
-            sec_patterns = [
-                r'security[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'authentication[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'authorization[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'validation[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)'
-            ]
-            
-            for pattern in sec_patterns:
-                matches = re.findall(pattern, response, re.DOTALL | re.IGNORECASE)
-                components['security_considerations'].extend(matches)
-            
-            # Extract performance notes
-            perf_patterns = [
-                r'performance[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'scalability[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'throughput[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)',
-                r'latency[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)'
-            ]
-            
-            for pattern in perf_patterns:
-                matches = re.findall(pattern, response, re.DOTALL | re.IGNORECASE)
-                components['performance_notes'].extend(matches)
-            
-            return components
+            return extract_components(response)
             
         except Exception as e:
             logger.error(f"Error extracting response components: {str(e)}")
@@ -407,6 +346,7 @@ class IntelligentScoringSystem:
             
             # Analyze reasoning quality
             total_reasoning = ' '.join(reasoning + explanations)
+            reasoning_lower = total_reasoning.lower()
             
             if len(total_reasoning) > 100:
                 score += 0.1  # Detailed reasoning
@@ -416,20 +356,20 @@ class IntelligentScoringSystem:
             
             # Check for logical keywords
             logical_keywords = ['because', 'therefore', 'however', 'although', 'while', 'if', 'then']
-            logical_count = sum(1 for keyword in logical_keywords if keyword in total_reasoning.lower())
+            logical_count = sum(1 for keyword in logical_keywords if keyword in reasoning_lower)
             score += min(logical_count * 0.05, 0.2)
             
             # Check for approach explanation
             approach_keywords = ['approach', 'strategy', 'method', 'algorithm', 'solution']
-            approach_count = sum(1 for keyword in approach_keywords if keyword in total_reasoning.lower())
+            approach_count = sum(1 for keyword in approach_keywords if keyword in reasoning_lower)
             score += min(approach_count * 0.05, 0.15)
             
             # Difficulty-based adjustments
             if difficulty in [DifficultyLevel.EXPERT, DifficultyLevel.MASTER]:
-                if 'complexity' in total_reasoning.lower() or 'optimization' in total_reasoning.lower():
+                if 'complexity' in reasoning_lower or 'optimization' in reasoning_lower:
                     score += 0.1  # Advanced thinking
             
-                if 'trade-off' in total_reasoning.lower() or 'tradeoff' in total_reasoning.lower():
+                if 'trade-off' in reasoning_lower or 'tradeoff' in reasoning_lower:
                     score += 0.05  # Understanding trade-offs
             
             return min(max(score, 0.0), 1.0)
@@ -446,6 +386,8 @@ class IntelligentScoringSystem:
             
             total_content = ' '.join(code_sections + explanations)
             
+            content_lower = total_content.lower()
+            
             # Check for innovative patterns
             innovative_patterns = [
                 'generator', 'yield', 'decorator', '@', 'lambda', 'comprehension',
@@ -458,15 +400,15 @@ class IntelligentScoringSystem:
             
             # Check for creative approaches
             creative_keywords = ['creative', 'novel', 'unique', 'innovative', 'elegant', 'clever']
-            creative_count = sum(1 for keyword in creative_keywords if keyword in total_content.lower())
+            creative_count = sum(1 for keyword in creative_keywords if keyword in content_lower)
             score += min(creative_count * 0.05, 0.2)
             
             # Difficulty-based adjustments
             if difficulty in [DifficultyLevel.EXPERT, DifficultyLevel.MASTER]:
-                if 'design pattern' in total_content.lower() or 'pattern' in total_content.lower():
+                if 'design pattern' in content_lower or 'pattern' in content_lower:
                     score += 0.1  # Design patterns
                 
-                if 'algorithm' in total_content.lower() or 'complexity' in total_content.lower():
+                if 'algorithm' in content_lower or 'complexity' in content_lower:
                     score += 0.1  # Algorithmic thinking
             
             return min(max(score, 0.0), 1.0)
@@ -483,6 +425,8 @@ class IntelligentScoringSystem:
             
             total_content = ' '.join(code_sections + optimization_notes)
             
+            content_lower = total_content.lower()
+            
             # Check for efficient patterns
             efficient_patterns = [
                 'list comprehension', 'generator', 'yield', 'map(', 'filter(',
@@ -494,7 +438,7 @@ class IntelligentScoringSystem:
             
             # Check for optimization mentions
             optimization_keywords = ['optimize', 'efficient', 'performance', 'complexity', 'O(', 'time', 'space']
-            optimization_count = sum(1 for keyword in optimization_keywords if keyword in total_content.lower())
+            optimization_count = sum(1 for keyword in optimization_keywords if keyword in content_lower)
             score += min(optimization_count * 0.03, 0.2)
             
             # Penalize inefficient patterns
@@ -516,18 +460,20 @@ class IntelligentScoringSystem:
             
             total_content = ' '.join(code_sections + security_considerations)
             
+            content_lower = total_content.lower()
+            
             # Check for security practices
             security_patterns = [
                 'input validation', 'sanitize', 'escape', 'quote', 'authentication',
                 'authorization', 'encrypt', 'hash', 'salt', 'csrf', 'xss', 'sql injection'
             ]
             
-            security_count = sum(1 for pattern in security_patterns if pattern in total_content.lower())
+            security_count = sum(1 for pattern in security_patterns if pattern in content_lower)
             score += min(security_count * 0.08, 0.4)
             
             # Check for security keywords
             security_keywords = ['security', 'secure', 'safe', 'protected', 'validate', 'verify']
-            security_keyword_count = sum(1 for keyword in security_keywords if keyword in total_content.lower())
+            security_keyword_count = sum(1 for keyword in security_keywords if keyword in content_lower)
             score += min(security_keyword_count * 0.03, 0.2)
             
             # Penalize unsafe practices
@@ -549,18 +495,20 @@ class IntelligentScoringSystem:
             
             total_content = ' '.join(code_sections + performance_notes)
             
+            content_lower = total_content.lower()
+            
             # Check for performance considerations
             performance_patterns = [
                 'caching', 'cache', 'index', 'optimize', 'performance', 'scalability',
                 'throughput', 'latency', 'memory', 'cpu', 'gpu', 'parallel', 'async'
             ]
             
-            performance_count = sum(1 for pattern in performance_patterns if pattern in total_content.lower())
+            performance_count = sum(1 for pattern in performance_patterns if pattern in content_lower)
             score += min(performance_count * 0.05, 0.3)
             
             # Check for performance keywords
             performance_keywords = ['fast', 'efficient', 'speed', 'quick', 'optimized']
-            performance_keyword_count = sum(1 for keyword in performance_keywords if keyword in total_content.lower())
+            performance_keyword_count = sum(1 for keyword in performance_keywords if keyword in content_lower)
             score += min(performance_keyword_count * 0.03, 0.15)
             
             return min(max(score, 0.0), 1.0)
@@ -577,6 +525,8 @@ class IntelligentScoringSystem:
             
             total_content = ' '.join(code_sections + documentation + testing_approach)
             
+            content_lower = total_content.lower()
+            
             # Check for documentation
             if documentation:
                 score += 0.1  # Has documentation
@@ -589,7 +539,7 @@ class IntelligentScoringSystem:
                 score += 0.1  # Has testing approach
             
             test_keywords = ['test', 'assert', 'validate', 'verify', 'check']
-            test_count = sum(1 for keyword in test_keywords if keyword in total_content.lower())
+            test_count = sum(1 for keyword in test_keywords if keyword in content_lower)
             score += min(test_count * 0.03, 0.15)
             
             # Check for modularity
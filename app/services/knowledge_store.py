@@ -0,0 +1,224 @@
+"""
+Knowledge Store for the SCKIPIT knowledge base
+Embedded SQLite (WAL mode) store keyed by source URL. Each refreshed source is
+upserted on its own, together with the validators (ETag/Last-Modified) and the
+next refresh time used for conditional, interval-based refreshes. Reads go
+through a read-only mapping interface or select only the columns they need, so
+the knowledge base is never loaded or rewritten as a whole.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+import structlog
+
+logger = structlog.get_logger()
+
+KNOWLEDGE_DB_NAME = "sckipit_knowledge_base.db"
+LEGACY_KNOWLEDGE_FILE_NAME = "sckipit_knowledge_base.json"  # Whole-file knowledge base, imported once
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS knowledge_entries (
+    url TEXT PRIMARY KEY,
+    knowledge TEXT,
+    quality_score REAL NOT NULL DEFAULT 0.0,
+    last_updated TEXT,
+    content_hash TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    checked_at REAL,
+    next_refresh_at REAL NOT NULL DEFAULT 0,
+    failure_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_knowledge_entries_quality ON knowledge_entries(quality_score);
+CREATE TABLE IF NOT EXISTS knowledge_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class KnowledgeStore(Mapping):
+    """Knowledge entries keyed by source URL, with per-source refresh bookkeeping"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()):
+        with self._lock:
+            self._conn.execute(sql, params)
+
+    # Reads (entries without fetched knowledge are bookkeeping only and stay hidden)
+
+    def __getitem__(self, url: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT knowledge, last_updated, quality_score FROM knowledge_entries "
+                "WHERE url = ? AND knowledge IS NOT NULL", (url,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(url)
+        return {"knowledge": row["knowledge"], "last_updated": row["last_updated"], "quality_score": row["quality_score"]}
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT url FROM knowledge_entries WHERE knowledge IS NOT NULL").fetchall()
+        return iter([row["url"] for row in rows])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM knowledge_entries WHERE knowledge IS NOT NULL").fetchone()[0]
+
+    def latest_update(self) -> Optional[str]:
+        """Newest last_updated of any fetched entry (None when empty), without loading knowledge"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT MAX(last_updated) FROM knowledge_entries WHERE knowledge IS NOT NULL"
+            ).fetchone()[0]
+
+    def iter_knowledge(self, min_quality: float = 0.0) -> List[Tuple[str, str]]:
+        """(url, knowledge) for entries above a quality score, via the quality index"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, knowledge FROM knowledge_entries WHERE quality_score > ? AND knowledge IS NOT NULL",
+                (min_quality,),
+            ).fetchall()
+        return [(row["url"], row["knowledge"]) for row in rows]
+
+    def get_due(self, urls: List[str], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Sources whose refresh time has passed (or that were never fetched), with their validators"""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, content_hash, etag, last_modified, next_refresh_at, failure_count FROM knowledge_entries"
+            ).fetchall()
+        known = {row["url"]: row for row in rows}
+        due = []
+        for url in urls:
+            row = known.get(url)
+            if row is None:
+                due.append({"url": url, "content_hash": None, "etag": None, "last_modified": None, "failure_count": 0})
+            elif row["next_refresh_at"] <= now:
+                due.append({key: row[key] for key in ("url", "content_hash", "etag", "last_modified", "failure_count")})
+        return due
+
+    # Per-source writes
+
+    def store_content(self, url: str, knowledge: str, quality_score: float, content_hash: str,
+                      next_refresh_at: float, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Upsert a source whose content changed"""
+        self._execute(
+            """
+            INSERT INTO knowledge_entries (
+                url, knowledge, quality_score, last_updated, content_hash, etag, last_modified,
+                checked_at, next_refresh_at, failure_count
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+            ON CONFLICT(url) DO UPDATE SET
+                knowledge = excluded.knowledge,
+                quality_score = excluded.quality_score,
+                last_updated = excluded.last_updated,
+                content_hash = excluded.content_hash,
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                checked_at = excluded.checked_at,
+                next_refresh_at = excluded.next_refresh_at,
+                failure_count = 0
+            """,
+            (url, knowledge, quality_score, datetime.now().isoformat(), content_hash, etag, last_modified,
+             time.time(), next_refresh_at),
+        )
+
+    def mark_unchanged(self, url: str, next_refresh_at: float, etag: Optional[str] = None,
+                       last_modified: Optional[str] = None):
+        """Record a check that found no new content; validators are kept unless the server sent new ones"""
+        self._execute(
+            """
+            UPDATE knowledge_entries SET
+                etag = COALESCE(?, etag),
+                last_modified = COALESCE(?, last_modified),
+                checked_at = ?,
+                next_refresh_at = ?,
+                failure_count = 0
+            WHERE url = ?
+            """,
+            (etag, last_modified, time.time(), next_refresh_at, url),
+        )
+
+    def mark_failed(self, url: str, next_refresh_at: float):
+        self._execute(
+            """
+            INSERT INTO knowledge_entries (url, checked_at, next_refresh_at, failure_count) VALUES (?, ?, ?, 1)
+            ON CONFLICT(url) DO UPDATE SET
+                checked_at = excluded.checked_at,
+                next_refresh_at = excluded.next_refresh_at,
+                failure_count = knowledge_entries.failure_count + 1
+            """,
+            (url, time.time(), next_refresh_at),
+        )
+
+    def import_legacy(self, path: str) -> int:
+        """Import the legacy whole-file JSON knowledge base once; later calls are no-ops"""
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM knowledge_meta WHERE key = 'legacy_imported'").fetchone():
+                return 0
+        entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            except Exception as e:
+                logger.warning("Failed to read legacy knowledge base", path=path, error=str(e))
+                return 0
+        rows = [
+            (url, entry.get("knowledge"), entry.get("quality_score", 0.0), entry.get("last_updated"))
+            for url, entry in entries.items() if isinstance(entry, dict) and entry.get("knowledge")
+        ]
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO knowledge_entries (url, knowledge, quality_score, last_updated) "
+                    "VALUES (?, ?, ?, ?)", rows
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO knowledge_meta (key, value) VALUES ('legacy_imported', ?)",
+                    (datetime.utcnow().isoformat(),),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if rows:
+            logger.info("Imported legacy knowledge base into knowledge store", path=path, entries=len(rows))
+        return len(rows)
+
+
+_stores: Dict[str, KnowledgeStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_knowledge_store(directory: str) -> KnowledgeStore:
+    """Shared store for a model directory, importing its legacy JSON knowledge base on first open"""
+    db_path = os.path.abspath(os.path.join(directory, KNOWLEDGE_DB_NAME))
+    with _stores_lock:
+        if db_path not in _stores:
+            os.makedirs(directory, exist_ok=True)
+            store = KnowledgeStore(db_path)
+            store.import_legacy(os.path.join(directory, LEGACY_KNOWLEDGE_FILE_NAME))
+            _stores[db_path] = store
+    return _stores[db_path]
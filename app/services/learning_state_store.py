@@ -0,0 +1,194 @@
+"""
+Learning State Store - Per-AI learning counters shared across workers and restarts
+AI levels derive from compact counters (learning events, improvements learned,
+productivity score) kept in the ai_learning_states table. Writes are atomic
+upserts that increment the counters in the database, so every worker adds to
+the same totals. Given a WriteBuffer, events only add to a pending delta per AI
+and the cache is updated optimistically; the buffer writes each AI's summed
+delta as one coalesced upsert per flush. Reads come from a small per-process
+cache that is refreshed in the background once older than the TTL, so level
+lookups stay O(1) and synchronous.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+import structlog
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.core.config import settings
+from app.core.database import get_session
+from app.models.sql_models import AILearningState
+
+logger = structlog.get_logger()
+
+COUNTER_FIELDS = ("event_count", "improvement_count", "productivity_score_sum", "productivity_event_count")
+
+# Minimum learning score for each level above 1
+LEVEL_THRESHOLDS = (100, 300, 600, 1000, 1500, 2200, 3000, 4000, 5000)
+
+
+def level_for_counters(counters: Dict[str, Any]) -> int:
+    """Level 1-10 from learning counters"""
+    productivity_events = counters.get("productivity_event_count", 0)
+    average_productivity = counters.get("productivity_score_sum", 0.0) / productivity_events if productivity_events else 0.0
+    score = counters.get("event_count", 0) * 10 + counters.get("improvement_count", 0) * 20 + average_productivity * 100
+    return 1 + sum(score >= threshold for threshold in LEVEL_THRESHOLDS)
+
+
+def _empty_counters() -> Dict[str, Any]:
+    return {"event_count": 0, "improvement_count": 0, "productivity_score_sum": 0.0,
+            "productivity_event_count": 0, "last_learning_at": None}
+
+
+def _add_delta(counters: Dict[str, Any], delta: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if delta:
+        for field in COUNTER_FIELDS:
+            counters[field] += delta[field]
+        counters["last_learning_at"] = delta["last_learning_at"]
+    return counters
+
+
+def _row_counters(row) -> Dict[str, Any]:
+    return {
+        "event_count": row.event_count or 0,
+        "improvement_count": row.improvement_count or 0,
+        "productivity_score_sum": float(row.productivity_score_sum or 0.0),
+        "productivity_event_count": row.productivity_event_count or 0,
+        "last_learning_at": row.last_learning_at,
+    }
+
+
+class LearningStateStore:
+    """Database-backed learning counters with a short-TTL per-process read cache"""
+
+    def __init__(self, ttl: Optional[float] = None):
+        self._ttl = ttl
+        self._cache: Dict[str, Dict[str, Any]] = {}  # ai_type -> counters
+        self._loaded_at: Dict[str, float] = {}  # ai_type -> monotonic time of its last upsert
+        self._pending: Dict[str, Dict[str, Any]] = {}  # ai_type -> delta not yet taken by a buffer flush
+        self._refreshed_at: Optional[float] = None  # Monotonic time of the last full reload
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.stats = {"records": 0, "buffered_records": 0, "record_failures": 0, "refreshes": 0, "refresh_failures": 0}
+
+    @property
+    def ttl(self) -> float:
+        return settings.learning_state_cache_ttl if self._ttl is None else self._ttl
+
+    def _upsert(self, session, ai_type: str, delta: Dict[str, Any]):
+        """INSERT ... ON CONFLICT statement adding a delta to an AI's counters"""
+        insert_fn = sqlite_insert if session.bind.dialect.name == "sqlite" else pg_insert
+        table = AILearningState.__table__
+        statement = insert_fn(table).values(
+            ai_type=ai_type, updated_at=delta["last_learning_at"],
+            **{field: delta[field] for field in (*COUNTER_FIELDS, "last_learning_at")}
+        )
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.ai_type],
+            set_={
+                **{field: table.c[field] + statement.excluded[field] for field in COUNTER_FIELDS},
+                "last_learning_at": statement.excluded.last_learning_at,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+
+    def _pending_write(self, ai_type: str):
+        """Coalesced buffer write of the AI's pending delta, taken once so retries write the same delta"""
+        taken: List[Optional[Dict[str, Any]]] = []
+
+        async def write(session):
+            if not taken:
+                taken.append(self._pending.pop(ai_type, None))
+            if taken[0]:
+                await session.execute(self._upsert(session, ai_type, taken[0]))
+        return write
+
+    async def record(self, ai_type: str, events: int = 1, improvements: int = 0,
+                     productivity_score: Optional[float] = None, write_buffer=None) -> Dict[str, Any]:
+        """Add to an AI's counters; returns the updated totals as this process sees them
+
+        With a write_buffer the delta joins the AI's coalesced write for the next flush
+        and the cache is updated optimistically; without one it is upserted immediately.
+        """
+        now = datetime.utcnow()
+        delta = {
+            "event_count": events,
+            "improvement_count": improvements,
+            "productivity_score_sum": productivity_score or 0.0,
+            "productivity_event_count": 1 if productivity_score is not None else 0,
+            "last_learning_at": now,
+        }
+        if write_buffer is not None:
+            _add_delta(self._pending.setdefault(ai_type, {**_empty_counters(), "last_learning_at": now}), delta)
+            write_buffer.set_latest(("ai_learning_state", ai_type), self._pending_write(ai_type))
+            counters = _add_delta(dict(self._cache.get(ai_type) or _empty_counters()), delta)
+            self.stats["buffered_records"] += 1
+        else:
+            try:
+                async with get_session() as session:
+                    table = AILearningState.__table__
+                    statement = self._upsert(session, ai_type, delta).returning(
+                        *[table.c[field] for field in COUNTER_FIELDS], table.c.last_learning_at
+                    )
+                    row = (await session.execute(statement)).one()
+                    await session.commit()
+                counters = _add_delta(_row_counters(row), self._pending.get(ai_type))
+                self._loaded_at[ai_type] = time.monotonic()
+            except Exception as e:
+                # Keep this process's view moving; the next successful refresh restores the shared totals
+                self.stats["record_failures"] += 1
+                logger.warning("Learning state write failed, counted locally only", ai_type=ai_type, error=str(e))
+                counters = _add_delta(dict(self._cache.get(ai_type) or _empty_counters()), delta)
+        self._cache[ai_type] = counters
+        self.stats["records"] += 1
+        return counters
+
+    async def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """Reload every AI's counters from the database"""
+        try:
+            async with get_session() as session:
+                rows = (await session.execute(select(
+                    AILearningState.ai_type, *[getattr(AILearningState, field) for field in COUNTER_FIELDS],
+                    AILearningState.last_learning_at
+                ))).all()
+            for row in rows:
+                # Deltas still waiting for a flush stay visible on top of the stored totals
+                self._cache[row.ai_type] = _add_delta(_row_counters(row), self._pending.get(row.ai_type))
+            self._refreshed_at = time.monotonic()
+            self.stats["refreshes"] += 1
+        except Exception as e:
+            self.stats["refresh_failures"] += 1
+            logger.warning("Learning state refresh failed", error=str(e))
+        return self._cache
+
+    def _schedule_refresh(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        try:
+            self._refresh_task = asyncio.get_running_loop().create_task(self.refresh())
+        except RuntimeError:
+            pass  # No running loop (sync caller); serve the cached counters
+
+    def get_counters(self, ai_type: str) -> Dict[str, Any]:
+        """Cached counters for an AI; stale entries are served while a background refresh runs"""
+        loaded_at = max(self._loaded_at.get(ai_type, 0.0), self._refreshed_at or 0.0)
+        if not loaded_at or time.monotonic() - loaded_at > self.ttl:
+            self._schedule_refresh()
+        return self._cache.get(ai_type) or _empty_counters()
+
+    def get_level(self, ai_type: str) -> int:
+        return level_for_counters(self.get_counters(ai_type))
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "cached_ai_types": len(self._cache),
+            "ttl_seconds": self.ttl,
+            "pending_ai_types": len(self._pending),
+            **self.stats,
+        }
+
+
+learning_state_store = LearningStateStore()
@@ -0,0 +1,198 @@
+"""
+Learning Time-Series Service - Windowed queries over hourly learning buckets
+Learning rows are rolled up per AI type and hour into learning_hourly_buckets
+as they are written. Range, top-N and trend queries read only the buckets in
+the requested window (via the (ai_type, bucket_start) and bucket_start
+indexes) and roll them up to hour, day or week resolution, so dashboard polls
+cost O(buckets in range) rather than O(learning history). Long ranges are
+paged with an opaque cursor: the start of the next page.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Tuple
+import structlog
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.sql_models import LearningHourlyBucket
+
+logger = structlog.get_logger()
+
+RESOLUTIONS = {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}
+DEFAULT_WINDOWS = {"hour": timedelta(hours=24), "day": timedelta(days=30), "week": timedelta(weeks=12)}
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    # Learning timestamps are stored as naive UTC
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def period_start(moment: datetime, resolution: str) -> datetime:
+    """Start of the hour, day or (Monday-based) week containing a moment"""
+    moment = _naive_utc(moment).replace(minute=0, second=0, microsecond=0)
+    if resolution == "hour":
+        return moment
+    moment = moment.replace(hour=0)
+    if resolution == "week":
+        moment -= timedelta(days=moment.weekday())
+    return moment
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {"event_count": 0, "success_count": 0, "success_rate_sum": 0.0, "applied_count": 0}
+
+
+def _add(totals: Dict[str, Any], event_count, success_count, success_rate_sum, applied_count_sum):
+    totals["event_count"] += int(event_count or 0)
+    totals["success_count"] += int(success_count or 0)
+    totals["success_rate_sum"] += float(success_rate_sum or 0.0)
+    totals["applied_count"] += int(applied_count_sum or 0)
+
+
+def _summary(totals: Dict[str, Any]) -> Dict[str, Any]:
+    events = totals["event_count"]
+    return {
+        "event_count": events,
+        "success_count": totals["success_count"],
+        "avg_success_rate": round(totals["success_rate_sum"] / events, 4) if events else 0.0,
+        "applied_count": totals["applied_count"],
+    }
+
+
+def _change(current: int, previous: int) -> Optional[float]:
+    return round((current - previous) / previous, 4) if previous else None
+
+
+class LearningTimeseriesService:
+    """Range, top-N and trend queries over the hourly learning rollup"""
+
+    def resolve_window(self, start: Optional[datetime], end: Optional[datetime],
+                       resolution: str) -> Tuple[datetime, datetime]:
+        """Window aligned to whole periods; defaults to a recent window for the resolution"""
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unsupported resolution '{resolution}', expected one of {', '.join(RESOLUTIONS)}")
+        end = _naive_utc(end) if end else datetime.utcnow()
+        start = _naive_utc(start) if start else end - DEFAULT_WINDOWS[resolution]
+        if start >= end:
+            raise ValueError("'from' must be before 'to'")
+        end_period = period_start(end, resolution)
+        if end_period < end:
+            end_period += RESOLUTIONS[resolution]
+        return period_start(start, resolution), end_period
+
+    async def query(self, session: AsyncSession, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                    resolution: str = "hour", ai_type: Optional[str] = None, cursor: Optional[str] = None,
+                    limit: Optional[int] = None, top: int = 5) -> Dict[str, Any]:
+        """One page of zero-filled points for the window, plus top AI types and trend for the whole window"""
+        start, end = self.resolve_window(start, end, resolution)
+        step = RESOLUTIONS[resolution]
+        limit = max(1, limit or settings.learning_timeseries_page_size)
+        page_start = start
+        if cursor:
+            try:
+                page_start = period_start(datetime.fromisoformat(cursor), resolution)
+            except ValueError:
+                raise ValueError(f"Invalid cursor '{cursor}'")
+            page_start = min(max(page_start, start), end)
+        page_end = min(end, page_start + step * limit)
+
+        points = await self._points(session, page_start, page_end, resolution, ai_type)
+        summary = await self._window_summary(session, start, end, ai_type, top)
+        return {
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "resolution": resolution,
+            "ai_type": ai_type,
+            "points": points,
+            "next_cursor": page_end.isoformat() if page_end < end else None,
+            **summary,
+        }
+
+    async def _points(self, session: AsyncSession, start: datetime, end: datetime, resolution: str,
+                      ai_type: Optional[str]) -> List[Dict[str, Any]]:
+        query = select(
+            LearningHourlyBucket.ai_type,
+            LearningHourlyBucket.bucket_start,
+            LearningHourlyBucket.event_count,
+            LearningHourlyBucket.success_count,
+            LearningHourlyBucket.success_rate_sum,
+            LearningHourlyBucket.applied_count_sum,
+        ).where(LearningHourlyBucket.bucket_start >= start, LearningHourlyBucket.bucket_start < end)
+        if ai_type:
+            query = query.where(LearningHourlyBucket.ai_type == ai_type)
+
+        periods: Dict[datetime, Dict[str, Dict[str, Any]]] = {}
+        for bucket_ai, bucket_start, *measures in (await session.execute(query)).all():
+            by_ai = periods.setdefault(period_start(bucket_start, resolution), {})
+            _add(by_ai.setdefault(bucket_ai, _empty_totals()), *measures)
+
+        points = []
+        moment = start
+        while moment < end:
+            by_ai = periods.get(moment, {})
+            totals = _empty_totals()
+            for ai_totals in by_ai.values():
+                _add(totals, ai_totals["event_count"], ai_totals["success_count"],
+                     ai_totals["success_rate_sum"], ai_totals["applied_count"])
+            points.append({
+                "start": moment.isoformat(),
+                **_summary(totals),
+                "by_ai": {name: _summary(ai_totals) for name, ai_totals in sorted(by_ai.items())},
+            })
+            moment += RESOLUTIONS[resolution]
+        return points
+
+    async def _window_summary(self, session: AsyncSession, start: datetime, end: datetime,
+                              ai_type: Optional[str], top: int) -> Dict[str, Any]:
+        """Per-AI totals for the window and the equally long window before it, in one grouped query"""
+        previous_start = start - (end - start)
+        current = LearningHourlyBucket.bucket_start >= start
+
+        def window_sum(column, in_current):
+            return func.sum(case((current if in_current else ~current, column), else_=0))
+
+        query = select(
+            LearningHourlyBucket.ai_type,
+            window_sum(LearningHourlyBucket.event_count, True),
+            window_sum(LearningHourlyBucket.success_count, True),
+            window_sum(LearningHourlyBucket.success_rate_sum, True),
+            window_sum(LearningHourlyBucket.applied_count_sum, True),
+            window_sum(LearningHourlyBucket.event_count, False),
+            window_sum(LearningHourlyBucket.success_rate_sum, False),
+        ).where(
+            LearningHourlyBucket.bucket_start >= previous_start, LearningHourlyBucket.bucket_start < end
+        ).group_by(LearningHourlyBucket.ai_type)
+        if ai_type:
+            query = query.where(LearningHourlyBucket.ai_type == ai_type)
+
+        totals, previous = _empty_totals(), _empty_totals()
+        per_ai = []
+        for name, events, successes, rate_sum, applied, previous_events, previous_rate_sum in (await session.execute(query)).all():
+            ai_totals = _empty_totals()
+            _add(ai_totals, events, successes, rate_sum, applied)
+            _add(totals, events, successes, rate_sum, applied)
+            _add(previous, previous_events, 0, previous_rate_sum, 0)
+            if ai_totals["event_count"]:
+                per_ai.append({"ai_type": name, **_summary(ai_totals)})
+
+        per_ai.sort(key=lambda entry: (-entry["event_count"], -entry["avg_success_rate"], entry["ai_type"]))
+        current_summary, previous_summary = _summary(totals), _summary(previous)
+        return {
+            "totals": current_summary,
+            "top_ai_types": per_ai[:max(0, top)],
+            "trend": {
+                "previous_from": previous_start.isoformat(),
+                "previous_event_count": previous_summary["event_count"],
+                "previous_avg_success_rate": previous_summary["avg_success_rate"],
+                "event_count_change": _change(current_summary["event_count"], previous_summary["event_count"]),
+                "avg_success_rate_change": round(
+                    current_summary["avg_success_rate"] - previous_summary["avg_success_rate"], 4
+                ),
+            },
+        }
+
+
+learning_timeseries_service = LearningTimeseriesService()
@@ -3,13 +3,13 @@ Advanced Logging Service for AI Systems
 Provides separate logging for different AI components with structured output
 """
 
-import logging
 import structlog
-import json
 from datetime import datetime
 from typing import Dict, Any, Optional
 from enum import Enum
 
+from app.core.logging import configure_structlog, sampler
+
 
 class LogLevel(Enum):
     """Log levels for different AI systems"""
@@ -38,154 +38,57 @@ class AILoggingService:
     
     def _initialize_loggers(self):
         """Initialize separate loggers for each AI system"""
-        # Configure structlog
-        structlog.configure(
-            processors=[
-                structlog.stdlib.filter_by_level,
-                structlog.stdlib.add_logger_name,
-                structlog.stdlib.add_log_level,
-                structlog.stdlib.PositionalArgumentsFormatter(),
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.processors.StackInfoRenderer(),
-                structlog.processors.format_exc_info,
-                structlog.processors.UnicodeDecoder(),
-                structlog.processors.JSONRenderer()
-            ],
-            context_class=dict,
-            logger_factory=structlog.stdlib.LoggerFactory(),
-            wrapper_class=structlog.stdlib.BoundLogger,
-            cache_logger_on_first_use=True,
-        )
+        # Shared, idempotent configuration; records go through the queue-backed pipeline
+        configure_structlog()
         
         # Create loggers for each AI system
         for system_type in AISystemType:
             logger = structlog.get_logger(system_type.value)
             self.loggers[system_type] = logger
     
-    def log_project_horus(self, message: str, level: LogLevel = LogLevel.INFO, 
-                         context: Optional[Dict[str, Any]] = None):
-        """Log Project HORUS system events"""
-        logger = self.loggers[AISystemType.PROJECT_HORUS]
+    def _log(self, system_type: AISystemType, message: str, level: LogLevel,
+             context: Optional[Dict[str, Any]] = None):
+        """Emit one event for a system; sampled-out events are dropped before any formatting"""
+        if not sampler.allow(system_type.value, level.value):
+            return
+        
         log_data = {
-            "system": "project_horus",
+            "system": system_type.value,
             "message": message,
             "level": level.value,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow().isoformat(),
+            "_presampled": True
         }
         
         if context:
             log_data.update(context)
         
-        if level == LogLevel.DEBUG:
-            logger.debug("", **log_data)
-        elif level == LogLevel.INFO:
-            logger.info("", **log_data)
-        elif level == LogLevel.WARNING:
-            logger.warning("", **log_data)
-        elif level == LogLevel.ERROR:
-            logger.error("", **log_data)
-        elif level == LogLevel.CRITICAL:
-            logger.critical("", **log_data)
+        getattr(self.loggers[system_type], level.value)("", **log_data)
+    
+    def log_project_horus(self, message: str, level: LogLevel = LogLevel.INFO, 
+                         context: Optional[Dict[str, Any]] = None):
+        """Log Project HORUS system events"""
+        self._log(AISystemType.PROJECT_HORUS, message, level, context)
     
     def log_training_ground(self, message: str, level: LogLevel = LogLevel.INFO,
                            context: Optional[Dict[str, Any]] = None):
         """Log Training Ground system events"""
-        logger = self.loggers[AISystemType.TRAINING_GROUND]
-        log_data = {
-            "system": "training_ground",
-            "message": message,
-            "level": level.value,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        if context:
-            log_data.update(context)
-        
-        if level == LogLevel.DEBUG:
-            logger.debug("", **log_data)
-        elif level == LogLevel.INFO:
-            logger.info("", **log_data)
-        elif level == LogLevel.WARNING:
-            logger.warning("", **log_data)
-        elif level == LogLevel.ERROR:
-            logger.error("", **log_data)
-        elif level == LogLevel.CRITICAL:
-            logger.critical("", **log_data)
+        self._log(AISystemType.TRAINING_GROUND, message, level, context)
     
     def log_enhanced_adversarial(self, message: str, level: LogLevel = LogLevel.INFO,
                                 context: Optional[Dict[str, Any]] = None):
         """Log Enhanced Adversarial system events"""
-        logger = self.loggers[AISystemType.ENHANCED_ADVERSARIAL]
-        log_data = {
-            "system": "enhanced_adversarial",
-            "message": message,
-            "level": level.value,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        if context:
-            log_data.update(context)
-        
-        if level == LogLevel.DEBUG:
-            logger.debug("", **log_data)
-        elif level == LogLevel.INFO:
-            logger.info("", **log_data)
-        elif level == LogLevel.WARNING:
-            logger.warning("", **log_data)
-        elif level == LogLevel.ERROR:
-            logger.error("", **log_data)
-        elif level == LogLevel.CRITICAL:
-            logger.critical("", **log_data)
+        self._log(AISystemType.ENHANCED_ADVERSARIAL, message, level, context)
     
     def log_custody_protocol(self, message: str, level: LogLevel = LogLevel.INFO,
                             context: Optional[Dict[str, Any]] = None):
         """Log Custody Protocol system events"""
-        logger = self.loggers[AISystemType.CUSTODY_PROTOCOL]
-        log_data = {
-            "system": "custody_protocol",
-            "message": message,
-            "level": level.value,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        if context:
-            log_data.update(context)
-        
-        if level == LogLevel.DEBUG:
-            logger.debug("", **log_data)
-        elif level == LogLevel.INFO:
-            logger.info("", **log_data)
-        elif level == LogLevel.WARNING:
-            logger.warning("", **log_data)
-        elif level == LogLevel.ERROR:
-            logger.error("", **log_data)
-        elif level == LogLevel.CRITICAL:
-            logger.critical("", **log_data)
+        self._log(AISystemType.CUSTODY_PROTOCOL, message, level, context)
     
     def log_general(self, message: str, level: LogLevel = LogLevel.INFO,
                    context: Optional[Dict[str, Any]] = None):
         """Log general system events"""
-        logger = self.loggers[AISystemType.GENERAL]
-        log_data = {
-            "system": "general",
-            "message": message,
-            "level": level.value,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        if context:
-            log_data.update(context)
-        
-        if level == LogLevel.DEBUG:
-            logger.debug("", **log_data)
-        elif level == LogLevel.INFO:
-            logger.info("", **log_data)
-        elif level == LogLevel.WARNING:
-            logger.warning("", **log_data)
-        elif level == LogLevel.ERROR:
-            logger.error("", **log_data)
-        elif level == LogLevel.CRITICAL:
-            logger.critical("", **log_data)
+        self._log(AISystemType.GENERAL, message, level, context)
     
     def log_test_execution(self, ai_type: str, test_type: str, score: float, 
                           passed: bool, duration: float, context: Optional[Dict[str, Any]] = None):
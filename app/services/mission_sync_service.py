@@ -0,0 +1,265 @@
+"""
+Mission Sync Service - Bulk mission upserts with subtask diffing
+New missions are written with multi-row INSERT ... ON CONFLICT DO UPDATE
+(PostgreSQL and SQLite) and existing ones with a bulk UPDATE by primary key, so
+partial updates only touch the posted fields. Subtasks are diffed against the
+stored set so only changes are written, and a version cursor lets clients sync
+incrementally
+"""
+
+import sqlite3
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+import structlog
+from sqlalchemy import select, update, delete, insert, func, DateTime
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sql_models import Mission, MissionSubtask
+
+logger = structlog.get_logger()
+
+MISSION_COLUMNS = {column.name: column for column in Mission.__table__.columns}
+SUBTASK_COLUMNS = {column.name: column for column in MissionSubtask.__table__.columns}
+
+# Columns the client never overwrites on an existing row
+PROTECTED_COLUMNS = {"id", "created_at", "updated_at"}
+
+
+def _bind_parameter_limit(dialect_name: str) -> int:
+    if dialect_name == "sqlite":
+        return 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+    return 32767  # PostgreSQL wire protocol limit
+
+
+def _parse_uuid(value: Any) -> Optional[uuid.UUID]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _coerce_row(data: Dict[str, Any], columns: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep known columns and parse ISO datetimes sent as strings"""
+    row = {}
+    for key, value in data.items():
+        column = columns.get(key)
+        if column is None:
+            continue
+        if isinstance(column.type, DateTime) and isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+            except ValueError:
+                value = None
+        row[key] = value
+    return row
+
+
+def _parse_version(since_version: Optional[str]) -> Optional[datetime]:
+    if not since_version:
+        return None
+    try:
+        return datetime.fromisoformat(since_version.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        raise ValueError(f"Invalid since_version cursor: {since_version}")
+
+
+def _serialize(obj: Any, columns: Dict[str, Any]) -> Dict[str, Any]:
+    data = {}
+    for key in columns:
+        value = getattr(obj, key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, uuid.UUID):
+            value = str(value)
+        data[key] = value
+    return data
+
+
+class MissionSyncService:
+    """Bulk mission synchronisation"""
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MissionSyncService, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self._initialized = True
+
+    def _insert(self, session: AsyncSession):
+        return sqlite_insert if session.bind.dialect.name == "sqlite" else pg_insert
+
+    def _chunks(self, session: AsyncSession, rows: List[Dict[str, Any]], columns_per_row: int):
+        size = max(1, _bind_parameter_limit(session.bind.dialect.name) // max(columns_per_row, 1))
+        for start in range(0, len(rows), size):
+            yield rows[start:start + size]
+
+    async def sync(self, session: AsyncSession, missions_data: List[Dict[str, Any]],
+                   since_version: Optional[str] = None) -> Dict[str, Any]:
+        """Upsert missions and diff their subtasks; returns counts and the next version cursor"""
+        since = _parse_version(since_version)
+        now = datetime.utcnow()
+
+        rows: List[Dict[str, Any]] = []
+        subtasks_by_mission: Dict[uuid.UUID, List[Dict[str, Any]]] = {}
+        for mission_data in missions_data:
+            row = _coerce_row(mission_data, MISSION_COLUMNS)
+            row["id"] = _parse_uuid(mission_data.get("id")) or uuid.uuid4()
+            row["updated_at"] = now
+            rows.append(row)
+            if isinstance(mission_data.get("subtasks"), list):
+                subtasks_by_mission[row["id"]] = mission_data["subtasks"]
+
+        # Later duplicates of the same id win, as they would with per-row updates
+        rows = list({row["id"]: row for row in rows}.values())
+        mission_ids = [row["id"] for row in rows]
+
+        existing_ids = set()
+        for chunk in self._chunks(session, mission_ids, 1):
+            result = await session.execute(select(Mission.id).where(Mission.id.in_(chunk)))
+            existing_ids.update(result.scalars().all())
+
+        await self._update_missions(session, [row for row in rows if row["id"] in existing_ids])
+        await self._upsert_missions(session, [row for row in rows if row["id"] not in existing_ids], now)
+        subtask_changes = await self._sync_subtasks(session, subtasks_by_mission)
+        await session.commit()
+
+        synced_ids = {str(mission_id) for mission_id in mission_ids}
+        version_query = select(func.max(Mission.updated_at))
+        version = (await session.execute(version_query)).scalar()
+
+        server_changes: List[str] = []
+        if since is not None:
+            result = await session.execute(
+                select(Mission.id).where(Mission.updated_at > since, Mission.updated_at < now)
+            )
+            server_changes = [str(mission_id) for mission_id in result.scalars().all()
+                              if str(mission_id) not in synced_ids]
+
+        inserted = len([mission_id for mission_id in mission_ids if mission_id not in existing_ids])
+        logger.debug("Bulk mission sync written", missions=len(mission_ids), inserted=inserted,
+                     subtasks=subtask_changes)
+        return {
+            "synced_count": inserted,
+            "updated_count": len(mission_ids) - inserted,
+            "total_processed": len(missions_data),
+            "subtasks": subtask_changes,
+            "version": version.isoformat() if version else None,
+            "server_changes": server_changes,
+        }
+
+    async def get_changes(self, session: AsyncSession, since_version: Optional[str] = None) -> Dict[str, Any]:
+        """Missions updated after the cursor, oldest first; the returned version resumes the scan
+
+        Not paginated: a bulk sync stamps every row with the same updated_at, so a
+        LIMIT could split a tie and the cursor would skip the rest of it.
+        """
+        since = _parse_version(since_version)
+        query = select(Mission).order_by(Mission.updated_at)
+        if since is not None:
+            query = query.where(Mission.updated_at > since)
+        missions = (await session.execute(query)).scalars().all()
+
+        version = missions[-1].updated_at if missions else since
+        return {
+            "missions": [_serialize(mission, MISSION_COLUMNS) for mission in missions],
+            "count": len(missions),
+            "version": version.isoformat() if version else None,
+        }
+
+    async def _update_missions(self, session: AsyncSession, rows: List[Dict[str, Any]]):
+        """ORM bulk UPDATE by primary key of the posted fields (executemany, grouped by column set)"""
+        updates = [
+            {key: value for key, value in row.items() if key not in PROTECTED_COLUMNS or key in ("id", "updated_at")}
+            for row in rows
+        ]
+        if updates:
+            await session.execute(update(Mission), updates)
+
+    async def _upsert_missions(self, session: AsyncSession, rows: List[Dict[str, Any]], now: datetime):
+        """One multi-row INSERT ... ON CONFLICT DO UPDATE per row shape and parameter-limit chunk
+
+        Only used for ids that did not exist when the sync started; the conflict clause
+        covers a concurrent insert of the same id.
+        """
+        insert_fn = self._insert(session)
+        by_shape: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            row.setdefault("created_at", now)
+            by_shape.setdefault(tuple(sorted(row.keys())), []).append(row)
+
+        for keys, shape_rows in by_shape.items():
+            for chunk in self._chunks(session, shape_rows, len(keys)):
+                statement = insert_fn(Mission.__table__).values(chunk)
+                update_columns = {
+                    key: statement.excluded[key] for key in keys if key not in PROTECTED_COLUMNS
+                }
+                update_columns["updated_at"] = statement.excluded.updated_at
+                await session.execute(
+                    statement.on_conflict_do_update(index_elements=[Mission.__table__.c.id], set_=update_columns)
+                )
+
+    async def _sync_subtasks(self, session: AsyncSession,
+                             subtasks_by_mission: Dict[uuid.UUID, List[Dict[str, Any]]]) -> Dict[str, int]:
+        """Diff posted subtasks against stored ones; only inserts, changed fields and removals are written"""
+        changes = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        if not subtasks_by_mission:
+            return changes
+
+        stored: Dict[uuid.UUID, List[MissionSubtask]] = {}
+        for chunk in self._chunks(session, list(subtasks_by_mission.keys()), 1):
+            result = await session.execute(select(MissionSubtask).where(MissionSubtask.mission_id.in_(chunk)))
+            for subtask in result.scalars().all():
+                stored.setdefault(subtask.mission_id, []).append(subtask)
+
+        inserts: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        deletes: List[uuid.UUID] = []
+        now = datetime.utcnow()
+        for mission_id, posted in subtasks_by_mission.items():
+            by_id = {subtask.id: subtask for subtask in stored.get(mission_id, [])}
+            by_name = {subtask.name: subtask for subtask in stored.get(mission_id, [])}
+            matched = set()
+            for subtask_data in posted:
+                row = _coerce_row(subtask_data, SUBTASK_COLUMNS)
+                row["mission_id"] = mission_id
+                current = by_id.get(_parse_uuid(subtask_data.get("id"))) or by_name.get(row.get("name"))
+                if current is None or current.id in matched:
+                    row["id"] = _parse_uuid(subtask_data.get("id")) or uuid.uuid4()
+                    row.setdefault("created_at", now)
+                    row["updated_at"] = now
+                    inserts.append(row)
+                    continue
+                matched.add(current.id)
+                changed = {
+                    key: value for key, value in row.items()
+                    if key not in PROTECTED_COLUMNS and getattr(current, key) != value
+                }
+                if changed:
+                    updates.append({"id": current.id, "updated_at": now, **changed})
+                else:
+                    changes["unchanged"] += 1
+            deletes.extend(subtask_id for subtask_id in by_id if subtask_id not in matched)
+
+        if deletes:
+            for chunk in self._chunks(session, deletes, 1):
+                await session.execute(delete(MissionSubtask).where(MissionSubtask.id.in_(chunk)))
+        if updates:
+            # ORM bulk UPDATE by primary key (executemany, grouped by changed-column set)
+            await session.execute(update(MissionSubtask), updates)
+        if inserts:
+            await session.execute(insert(MissionSubtask), inserts)
+
+        changes.update(inserted=len(inserts), updated=len(updates), deleted=len(deletes))
+        return changes
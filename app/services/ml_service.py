@@ -20,6 +20,7 @@ from textblob import TextBlob
 
 from ..core.config import settings
 from ..core.database import get_session
+from .model_registry import model_registry
 
 logger = structlog.get_logger()
 
@@ -76,9 +77,9 @@ class MLService:
             model_path = os.path.join(settings.ml_model_path, model_file)
             if os.path.exists(model_path):
                 try:
-                    with open(model_path, 'rb') as f:
-                        model_name = model_file.replace('.pkl', '')
-                        self.models[model_name] = pickle.load(f)
+                    model_name = model_file.replace('.pkl', '')
+                    # Shared, lazily loaded model (see model_registry)
+                    self.models[model_name] = model_registry.handle(model_path, model_name)
                     logger.info(f"Loaded model: {model_name}")
                 except Exception as e:
                     logger.error(f"Failed to load model {model_file}: {str(e)}")
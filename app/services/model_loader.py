@@ -7,16 +7,17 @@ import pickle
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, AdaBoostRegressor
 
+from .model_registry import model_registry
+
 def load_or_create_trained_model(model_path, model_type="random_forest"):
     """Load a trained model or create a minimal trained one"""
     if os.path.exists(model_path):
-        try:
-            with open(model_path, 'rb') as f:
-                model = pickle.load(f)
+        # Shared handle, validated now so an unreadable file still falls back to a fresh model
+        model = model_registry.handle(model_path, validate=True)
+        if model is not None:
             print(f"✅ Loaded trained model: {model_path}")
             return model
-        except Exception as e:
-            print(f"⚠️  Error loading model {model_path}: {e}")
+        print(f"⚠️  Error loading model {model_path}")
     
     # Create minimal trained model
     print(f"🔧 Creating minimal trained model: {model_path}")
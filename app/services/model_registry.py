@@ -0,0 +1,441 @@
+"""
+Model Registry - Shared, lazily loaded, memory-mapped ML model artifacts
+Services ask the registry for a handle to a pickled model file instead of
+unpickling their own copy at init. The first predict through any handle loads
+the artifact; artifacts are keyed by content hash, so every handle to the same
+bytes shares one in-memory model. On first load a pickled model is re-dumped
+with joblib next to the models, and loaded from there with mmap_mode so its
+numpy arrays are file-backed pages shared by every worker process.
+
+Handles count as references to their artifact. Models unused for the idle
+window are evicted (their handles reload on next use); artifacts no handle
+refers to are dropped, and joblib files for content no model file has any more
+are deleted. A handle whose file was rewritten (e.g. retrained) moves to the
+new content on its next use. Training through a handle (fit and friends)
+detaches it onto a private, fully loaded copy so shared models are never
+mutated.
+"""
+
+import hashlib
+import os
+import pickle
+import pickletools
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional, Any, Tuple
+import joblib
+import numpy as np
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+REGISTRY_DIR_NAME = ".registry"  # joblib artifacts, inside the model directory
+
+
+def _model_bytes(model) -> Tuple[int, int]:
+    """(private, mapped) bytes of the numpy arrays reachable from a model"""
+    private = mapped = 0
+    seen = set()
+    stack = [model]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, np.ndarray):
+            base = obj
+            while base is not None and not isinstance(base, np.memmap):
+                base = base.base if isinstance(base, np.ndarray) else None
+            if base is None:
+                private += obj.nbytes
+            else:
+                mapped += obj.nbytes
+            if obj.dtype == object:
+                stack.extend(obj.ravel())
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+            stack.extend(vars(obj).values())
+        if hasattr(obj, "__getstate__") and type(obj).__module__.startswith("sklearn.tree"):
+            # Cython trees keep their node arrays in their pickled state
+            try:
+                stack.append(obj.__getstate__())
+            except Exception:
+                pass
+    return private, mapped
+
+
+def _pickled_class_name(path: str) -> Optional[str]:
+    """Class name of the object pickled in a file, read from its opcodes without unpickling"""
+    strings: List[str] = []
+    try:
+        with open(path, "rb") as f:
+            for opcode, arg, _ in pickletools.genops(f):
+                if opcode.name in ("GLOBAL", "INST"):
+                    module, name = arg.split(" ", 1)
+                elif opcode.name == "STACK_GLOBAL" and len(strings) >= 2:
+                    module, name = strings[-2], strings[-1]
+                else:
+                    if isinstance(arg, str):
+                        strings.append(arg)
+                    continue
+                if module not in ("copyreg", "copy_reg"):  # Protocol 0/1 reconstructor precedes the class
+                    return name
+    except Exception:
+        pass
+    return None
+
+
+class ModelEntry:
+    """One content-addressed model artifact"""
+
+    def __init__(self, key: str, path: str):
+        self.key = key
+        self.path = path
+        self.model = None
+        self.refs = 0
+        self.loads = 0
+        self.uses = 0
+        self.evictions = 0
+        self.mmap = False
+        self.last_used = time.monotonic()
+
+
+class ModelHandle:
+    """Stand-in for a model that loads through the registry on first use"""
+
+    def __init__(self, registry: "ModelRegistry", path: str, name: Optional[str] = None):
+        self._registry = registry
+        self.path = path
+        self.name = name or os.path.splitext(os.path.basename(path))[0]
+        self._key: Optional[str] = None
+        self._finalizer = None  # Drops this handle's reference when it is garbage collected
+        self._private = None  # Detached copy after training through this handle
+
+    def _model(self):
+        if self._private is not None:
+            return self._private
+        return self._registry._resolve(self)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._private is not None or self._registry._is_resident(self._key)
+
+    @property
+    def model_class(self) -> Optional[str]:
+        """Class name of the wrapped estimator; never loads the model"""
+        if self._private is not None:
+            return type(self._private).__name__
+        return self._registry.model_class(self)
+
+    @property
+    def loaded_model(self):
+        """The wrapped estimator if it is already in memory, else None (never loads)"""
+        if self._private is not None:
+            return self._private
+        return self._registry._resident_model(self._key)
+
+    def _detach(self):
+        if self._private is None:
+            self._private = self._registry.load_private(self.path)
+            self._registry._release_handle(self)
+        return self._private
+
+    # Inference goes to the shared model
+    def predict(self, *args, **kwargs):
+        return self._model().predict(*args, **kwargs)
+
+    def predict_proba(self, *args, **kwargs):
+        return self._model().predict_proba(*args, **kwargs)
+
+    def transform(self, *args, **kwargs):
+        return self._model().transform(*args, **kwargs)
+
+    def score(self, *args, **kwargs):
+        return self._model().score(*args, **kwargs)
+
+    # Training works on a private copy
+    def fit(self, *args, **kwargs):
+        self._detach().fit(*args, **kwargs)
+        return self
+
+    def partial_fit(self, *args, **kwargs):
+        self._detach().partial_fit(*args, **kwargs)
+        return self
+
+    def fit_transform(self, *args, **kwargs):
+        return self._detach().fit_transform(*args, **kwargs)
+
+    def fit_predict(self, *args, **kwargs):
+        return self._detach().fit_predict(*args, **kwargs)
+
+    def __getattr__(self, attribute):
+        if attribute.startswith("__") or attribute in ("_registry", "_key", "_finalizer", "_private", "path", "name"):
+            raise AttributeError(attribute)
+        return getattr(self._model(), attribute)
+
+    def __reduce_ex__(self, protocol):
+        # Pickling a handle (e.g. when a service saves its model) writes the model itself,
+        # loadable without this module
+        return (pickle.loads, (pickle.dumps(self._model(), protocol),))
+
+    def __repr__(self):
+        return f"<ModelHandle {self.name} loaded={self.is_loaded}>"
+
+
+class ModelRegistry:
+    """Process-wide registry of shared model artifacts"""
+
+    def __init__(self, idle_seconds: Optional[float] = None, use_mmap: Optional[bool] = None):
+        self._idle_seconds = idle_seconds
+        self._use_mmap = use_mmap
+        self._entries: Dict[str, ModelEntry] = {}
+        self._hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}  # path -> ((size, mtime_ns), content hash)
+        self._paths = set()  # Every model file a handle was created for
+        self._class_names: Dict[str, Optional[str]] = {}  # content hash -> pickled class name
+        self._lock = threading.RLock()
+        self._last_sweep = time.monotonic()
+        self.stats = {"handles": 0, "loads": 0, "evictions": 0, "detached": 0, "rekeyed": 0,
+                      "artifacts_removed": 0, "invalid": 0}
+
+    @property
+    def idle_seconds(self) -> float:
+        return settings.model_registry_idle_seconds if self._idle_seconds is None else self._idle_seconds
+
+    @property
+    def use_mmap(self) -> bool:
+        return settings.model_registry_mmap if self._use_mmap is None else self._use_mmap
+
+    def handle(self, path: str, name: Optional[str] = None, validate: bool = False) -> Optional[ModelHandle]:
+        """Handle for a model file, or None if the file does not exist; nothing is read yet.
+
+        With validate=True the model is loaded now, and None is returned if the file
+        cannot be unpickled, so callers can fall back to building a fresh model.
+        """
+        if not os.path.exists(path):
+            return None
+        self.stats["handles"] += 1
+        handle = ModelHandle(self, os.path.abspath(path), name)
+        with self._lock:
+            self._paths.add(handle.path)
+        if validate:
+            try:
+                handle._model()
+            except Exception as e:
+                self.stats["invalid"] += 1
+                self._release_handle(handle)
+                logger.warning("Model file could not be loaded", path=handle.path, error=str(e))
+                return None
+        return handle
+
+    def content_hash(self, path: str) -> str:
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self._hashes.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        self._hashes[path] = (signature, digest.hexdigest())
+        return self._hashes[path][1]
+
+    def _resolve(self, handle: ModelHandle):
+        with self._lock:
+            try:
+                key = self.content_hash(handle.path)
+            except OSError:
+                if handle._key is None:
+                    raise
+                key = handle._key  # File removed: keep serving the model already attached
+            if handle._key is not None and handle._key != key:
+                # The file was rewritten since this handle attached; move to the new content
+                self._release_handle(handle)
+                self.stats["rekeyed"] += 1
+            if handle._key is None:
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = self._entries[key] = ModelEntry(key, handle.path)
+                entry.refs += 1
+                handle._key = key
+                handle._finalizer = weakref.finalize(handle, self._release, key)
+            entry = self._entries[handle._key]
+            if entry.model is None:
+                entry.model, entry.mmap = self._load(entry)
+                entry.loads += 1
+                self.stats["loads"] += 1
+            entry.uses += 1
+            entry.last_used = time.monotonic()
+            model = entry.model
+        self._maybe_sweep()
+        return model
+
+    def _is_resident(self, key: Optional[str]) -> bool:
+        return self._resident_model(key) is not None
+
+    def _resident_model(self, key: Optional[str]):
+        entry = self._entries.get(key) if key else None
+        return entry.model if entry is not None else None
+
+    def model_class(self, handle: ModelHandle) -> Optional[str]:
+        with self._lock:
+            model = self._resident_model(handle._key)
+            if model is not None:
+                return type(model).__name__
+            try:
+                key = self.content_hash(handle.path)
+            except OSError:
+                return None
+            if key not in self._class_names:
+                self._class_names[key] = _pickled_class_name(handle.path)
+            return self._class_names[key]
+
+    def _artifact_path(self, entry: ModelEntry) -> str:
+        return os.path.join(os.path.dirname(entry.path), REGISTRY_DIR_NAME, f"{entry.key}.joblib")
+
+    def _load(self, entry: ModelEntry) -> Tuple[Any, bool]:
+        if self.use_mmap:
+            artifact = self._artifact_path(entry)
+            try:
+                if not os.path.exists(artifact):
+                    with open(entry.path, "rb") as f:
+                        model = pickle.load(f)
+                    os.makedirs(os.path.dirname(artifact), exist_ok=True)
+                    temp_path = f"{artifact}.{os.getpid()}.tmp"
+                    joblib.dump(model, temp_path)
+                    os.replace(temp_path, artifact)
+                model = joblib.load(artifact, mmap_mode="r")
+                logger.info("Loaded shared model", path=entry.path, key=entry.key[:12], mmap=True)
+                return model, True
+            except Exception as e:
+                logger.warning("Memory-mapped model load failed, unpickling", path=entry.path, error=str(e))
+        with open(entry.path, "rb") as f:
+            model = pickle.load(f)
+        logger.info("Loaded shared model", path=entry.path, key=entry.key[:12], mmap=False)
+        return model, False
+
+    def load_private(self, path: str):
+        """A fully loaded, writable copy of a model file"""
+        self.stats["detached"] += 1
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def _release_handle(self, handle: ModelHandle):
+        with self._lock:
+            if handle._finalizer is not None:
+                handle._finalizer()  # Releases the reference once, now rather than at collection
+            handle._finalizer = None
+            handle._key = None
+
+    def _release(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.refs > 0:
+                entry.refs -= 1
+            if entry is not None and entry.refs == 0 and not self._is_current(key):
+                # Superseded content nothing refers to any more
+                del self._entries[key]
+                self._remove_artifact(entry)
+
+    def _is_current(self, key: str) -> bool:
+        return any(cached[1] == key for cached in self._hashes.values())
+
+    def _remove_artifact(self, entry: ModelEntry):
+        try:
+            os.remove(self._artifact_path(entry))
+            self.stats["artifacts_removed"] += 1
+        except OSError:
+            pass
+
+    def prune_artifacts(self) -> int:
+        """Delete joblib artifacts that match neither a loaded entry nor any model file's current content"""
+        with self._lock:
+            keep = set(self._entries)
+            directories = set()
+            for path in list(self._paths):
+                directories.add(os.path.join(os.path.dirname(path), REGISTRY_DIR_NAME))
+                try:
+                    keep.add(self.content_hash(path))
+                except OSError:
+                    pass  # Removed model file: its artifacts are stale too
+            removed = 0
+            for directory in directories:
+                try:
+                    names = os.listdir(directory)
+                except OSError:
+                    continue
+                for name in names:
+                    key, extension = os.path.splitext(name)
+                    if extension == ".joblib" and key not in keep:
+                        try:
+                            os.remove(os.path.join(directory, name))
+                            removed += 1
+                        except OSError:
+                            pass
+        self.stats["artifacts_removed"] += removed
+        if removed:
+            logger.info("Removed superseded model artifacts", removed=removed)
+        return removed
+
+    def _maybe_sweep(self):
+        now = time.monotonic()
+        if now - self._last_sweep >= min(60.0, self.idle_seconds):
+            self._last_sweep = now
+            self.evict_idle()
+
+    def evict_idle(self, idle_seconds: Optional[float] = None) -> int:
+        """Unload models unused for the idle window and drop artifacts without references"""
+        idle_seconds = self.idle_seconds if idle_seconds is None else idle_seconds
+        now = time.monotonic()
+        evicted = 0
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.model is not None and now - entry.last_used >= idle_seconds:
+                    entry.model = None
+                    entry.evictions += 1
+                    evicted += 1
+                if entry.refs == 0 and entry.model is None:
+                    del self._entries[key]
+        self.stats["evictions"] += evicted
+        if evicted:
+            logger.info("Evicted idle models", evicted=evicted)
+        self.prune_artifacts()
+        return evicted
+
+    def get_status(self) -> Dict[str, Any]:
+        models: List[Dict[str, Any]] = []
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._entries.values())
+        for entry in entries:
+            private, mapped = _model_bytes(entry.model) if entry.model is not None else (0, 0)
+            models.append({
+                "path": entry.path,
+                "content_hash": entry.key,
+                "resident": entry.model is not None,
+                "mmap": entry.mmap,
+                "private_bytes": private,
+                "mapped_bytes": mapped,
+                "references": entry.refs,
+                "loads": entry.loads,
+                "uses": entry.uses,
+                "evictions": entry.evictions,
+                "idle_seconds": round(now - entry.last_used, 1),
+            })
+        return {
+            "models": sorted(models, key=lambda model: model["path"]),
+            "resident_models": sum(model["resident"] for model in models),
+            "private_bytes": sum(model["private_bytes"] for model in models),
+            "mapped_bytes": sum(model["mapped_bytes"] for model in models),
+            "idle_seconds": self.idle_seconds,
+            **self.stats,
+        }
+
+
+model_registry = ModelRegistry()
@@ -1,50 +1,253 @@
 import os
-import importlib.util
 import sys
-from typing import Dict, List, Any
+import time
+import queue
+import hashlib
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional
+import structlog
+
+from app.core.config import settings
+from app.services import plugin_worker
+
+logger = structlog.get_logger()
 
 PLUGIN_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'plugins')
 PLUGIN_DIR = os.path.abspath(PLUGIN_DIR)
 
+
+class PluginError(Exception):
+    """Plugin code failed, timed out or crashed its worker"""
+
+
+class PluginTimeout(PluginError):
+    """Plugin call exceeded its timeout; the worker running it was replaced"""
+
+
+_main_swap_lock = threading.Lock()
+
+
+@contextmanager
+def _worker_main_module():
+    """Make plugin_worker the __main__ that spawn/forkserver children re-import.
+
+    Both start methods re-run the parent's __main__ in every new process; under
+    `python main_unified.py` that is the whole app, whose imports would start
+    services while the child is still bootstrapping.
+    """
+    with _main_swap_lock:
+        original = sys.modules.get("__main__")
+        sys.modules["__main__"] = plugin_worker
+        try:
+            yield
+        finally:
+            sys.modules["__main__"] = original
+
+
+class _PluginWorker:
+    def __init__(self, context, memory_limit_mb: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=plugin_worker.worker_main, args=(child_conn, memory_limit_mb),
+                                       daemon=True)
+        with _worker_main_module():
+            self.process.start()
+        child_conn.close()
+
+    def stop(self, graceful: bool = True):
+        if graceful and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(1)
+            except (OSError, ValueError):
+                pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(1)
+        self.conn.close()
+
+
+class PluginWorkerPool:
+    """Warm subprocesses executing plugin calls with per-call timeouts and memory limits"""
+
+    def __init__(self, size: int, timeout: float, memory_limit_mb: int):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        methods = multiprocessing.get_all_start_methods()
+        # forkserver/spawn avoid forking a multi-threaded server process
+        self._context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._idle: "queue.Queue[_PluginWorker]" = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self.replaced = 0
+
+    def _acquire(self, timeout: float) -> _PluginWorker:
+        with self._lock:
+            if self._idle.empty() and self._started < self.size:
+                self._started += 1
+                return _PluginWorker(self._context, self.memory_limit_mb)
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise PluginTimeout(f"No plugin worker available within {timeout}s")
+
+    def _replace(self, worker: _PluginWorker):
+        worker.stop(graceful=False)
+        self.replaced += 1
+        self._idle.put(_PluginWorker(self._context, self.memory_limit_mb))
+
+    def call(self, path: str, digest: str, method: str, args: tuple = (), timeout: Optional[float] = None) -> Any:
+        timeout = timeout or self.timeout
+        worker = self._acquire(timeout)
+        try:
+            worker.conn.send((path, digest, method, args))
+            if not worker.conn.poll(timeout):
+                self._replace(worker)
+                raise PluginTimeout(f"{method} timed out after {timeout}s")
+            status, result = worker.conn.recv()
+        except (EOFError, OSError, BrokenPipeError) as e:
+            self._replace(worker)
+            raise PluginError(f"Plugin worker crashed: {type(e).__name__}")
+        self._idle.put(worker)
+        if status != "ok":
+            raise PluginError(result)
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            while not self._idle.empty():
+                self._idle.get_nowait().stop()
+            self._started = 0
+
+
 class PluginManager:
-    def __init__(self):
-        self.plugins = {}  # name -> plugin instance
+    def __init__(self, plugin_dir: str = PLUGIN_DIR, workers: Optional[int] = None,
+                 timeout: Optional[float] = None, memory_limit_mb: Optional[int] = None):
+        self.plugin_dir = plugin_dir
+        self.plugins = {}  # name -> {"path", "digest", "mtime_ns", "size", "class_name"}
+        self.failed = {}  # name -> load error
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.pool = PluginWorkerPool(
+            workers or settings.plugin_workers,
+            timeout or settings.plugin_timeout_seconds,
+            memory_limit_mb if memory_limit_mb is not None else settings.plugin_memory_limit_mb,
+        )
+        self._reload_lock = threading.Lock()
         self.reload_plugins()
 
-    def reload_plugins(self):
-        self.plugins = {}
-        for fname in os.listdir(PLUGIN_DIR):
-            if fname.endswith('.py') and fname != 'base_plugin.py':
+    def reload_plugins(self) -> Dict[str, List[str]]:
+        """Load new and changed plugin files only; unchanged files are not re-executed.
+
+        A file is considered changed when its mtime/size differ and its content hash
+        differs too, so touching a file does not trigger a reload.
+        """
+        summary = {"loaded": [], "reloaded": [], "unchanged": [], "removed": [], "failed": []}
+        with self._reload_lock:
+            seen = set()
+            for fname in sorted(os.listdir(self.plugin_dir)):
+                if not fname.endswith('.py') or fname == 'base_plugin.py':
+                    continue
                 plugin_name = fname[:-3]
-                plugin_path = os.path.join(PLUGIN_DIR, fname)
-                spec = importlib.util.spec_from_file_location(plugin_name, plugin_path)
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    sys.modules[plugin_name] = module
-                    try:
-                        spec.loader.exec_module(module)
-                        for attr in dir(module):
-                            obj = getattr(module, attr)
-                            if hasattr(obj, '__bases__') and 'BasePlugin' in [b.__name__ for b in obj.__bases__]:
-                                self.plugins[plugin_name] = obj()
-                    except Exception as e:
-                        print(f"Failed to load plugin {plugin_name}: {e}")
+                plugin_path = os.path.join(self.plugin_dir, fname)
+                seen.add(plugin_name)
+                stat = os.stat(plugin_path)
+                current = self.plugins.get(plugin_name) or self.failed.get(plugin_name)
+                if current and (current["mtime_ns"], current["size"]) == (stat.st_mtime_ns, stat.st_size):
+                    summary["unchanged"].append(plugin_name)
+                    continue
+                with open(plugin_path, 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+                entry = {"path": plugin_path, "digest": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                if current and current["digest"] == digest:
+                    current.update(entry)
+                    summary["unchanged"].append(plugin_name)
+                    continue
+                try:
+                    # Validated in a worker: plugin code never runs in the server process
+                    entry["class_name"] = self.pool.call(plugin_path, digest, "load")
+                except PluginError as e:
+                    logger.error("Failed to load plugin", plugin=plugin_name, error=str(e))
+                    self.plugins.pop(plugin_name, None)
+                    self.failed[plugin_name] = {**entry, "error": str(e)}
+                    summary["failed"].append(plugin_name)
+                    continue
+                summary["reloaded" if plugin_name in self.plugins else "loaded"].append(plugin_name)
+                self.failed.pop(plugin_name, None)
+                self.plugins[plugin_name] = entry
+            for plugin_name in set(self.plugins) - seen:
+                del self.plugins[plugin_name]
+                summary["removed"].append(plugin_name)
+            for plugin_name in set(self.failed) - seen:
+                del self.failed[plugin_name]
+        return summary
+
+    def _call(self, name: str, method: str, *args) -> Any:
+        plugin = self.plugins[name]
+        stats = self.stats.setdefault(name, {
+            "calls": 0, "failures": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0, "last_error": None
+        })
+        stats["calls"] += 1
+        start = time.perf_counter()
+        try:
+            return self.pool.call(plugin["path"], plugin["digest"], method, args)
+        except PluginError as e:
+            stats["failures"] += 1
+            if isinstance(e, PluginTimeout):
+                stats["timeouts"] += 1
+            stats["last_error"] = f"{method}: {e}"
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            stats["total_ms"] += elapsed
+            stats["max_ms"] = max(stats["max_ms"], elapsed)
 
     def list_plugins(self) -> List[str]:
         return list(self.plugins.keys())
 
     def describe_plugin(self, name: str) -> str:
-        plugin = self.plugins.get(name)
-        return plugin.describe() if plugin else "Plugin not found"
+        if name not in self.plugins:
+            return "Plugin not found"
+        try:
+            return self._call(name, "describe")
+        except PluginError as e:
+            return f"Plugin error: {e}"
 
     def run_plugin(self, name: str, data: Dict[str, Any]) -> Any:
-        plugin = self.plugins.get(name)
-        if not plugin:
+        if name not in self.plugins:
             return {"error": "Plugin not found"}
-        return plugin.run(data)
+        try:
+            return self._call(name, "run", data)
+        except PluginError as e:
+            return {"error": str(e), "timeout": isinstance(e, PluginTimeout)}
 
     def test_plugin(self, name: str) -> bool:
-        plugin = self.plugins.get(name)
-        if not plugin:
+        if name not in self.plugins:
             return False
-        return plugin.test() 
\ No newline at end of file
+        try:
+            return self._call(name, "test")
+        except PluginError:
+            return False
+
+    def get_stats(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Per-plugin latency and failure statistics"""
+        names = [name] if name else list(self.plugins)
+        result = {}
+        for plugin_name in names:
+            stats = dict(self.stats.get(plugin_name, {"calls": 0, "failures": 0, "timeouts": 0,
+                                                       "total_ms": 0.0, "max_ms": 0.0, "last_error": None}))
+            stats["avg_ms"] = round(stats["total_ms"] / stats["calls"], 2) if stats["calls"] else 0.0
+            stats["total_ms"] = round(stats["total_ms"], 2)
+            stats["max_ms"] = round(stats["max_ms"], 2)
+            stats["digest"] = self.plugins[plugin_name]["digest"][:12] if plugin_name in self.plugins else None
+            result[plugin_name] = stats
+        return {
+            "plugins": result,
+            "failed_to_load": {n: entry["error"] for n, entry in self.failed.items()},
+            "workers": self.pool.size,
+            "workers_replaced": self.pool.replaced,
+        }
+
+    def shutdown(self):
+        self.pool.shutdown()
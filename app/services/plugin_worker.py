@@ -0,0 +1,63 @@
+"""
+Plugin worker process entry point
+Kept free of application imports: worker processes use this module as their
+__main__, so starting one never re-imports the server entry script (and with
+it the whole FastAPI app and its module-level services).
+"""
+
+import os
+import importlib.util
+from typing import Dict, Any, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def load_plugin(path: str, digest: str):
+    """Execute a plugin file and instantiate its BasePlugin subclass"""
+    plugin_name = os.path.basename(path)[:-3]
+    spec = importlib.util.spec_from_file_location(f"plugin_{plugin_name}_{digest[:12]}", path)
+    if not spec or not spec.loader:
+        raise ImportError(f"Cannot load {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for attr in dir(module):
+        obj = getattr(module, attr)
+        if hasattr(obj, '__bases__') and 'BasePlugin' in [b.__name__ for b in obj.__bases__]:
+            return obj()
+    raise ImportError(f"No BasePlugin subclass in {os.path.basename(path)}")
+
+
+def worker_main(conn, memory_limit_mb: int):
+    """Worker loop: keeps loaded plugins warm, keyed by path and content hash"""
+    if resource is not None and memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    loaded: Dict[str, Tuple[str, Any]] = {}
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if request is None:
+            return
+        path, digest, method, args = request
+        try:
+            cached = loaded.get(path)
+            if cached is None or cached[0] != digest:
+                loaded[path] = (digest, load_plugin(path, digest))
+            instance = loaded[path][1]
+            result = type(instance).__name__ if method == "load" else getattr(instance, method)(*args)
+            reply = ("ok", result)
+        except MemoryError:
+            loaded.pop(path, None)
+            reply = ("error", f"MemoryError: plugin exceeded the {memory_limit_mb} MB worker limit")
+        except BaseException as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # Unpicklable result
+            conn.send(("error", f"Plugin result could not be returned: {e}"))
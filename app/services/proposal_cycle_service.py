@@ -11,9 +11,13 @@ from enum import Enum
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import init_database, SessionLocal
+from app.core.database import init_database
+from app.core.task_supervisor import task_supervisor, RESTART_ON_FAILURE
 from app.models.sql_models import Proposal
 from app.services.ai_agent_service import AIAgentService
+from app.services.proposal_events import (
+    ProposalEvent, PROPOSAL_CREATED, PROPOSAL_STATUS_CHANGED, PROPOSAL_DELETED, get_proposal_event_bus
+)
 
 logger = structlog.get_logger()
 
@@ -32,140 +36,196 @@ class AIAgent(Enum):
     CONQUEST = "conquest"
 
 class ProposalCycleService:
-    """Manages round-robin proposal generation cycles"""
+    """Manages round-robin proposal generation cycles.
+
+    Per-agent proposal counts by status are kept in memory, updated from proposal
+    lifecycle events and reconciled against the database on startup and periodically,
+    so turn-taking needs no database round-trip.
+    """
+    
+    _instance = None
+    _initialized = False
+    
+    # Statuses that keep a cycle open
+    ACTIVE_STATUSES = ("pending", "in_review")
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ProposalCycleService, cls).__new__(cls)
+        return cls._instance
     
     def __init__(self):
-        self.current_agent_index = 0
-        self.proposals_per_agent = 5  # Each AI creates 5 proposals before moving to next
-        self.agents = [AIAgent.IMPERIUM, AIAgent.GUARDIAN, AIAgent.SANDBOX, AIAgent.CONQUEST]
-        self.cycle_status = CycleStatus.ACTIVE
-        self.last_cycle_reset = datetime.now()
-        self.ai_agent_service = None
+        if not self._initialized:
+            self.current_agent_index = 0
+            self.proposals_per_agent = 5  # Each AI creates 5 proposals before moving to next
+            self.agents = [AIAgent.IMPERIUM, AIAgent.GUARDIAN, AIAgent.SANDBOX, AIAgent.CONQUEST]
+            self.cycle_status = CycleStatus.ACTIVE
+            self.last_cycle_reset = datetime.now()
+            self.ai_agent_service = None
+            self.reconcile_interval = 300  # Seconds between reconciliations with the database
+            self._counts: Dict[str, Dict[str, int]] = {}  # ai_type -> status -> count
+            self._last_reconciled: Optional[datetime] = None
+            self._needs_reconcile = True
+            self._reconcile_task: Optional[asyncio.Task] = None
+            self._state_stats = {"events_applied": 0, "reconciliations": 0, "drift_corrections": 0}
+            get_proposal_event_bus().subscribe(self._on_proposal_event)
+            self._initialized = True
         
     @classmethod
     async def initialize(cls):
         """Initialize the proposal cycle service"""
         service = cls()
-        service.ai_agent_service = await AIAgentService.initialize()
+        if service.ai_agent_service is None:
+            service.ai_agent_service = await AIAgentService.initialize()
+        try:
+            await service.reconcile()
+        except Exception as e:
+            logger.warning(f"Initial proposal cycle reconciliation failed: {e}")
+        if service._reconcile_task is None or service._reconcile_task.done():
+            service._reconcile_task = task_supervisor.spawn(
+                "proposal-cycle-reconcile", service._reconcile_loop, owner="proposal_cycle",
+                restart=RESTART_ON_FAILURE, interval=service.reconcile_interval
+            )
         logger.info("🔄 Proposal Cycle Service initialized")
         return service
     
+    def _adjust(self, ai_type: Optional[str], status: Optional[str], delta: int):
+        if ai_type is None or status is None:
+            return
+        agent_counts = self._counts.setdefault(ai_type, {})
+        agent_counts[status] = max(0, agent_counts.get(status, 0) + delta)
+    
+    def _on_proposal_event(self, proposal_event: ProposalEvent):
+        """Apply a committed proposal change to the in-memory counts"""
+        if proposal_event.kind == PROPOSAL_CREATED:
+            self._adjust(proposal_event.ai_type, proposal_event.new_status, 1)
+        elif proposal_event.kind == PROPOSAL_STATUS_CHANGED:
+            if proposal_event.old_status is None:
+                # Previous status unknown: count the new one and reconcile before the next read
+                self._needs_reconcile = True
+            self._adjust(proposal_event.ai_type, proposal_event.old_status, -1)
+            self._adjust(proposal_event.ai_type, proposal_event.new_status, 1)
+        elif proposal_event.kind == PROPOSAL_DELETED:
+            self._adjust(proposal_event.ai_type, proposal_event.old_status, -1)
+        self._state_stats["events_applied"] += 1
+    
+    async def reconcile(self):
+        """Replace the in-memory counts with one GROUP BY over proposals"""
+        await init_database()
+        from app.core.database import get_session
+        
+        async with get_session() as session:
+            result = await session.execute(
+                select(Proposal.ai_type, Proposal.status, func.count(Proposal.id))
+                .group_by(Proposal.ai_type, Proposal.status)
+            )
+            counts: Dict[str, Dict[str, int]] = {}
+            for ai_type, status, count in result:
+                counts.setdefault(ai_type, {})[status] = count
+        
+        if self._last_reconciled is not None and counts != self._current_counts():
+            self._state_stats["drift_corrections"] += 1
+            logger.info("🔄 Proposal cycle state corrected from database")
+        self._counts = counts
+        self._last_reconciled = datetime.now()
+        self._needs_reconcile = False
+        self._state_stats["reconciliations"] += 1
+    
+    async def _ensure_reconciled(self):
+        """Reconcile before a read if never done yet or an event left the counts uncertain"""
+        if self._last_reconciled is None or self._needs_reconcile:
+            await self.reconcile()
+    
+    async def _reconcile_loop(self):
+        """Periodically reconcile the in-memory state (catches bulk updates and missed events)"""
+        while True:
+            try:
+                await asyncio.sleep(self.reconcile_interval)
+                await self.reconcile()
+                task_supervisor.beat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error reconciling proposal cycle state: {e}")
+                task_supervisor.beat(error=e)
+    
+    def _current_counts(self) -> Dict[str, Dict[str, int]]:
+        return {
+            ai_type: {status: count for status, count in statuses.items() if count}
+            for ai_type, statuses in self._counts.items()
+            if any(statuses.values())
+        }
+    
+    def _count(self, ai_type: str, status: str) -> int:
+        return self._counts.get(ai_type, {}).get(status, 0)
+    
+    def _active_total(self) -> int:
+        return sum(
+            statuses.get(status, 0) for statuses in self._counts.values() for status in self.ACTIVE_STATUSES
+        )
+    
     async def get_next_agent(self) -> Optional[AIAgent]:
         """Get the next AI agent that should generate a proposal"""
         try:
-            await init_database()
-            from app.core.database import get_session
+            await self._ensure_reconciled()
             
-            async with get_session() as session:
-                # Check if current cycle is complete (all proposals approved/rejected)
-                if await self._is_cycle_complete(session):
-                    logger.info("🔄 Cycle complete, starting new cycle")
-                    self.current_agent_index = 0
-                    self.last_cycle_reset = datetime.now()
-                    self.cycle_status = CycleStatus.ACTIVE
-                
-                # Get current agent
+            # Check if current cycle is complete (all proposals approved/rejected)
+            if self._is_cycle_complete():
+                logger.info("🔄 Cycle complete, starting new cycle")
+                self.current_agent_index = 0
+                self.last_cycle_reset = datetime.now()
+                self.cycle_status = CycleStatus.ACTIVE
+            
+            # Get current agent
+            current_agent = self.agents[self.current_agent_index]
+            
+            # Check if current agent has completed its quota
+            if self._has_agent_completed_proposals(current_agent):
+                # Move to next agent
+                self.current_agent_index = (self.current_agent_index + 1) % len(self.agents)
                 current_agent = self.agents[self.current_agent_index]
-                
-                # Check if current agent has completed its quota
-                if await self._has_agent_completed_proposals(session, current_agent):
-                    # Move to next agent
-                    self.current_agent_index = (self.current_agent_index + 1) % len(self.agents)
-                    current_agent = self.agents[self.current_agent_index]
-                    logger.info(f"🔄 Moving to next agent: {current_agent.value}")
-                
-                return current_agent
+                logger.info(f"🔄 Moving to next agent: {current_agent.value}")
+            
+            return current_agent
                 
         except Exception as e:
             logger.error(f"Error getting next agent: {e}")
             return None
     
-    async def _is_cycle_complete(self, session: AsyncSession) -> bool:
+    def _is_cycle_complete(self) -> bool:
         """Check if the current cycle is complete (all proposals approved/rejected)"""
-        try:
-            # Count pending proposals
-            pending_query = select(func.count(Proposal.id)).where(Proposal.status == "pending")
-            pending_result = await session.execute(pending_query)
-            pending_count = pending_result.scalar() or 0
-            
-            # Count in_review proposals
-            review_query = select(func.count(Proposal.id)).where(Proposal.status == "in_review")
-            review_result = await session.execute(review_query)
-            review_count = review_result.scalar() or 0
-            
-            total_active = pending_count + review_count
-            
-            if total_active == 0:
-                logger.info("🔄 All proposals processed, cycle complete")
-                return True
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"Error checking cycle completion: {e}")
-            return False
+        if self._active_total() == 0:
+            logger.info("🔄 All proposals processed, cycle complete")
+            return True
+        return False
     
-    async def _has_agent_completed_proposals(self, session: AsyncSession, agent: AIAgent) -> bool:
+    def _has_agent_completed_proposals(self, agent: AIAgent) -> bool:
         """Check if an agent has completed its proposal quota"""
-        try:
-            # Count pending proposals for this agent
-            query = select(func.count(Proposal.id)).where(
-                Proposal.status == "pending",
-                Proposal.ai_type == agent.value
-            )
-            result = await session.execute(query)
-            pending_count = result.scalar() or 0
-            
-            # Check if agent has reached its quota
-            if pending_count >= self.proposals_per_agent:
-                logger.info(f"🔄 Agent {agent.value} has completed {pending_count} proposals")
-                return True
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"Error checking agent completion: {e}")
-            return False
+        pending_count = self._count(agent.value, "pending")
+        if pending_count >= self.proposals_per_agent:
+            logger.info(f"🔄 Agent {agent.value} has completed {pending_count} proposals")
+            return True
+        return False
     
     async def get_cycle_status(self) -> Dict:
         """Get current cycle status"""
         try:
-            await init_database()
-            from app.core.database import get_session
+            await self._ensure_reconciled()
             
-            async with get_session() as session:
-                # Get proposal counts by status and agent
-                status_query = select(
-                    Proposal.ai_type,
-                    Proposal.status,
-                    func.count(Proposal.id).label('count')
-                ).group_by(Proposal.ai_type, Proposal.status)
-                
-                result = await session.execute(status_query)
-                proposal_counts = {}
-                
-                for row in result:
-                    ai_type = row.ai_type
-                    status = row.status
-                    count = row.count
-                    
-                    if ai_type not in proposal_counts:
-                        proposal_counts[ai_type] = {}
-                    
-                    proposal_counts[ai_type][status] = count
-                
-                # Get current agent info
-                current_agent = self.agents[self.current_agent_index]
-                
-                return {
-                    "cycle_status": self.cycle_status.value,
-                    "current_agent": current_agent.value,
-                    "agent_index": self.current_agent_index,
-                    "proposals_per_agent": self.proposals_per_agent,
-                    "last_cycle_reset": self.last_cycle_reset.isoformat(),
-                    "proposal_counts": proposal_counts,
-                    "total_agents": len(self.agents)
-                }
+            # Get current agent info
+            current_agent = self.agents[self.current_agent_index]
+            
+            return {
+                "cycle_status": self.cycle_status.value,
+                "current_agent": current_agent.value,
+                "agent_index": self.current_agent_index,
+                "proposals_per_agent": self.proposals_per_agent,
+                "last_cycle_reset": self.last_cycle_reset.isoformat(),
+                "proposal_counts": self._current_counts(),
+                "total_agents": len(self.agents),
+                "last_reconciled": self._last_reconciled.isoformat() if self._last_reconciled else None,
+                "state": dict(self._state_stats)
+            }
                 
         except Exception as e:
             logger.error(f"Error getting cycle status: {e}")
@@ -186,7 +246,8 @@ class ProposalCycleService:
                 await session.execute(text("DELETE FROM proposals"))
                 await session.commit()
                 
-                # Reset cycle state
+                # Reset cycle state (a raw DELETE publishes no proposal events)
+                self._counts = {}
                 self.current_agent_index = 0
                 self.cycle_status = CycleStatus.ACTIVE
                 self.last_cycle_reset = datetime.now()
@@ -201,36 +262,21 @@ class ProposalCycleService:
     async def get_agent_progress(self, agent: AIAgent) -> Dict:
         """Get progress for a specific agent"""
         try:
-            await init_database()
-            from app.core.database import get_session
+            await self._ensure_reconciled()
             
-            async with get_session() as session:
-                # Count proposals by status for this agent
-                query = select(
-                    Proposal.status,
-                    func.count(Proposal.id).label('count')
-                ).where(
-                    Proposal.ai_type == agent.value
-                ).group_by(Proposal.status)
-                
-                result = await session.execute(query)
-                status_counts = {}
-                
-                for row in result:
-                    status_counts[row.status] = row.count
-                
-                pending_count = status_counts.get("pending", 0)
-                progress = min(pending_count / self.proposals_per_agent, 1.0)
-                
-                return {
-                    "agent": agent.value,
-                    "pending_count": pending_count,
-                    "quota": self.proposals_per_agent,
-                    "progress": progress,
-                    "is_complete": pending_count >= self.proposals_per_agent,
-                    "status_counts": status_counts
-                }
+            status_counts = {status: count for status, count in self._counts.get(agent.value, {}).items() if count}
+            pending_count = status_counts.get("pending", 0)
+            progress = min(pending_count / self.proposals_per_agent, 1.0)
+            
+            return {
+                "agent": agent.value,
+                "pending_count": pending_count,
+                "quota": self.proposals_per_agent,
+                "progress": progress,
+                "is_complete": pending_count >= self.proposals_per_agent,
+                "status_counts": status_counts
+            }
                 
         except Exception as e:
             logger.error(f"Error getting agent progress: {e}")
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
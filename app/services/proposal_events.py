@@ -0,0 +1,142 @@
+"""
+Proposal Events - In-process proposal lifecycle event bus
+Proposal inserts, status changes and deletes are captured from ORM flushes and
+published once the transaction commits, so subscribers never see rolled-back changes.
+Events are tagged with the transaction that flushed them, so rolling back a SAVEPOINT
+discards only the events of that savepoint.
+Bulk UPDATE/DELETE statements bypass the ORM and are not observed; subscribers that
+keep derived state should reconcile against the database periodically.
+"""
+
+import asyncio
+import inspect as pyinspect
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional, Any
+import structlog
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.sql_models import Proposal
+
+logger = structlog.get_logger()
+
+PROPOSAL_CREATED = "created"
+PROPOSAL_STATUS_CHANGED = "status_changed"
+PROPOSAL_DELETED = "deleted"
+
+
+@dataclass
+class ProposalEvent:
+    """A committed change to a proposal"""
+    kind: str
+    proposal_id: str
+    ai_type: Optional[str]
+    old_status: Optional[str]
+    new_status: Optional[str]
+    file_path: Optional[str] = None
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+
+
+class ProposalEventBus:
+    """Publishes committed proposal lifecycle events to in-process subscribers"""
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ProposalEventBus, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self._subscribers: List[Callable[[ProposalEvent], Any]] = []
+            self._stats = {"published": 0, "subscriber_errors": 0}
+            self._install_session_hooks()
+            self._initialized = True
+
+    def subscribe(self, callback: Callable[[ProposalEvent], Any]):
+        """Register a callback; plain functions run inline, coroutine functions are scheduled as tasks"""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ProposalEvent], Any]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def publish(self, proposal_event: ProposalEvent):
+        self._stats["published"] += 1
+        for callback in list(self._subscribers):
+            try:
+                if pyinspect.iscoroutinefunction(callback):
+                    asyncio.get_running_loop().create_task(callback(proposal_event))
+                else:
+                    callback(proposal_event)
+            except Exception as e:
+                self._stats["subscriber_errors"] += 1
+                logger.error("Proposal event subscriber failed", kind=proposal_event.kind, error=str(e))
+
+    def get_stats(self):
+        return {**self._stats, "subscribers": len(self._subscribers)}
+
+    def _install_session_hooks(self):
+        event.listen(Session, "after_flush", _collect_proposal_changes)
+        event.listen(Session, "after_commit", self._publish_pending)
+        event.listen(Session, "after_soft_rollback", _discard_pending)
+
+    def _publish_pending(self, session: Session):
+        pending = session.info.pop("proposal_events", None)
+        for _, proposal_event in pending or []:
+            self.publish(proposal_event)
+
+
+def _collect_proposal_changes(session: Session, flush_context):
+    """Record proposal changes made by this flush until the transaction commits"""
+    changes: List[ProposalEvent] = []
+    for obj in session.new:
+        if isinstance(obj, Proposal):
+            changes.append(ProposalEvent(
+                PROPOSAL_CREATED, str(obj.id), obj.ai_type, None, obj.status, obj.file_path
+            ))
+    for obj in session.dirty:
+        if isinstance(obj, Proposal):
+            history = inspect(obj).attrs.status.history
+            if history.has_changes():
+                # old_status is None when the previous value was never loaded
+                old_status = history.deleted[0] if history.deleted else None
+                changes.append(ProposalEvent(
+                    PROPOSAL_STATUS_CHANGED, str(obj.id), obj.ai_type, old_status, obj.status, obj.file_path
+                ))
+    for obj in session.deleted:
+        if isinstance(obj, Proposal):
+            changes.append(ProposalEvent(
+                PROPOSAL_DELETED, str(obj.id), obj.ai_type, obj.status, None, obj.file_path
+            ))
+    if changes:
+        # Tagged with the innermost savepoint (None outside one) so its rollback can drop them
+        savepoint = session.get_nested_transaction()
+        session.info.setdefault("proposal_events", []).extend((savepoint, change) for change in changes)
+
+
+def _within(transaction, ancestor) -> bool:
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+def _discard_pending(session: Session, previous_transaction):
+    """Drop events rolled back with a transaction: all of them, or only a savepoint's own"""
+    if not previous_transaction.nested:
+        session.info.pop("proposal_events", None)
+        return
+    pending = session.info.get("proposal_events")
+    if pending:
+        pending[:] = [(transaction, proposal_event) for transaction, proposal_event in pending
+                      if not _within(transaction, previous_transaction)]
+
+
+def get_proposal_event_bus() -> ProposalEventBus:
+    return ProposalEventBus()
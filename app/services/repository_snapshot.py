@@ -0,0 +1,80 @@
+"""
+Repository Snapshot - One read-only view of the repository per agent cycle
+The listing is taken once; file contents are fetched lazily, at most once per
+path (concurrent readers share the in-flight fetch), and derived forms such as
+lower-cased text and lines are computed once and shared by every agent.
+"""
+
+import asyncio
+from datetime import datetime
+from functools import cached_property
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Tuple
+import structlog
+
+logger = structlog.get_logger()
+
+
+class SnapshotFile:
+    """File content with lazily computed, shared derived forms"""
+
+    def __init__(self, path: str, content: str):
+        self.path = path
+        self.content = content
+
+    @cached_property
+    def lower(self) -> str:
+        return self.content.lower()
+
+    @cached_property
+    def lines(self) -> Tuple[str, ...]:
+        return tuple(self.content.splitlines())
+
+
+class RepositorySnapshot:
+    """Immutable repository listing with once-per-cycle file reads"""
+
+    def __init__(self, github_service, items: List[Dict[str, Any]]):
+        self.github_service = github_service
+        self.items: Tuple[MappingProxyType, ...] = tuple(MappingProxyType(dict(item)) for item in items)
+        self.taken_at = datetime.utcnow()
+        self._files: Dict[str, asyncio.Future] = {}  # path -> fetch task
+        self.stats = {"fetches": 0, "hits": 0, "failures": 0}
+
+    @classmethod
+    async def take(cls, github_service) -> Optional["RepositorySnapshot"]:
+        """List the repository once; None when it cannot be read"""
+        items = await github_service.get_repo_content()
+        if not items:
+            return None
+        return cls(github_service, items)
+
+    async def get_file(self, path: str) -> Optional[SnapshotFile]:
+        """File as of this cycle; the first caller fetches it, later and concurrent callers share the result"""
+        task = self._files.get(path)
+        if task is None:
+            # A task of its own, so an agent hitting its deadline does not cancel a fetch others await
+            task = asyncio.ensure_future(self._fetch(path))
+            self._files[path] = task
+            self.stats["fetches"] += 1
+        else:
+            self.stats["hits"] += 1
+        return await asyncio.shield(task)
+
+    async def _fetch(self, path: str) -> Optional[SnapshotFile]:
+        try:
+            content = await self.github_service.get_file_content(path)
+        except Exception as e:
+            logger.warning("Snapshot file fetch failed", path=path, error=str(e))
+            content = None
+        if content is None:
+            self.stats["failures"] += 1
+            return None
+        return SnapshotFile(path, content)
+
+    async def get_file_content(self, path: str) -> Optional[str]:
+        snapshot_file = await self.get_file(path)
+        return snapshot_file.content if snapshot_file else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "files_listed": len(self.items), "taken_at": self.taken_at.isoformat()}
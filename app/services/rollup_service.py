@@ -0,0 +1,299 @@
+"""
+Rollup Service - Daily per-AI aggregates and raw-row retention
+Folds token usage logs, learning logs, AI answers and internet learning results
+into per-day rollup tables, then deletes raw rows past their retention window.
+Reports read the rollups, so their cost follows the number of days reported
+rather than the number of raw rows ever written.
+
+Each run recomputes every day from the newest rolled-up day onwards (delete and
+re-insert in one transaction), so runs are idempotent and today's partial day is
+refreshed. Rows without a parseable created_at belong to no day and are skipped.
+Retention is off unless RETENTION_*_DAYS is set, because the explainability
+endpoints and learning log queries still read individual raw rows; it never
+deletes raw rows of a day that can still be recomputed.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Any, Callable
+import structlog
+from sqlalchemy import select, delete, insert, func, case, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_session
+from app.core.task_supervisor import task_supervisor, RESTART_ON_FAILURE
+from app.models.sql_models import (
+    TokenUsageLog, TokenUsageDaily, LearningLog, AIAnswer, InternetLearningResult, ActivityDailyRollup
+)
+
+logger = structlog.get_logger()
+
+
+def _flag(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+@dataclass
+class RollupSource:
+    """Raw table folded into a daily rollup table"""
+    name: str
+    model: Any
+    rollup: Any
+    key: Callable[[], Dict[str, Any]]  # rollup key columns besides day
+    measures: Callable[[], Dict[str, Any]]  # rollup column -> aggregate expression
+    retention_days: Callable[[], int]
+
+
+SOURCES = [
+    RollupSource(
+        "token_usage_logs", TokenUsageLog, TokenUsageDaily,
+        lambda: {"ai_type": TokenUsageLog.ai_type},
+        lambda: {
+            "tokens_in": func.coalesce(func.sum(TokenUsageLog.tokens_in), 0),
+            "tokens_out": func.coalesce(func.sum(TokenUsageLog.tokens_out), 0),
+            "total_tokens": func.coalesce(func.sum(TokenUsageLog.total_tokens), 0),
+            "request_count": func.count(),
+            "failed_requests": _flag(TokenUsageLog.success == False),
+        },
+        lambda: settings.retention_token_usage_log_days,
+    ),
+    RollupSource(
+        "learning_logs", LearningLog, ActivityDailyRollup,
+        lambda: {"ai_type": func.coalesce(LearningLog.agent_type, ""), "dimension": LearningLog.event_type},
+        lambda: {
+            "event_count": func.count(),
+            "value_sum": func.coalesce(func.sum(LearningLog.results_count), 0),
+            "score_sum": func.coalesce(func.sum(LearningLog.impact_score), 0),
+            "duration_sum": func.coalesce(func.sum(LearningLog.processing_time), 0),
+            "flag_count": _flag(LearningLog.error_message.isnot(None)),
+        },
+        lambda: settings.retention_learning_log_days,
+    ),
+    RollupSource(
+        "ai_answers", AIAnswer, ActivityDailyRollup,
+        lambda: {"ai_type": AIAnswer.ai_type, "dimension": func.coalesce(AIAnswer.reasoning_quality, "")},
+        lambda: {
+            "event_count": func.count(),
+            "value_sum": func.coalesce(func.sum(AIAnswer.answer_length), 0),
+            "score_sum": func.coalesce(func.sum(AIAnswer.confidence_score), 0),
+            "duration_sum": literal(0.0),
+            "flag_count": _flag(AIAnswer.is_fallback == True),
+        },
+        lambda: settings.retention_ai_answer_days,
+    ),
+    RollupSource(
+        "internet_learning_results", InternetLearningResult, ActivityDailyRollup,
+        lambda: {"ai_type": InternetLearningResult.agent_id, "dimension": InternetLearningResult.source},
+        lambda: {
+            "event_count": func.count(),
+            "value_sum": func.coalesce(func.sum(InternetLearningResult.learning_value), 0),
+            "score_sum": func.coalesce(func.sum(InternetLearningResult.relevance_score), 0),
+            "duration_sum": literal(0.0),
+            "flag_count": _flag(InternetLearningResult.applied_to_agent == True),
+        },
+        lambda: settings.retention_internet_learning_days,
+    ),
+]
+
+
+def _to_date(value) -> date:
+    """func.date() returns a date on PostgreSQL and an ISO string on SQLite"""
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _start_of(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day)
+
+
+class RollupService:
+    """Maintains daily rollups and applies raw-row retention"""
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(RollupService, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.delete_batch_size = 5000
+            self._task: Optional[asyncio.Task] = None
+            self._running = False
+            self._last_run: Optional[Dict[str, Any]] = None
+            self._initialized = True
+
+    def _scope(self, source: RollupSource):
+        """Filter selecting this source's rows in its rollup table"""
+        if source.rollup is ActivityDailyRollup:
+            return ActivityDailyRollup.source == source.name
+        return literal(True)
+
+    async def _rolled_through(self, session: AsyncSession, source: RollupSource) -> Optional[date]:
+        """Newest day already present in the rollup table for a source"""
+        value = (await session.execute(
+            select(func.max(source.rollup.day)).where(self._scope(source))
+        )).scalar()
+        return _to_date(value) if value is not None else None
+
+    async def rollup_source(self, session: AsyncSession, source: RollupSource) -> Dict[str, Any]:
+        """Recompute the source's rollups from its newest rolled-up day onwards"""
+        model = source.model
+        start = await self._rolled_through(session, source)
+        if start is None:
+            oldest = (await session.execute(select(func.min(model.created_at)))).scalar()
+            if oldest is None:
+                return {"days": 0, "rows": 0, "from": None}
+            start = oldest.date() if isinstance(oldest, datetime) else _to_date(oldest)
+
+        day = func.date(model.created_at)
+        keys = source.key()
+        measures = source.measures()
+        query = (
+            select(day.label("day"), *[expr.label(name) for name, expr in keys.items()],
+                   *[expr.label(name) for name, expr in measures.items()])
+            .where(model.created_at.isnot(None), model.created_at >= _start_of(start), day.isnot(None))
+            .group_by(day, *keys.values())
+        )
+        rows = []
+        for row in (await session.execute(query)).mappings():
+            values = {name: row[name] for name in (*keys, *measures)}
+            values["day"] = _to_date(row["day"])
+            if source.rollup is ActivityDailyRollup:
+                values["source"] = source.name
+            rows.append(values)
+
+        await session.execute(
+            delete(source.rollup).where(self._scope(source), source.rollup.day >= start)
+        )
+        if rows:
+            await session.execute(insert(source.rollup), rows)
+        await session.commit()
+        return {"days": len({row["day"] for row in rows}), "rows": len(rows), "from": start.isoformat()}
+
+    async def apply_retention(self, session: AsyncSession, source: RollupSource, today: Optional[date] = None) -> int:
+        """Delete raw rows older than the retention window that are already rolled up"""
+        retention_days = source.retention_days()
+        if retention_days <= 0:
+            return 0
+        rolled_through = await self._rolled_through(session, source)
+        if rolled_through is None:
+            return 0
+        today = today or datetime.utcnow().date()
+        # Days from rolled_through onwards are recomputed on the next run and need their raw rows
+        cutoff = _start_of(min(today - timedelta(days=retention_days), rolled_through))
+        model = source.model
+        deleted = 0
+        while True:
+            batch = select(model.id).where(model.created_at < cutoff).limit(self.delete_batch_size)
+            result = await session.execute(
+                delete(model).where(model.id.in_(batch.scalar_subquery())).execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            deleted += result.rowcount or 0
+            if not result.rowcount or result.rowcount < self.delete_batch_size:
+                return deleted
+
+    async def run_once(self, session: Optional[AsyncSession] = None, today: Optional[date] = None) -> Dict[str, Any]:
+        """Roll up every source, then apply retention; safe to run repeatedly"""
+        if session is None:
+            async with get_session() as own_session:
+                return await self.run_once(own_session, today)
+
+        started = datetime.utcnow()
+        results = {}
+        for source in SOURCES:
+            try:
+                rollup = await self.rollup_source(session, source)
+                rollup["raw_rows_deleted"] = await self.apply_retention(session, source, today)
+                results[source.name] = rollup
+            except Exception as e:
+                await session.rollback()
+                logger.error("Rollup failed", source=source.name, error=str(e))
+                results[source.name] = {"error": str(e)}
+        self._last_run = {
+            "started_at": started.isoformat(),
+            "duration_ms": round((datetime.utcnow() - started).total_seconds() * 1000, 2),
+            "sources": results,
+        }
+        logger.info("Daily rollups complete", **{name: result.get("rows") for name, result in results.items()})
+        return self._last_run
+
+    async def get_token_usage_by_day(self, session: AsyncSession, start: date, end: Optional[date] = None,
+                                     ai_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Token usage per day and AI from the rollups; today comes from the raw logs"""
+        today = datetime.utcnow().date()
+        end = end or today
+        query = select(TokenUsageDaily).where(
+            TokenUsageDaily.day >= start, TokenUsageDaily.day <= min(end, today - timedelta(days=1))
+        )
+        if ai_type:
+            query = query.where(TokenUsageDaily.ai_type == ai_type)
+        rows = [
+            {
+                "day": row.day.isoformat(), "ai_type": row.ai_type, "tokens_in": row.tokens_in or 0,
+                "tokens_out": row.tokens_out or 0, "total_tokens": row.total_tokens or 0,
+                "request_count": row.request_count or 0, "failed_requests": row.failed_requests or 0,
+            }
+            for row in (await session.execute(query.order_by(TokenUsageDaily.day))).scalars().all()
+        ]
+        if start <= today <= end:
+            # Today is still being written; aggregate its raw rows directly
+            source = SOURCES[0]
+            live = select(TokenUsageLog.ai_type, *[expr.label(name) for name, expr in source.measures().items()]) \
+                .where(TokenUsageLog.created_at >= _start_of(today)).group_by(TokenUsageLog.ai_type)
+            if ai_type:
+                live = live.where(TokenUsageLog.ai_type == ai_type)
+            for row in (await session.execute(live)).mappings():
+                rows.append({"day": today.isoformat(), **{key: row[key] or 0 for key in row.keys()},
+                             "ai_type": row["ai_type"]})
+        return rows
+
+    async def get_table_sizes(self, session: AsyncSession) -> Dict[str, int]:
+        """Row counts of the raw and rollup tables, in one round-trip"""
+        models = {source.name: source.model for source in SOURCES}
+        models.update({"token_usage_daily": TokenUsageDaily, "activity_daily_rollups": ActivityDailyRollup})
+        row = (await session.execute(select(*[
+            select(func.count()).select_from(model).scalar_subquery().label(name) for name, model in models.items()
+        ]))).one()
+        return dict(row._mapping)
+
+    async def start(self, interval: Optional[int] = None):
+        """Run the rollup job periodically in the background"""
+        if self._running:
+            return
+        self._running = True
+        interval = interval or settings.rollup_interval_seconds
+        self._task = task_supervisor.spawn("rollup", self._loop, interval, owner="rollup",
+                                           restart=RESTART_ON_FAILURE, interval=interval)
+
+    async def stop(self):
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self, interval: int):
+        while self._running:
+            try:
+                await self.run_once()
+                task_supervisor.beat()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Error in rollup job", error=str(e))
+                task_supervisor.beat(error=e)
+            await asyncio.sleep(interval)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"running": self._running, "last_run": self._last_run}
+
+
+rollup_service = RollupService()
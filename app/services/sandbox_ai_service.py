@@ -33,6 +33,7 @@ from ..core.config import settings
 from .ml_service import MLService
 from .sckipit_service import SckipitService
 from .ai_learning_service import AILearningService
+from .model_registry import model_registry
 
 logger = structlog.get_logger()
 
@@ -204,8 +205,8 @@ class SandboxAIService:
                 model_path = os.path.join(settings.ml_model_path, filename)
                 if os.path.exists(model_path):
                     try:
-                        with open(model_path, 'rb') as f:
-                            self._ml_models[model_name] = pickle.load(f)
+                        # Shared, lazily loaded model (see model_registry)
+                        self._ml_models[model_name] = model_registry.handle(model_path, model_name)
                         logger.info(f"Loaded enhanced model: {model_name}")
                     except Exception as e:
                         logger.error(f"Failed to load enhanced model {filename}: {str(e)}")
@@ -228,8 +229,8 @@ class SandboxAIService:
                 model_path = os.path.join(settings.ml_model_path, filename)
                 if os.path.exists(model_path):
                     try:
-                        with open(model_path, 'rb') as f:
-                            self.sckipit_models[model_name] = pickle.load(f)
+                        # Shared, lazily loaded model (see model_registry)
+                        self.sckipit_models[model_name] = model_registry.handle(model_path, model_name)
                         logger.info(f"Loaded SCKIPIT model: {model_name}")
                     except Exception as e:
                         logger.error(f"Failed to load SCKIPIT model {filename}: {str(e)}")
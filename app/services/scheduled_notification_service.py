@@ -8,6 +8,7 @@ import structlog
 from typing import Dict, Any
 
 from .weekly_usage_notification_service import weekly_notification_service
+from ..core.task_supervisor import task_supervisor, RESTART_ON_FAILURE
 
 logger = structlog.get_logger()
 
@@ -46,7 +47,9 @@ class ScheduledNotificationService:
         logger.info("Starting weekly notification scheduler")
         
         # Start the background task
-        self._task = asyncio.create_task(self._weekly_scheduler_loop())
+        self._task = task_supervisor.spawn("weekly-notifications", self._weekly_scheduler_loop,
+                                           owner="notifications", restart=RESTART_ON_FAILURE,
+                                           interval=7 * 24 * 3600)
     
     async def stop_weekly_scheduler(self):
         """Stop the weekly notification scheduler"""
@@ -90,6 +93,7 @@ class ScheduledNotificationService:
                     # Send weekly notifications
                     logger.info("Sending weekly token usage notifications")
                     result = await weekly_notification_service.send_weekly_notifications()
+                    task_supervisor.beat()
                     
                     if result.get("status") == "success":
                         logger.info("Weekly notifications sent successfully", 
@@ -104,6 +108,7 @@ class ScheduledNotificationService:
                 break
             except Exception as e:
                 logger.error("Error in weekly scheduler loop", error=str(e))
+                task_supervisor.beat(error=e)
                 # Wait 1 hour before retrying
                 await asyncio.sleep(3600)
     
@@ -36,11 +36,62 @@ from ..core.config import settings
 from ..core.railway_utils import should_skip_external_requests
 from .ml_service import MLService
 from . import trusted_sources
+from .knowledge_store import get_knowledge_store
+from .model_registry import model_registry
+from .code_analysis_cache import code_analysis_cache
 from app.services.advanced_code_generator import AdvancedCodeGenerator
 from .model_loader import load_all_models
 
 logger = structlog.get_logger()
 
+MAX_SOURCE_REFRESH_SECONDS = 7 * 24 * 3600  # Upper bound for Cache-Control max-age
+
+
+def _source_refresh_interval(headers) -> float:
+    """Per-source refresh interval: the response's Cache-Control max-age if given, else the configured default"""
+    for directive in headers.get('Cache-Control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+        if name.lower() == 'max-age' and value.isdigit():
+            return float(min(max(int(value), settings.sckipit_source_min_refresh_seconds), MAX_SOURCE_REFRESH_SECONDS))
+    return float(settings.sckipit_source_refresh_seconds)
+
+
+QUALITY_FEATURES_VERSION = 1  # Bump when _code_quality_features changes
+
+
+def _code_quality_features(profile) -> Dict[str, float]:
+    """Code quality features from one pass over the snippet"""
+    line_count = max(len(profile.lines), 1)
+    
+    complexity_indicators = ['if ', 'for ', 'while ', 'try:', 'except:', 'with ']
+    complexity_count = sum(profile.count(indicator) for indicator in complexity_indicators)
+    
+    avg_line_length = sum(len(line) for line in profile.lines) / line_count
+    
+    # Simple maintainability score based on structure
+    has_docstrings = profile.contains('"""') or profile.contains("'''")
+    has_comments = profile.contains('#')
+    has_functions = profile.contains('def ')  # Also matches 'async def '
+    maintainability_score = 0.0
+    if has_docstrings:
+        maintainability_score += 0.3
+    if has_comments:
+        maintainability_score += 0.2
+    if has_functions:
+        maintainability_score += 0.5
+    
+    return {
+        'code_length': len(profile.code),
+        'line_count': profile.count('\n'),
+        'function_count': profile.count('def ') + profile.count('async def '),
+        'class_count': profile.count('class '),
+        'import_count': profile.count('import ') + profile.count('from '),
+        'comment_ratio': profile.count('#') / line_count,
+        'complexity_score': min(1.0, complexity_count / 10.0),
+        'readability_score': max(0.0, 1.0 - (avg_line_length / 100.0)),
+        'maintainability_score': min(1.0, maintainability_score),
+    }
+
 
 class SckipitService:
     """Sckipit Service - ML-driven suggestions for Conquest app creation and Sandbox experiments"""
@@ -62,6 +113,8 @@ class SckipitService:
         if not self._initialized:
             self.ml_service = MLService()
             self._initialized = True
+            # Knowledge entries live in an embedded keyed store rather than one JSON file
+            self._knowledge_base = get_knowledge_store(settings.ml_model_path)
             
             # Use the model_loader to ensure all models are properly trained
             try:
@@ -89,9 +142,8 @@ class SckipitService:
 
     def _load_model(self, path):
         if os.path.exists(path):
-            with open(path, 'rb') as f:
-                model = pickle.load(f)
-            logger.info(f"[MODEL LOAD] Loaded model from {path}: {type(model)}")
+            model = model_registry.handle(path)
+            logger.info(f"[MODEL LOAD] Registered shared model for {path}")
             return model
         logger.warning(f"[MODEL LOAD] Model file not found: {path}")
         return None
@@ -325,8 +377,8 @@ class _GeneratedWidgetState extends State<GeneratedWidget> {{
             model_path = os.path.join(settings.ml_model_path, filename)
             if os.path.exists(model_path):
                 try:
-                    with open(model_path, 'rb') as f:
-                        self._models[model_name] = pickle.load(f)
+                    # Shared, lazily loaded model (see model_registry)
+                    self._models[model_name] = model_registry.handle(model_path, model_name)
                     logger.info(f"Loaded Sckipit model: {model_name}")
                 except Exception as e:
                     logger.error(f"Failed to load Sckipit model {filename}: {str(e)}")
@@ -344,65 +396,77 @@ class _GeneratedWidgetState extends State<GeneratedWidget> {{
     async def _load_knowledge_base(self):
         """Load and update knowledge base from trusted sources"""
         try:
-            # Load existing knowledge
-            knowledge_path = os.path.join(settings.ml_model_path, 'sckipit_knowledge_base.json')
-            if os.path.exists(knowledge_path):
-                with open(knowledge_path, 'r') as f:
-                    self._knowledge_base = json.load(f)
-            
-            # Update knowledge from trusted sources
+            # Update knowledge from trusted sources (only sources due for a refresh are fetched)
             await self._update_knowledge_from_sources()
             
             logger.info(f"Knowledge base loaded with {len(self._knowledge_base)} entries")
         except Exception as e:
             logger.error(f"Error loading knowledge base: {str(e)}")
     
-    async def _update_knowledge_from_sources(self):
-        """Update knowledge base from trusted sources"""
+    async def _update_knowledge_from_sources(self) -> Dict[str, int]:
+        """Refresh due trusted sources concurrently over one pooled session, storing each changed entry"""
+        counts = {'due': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
         try:
             # Skip external knowledge fetching during Railway startup to prevent hangs
             if should_skip_external_requests():
                 logger.info("Skipping external knowledge fetching to prevent startup hangs in containerized environment")
-                return
+                return counts
                 
-            # Get current trusted sources
+            # Get current trusted sources that are due for a refresh
             sources = trusted_sources.get_trusted_sources()
-            
-            for source in sources:
-                try:
-                    # Fetch new knowledge from source
-                    new_knowledge = await self._fetch_knowledge_from_source({'url': source})
-                    if new_knowledge:
-                        self._knowledge_base[source] = {
-                            'knowledge': new_knowledge,
-                            'last_updated': datetime.now().isoformat(),
-                            'quality_score': await self._predict_source_quality({'url': source})
-                        }
-                except Exception as e:
-                    logger.warning(f"Failed to update knowledge from {source['url']}: {str(e)}")
-            
-            # Save updated knowledge base
-            knowledge_path = os.path.join(settings.ml_model_path, 'sckipit_knowledge_base.json')
-            with open(knowledge_path, 'w') as f:
-                json.dump(self._knowledge_base, f, indent=2)
-            
-            logger.info("Knowledge base updated from trusted sources")
+            due = self._knowledge_base.get_due(sources)
+            counts['due'] = len(due)
+            if due:
+                concurrency = max(1, settings.sckipit_refresh_concurrency)
+                semaphore = asyncio.Semaphore(concurrency)
+                connector = aiohttp.TCPConnector(limit=concurrency)
+                async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=10)) as session:
+                    outcomes = await asyncio.gather(*[self._refresh_source(session, semaphore, entry) for entry in due])
+                for outcome in outcomes:
+                    counts[outcome] += 1
+            
+            logger.info("Knowledge base updated from trusted sources", sources=len(sources), **counts)
         except Exception as e:
             logger.error(f"Error updating knowledge from sources: {str(e)}")
+        return counts
     
-    async def _fetch_knowledge_from_source(self, source: Dict) -> Optional[str]:
-        """Fetch knowledge from a trusted source"""
+    async def _refresh_source(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, entry: Dict[str, Any]) -> str:
+        """Conditionally fetch one source; returns 'updated', 'unchanged' or 'failed'"""
+        url = entry['url']
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(source['url'], timeout=10) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        # Extract relevant knowledge (simplified)
-                        return content[:1000]  # First 1000 chars as knowledge
-            return None
+            async with semaphore:
+                async with session.get(url, headers=headers) as response:
+                    next_refresh_at = time.time() + _source_refresh_interval(response.headers)
+                    etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+                    if response.status == 304:
+                        self._knowledge_base.mark_unchanged(url, next_refresh_at, etag, last_modified)
+                        return 'unchanged'
+                    if response.status != 200:
+                        raise aiohttp.ClientResponseError(response.request_info, (), status=response.status)
+                    # Extract relevant knowledge (simplified)
+                    knowledge = (await response.text())[:1000]  # First 1000 chars as knowledge
         except Exception as e:
-            logger.warning(f"Failed to fetch from {source['url']}: {str(e)}")
-            return None
+            # Back off from failing sources, doubling up to the default interval
+            retry_in = min(settings.sckipit_source_min_refresh_seconds * 2 ** entry.get('failure_count', 0),
+                           settings.sckipit_source_refresh_seconds)
+            self._knowledge_base.mark_failed(url, time.time() + retry_in)
+            logger.warning(f"Failed to update knowledge from {url}: {str(e)}")
+            return 'failed'
+        
+        content_hash = hashlib.sha256(knowledge.encode('utf-8')).hexdigest()
+        if content_hash == entry.get('content_hash'):
+            self._knowledge_base.mark_unchanged(url, next_refresh_at, etag, last_modified)
+            return 'unchanged'
+        self._knowledge_base.store_content(
+            url, knowledge, await self._predict_source_quality({'url': url}), content_hash,
+            next_refresh_at, etag, last_modified
+        )
+        return 'updated'
     
     async def _predict_source_quality(self, source: Dict) -> float:
         """Predict the quality of a knowledge source"""
@@ -718,13 +782,12 @@ class _GeneratedWidgetState extends State<GeneratedWidget> {{
         """Get suggestions based on knowledge base"""
         suggestions = []
         
-        for source_url, knowledge in self._knowledge_base.items():
-            if knowledge['quality_score'] > 0.7:
-                content = knowledge['knowledge'].lower()
-                for keyword in keywords:
-                    if keyword.lower() in content:
-                        # Extract relevant suggestions from knowledge
-                        suggestions.append(f"knowledge_based_{keyword}")
+        for source_url, knowledge in self._knowledge_base.iter_knowledge(min_quality=0.7):
+            content = knowledge.lower()
+            for keyword in keywords:
+                if keyword.lower() in content:
+                    # Extract relevant suggestions from knowledge
+                    suggestions.append(f"knowledge_based_{keyword}")
         
         return suggestions[:5]  # Limit to 5 suggestions
     
@@ -797,48 +860,21 @@ class _GeneratedWidgetState extends State<GeneratedWidget> {{
     
     async def _extract_code_quality_features(self, code: str, file_path: str) -> Dict[str, float]:
         """Extract features for code quality analysis"""
-        features = {
-            'code_length': len(code),
-            'line_count': code.count('\n'),
-            'function_count': code.count('def ') + code.count('async def '),
-            'class_count': code.count('class '),
-            'import_count': code.count('import ') + code.count('from '),
-            'comment_ratio': code.count('#') / max(len(code.split('\n')), 1),
-            'complexity_score': await self._calculate_complexity_score(code),
-            'readability_score': await self._calculate_readability_score(code),
-            'maintainability_score': await self._calculate_maintainability_score(code)
-        }
-        
-        return features
+        return code_analysis_cache.get_or_compute(
+            "sckipit.quality_features", QUALITY_FEATURES_VERSION, code, _code_quality_features
+        )
     
     async def _calculate_complexity_score(self, code: str) -> float:
         """Calculate code complexity score"""
-        complexity_indicators = ['if ', 'for ', 'while ', 'try:', 'except:', 'with ']
-        complexity_count = sum(code.count(indicator) for indicator in complexity_indicators)
-        return min(1.0, complexity_count / 10.0)
+        return (await self._extract_code_quality_features(code, ""))["complexity_score"]
     
     async def _calculate_readability_score(self, code: str) -> float:
         """Calculate code readability score"""
-        lines = code.split('\n')
-        avg_line_length = sum(len(line) for line in lines) / max(len(lines), 1)
-        return max(0.0, 1.0 - (avg_line_length / 100.0))
+        return (await self._extract_code_quality_features(code, ""))["readability_score"]
     
     async def _calculate_maintainability_score(self, code: str) -> float:
         """Calculate code maintainability score"""
-        # Simple maintainability score based on structure
-        has_docstrings = '"""' in code or "'''" in code
-        has_comments = '#' in code
-        has_functions = 'def ' in code or 'async def ' in code
-        
-        score = 0.0
-        if has_docstrings:
-            score += 0.3
-        if has_comments:
-            score += 0.2
-        if has_functions:
-            score += 0.5
-        
-        return min(1.0, score)
+        return (await self._extract_code_quality_features(code, ""))["maintainability_score"]
     
     async def _rule_based_quality_score(self, code: str) -> float:
         """Fallback rule-based quality score"""
@@ -1429,7 +1465,7 @@ class _GeneratedWidgetState extends State<GeneratedWidget> {{
             },
             'recent_activity': {
                 'last_suggestion': self._suggestion_history[-1] if self._suggestion_history else None,
-                'last_knowledge_update': max([k['last_updated'] for k in self._knowledge_base.values()]) if self._knowledge_base else None
+                'last_knowledge_update': self._knowledge_base.latest_update()
             }
         }
 
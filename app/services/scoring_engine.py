@@ -0,0 +1,150 @@
+"""
+Compiled Scoring Engine
+=======================
+
+Precompiled pattern engine for IntelligentScoringSystem. All keyword-labelled
+section patterns ("approach: ...", "security: ...", etc.) are merged into one
+combined header scan so a response is traversed once for every dimension's
+sections, instead of once per pattern.
+"""
+
+import re
+from typing import Dict, List, Any
+
+# Terminator shared by every labelled section pattern
+_SECTION_BODY = r'[:\s]+(.*?)(?=\n\n|\n[A-Z]|$)'
+
+# Labelled sections feeding each component, in the original pattern order
+SECTION_COMPONENTS = {
+    'explanations': ['explanation', 'reasoning', 'approach', 'strategy'],
+    'reasoning': ['explanation', 'reasoning', 'approach', 'strategy'],
+    'testing_approach': ['test', 'assert', 'validation'],
+    'optimization_notes': ['optimization', 'efficiency', 'performance'],
+    'security_considerations': ['security', 'authentication', 'authorization', 'validation'],
+    'performance_notes': ['performance', 'scalability', 'throughput', 'latency'],
+}
+
+SECTION_KEYWORDS = list(dict.fromkeys(kw for kws in SECTION_COMPONENTS.values() for kw in kws))
+
+# Per-keyword section patterns (reference semantics, and the fallback for non-ASCII text)
+SECTION_PATTERNS = {
+    kw: re.compile(kw + _SECTION_BODY, re.DOTALL | re.IGNORECASE) for kw in SECTION_KEYWORDS
+}
+
+# Single-pass scanner: one case-sensitive pass over the lowered text finds every section header
+# (zero-width, so headers of different keywords may overlap), then each body is cut at its terminator
+_SECTION_HEADER = re.compile(r'(?=(' + '|'.join(SECTION_KEYWORDS) + r')[:\s])')
+_SECTION_SEPARATOR = re.compile(r'[:\s]+')
+_SECTION_TERMINATOR = re.compile(r'\n\n|\n[A-Za-z]')
+
+CODE_PATTERNS = [
+    re.compile(r'```[\w]*\n(.*?)\n```', re.DOTALL | re.IGNORECASE),
+    re.compile(r'`([^`]+)`', re.DOTALL | re.IGNORECASE),
+    re.compile(r'def\s+\w+\s*\([^)]*\):', re.DOTALL | re.IGNORECASE),
+    re.compile(r'class\s+\w+', re.DOTALL | re.IGNORECASE),
+    re.compile(r'import\s+[\w\s,]+', re.DOTALL | re.IGNORECASE),
+    re.compile(r'from\s+[\w.]+\s+import\s+[\w\s,]+', re.DOTALL | re.IGNORECASE),
+]
+
+DOC_PATTERNS = [
+    re.compile(r'#\s+(.*?)(?=\n|$)', re.DOTALL),
+    re.compile(r'"""([^"]*)"""', re.DOTALL),
+    re.compile(r"'''([^']*)'''", re.DOTALL),
+    re.compile(r'#\s+([^\n]+)', re.DOTALL),
+]
+
+
+def _empty_components() -> Dict[str, List[str]]:
+    return {
+        'code_sections': [],
+        'explanations': [],
+        'reasoning': [],
+        'documentation': [],
+        'testing_approach': [],
+        'optimization_notes': [],
+        'security_considerations': [],
+        'performance_notes': []
+    }
+
+
+def extract_sections(response: str) -> Dict[str, List[str]]:
+    """Find every labelled section for every keyword in a single pass.
+
+    Results are identical to running re.findall once per keyword pattern:
+    matches are non-overlapping per keyword and bodies end at the first blank
+    line, newline followed by a letter, or end of text.
+    """
+    if not response.isascii():
+        # Case folding can change offsets outside ASCII; use the per-keyword patterns
+        return {kw: pattern.findall(response) for kw, pattern in SECTION_PATTERNS.items()}
+
+    sections: Dict[str, List[str]] = {kw: [] for kw in SECTION_KEYWORDS}
+    next_start = {kw: 0 for kw in SECTION_KEYWORDS}
+    length = len(response)
+    # "$" also matches just before a trailing newline
+    end_of_text = length - 1 if response.endswith('\n') else length
+
+    for header in _SECTION_HEADER.finditer(response.lower()):
+        keyword = header.group(1)
+        if header.start() < next_start[keyword]:
+            continue
+        body_start = _SECTION_SEPARATOR.match(response, header.start() + len(keyword)).end()
+        terminator = _SECTION_TERMINATOR.search(response, body_start)
+        body_end = terminator.start() if terminator else length
+        if end_of_text >= body_start:
+            body_end = min(body_end, end_of_text)
+        sections[keyword].append(response[body_start:body_end])
+        next_start[keyword] = body_end
+    return sections
+
+
+def extract_components(response: str) -> Dict[str, List[str]]:
+    """Extract all response components used by the scoring dimensions"""
+    components = _empty_components()
+
+    for pattern in CODE_PATTERNS:
+        components['code_sections'].extend(pattern.findall(response))
+
+    sections = extract_sections(response)
+    for component, keywords in SECTION_COMPONENTS.items():
+        for keyword in keywords:
+            components[component].extend(sections[keyword])
+
+    for pattern in DOC_PATTERNS:
+        components['documentation'].extend(pattern.findall(response))
+
+    return components
+
+
+def extract_components_reference(response: str) -> Dict[str, List[str]]:
+    """Per-pattern extraction (one traversal per pattern); kept for benchmarks and equivalence tests"""
+    components = _empty_components()
+
+    for pattern in CODE_PATTERNS:
+        components['code_sections'].extend(re.findall(pattern.pattern, response, pattern.flags))
+
+    for component, keywords in SECTION_COMPONENTS.items():
+        for keyword in keywords:
+            components[component].extend(SECTION_PATTERNS[keyword].findall(response))
+
+    for pattern in DOC_PATTERNS:
+        components['documentation'].extend(re.findall(pattern.pattern, response, pattern.flags))
+
+    return components
+
+
+def response_text(ai_response: Any) -> str:
+    """Flatten a stored AIResponse row into the text the scoring system evaluates"""
+    parts: List[str] = []
+    content = getattr(ai_response, 'generated_content', None)
+    if isinstance(content, dict):
+        parts.extend(str(value) for value in content.values())
+    elif content:
+        parts.append(str(content))
+    for snippet in getattr(ai_response, 'code_snippets', None) or []:
+        parts.append(f"```python\n{snippet}\n```")
+    for field in ('documentation', 'testing_approach', 'performance_considerations', 'security_measures'):
+        value = getattr(ai_response, field, None)
+        if value:
+            parts.append(value)
+    return '\n\n'.join(parts)
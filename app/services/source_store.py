@@ -0,0 +1,342 @@
+"""
+Source Store for trusted-source analytics
+Embedded SQLite (WAL mode) store with per-event upserts, indexed ranking queries
+and a periodic compacted JSON snapshot
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Any
+from datetime import datetime
+import structlog
+
+logger = structlog.get_logger()
+
+# Weighted performance score used for ranking: quality 0.4, learning value 0.4, success rate 0.2
+PERFORMANCE_SCORE_SQL = (
+    "quality_score * 0.4 + learning_value * 0.4 + "
+    "(CAST(success_count AS REAL) / MAX(discovery_count, 1)) * 0.2"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trusted_sources (
+    url TEXT PRIMARY KEY,
+    added_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS learning_sources (
+    ai_type TEXT NOT NULL,
+    url TEXT NOT NULL,
+    discovered_at TEXT NOT NULL,
+    PRIMARY KEY (ai_type, url)
+);
+CREATE TABLE IF NOT EXISTS source_metrics (
+    ai_type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    discovery_count INTEGER NOT NULL DEFAULT 0,
+    success_count INTEGER NOT NULL DEFAULT 0,
+    failure_count INTEGER NOT NULL DEFAULT 0,
+    quality_score REAL NOT NULL DEFAULT 0.0,
+    learning_value REAL NOT NULL DEFAULT 0.0,
+    performance_score REAL NOT NULL DEFAULT 0.0,
+    last_used TEXT,
+    PRIMARY KEY (ai_type, source)
+);
+CREATE INDEX IF NOT EXISTS idx_source_metrics_ai_type_performance
+    ON source_metrics(ai_type, performance_score DESC);
+CREATE TABLE IF NOT EXISTS source_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    ai_type TEXT,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_source_events_timestamp ON source_events(timestamp);
+CREATE TABLE IF NOT EXISTS source_analytics_kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SourceStore:
+    """Transactional store for trusted sources, learning sources and source analytics"""
+
+    def __init__(self, db_path: str, snapshot_interval: float = 300.0, max_events: int = 1000):
+        self.db_path = db_path
+        self.snapshot_interval = snapshot_interval
+        self.max_events = max_events
+        self._lock = threading.RLock()
+        self._last_snapshot = time.monotonic()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, statements: List[tuple]):
+        """Run a batch of statements in a single transaction"""
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                for sql, params in statements:
+                    self._conn.execute(sql, params)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM trusted_sources) + "
+                "(SELECT COUNT(*) FROM learning_sources) + "
+                "(SELECT COUNT(*) FROM source_analytics_kv) AS n"
+            ).fetchone()
+        return row["n"] == 0
+
+    # Trusted sources
+
+    def add_trusted_source(self, url: str):
+        self._write([(
+            "INSERT OR IGNORE INTO trusted_sources (url, added_at) VALUES (?, ?)",
+            (url, datetime.now().isoformat()),
+        )])
+
+    def remove_trusted_source(self, url: str):
+        self._write([("DELETE FROM trusted_sources WHERE url = ?", (url,))])
+
+    def replace_trusted_sources(self, urls: List[str]):
+        now = datetime.now().isoformat()
+        statements = [("DELETE FROM trusted_sources", ())]
+        statements += [("INSERT OR IGNORE INTO trusted_sources (url, added_at) VALUES (?, ?)", (url, now)) for url in urls]
+        self._write(statements)
+
+    def get_trusted_sources(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT url FROM trusted_sources ORDER BY rowid").fetchall()
+        return [row["url"] for row in rows]
+
+    # Learning sources
+
+    def add_learning_sources(self, ai_type: str, urls: List[str]):
+        now = datetime.now().isoformat()
+        self._write([
+            ("INSERT OR IGNORE INTO learning_sources (ai_type, url, discovered_at) VALUES (?, ?, ?)", (ai_type, url, now))
+            for url in urls
+        ])
+
+    def get_learning_sources(self) -> Dict[str, List[str]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT ai_type, url FROM learning_sources ORDER BY rowid").fetchall()
+        sources: Dict[str, List[str]] = {}
+        for row in rows:
+            sources.setdefault(row["ai_type"], []).append(row["url"])
+        return sources
+
+    # Source metrics
+
+    def upsert_source_metrics(self, ai_type: str, source: str, metrics: Dict[str, Any]):
+        """Write the full metrics row for one source (legacy import; live updates use increment_source_metrics)"""
+        self._write([(
+            """
+            INSERT INTO source_metrics (
+                ai_type, source, discovery_count, success_count, failure_count,
+                quality_score, learning_value, last_used, performance_score
+            ) VALUES (
+                :ai_type, :source, :discovery_count, :success_count, :failure_count,
+                :quality_score, :learning_value, :last_used, 0.0
+            )
+            ON CONFLICT(ai_type, source) DO UPDATE SET
+                discovery_count = excluded.discovery_count,
+                success_count = excluded.success_count,
+                failure_count = excluded.failure_count,
+                quality_score = excluded.quality_score,
+                learning_value = excluded.learning_value,
+                last_used = excluded.last_used
+            """,
+            {
+                "ai_type": ai_type,
+                "source": source,
+                "discovery_count": metrics.get("discovery_count", 0),
+                "success_count": metrics.get("success_count", 0),
+                "failure_count": metrics.get("failure_count", 0),
+                "quality_score": metrics.get("quality_score", 0.0),
+                "learning_value": metrics.get("learning_value", 0.0),
+                "last_used": metrics.get("last_used"),
+            },
+        ), (
+            f"UPDATE source_metrics SET performance_score = {PERFORMANCE_SCORE_SQL} "
+            "WHERE ai_type = ? AND source = ?",
+            (ai_type, source),
+        )])
+
+    def increment_source_metrics(self, ai_type: str, source: str, discovery_count: int = 0,
+                                 success_count: int = 0, failure_count: int = 0, quality_delta: float = 0.0,
+                                 learning_value: Optional[float] = None,
+                                 last_used: Optional[str] = None) -> Dict[str, Any]:
+        """Apply deltas to one source's metrics in SQL, so concurrent writers never lose updates.
+
+        quality_score moves by quality_delta within [0, 1]; learning_value, when given, is
+        averaged with the stored value. Returns the updated row.
+        """
+        params = {
+            "ai_type": ai_type,
+            "source": source,
+            "discovery_count": discovery_count,
+            "success_count": success_count,
+            "failure_count": failure_count,
+            "quality_delta": quality_delta,
+            "learning_value": learning_value,
+            "last_used": last_used,
+        }
+        with self._lock:
+            self._write([(
+                """
+                INSERT INTO source_metrics (
+                    ai_type, source, discovery_count, success_count, failure_count,
+                    quality_score, learning_value, last_used, performance_score
+                ) VALUES (
+                    :ai_type, :source, :discovery_count, :success_count, :failure_count,
+                    MIN(1.0, MAX(0.0, :quality_delta)), COALESCE(:learning_value / 2.0, 0.0), :last_used, 0.0
+                )
+                ON CONFLICT(ai_type, source) DO UPDATE SET
+                    discovery_count = discovery_count + excluded.discovery_count,
+                    success_count = success_count + excluded.success_count,
+                    failure_count = failure_count + excluded.failure_count,
+                    quality_score = MIN(1.0, MAX(0.0, quality_score + :quality_delta)),
+                    learning_value = COALESCE((learning_value + :learning_value) / 2.0, learning_value),
+                    last_used = COALESCE(excluded.last_used, last_used)
+                """,
+                params,
+            ), (
+                f"UPDATE source_metrics SET performance_score = {PERFORMANCE_SCORE_SQL} "
+                "WHERE ai_type = ? AND source = ?",
+                (ai_type, source),
+            )])
+            row = self._conn.execute(
+                "SELECT discovery_count, success_count, failure_count, quality_score, last_used, learning_value "
+                "FROM source_metrics WHERE ai_type = ? AND source = ?",
+                (ai_type, source),
+            ).fetchone()
+        return dict(row)
+
+    def get_source_metrics(self, ai_type: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        query = (
+            "SELECT ai_type, source, discovery_count, success_count, failure_count, "
+            "quality_score, last_used, learning_value FROM source_metrics"
+        )
+        params: tuple = ()
+        if ai_type:
+            query += " WHERE ai_type = ?"
+            params = (ai_type,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        metrics: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for row in rows:
+            data = dict(row)
+            row_ai_type = data.pop("ai_type")
+            source = data.pop("source")
+            metrics.setdefault(row_ai_type, {})[source] = data
+        return metrics
+
+    def get_top_sources(self, ai_type: str, limit: int = 5) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source FROM source_metrics WHERE ai_type = ? "
+                "ORDER BY performance_score DESC LIMIT ?",
+                (ai_type, limit),
+            ).fetchall()
+        return [row["source"] for row in rows]
+
+    # Analytics
+
+    def append_event(self, event: Dict[str, Any]):
+        """Append one analytics event, trimming the log to the most recent events"""
+        self._write([
+            (
+                "INSERT INTO source_events (type, source, ai_type, timestamp) VALUES (?, ?, ?, ?)",
+                (event["type"], event["source"], event.get("ai_type"), event["timestamp"]),
+            ),
+            (
+                "DELETE FROM source_events WHERE id <= (SELECT MAX(id) FROM source_events) - ?",
+                (self.max_events,),
+            ),
+        ])
+
+    def get_events(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        limit = limit or self.max_events
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT type, source, ai_type, timestamp FROM "
+                "(SELECT * FROM source_events ORDER BY id DESC LIMIT ?) ORDER BY id",
+                (limit,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def set_analytics_value(self, key: str, value: Any):
+        self._write([(
+            "INSERT INTO source_analytics_kv (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value)),
+        )])
+
+    def get_analytics(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM source_analytics_kv").fetchall()
+        return {row["key"]: json.loads(row["value"]) for row in rows}
+
+    # Import and snapshot
+
+    def import_legacy(self, trusted_sources: List[str], learning_sources: Dict[str, List[str]],
+                      source_metrics: Dict[str, Dict[str, Dict[str, Any]]], source_analytics: Dict[str, Any]):
+        """Seed the store from the legacy whole-file JSON data"""
+        self.replace_trusted_sources(trusted_sources)
+        for ai_type, urls in learning_sources.items():
+            self.add_learning_sources(ai_type, urls)
+        for ai_type, sources in source_metrics.items():
+            for source, metrics in sources.items():
+                self.upsert_source_metrics(ai_type, source, metrics)
+        for event in source_analytics.get("events", []):
+            self.append_event(event)
+        for key, value in source_analytics.items():
+            if key != "events":
+                self.set_analytics_value(key, value)
+
+    def maybe_snapshot(self, paths: Dict[str, str]) -> bool:
+        """Write a compacted snapshot if the snapshot interval has elapsed"""
+        if time.monotonic() - self._last_snapshot < self.snapshot_interval:
+            return False
+        self.snapshot(paths)
+        return True
+
+    def snapshot(self, paths: Dict[str, str]):
+        """Write compacted JSON snapshots of the store using atomic replace"""
+        now = datetime.now().isoformat()
+        analytics = self.get_analytics()
+        analytics["events"] = self.get_events()
+        analytics["last_updated"] = now
+        payloads = {
+            "trusted_sources": self.get_trusted_sources(),
+            "learning_sources": {
+                "learning_sources": self.get_learning_sources(),
+                "source_metrics": self.get_source_metrics(),
+                "last_updated": now,
+            },
+            "source_analytics": analytics,
+        }
+        for name, path in paths.items():
+            try:
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(payloads[name], f, separators=(",", ":"))
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.warning("Failed to write source snapshot", snapshot=name, error=str(e))
+        self._last_snapshot = time.monotonic()
@@ -13,6 +13,7 @@ import structlog
 from ..core.database import get_session
 from ..core.config import settings
 from ..models.sql_models import TokenUsage, TokenUsageLog
+from .rollup_service import rollup_service
 
 logger = structlog.get_logger()
 
@@ -808,28 +809,23 @@ class TokenUsageService:
             current_date = now.strftime("%Y-%m-%d")
             
             async with get_session() as session:
-                # Get all usage for the current month
-                stmt_all = select(TokenUsageLog).where(
-                    TokenUsageLog.month_year == current_month
-                )
+                # Closed days come from the daily rollups, today from its raw rows
+                month_days = await rollup_service.get_token_usage_by_day(session, now.date().replace(day=1), now.date())
                 
-                result_all = await session.execute(stmt_all)
-                all_logs = result_all.scalars().all()
+                stmt_today = select(TokenUsageLog.created_at, TokenUsageLog.total_tokens).where(
+                    TokenUsageLog.created_at >= datetime(now.year, now.month, now.day)
+                )
+                today_logs = (await session.execute(stmt_today)).all()
                 
-                # Process daily usage manually
                 daily_usage = {}
                 hourly_usage = {}
                 
-                for log in all_logs:
-                    if log.created_at:
-                        # Daily usage
-                        day_key = log.created_at.strftime("%Y-%m-%d")
-                        daily_usage[day_key] = daily_usage.get(day_key, 0) + (log.total_tokens or 0)
-                        
-                        # Hourly usage for today
-                        if day_key == current_date:
-                            hour_key = log.created_at.strftime("%Y-%m-%d %H:00")
-                            hourly_usage[hour_key] = hourly_usage.get(hour_key, 0) + (log.total_tokens or 0)
+                for day in month_days:
+                    daily_usage[day["day"]] = daily_usage.get(day["day"], 0) + day["total_tokens"]
+                
+                for created_at, total_tokens in today_logs:
+                    hour_key = created_at.strftime("%Y-%m-%d %H:00")
+                    hourly_usage[hour_key] = hourly_usage.get(hour_key, 0) + (total_tokens or 0)
                 
                 daily_usage_data = [
                     {"date": day, "tokens": tokens} 
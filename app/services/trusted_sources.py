@@ -12,11 +12,20 @@ from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.cluster import KMeans
 import structlog
 
+from .source_store import SourceStore
+
 logger = structlog.get_logger()
 
 TRUSTED_SOURCES_FILE = os.path.join(os.path.dirname(__file__), 'trusted_sources.json')
 LEARNING_SOURCES_FILE = os.path.join(os.path.dirname(__file__), 'learning_sources.json')
 SOURCE_ANALYTICS_FILE = os.path.join(os.path.dirname(__file__), 'source_analytics.json')
+SOURCE_STORE_FILE = os.path.join(os.path.dirname(__file__), 'trusted_sources.db')
+
+SNAPSHOT_PATHS = {
+    'trusted_sources': TRUSTED_SOURCES_FILE,
+    'learning_sources': LEARNING_SOURCES_FILE,
+    'source_analytics': SOURCE_ANALYTICS_FILE,
+}
 
 DEFAULT_TRUSTED_SOURCES = [
     "https://stackoverflow.com",
@@ -98,9 +107,34 @@ _learning_sources = {}  # AI-specific discovered sources
 _source_metrics = {}  # Track source performance
 _source_analytics = {}  # ML-enhanced analytics
 _source_clusters = {}  # Clustered sources for better discovery
+_store: Optional[SourceStore] = None  # Durable store; the globals above are its in-memory read model
 
 def load_trusted_sources():
-    global _trusted_sources, _learning_sources, _source_metrics, _source_analytics, _source_clusters
+    global _trusted_sources, _learning_sources, _source_metrics, _source_analytics, _source_clusters, _store
+    if _store is None:
+        _store = SourceStore(SOURCE_STORE_FILE)
+    
+    if _store.is_empty():
+        # First run against the store: seed it from the legacy JSON files
+        _load_legacy_json()
+        _store.import_legacy(_trusted_sources, _learning_sources, _source_metrics, _source_analytics)
+        logger.info("Imported legacy trusted source JSON into source store", path=SOURCE_STORE_FILE)
+    
+    _trusted_sources = _store.get_trusted_sources()
+    _learning_sources = _store.get_learning_sources()
+    _source_metrics = _store.get_source_metrics()
+    _source_analytics = {
+        'source_clusters': {},
+        'quality_scores': {},
+        'discovery_patterns': {},
+        'growth_metrics': {},
+        'last_updated': datetime.now().isoformat()
+    }
+    _source_analytics.update(_store.get_analytics())
+    _source_analytics['events'] = _store.get_events()
+
+def _load_legacy_json():
+    global _trusted_sources, _learning_sources, _source_metrics, _source_analytics
     if os.path.exists(TRUSTED_SOURCES_FILE):
         with open(TRUSTED_SOURCES_FILE, 'r') as f:
             _trusted_sources = json.load(f)
@@ -131,21 +165,22 @@ def load_trusted_sources():
         }
 
 def save_trusted_sources():
-    with open(TRUSTED_SOURCES_FILE, 'w') as f:
-        json.dump(_trusted_sources, f, indent=2)
+    """Persist the full trusted source list (individual changes are written as they happen)"""
+    _store.replace_trusted_sources(_trusted_sources)
+    _store.maybe_snapshot(SNAPSHOT_PATHS)
 
 def save_learning_sources():
-    with open(LEARNING_SOURCES_FILE, 'w') as f:
-        json.dump({
-            'learning_sources': _learning_sources,
-            'source_metrics': _source_metrics,
-            'last_updated': datetime.now().isoformat()
-        }, f, indent=2)
+    """Learning sources and metrics are upserted per event; only refresh the snapshot"""
+    _store.maybe_snapshot(SNAPSHOT_PATHS)
 
 def save_source_analytics():
+    """Source analytics are written per event; only refresh the snapshot"""
     _source_analytics['last_updated'] = datetime.now().isoformat()
-    with open(SOURCE_ANALYTICS_FILE, 'w') as f:
-        json.dump(_source_analytics, f, indent=2)
+    _store.maybe_snapshot(SNAPSHOT_PATHS)
+
+def snapshot_sources():
+    """Force a compacted JSON snapshot of the source store"""
+    _store.snapshot(SNAPSHOT_PATHS)
 
 def get_trusted_sources():
     return list(_trusted_sources)
@@ -153,7 +188,7 @@ def get_trusted_sources():
 def get_learning_sources(ai_type: Optional[str] = None) -> Dict[str, List[str]]:
     """Get AI-specific learning sources with ML-enhanced discovery"""
     if ai_type:
-        sources = _learning_sources.get(ai_type, [])
+        sources = list(_learning_sources.get(ai_type, []))
         # Add ML-recommended sources
         ml_recommendations = _get_ml_recommended_sources(ai_type)
         sources.extend(ml_recommendations)
@@ -163,6 +198,7 @@ def get_learning_sources(ai_type: Optional[str] = None) -> Dict[str, List[str]]:
 def add_trusted_source(url: str) -> bool:
     if url not in _trusted_sources:
         _trusted_sources.append(url)
+        _store.add_trusted_source(url)
         save_trusted_sources()
         _update_source_analytics('trusted_sources_added', url)
         return True
@@ -171,6 +207,7 @@ def add_trusted_source(url: str) -> bool:
 def remove_trusted_source(url: str) -> bool:
     if url in _trusted_sources:
         _trusted_sources.remove(url)
+        _store.remove_trusted_source(url)
         save_trusted_sources()
         _update_source_analytics('trusted_sources_removed', url)
         return True
@@ -213,6 +250,7 @@ async def discover_new_sources_from_learning_result(ai_type: str, learning_resul
                     _update_source_metrics(ai_type, source, learning_result)
                     _update_source_analytics('source_discovered', source, ai_type)
             
+            _store.add_learning_sources(ai_type, discovered_sources)
             save_learning_sources()
             _update_growth_metrics(ai_type, len(discovered_sources))
         
@@ -399,34 +437,22 @@ def _get_similarity_recommendations(ai_type: str) -> List[str]:
 
 def _update_source_metrics(ai_type: str, source: str, learning_result: Dict):
     """Update source performance metrics with ML enhancement"""
-    if ai_type not in _source_metrics:
-        _source_metrics[ai_type] = {}
-    
-    if source not in _source_metrics[ai_type]:
-        _source_metrics[ai_type][source] = {
-            'discovery_count': 0,
-            'success_count': 0,
-            'failure_count': 0,
-            'quality_score': 0.0,
-            'last_used': None,
-            'learning_value': 0.0
-        }
-    
-    metrics = _source_metrics[ai_type][source]
-    metrics['discovery_count'] += 1
-    metrics['last_used'] = datetime.now().isoformat()
-    
     # Calculate learning value
     learning_value = _calculate_learning_value(learning_result)
-    metrics['learning_value'] = (metrics['learning_value'] + learning_value) / 2
     
-    # Update quality score based on learning value
-    if learning_value > 0.7:
-        metrics['success_count'] += 1
-        metrics['quality_score'] = min(1.0, metrics['quality_score'] + 0.1)
-    else:
-        metrics['failure_count'] += 1
-        metrics['quality_score'] = max(0.0, metrics['quality_score'] - 0.05)
+    # Update quality score based on learning value; applied as deltas in the store so
+    # concurrent workers never overwrite each other's counts
+    success = learning_value > 0.7
+    metrics = _store.increment_source_metrics(
+        ai_type, source,
+        discovery_count=1,
+        success_count=1 if success else 0,
+        failure_count=0 if success else 1,
+        quality_delta=0.1 if success else -0.05,
+        learning_value=learning_value,
+        last_used=datetime.now().isoformat(),
+    )
+    _source_metrics.setdefault(ai_type, {})[source] = metrics
 
 def _calculate_learning_value(learning_result: Dict) -> float:
     """Calculate learning value using ML metrics"""
@@ -482,6 +508,7 @@ def _update_source_analytics(event_type: str, source: str, ai_type: str = None):
     }
     
     _source_analytics['events'].append(event)
+    _store.append_event(event)
     
     # Keep only recent events
     if len(_source_analytics['events']) > 1000:
@@ -512,39 +539,21 @@ def _update_growth_metrics(ai_type: str, new_sources_count: int):
     
     metrics['last_updated'] = datetime.now().isoformat()
     
+    _store.set_analytics_value('growth_metrics', _source_analytics['growth_metrics'])
     save_source_analytics()
 
 def get_source_performance(ai_type: Optional[str] = None) -> Dict[str, Dict]:
     """Get source performance metrics with ML enhancement"""
+    metrics = _store.get_source_metrics(ai_type)
     if ai_type:
-        return {ai_type: _source_metrics.get(ai_type, {})}
-    return _source_metrics.copy()
+        return {ai_type: metrics.get(ai_type, {})}
+    return metrics
 
 def get_top_performing_sources(ai_type: str, limit: int = 5) -> List[str]:
     """Get top performing sources using ML ranking"""
     try:
-        if ai_type not in _source_metrics:
-            return []
-        
-        sources = _source_metrics[ai_type]
-        
-        # Calculate ML-based performance score
-        scored_sources = []
-        for source, metrics in sources.items():
-            # ML performance score calculation
-            quality_score = metrics.get('quality_score', 0.0)
-            learning_value = metrics.get('learning_value', 0.0)
-            success_rate = metrics.get('success_count', 0) / max(metrics.get('discovery_count', 1), 1)
-            
-            # Weighted performance score
-            performance_score = (quality_score * 0.4 + learning_value * 0.4 + success_rate * 0.2)
-            
-            scored_sources.append((source, performance_score))
-        
-        # Sort by performance score
-        scored_sources.sort(key=lambda x: x[1], reverse=True)
-        
-        return [source for source, score in scored_sources[:limit]]
+        # Performance score is maintained on write and indexed per AI type
+        return _store.get_top_sources(ai_type, limit)
         
     except Exception as e:
         logger.error(f"Error getting top performing sources: {e}")
@@ -569,6 +578,7 @@ async def expand_ai_learning_sources(ai_type: str, topic: str) -> List[str]:
                 new_sources.append(source)
         
         if new_sources:
+            _store.add_learning_sources(ai_type, new_sources)
             save_learning_sources()
             _update_growth_metrics(ai_type, len(new_sources))
         
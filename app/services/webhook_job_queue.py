@@ -0,0 +1,391 @@
+"""
+Webhook Job Queue - Durable queue for GitHub webhook processing
+Deliveries are persisted to an embedded SQLite table and acknowledged at once;
+a worker pool claims jobs under a visibility timeout (lease), so jobs held by a
+crashed worker become claimable again. Deliveries are deduplicated on their
+delivery id, and queued jobs sharing a coalesce key (e.g. pushes to one ref)
+are merged into a single run. Jobs with the same key never run concurrently.
+A reclaimed lease counts as an attempt, so a job that keeps killing its worker
+fails after max_attempts. Finished jobs are purged after a retention window.
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Any, Callable, Awaitable
+import structlog
+
+from app.core.config import settings
+from app.core.task_supervisor import task_supervisor, RESTART_ON_FAILURE
+
+logger = structlog.get_logger()
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+WEBHOOK_JOBS_DB = os.path.join(ROOT_DIR, "webhook_jobs.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    delivery_id TEXT NOT NULL UNIQUE,
+    event TEXT NOT NULL,
+    coalesce_key TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    merged_into INTEGER,
+    coalesced_count INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    locked_until REAL,
+    locked_by TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_webhook_jobs_claim ON webhook_jobs(status, available_at, id);
+CREATE INDEX IF NOT EXISTS idx_webhook_jobs_coalesce ON webhook_jobs(coalesce_key, status);
+"""
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+COALESCED = "coalesced"
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+PURGE_INTERVAL_SECONDS = 3600.0  # How often workers purge finished jobs
+
+
+def merge_push_payloads(queued: Dict[str, Any], incoming: Dict[str, Any]) -> Dict[str, Any]:
+    """Latest push payload, carrying the commits of every push it absorbed"""
+    merged = dict(incoming)
+    merged["commits"] = list(queued.get("commits") or []) + list(incoming.get("commits") or [])
+    return merged
+
+
+class WebhookJobQueue:
+    """SQLite-backed job queue with leases, delivery dedup and coalescing"""
+
+    def __init__(self, db_path: str, max_attempts: int = 3, retry_delay: float = 30.0):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self, work: Callable[[], Any]) -> Any:
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                result = work()
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(self, delivery_id: str, event: str, payload: Dict[str, Any],
+                coalesce_key: Optional[str] = None,
+                merge: Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]] = merge_push_payloads) -> Dict[str, Any]:
+        """Persist a delivery; returns {"job_id", "status": enqueued|duplicate|coalesced}"""
+        def work():
+            now = time.time()
+            existing = self._conn.execute(
+                "SELECT id, merged_into FROM webhook_jobs WHERE delivery_id = ?", (delivery_id,)
+            ).fetchone()
+            if existing:
+                return {"job_id": existing["merged_into"] or existing["id"], "status": "duplicate"}
+
+            target = None
+            if coalesce_key:
+                target = self._conn.execute(
+                    "SELECT id, payload FROM webhook_jobs WHERE coalesce_key = ? AND status = ? "
+                    "ORDER BY id LIMIT 1", (coalesce_key, QUEUED)
+                ).fetchone()
+            if target:
+                merged = merge(json.loads(target["payload"]), payload)
+                self._conn.execute(
+                    "UPDATE webhook_jobs SET payload = ?, coalesced_count = coalesced_count + 1 WHERE id = ?",
+                    (json.dumps(merged), target["id"])
+                )
+                # Recorded so a redelivery of this id is still recognised as a duplicate
+                self._conn.execute(
+                    "INSERT INTO webhook_jobs (delivery_id, event, coalesce_key, payload, status, merged_into, "
+                    "available_at, created_at, finished_at) VALUES (?, ?, ?, '{}', ?, ?, ?, ?, ?)",
+                    (delivery_id, event, coalesce_key, COALESCED, target["id"], now, now, now)
+                )
+                return {"job_id": target["id"], "status": "coalesced"}
+
+            cursor = self._conn.execute(
+                "INSERT INTO webhook_jobs (delivery_id, event, coalesce_key, payload, status, available_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (delivery_id, event, coalesce_key, json.dumps(payload), QUEUED, now, now)
+            )
+            return {"job_id": cursor.lastrowid, "status": "enqueued"}
+
+        return self._transaction(work)
+
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[Dict[str, Any]]:
+        """Lease the oldest runnable job; expired leases of crashed workers are reclaimed"""
+        def work():
+            now = time.time()
+            # Every claim counted as an attempt; an expired lease with none left fails
+            # rather than being handed to yet another worker
+            self._conn.execute(
+                "UPDATE webhook_jobs SET status = ?, finished_at = ?, locked_until = NULL, "
+                "error = 'Lease expired on the final attempt' "
+                "WHERE status = ? AND locked_until < ? AND attempts >= ?",
+                (FAILED, now, RUNNING, now, self.max_attempts)
+            )
+            row = self._conn.execute(
+                """
+                SELECT * FROM webhook_jobs AS job
+                WHERE ((job.status = ? AND job.available_at <= ?) OR (job.status = ? AND job.locked_until < ?))
+                  AND (job.coalesce_key IS NULL OR NOT EXISTS (
+                      SELECT 1 FROM webhook_jobs AS other
+                      WHERE other.coalesce_key = job.coalesce_key AND other.id != job.id
+                        AND other.status = ? AND other.locked_until >= ?
+                  ))
+                ORDER BY job.id LIMIT 1
+                """,
+                (QUEUED, now, RUNNING, now, RUNNING, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE webhook_jobs SET status = ?, locked_until = ?, locked_by = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (RUNNING, now + visibility_timeout, worker_id, row["id"])
+            )
+            job = dict(row)
+            job["attempts"] += 1
+            job["payload"] = json.loads(job["payload"])
+            return job
+
+        return self._transaction(work)
+
+    def extend(self, job_id: int, worker_id: str, visibility_timeout: float) -> bool:
+        """Heartbeat: push the lease forward while the job is still being worked on"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE webhook_jobs SET locked_until = ? WHERE id = ? AND status = ? AND locked_by = ?",
+                (time.time() + visibility_timeout, job_id, RUNNING, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE webhook_jobs SET status = ?, finished_at = ?, locked_until = NULL, error = NULL "
+                "WHERE id = ? AND status = ? AND locked_by = ?",
+                (DONE, time.time(), job_id, RUNNING, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> str:
+        """Requeue with exponential backoff, or mark failed once attempts are exhausted"""
+        def work():
+            row = self._conn.execute(
+                "SELECT attempts FROM webhook_jobs WHERE id = ? AND status = ? AND locked_by = ?",
+                (job_id, RUNNING, worker_id)
+            ).fetchone()
+            if row is None:
+                return "lost"
+            now = time.time()
+            if row["attempts"] >= self.max_attempts:
+                self._conn.execute(
+                    "UPDATE webhook_jobs SET status = ?, finished_at = ?, locked_until = NULL, error = ? WHERE id = ?",
+                    (FAILED, now, error[:2000], job_id)
+                )
+                return FAILED
+            self._conn.execute(
+                "UPDATE webhook_jobs SET status = ?, available_at = ?, locked_until = NULL, error = ? WHERE id = ?",
+                (QUEUED, now + self.retry_delay * 2 ** (row["attempts"] - 1), error[:2000], job_id)
+            )
+            return QUEUED
+
+        return self._transaction(work)
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, delivery_id, event, coalesce_key, status, merged_into, coalesced_count, attempts, "
+                "created_at, finished_at, error FROM webhook_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM webhook_jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs (and their coalesced deliveries) older than the given age"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM webhook_jobs WHERE status IN (?, ?, ?) AND finished_at < ?",
+                (DONE, FAILED, COALESCED, time.time() - older_than_seconds)
+            )
+        return cursor.rowcount
+
+
+class WebhookJobService:
+    """Worker pool draining the webhook job queue"""
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(WebhookJobService, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.workers = settings.github_webhook_workers
+            self.visibility_timeout = settings.github_webhook_visibility_timeout
+            self.poll_interval = 5.0
+            self._queue: Optional[WebhookJobQueue] = None
+            self._handlers: Dict[str, JobHandler] = {}
+            self._tasks: List[asyncio.Task] = []
+            self._wakeup: Optional[asyncio.Event] = None
+            self._stats = {"processed": 0, "failed": 0, "retried": 0, "purged": 0}
+            self._last_purge: Optional[float] = None
+            self._initialized = True
+
+    @property
+    def queue(self) -> WebhookJobQueue:
+        if self._queue is None:
+            self._queue = WebhookJobQueue(WEBHOOK_JOBS_DB, max_attempts=settings.github_webhook_max_attempts)
+        return self._queue
+
+    def use_queue(self, job_queue: WebhookJobQueue):
+        """Swap the backing queue (tests, alternate storage)"""
+        self._queue = job_queue
+
+    def register(self, event: str, handler: JobHandler):
+        self._handlers[event] = handler
+
+    def handles(self, event: str) -> bool:
+        return event in self._handlers
+
+    def enqueue(self, delivery_id: Optional[str], event: str, payload: Dict[str, Any],
+                coalesce_key: Optional[str] = None) -> Dict[str, Any]:
+        result = self.queue.enqueue(delivery_id or f"local-{uuid.uuid4()}", event, payload, coalesce_key)
+        if result["status"] == "enqueued" and self._wakeup is not None:
+            self._wakeup.set()
+        return result
+
+    def is_running(self) -> bool:
+        """Whether this process has workers draining the queue"""
+        return any(not task.done() for task in self._tasks)
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            task_supervisor.spawn(f"webhook-worker-{i}", self._worker, f"webhook-worker-{os.getpid()}-{i}",
+                                  owner="webhooks", restart=RESTART_ON_FAILURE)
+            for i in range(self.workers)
+        ]
+        logger.info("Webhook job workers started", workers=self.workers)
+
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_pending(self, worker_id: str = "inline") -> int:
+        """Drain every runnable job in the current task; returns the number of jobs run"""
+        ran = 0
+        while await self._run_one(worker_id):
+            ran += 1
+        self._maybe_purge()
+        return ran
+
+    def _maybe_purge(self):
+        now = time.monotonic()
+        if self._last_purge is not None and now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        purged = self.queue.purge(settings.github_webhook_job_retention_seconds)
+        self._stats["purged"] += purged
+        if purged:
+            logger.info("Purged finished webhook jobs", purged=purged)
+
+    async def _worker(self, worker_id: str):
+        while True:
+            try:
+                ran = await self._run_one(worker_id)
+                task_supervisor.beat()
+                if not ran:
+                    self._maybe_purge()
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Webhook worker error", worker=worker_id, error=str(e))
+                task_supervisor.beat(error=e)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _run_one(self, worker_id: str) -> bool:
+        job = self.queue.claim(worker_id, self.visibility_timeout)
+        if job is None:
+            return False
+        handler = self._handlers.get(job["event"])
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"], worker_id))
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for {job['event']}")
+            await handler(job["payload"])
+        except Exception as e:
+            outcome = self.queue.fail(job["id"], worker_id, f"{type(e).__name__}: {e}")
+            self._stats["retried" if outcome == QUEUED else "failed"] += 1
+            logger.error("Webhook job failed", job_id=job["id"], github_event=job["event"], attempts=job["attempts"],
+                         outcome=outcome, error=str(e))
+        else:
+            self.queue.complete(job["id"], worker_id)
+            self._stats["processed"] += 1
+            logger.info("Webhook job completed", job_id=job["id"], github_event=job["event"],
+                        coalesced=job["coalesced_count"])
+        finally:
+            heartbeat.cancel()
+        return True
+
+    async def _heartbeat(self, job_id: int, worker_id: str):
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            self.queue.extend(job_id, worker_id, self.visibility_timeout)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "jobs_by_status": self.queue.stats(),
+            **self._stats,
+        }
+
+
+webhook_job_service = WebhookJobService()
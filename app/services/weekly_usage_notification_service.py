@@ -12,6 +12,7 @@ from sqlalchemy import select, func
 from ..core.database import get_session
 from ..models.sql_models import TokenUsage, Notification
 from ..services.token_usage_service import token_usage_service
+from ..services.rollup_service import rollup_service
 from ..core.config import settings
 
 logger = structlog.get_logger()
@@ -64,6 +65,16 @@ class WeeklyUsageNotificationService:
             # Get alerts
             alerts = await token_usage_service.get_usage_alerts()
             
+            # Last seven days from the daily rollups (bounded by days, not by raw log rows)
+            today = datetime.utcnow().date()
+            async with get_session() as session:
+                week_days = await rollup_service.get_token_usage_by_day(session, today - timedelta(days=6), today)
+            daily_breakdown = {}
+            week_by_ai = {}
+            for day in week_days:
+                daily_breakdown[day["day"]] = daily_breakdown.get(day["day"], 0) + day["total_tokens"]
+                week_by_ai[day["ai_type"]] = week_by_ai.get(day["ai_type"], 0) + day["total_tokens"]
+            
             # Generate AI-specific breakdown
             ai_breakdown = []
             for ai_type, usage in all_usage.get("ai_usage", {}).items():
@@ -71,7 +82,8 @@ class WeeklyUsageNotificationService:
                     "ai_type": ai_type,
                     "tokens_used": usage.get("total_tokens", 0),
                     "requests": usage.get("request_count", 0),
-                    "percentage": usage.get("usage_percentage", 0)
+                    "percentage": usage.get("usage_percentage", 0),
+                    "tokens_this_week": week_by_ai.get(ai_type, 0)
                 })
             
             # Determine status and recommendations
@@ -91,6 +103,8 @@ class WeeklyUsageNotificationService:
                 "week_ending": datetime.utcnow().strftime("%Y-%m-%d"),
                 "total_tokens_used": total_tokens,
                 "total_requests": total_requests,
+                "tokens_this_week": sum(daily_breakdown.values()),
+                "daily_breakdown": [{"date": day, "tokens": tokens} for day, tokens in sorted(daily_breakdown.items())],
                 "usage_percentage": round(usage_percentage, 2),
                 "status": status,
                 "ai_count": ai_count,
@@ -0,0 +1,215 @@
+"""
+Write Buffer - Batched database writes for high-frequency learning events
+Rows are queued in memory and flushed every N rows or T milliseconds as one
+multi-row INSERT per table; latest-state records (e.g. per-AI metrics) are
+coalesced by key so only the newest version is written per flush. A batch that
+keeps failing is split up (per model, per coalesced write, then by halving the
+rows) so only the rows that fail on their own are dropped
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Dict, List, Any, Callable, Awaitable, Optional, Tuple, Type
+import structlog
+from sqlalchemy import insert
+
+from app.core.task_supervisor import task_supervisor, RESTART_ON_FAILURE
+
+logger = structlog.get_logger()
+
+CoalescedWrite = Callable[[Any], Awaitable[None]]
+
+
+class WriteBuffer:
+    """Bounded in-process write buffer with size/time based flushing and backpressure"""
+
+    def __init__(self, name: str, session_factory: Optional[Callable[[], Any]] = None,
+                 max_batch: int = 200, flush_interval: float = 0.25, max_pending: int = 5000,
+                 max_retries: int = 3):
+        self.name = name
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self._session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._coalesced: Dict[Any, CoalescedWrite] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+        self._flush_latencies = deque(maxlen=100)
+        self._metrics = {
+            "rows_enqueued": 0,
+            "rows_written": 0,
+            "coalesced_writes": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "dropped_rows": 0,
+            "dropped_coalesced": 0,
+            "backpressure_waits": 0,
+            "max_flush_ms": 0.0,
+        }
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.core.database import get_session
+            return get_session()
+        return self._session_factory()
+
+    def _ensure_started(self):
+        """Start the flusher on the running loop (lazily, so the buffer works from any entry point)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or a new event loop (tests): rebuild loop-bound primitives
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._wakeup = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = None
+        if (self._task is None or self._task.done()) and not self._stopping:
+            self._task = task_supervisor.spawn(f"write-buffer-{self.name}", self._run, owner="write_buffer",
+                                               restart=RESTART_ON_FAILURE, interval=self.flush_interval)
+
+    async def add(self, model: Type[Any], row: Dict[str, Any]):
+        """Queue one row for insertion; waits while the buffer is full (backpressure)"""
+        self._ensure_started()
+        if self._queue.full():
+            self._metrics["backpressure_waits"] += 1
+            self._wakeup.set()
+        await self._queue.put((model, row))
+        self._metrics["rows_enqueued"] += 1
+        if self._queue.qsize() >= self.max_batch:
+            self._wakeup.set()
+
+    def set_latest(self, key: Any, write: CoalescedWrite):
+        """Schedule a latest-state write; a newer write for the same key replaces a pending one"""
+        self._ensure_started()
+        if key in self._coalesced:
+            self._metrics["coalesced_writes"] += 1
+        self._coalesced[key] = write
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+                task_supervisor.beat()
+            except Exception as e:
+                logger.error("Write buffer flush loop error", buffer=self.name, error=str(e))
+                task_supervisor.beat(error=e)
+
+    def _drain(self) -> List[Tuple[Type[Any], Dict[str, Any]]]:
+        items = []
+        while len(items) < self.max_batch and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        return items
+
+    async def flush(self):
+        """Write everything currently buffered, one multi-row INSERT per table per batch"""
+        if self._queue is None:
+            return
+        async with self._flush_lock:
+            while not self._queue.empty() or self._coalesced:
+                items = self._drain()
+                coalesced, self._coalesced = self._coalesced, {}
+                await self._write_batch(items, coalesced)
+
+    async def _try_write(self, by_model: Dict[Any, List[Dict[str, Any]]],
+                         coalesced: Dict[Any, CoalescedWrite]) -> Optional[Exception]:
+        """Write rows and coalesced writes in one transaction; returns the error instead of raising"""
+        try:
+            async with self._session() as session:
+                for model, rows in by_model.items():
+                    await session.execute(insert(model), rows)
+                for write in coalesced.values():
+                    await write(session)
+                await session.commit()
+            return None
+        except Exception as e:
+            return e
+
+    async def _write_batch(self, items: List[Tuple[Type[Any], Dict[str, Any]]], coalesced: Dict[Any, CoalescedWrite]):
+        by_model: Dict[Any, List[Dict[str, Any]]] = {}
+        for model, row in items:
+            by_model.setdefault(model, []).append(row)
+
+        for attempt in range(1, self.max_retries + 1):
+            started = time.perf_counter()
+            error = await self._try_write(by_model, coalesced)
+            if error is None:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self._flush_latencies.append(elapsed_ms)
+                self._metrics["flushes"] += 1
+                self._metrics["rows_written"] += len(items)
+                self._metrics["max_flush_ms"] = max(self._metrics["max_flush_ms"], elapsed_ms)
+                return
+            self._metrics["failed_flushes"] += 1
+            logger.warning("Write buffer flush failed", buffer=self.name, attempt=attempt,
+                           rows=len(items), error=str(error))
+            if attempt < self.max_retries:
+                await asyncio.sleep(min(0.1 * 2 ** attempt, 2.0))
+
+        await self._salvage(by_model, coalesced)
+
+    async def _salvage(self, by_model: Dict[Any, List[Dict[str, Any]]], coalesced: Dict[Any, CoalescedWrite]):
+        """Write a failed batch piece by piece so one bad row does not take the rest with it"""
+        for model, rows in by_model.items():
+            await self._write_rows_split(model, rows)
+        for key, write in coalesced.items():
+            error = await self._try_write({}, {key: write})
+            if error is not None:
+                self._metrics["dropped_coalesced"] += 1
+                logger.error("Write buffer dropped coalesced write", buffer=self.name, key=str(key), error=str(error))
+
+    async def _write_rows_split(self, model: Any, rows: List[Dict[str, Any]]):
+        """Write rows of one model, halving the chunk on failure until the failing rows are isolated"""
+        error = await self._try_write({model: rows}, {})
+        if error is None:
+            self._metrics["rows_written"] += len(rows)
+            return
+        if len(rows) == 1:
+            self._metrics["dropped_rows"] += 1
+            logger.error("Write buffer dropped row", buffer=self.name,
+                         model=getattr(model, "__tablename__", str(model)), error=str(error))
+            return
+        middle = len(rows) // 2
+        await self._write_rows_split(model, rows[:middle])
+        await self._write_rows_split(model, rows[middle:])
+
+    async def stop(self):
+        """Stop the flusher and write out everything still buffered"""
+        self._stopping = True
+        if self._task and not self._task.done():
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=self.flush_interval * 4 + 5)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+        try:
+            await self.flush()
+        finally:
+            self._task = None
+            self._stopping = False
+        logger.info("Write buffer stopped", buffer=self.name, rows_written=self._metrics["rows_written"])
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue depth, flush latency and throughput counters"""
+        latencies = sorted(self._flush_latencies)
+        return {
+            "name": self.name,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "pending_coalesced": len(self._coalesced),
+            "max_pending": self.max_pending,
+            "max_batch": self.max_batch,
+            "flush_interval_ms": self.flush_interval * 1000,
+            "avg_flush_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p95_flush_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2) if latencies else 0.0,
+            **self._metrics,
+        }
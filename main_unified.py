@@ -47,7 +47,7 @@ from app.routers import (
 from app.routers.custody_protocol import router as custody_protocol
 from app.routers.imperium_learning import router as imperium_learning_router
 from app.routers.codex import router as codex_router
-from app.routers.plugin import router as plugin_router
+from app.routers.plugin import router as plugin_router, shutdown_plugin_manager
 from app.routers.auto_apply import router as auto_apply_router
 from app.routers.optimized_services import router as optimized_services_router
 from app.routers.proposals import periodic_proposal_generation
@@ -104,7 +104,8 @@ from app.services.ai_learning_service import AILearningService
 from app.services.ml_service import MLService
 from app.core.config import settings
 from app.core.database import init_database, close_database, create_tables, create_indexes
-from app.core.logging import setup_logging
+from app.core.logging import setup_logging, shutdown_logging
+from app.core.task_supervisor import task_supervisor, RESTART_ON_FAILURE
 
 # Initialize all services
 from app.services.ai_agent_service import AIAgentService
@@ -142,6 +143,8 @@ from app.services.rolling_password_service import RollingPasswordService
 # Initialize other services from app/main.py
 from app.services.proposal_cycle_service import ProposalCycleService
 from app.services.token_usage_service import TokenUsageService
+from app.services.rollup_service import rollup_service
+from app.services.webhook_job_queue import webhook_job_service
 from app.services.scheduled_notification_service import ScheduledNotificationService
 from app.services.enhanced_autonomous_learning_service import EnhancedAutonomousLearningService  # FIXED IMPORT
 from app.services.custody_protocol_service import CustodyProtocolService
@@ -279,20 +282,29 @@ async def lifespan(app: FastAPI):
         if os.getenv("RUN_BACKGROUND_JOBS", "1") != "0":
             # Start autonomous AI cycle in background
             background_service = BackgroundService()
-            asyncio.create_task(background_service.start_autonomous_cycle())
+            await background_service.start_autonomous_cycle()
             
             # Start enhanced autonomous learning service with custody protocol
             enhanced_learning_service = EnhancedAutonomousLearningService()
-            asyncio.create_task(enhanced_learning_service.start_enhanced_autonomous_learning())
+            # Retried until the custody service is up; it then spawns its four supervised cycles
+            task_supervisor.spawn("enhanced-autonomous-learning", enhanced_learning_service.start_enhanced_autonomous_learning,
+                                  owner="enhanced_learning", restart=RESTART_ON_FAILURE)
             
             # Start auto-apply monitoring
-            asyncio.create_task(auto_apply_service.start_monitoring())
+            await auto_apply_service.start_monitoring()
 
             # Start periodic proposal generation feedback loop
-            asyncio.create_task(periodic_proposal_generation())
+            task_supervisor.spawn("periodic-proposal-generation", periodic_proposal_generation,
+                                  owner="proposals", restart=RESTART_ON_FAILURE, interval=2700)
             
             # Start additional services from app/main.py
-            asyncio.create_task(scheduled_notification_service.start_weekly_scheduler())
+            await scheduled_notification_service.start_weekly_scheduler()
+            
+            # Fold raw usage/learning rows into daily rollups and apply retention
+            await rollup_service.start()
+            
+            # Run queued GitHub webhook jobs (including any left over from before a restart)
+            await webhook_job_service.start()
             
             print("✅ Background jobs started - Learning cycles active")
             logger.info("✅ Background jobs started - Learning cycles active")
@@ -384,10 +396,20 @@ async def lifespan(app: FastAPI):
             await background_service.stop_autonomous_cycle()
         if 'scheduled_notification_service' in locals():
             await scheduled_notification_service.stop_weekly_scheduler()
+        await rollup_service.stop()
+        await webhook_job_service.stop()
+        # Cancel every remaining supervised loop (newest first) before its dependencies close
+        await task_supervisor.shutdown()
+        shutdown_plugin_manager()
+        # Flush buffered learning writes before the engine goes away
+        await AILearningService().write_buffer.stop()
         await close_database()
         logger.info("✅ Shutdown complete")
     except Exception as e:
         logger.error(f"❌ Error during shutdown: {str(e)}")
+    finally:
+        # Write out queued log records before the process exits
+        shutdown_logging()
 
 # Create FastAPI app with unified configuration + BACKUP STARTUP EVENT
 app = FastAPI(
@@ -434,6 +456,11 @@ app.add_middleware(
 
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
 
+if settings.query_profiler_enabled:
+    # Development/test only: per-request statement counts and endpoint query budgets
+    from app.core.query_profiler import QueryProfilerMiddleware
+    app.add_middleware(QueryProfilerMiddleware, enforce=settings.query_budget_enforce)
+
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
     response = await call_next(request)
@@ -666,6 +693,15 @@ async def debug_info():
             "timestamp": datetime.utcnow().isoformat()
         }
 
+@app.get("/debug/tasks")
+async def debug_tasks():
+    """Supervised background tasks with CPU, iteration, lag and error accounting"""
+    return {
+        "status": "ok",
+        "timestamp": datetime.utcnow().isoformat(),
+        **task_supervisor.get_status()
+    }
+
 if __name__ == "__main__":
     # FORCE Railway port detection - Railway must execute this
     port_env = os.environ.get("PORT")
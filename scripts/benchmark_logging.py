@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Logging Pipeline Micro-benchmark
+Compares the caller-side cost of AILoggingService events written synchronously
+with the queue-backed pipeline (fast file sink and a stalled sink such as a
+congested stdout pipe), with and without subsystem sampling
+"""
+
+import logging
+import logging.handlers
+import queue
+import sys
+import os
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logging import BoundedQueueHandler, sampler
+from app.services.logging_service import AILoggingService, AISystemType
+
+
+class StalledFileHandler(logging.FileHandler):
+    """File sink that stalls on every write, like a container log pipe under pressure"""
+
+    def emit(self, record):
+        time.sleep(0.0002)
+        super().emit(record)
+
+
+def bench(label, service, events):
+    start = time.perf_counter()
+    for i in range(events):
+        service.log_test_execution("imperium", "training_ground", 87.5, i % 3 != 0, 1.25, {"iteration": i})
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f}s  {elapsed / events * 1e6:8.2f} µs/call")
+    return elapsed / events
+
+
+def run_pipeline(service, sink, events, label):
+    """Time the same events through a synchronous handler and through the queue"""
+    root = logging.getLogger()
+    sink.setFormatter(logging.Formatter("%(message)s"))
+
+    root.addHandler(sink)
+    synchronous = bench(f"{label}: synchronous", service, events)
+    root.removeHandler(sink)
+
+    queue_handler = BoundedQueueHandler(queue.Queue(maxsize=events * 2))
+    listener = logging.handlers.QueueListener(queue_handler.queue, sink)
+    listener.start()
+    root.addHandler(queue_handler)
+    queued = bench(f"{label}: queued", service, events)
+    root.removeHandler(queue_handler)
+    listener.stop()
+    sink.close()
+    print(f"🚀 {label}: queue speedup {synchronous / queued:.2f}x, dropped {queue_handler.dropped}")
+    return queued
+
+
+def main(events: int = 10000):
+    service = AILoggingService()
+    logging.getLogger().setLevel(logging.INFO)
+    directory = tempfile.mkdtemp()
+
+    # Sampling disabled: every event is formatted and written
+    sampler.configure(AISystemType.TRAINING_GROUND.value, info_rate=1e12)
+    queued = run_pipeline(service, logging.FileHandler(os.path.join(directory, "fast.log")), events, "file sink")
+    run_pipeline(service, StalledFileHandler(os.path.join(directory, "stalled.log")), events, "stalled sink")
+
+    # Default-style rate limit: events over budget are dropped before formatting
+    sampler.configure(AISystemType.TRAINING_GROUND.value, info_rate=1000)
+    sampled = bench("rate limited (1000/s)", service, events)
+    print(f"📉 Rate limited: {sampler.stats[AISystemType.TRAINING_GROUND.value]['rate_limited']}")
+    print(f"🚀 Rate limiting speedup over queued: {queued / sampled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Scoring Engine Micro-benchmark
+Compares per-pattern component extraction with the compiled single-pass engine
+over stored AIResponse rows (falls back to a synthetic corpus when none exist)
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scoring_engine import extract_components, extract_components_reference, response_text
+from app.services.intelligent_scoring_system import IntelligentScoringSystem, DifficultyLevel
+
+SYNTHETIC_RESPONSE = """Approach: split the work into a cache layer and a worker pool.
+Reasoning: because the hot path is read heavy, therefore caching pays off.
+
+```python
+from functools import lru_cache
+import asyncio
+
+class Worker:
+    # Worker that validates input
+    async def run(self, item) -> dict:
+        try:
+            return {k: v for k, v in item.items()}
+        except Exception:
+            raise
+```
+
+Security: input validation and authentication on every call, hash and salt secrets.
+Performance: O(1) lookups, async throughput, low latency under load.
+Test: assert the worker returns the same keys.
+"""
+
+
+async def load_corpus(limit: int):
+    """Load stored AI responses, or fall back to a synthetic corpus"""
+    try:
+        from sqlalchemy import select
+        from app.core.database import init_database, get_session
+        from app.models.sql_models import AIResponse
+
+        await init_database()
+        async with get_session() as session:
+            result = await session.execute(select(AIResponse).limit(limit))
+            corpus = [response_text(row) for row in result.scalars().all()]
+        if corpus:
+            return corpus, "ai_responses"
+    except Exception as e:
+        print(f"⚠️ Could not load stored AI responses ({e}); using synthetic corpus")
+    return [SYNTHETIC_RESPONSE * (1 + i % 8) for i in range(limit)], "synthetic"
+
+
+def bench(label, func, corpus, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            func(text)
+    elapsed = time.perf_counter() - start
+    throughput = rounds * len(corpus) / elapsed
+    print(f"{label:<28} {elapsed:8.3f}s  {throughput:10.1f} responses/s")
+    return throughput
+
+
+async def main(limit: int = 500, rounds: int = 5):
+    corpus, source = await load_corpus(limit)
+    print(f"📊 Corpus: {len(corpus)} responses from {source}, {rounds} rounds")
+
+    mismatches = sum(1 for text in corpus if extract_components(text) != extract_components_reference(text))
+    print(f"🔍 Extraction mismatches vs reference: {mismatches}")
+
+    reference = bench("per-pattern extraction", extract_components_reference, corpus, rounds)
+    compiled = bench("compiled engine extraction", extract_components, corpus, rounds)
+    print(f"🚀 Extraction speedup: {compiled / reference:.2f}x")
+
+    scoring = IntelligentScoringSystem()
+    start = time.perf_counter()
+    await scoring.evaluate_ai_responses_batch(corpus, {}, DifficultyLevel.ADVANCED, "imperium")
+    elapsed = time.perf_counter() - start
+    print(f"{'batch evaluation':<28} {elapsed:8.3f}s  {len(corpus) / elapsed:10.1f} responses/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
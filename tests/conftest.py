@@ -0,0 +1,35 @@
+"""
+Shared Test Fixtures
+SQLite stand-ins for PostgreSQL-only column types and an async SQLite
+database fixture for the service and router tests
+"""
+
+import pytest
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.compiler import compiles
+
+from app.core.database import Base
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@pytest.fixture
+def sqlite_database(tmp_path):
+    """Open a file-backed SQLite database holding the tables of the given models.
+
+    Returns an async callable yielding ``(engine, session_factory)``; callers
+    dispose of the engine on the event loop that used it.
+    """
+
+    async def open_database(*models, name="test.db", **engine_kwargs):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}", **engine_kwargs)
+        tables = [model.__table__ for model in models]
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+        return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+    return open_database
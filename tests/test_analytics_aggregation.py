@@ -0,0 +1,119 @@
+"""
+Test Analytics Aggregation
+Verifies aggregated SCKIPIT figures against the raw rows behind each section,
+stale-while-revalidate caching, invalidation after writes, and isolation of
+failing or slow sections
+"""
+
+import asyncio
+
+from app.routers.analytics import get_comprehensive_sckipit_analytics
+from app.services.ai_learning_service import AILearningService
+from app.services.analytics_aggregation_service import AnalyticsAggregationService
+
+SECTION_FIELDS = {
+    "conquest": ("total_apps_created", "average_quality_score"),
+    "imperium": ("total_optimizations", "average_quality_improvement"),
+    "guardian": ("total_security_analyses", "average_security_score"),
+    "sandbox": ("total_experiments", "experiment_success_rate"),
+}
+
+
+def _fresh_service(monkeypatch):
+    service = AnalyticsAggregationService()
+    monkeypatch.setattr(service, "_loaders", {})
+    monkeypatch.setattr(service, "_cache", {})
+    monkeypatch.setattr(service, "_refreshing", {})
+    monkeypatch.setattr(service, "_stats", {"hits": 0, "stale_hits": 0, "misses": 0, "timeouts": 0, "errors": 0})
+    monkeypatch.setattr(service, "section_ttl", 3600.0)
+    return service
+
+
+def _register_row_sections(service, learning, computed):
+    """Sections computed from the test results AILearningService records"""
+    def loader(ai_type):
+        count_field, score_field = SECTION_FIELDS[ai_type]
+
+        async def load():
+            computed.append(ai_type)
+            rows = learning._learning_states.get(ai_type, {}).get("test_results", [])
+            scores = [row["score"] for row in rows]
+            return {count_field: len(rows), score_field: sum(scores) / len(scores) if scores else 0.0}
+        return load
+
+    for ai_type in SECTION_FIELDS:
+        service.register_section(ai_type, loader(ai_type))
+
+    async def sckipit_core():
+        return {"analytics": {}, "models_loaded": 0, "knowledge_base_size": 0}
+
+    service.register_section("sckipit_core", sckipit_core)
+
+
+def test_aggregates_match_raw_rows_and_refresh_after_writes(monkeypatch):
+    service = _fresh_service(monkeypatch)
+    learning = object.__new__(AILearningService)
+    learning._learning_states = {}
+    computed = []
+    _register_row_sections(service, learning, computed)
+
+    async def scenario():
+        for ai_type, scores in (("imperium", [0.1, 0.3]), ("guardian", [0.9]), ("sandbox", [0.5, 0.7, 0.6])):
+            for score in scores:
+                await learning.record_test_result(ai_type, "unit", score, "ok")
+
+        result = await get_comprehensive_sckipit_analytics(db=None)
+        raw_rows = [row for state in learning._learning_states.values() for row in state["test_results"]]
+        assert result["aggregated_metrics"]["total_ai_analyses"] == len(raw_rows) == 6
+        assert result["aggregated_metrics"]["total_sckipit_recommendations"] == 2 + 3
+        guardian = result["ai_services"]["guardian"]["analytics"]
+        assert guardian == {"total_security_analyses": 1, "average_security_score": 0.9}
+        assert abs(result["ai_services"]["imperium"]["analytics"]["average_quality_improvement"] - 0.2) < 1e-9
+
+        # A second read is served from the cache
+        computed.clear()
+        await service.get_sections()
+        assert computed == [] and service.get_cache_stats()["hits"] == 5
+
+        # A write invalidates only the affected AI (and the core section)
+        await learning.record_test_result("guardian", "unit", 0.5, "ok")
+        stale = await service.get_section("guardian")
+        assert stale["total_security_analyses"] == 1  # Served stale while revalidating
+        assert (await service.get_section("sandbox"))["total_experiments"] == 3
+        await asyncio.gather(*list(service._refreshing.values()))
+        assert computed == ["guardian"]
+        refreshed = await service.get_section("guardian")
+        assert refreshed == {"total_security_analyses": 2, "average_security_score": 0.7}
+
+        result = await get_comprehensive_sckipit_analytics(db=None)
+        assert result["aggregated_metrics"]["total_ai_analyses"] == 7
+
+    asyncio.run(scenario())
+
+
+def test_failing_and_slow_sections_do_not_fail_the_rest(monkeypatch):
+    service = _fresh_service(monkeypatch)
+    monkeypatch.setattr(service, "section_timeout", 0.05)
+
+    async def ok():
+        return {"total_experiments": 4}
+
+    async def broken():
+        raise RuntimeError("database unavailable")
+
+    async def slow():
+        await asyncio.sleep(1)
+        return {}
+
+    service.register_section("sandbox", ok)
+    service.register_section("guardian", broken)
+    service.register_section("imperium", slow)
+
+    sections = asyncio.run(service.get_sections())
+    assert sections == {
+        "sandbox": {"total_experiments": 4},
+        "guardian": {"error": "database unavailable"},
+        "imperium": {"error": "timeout"},
+    }
+    stats = service.get_cache_stats()
+    assert stats["errors"] == 1 and stats["timeouts"] == 1 and list(stats["sections"]) == ["sandbox"]
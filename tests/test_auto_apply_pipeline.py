@@ -0,0 +1,86 @@
+"""
+Test Auto-Apply Pipeline
+Verifies that approvals are applied from proposal events without polling, that proposals
+for the same file are serialized, and that stats come from event-maintained counters
+"""
+
+import asyncio
+from datetime import datetime
+
+
+from app.core import database
+from app.core.config import settings
+from app.models.sql_models import Proposal
+from app.services.auto_apply_service import AutoApplyService
+
+
+def _proposal(file_path):
+    return Proposal(ai_type="guardian", file_path=file_path, code_before="a", code_after="b",
+                    status="pending", test_status="pending")
+
+
+async def _run_scenario(tmp_path):
+    original_url = settings.database_url
+    settings.database_url = f"sqlite:///{tmp_path / 'auto_apply.db'}"
+    service = AutoApplyService()
+    try:
+        await database.init_database()
+        async with database.engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: database.Base.metadata.create_all(
+                sync_conn, tables=[Proposal.__table__]
+            ))
+
+        active = {}
+        overlaps = []
+
+        async def fake_apply(proposal, session):
+            # Stands in for the final safety test and file write
+            active[proposal.file_path] = active.get(proposal.file_path, 0) + 1
+            if active[proposal.file_path] > 1:
+                overlaps.append(proposal.file_path)
+            await asyncio.sleep(0.05)
+            active[proposal.file_path] -= 1
+            proposal.status = "auto-applied"
+            proposal.user_feedback = "auto-applied"
+            await session.commit()
+            return True
+
+        service._auto_apply_proposal = fake_apply
+        service.sweep_interval = 3600
+        await service.start_monitoring()
+        await asyncio.sleep(0.05)  # Initial sweep finds nothing
+
+        async with database.get_session() as session:
+            proposals = [_proposal("lib/a.dart") for _ in range(3)] + [_proposal("lib/b.dart")]
+            session.add_all(proposals)
+            await session.commit()
+            started = datetime.utcnow()
+            for proposal in proposals:
+                proposal.status = "accepted"
+                proposal.test_status = "passed"
+                proposal.user_feedback = "accepted"
+            await session.commit()
+
+        for _ in range(100):
+            if service._pipeline_stats["applied"] == 4:
+                break
+            await asyncio.sleep(0.02)
+        elapsed = (datetime.utcnow() - started).total_seconds()
+
+        assert service._pipeline_stats["applied"] == 4
+        assert elapsed < 5  # Applied from events, not on the sweep interval
+        assert overlaps == []
+
+        stats = await service.get_auto_apply_stats()
+        assert stats["auto_applied_count"] == 4
+        assert stats["pending_auto_apply_count"] == 0
+        assert stats["queue_depth"] == 0
+    finally:
+        await service.stop_monitoring()
+        del service._auto_apply_proposal
+        await database.close_database()
+        settings.database_url = original_url
+
+
+def test_approvals_are_applied_from_events(tmp_path):
+    asyncio.run(_run_scenario(tmp_path))
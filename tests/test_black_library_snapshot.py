@@ -0,0 +1,68 @@
+"""
+Test Black Library Snapshot Service
+Verifies batched snapshot loading, version-keyed caching and ETag stability
+against SQLite
+"""
+
+import asyncio
+
+from sqlalchemy import event
+
+from app.models.sql_models import Proposal, Learning, AgentMetrics, Experiment
+from app.routers.black_library import _assemble_live_data
+from app.services.black_library_snapshot_service import BlackLibrarySnapshotService
+
+
+async def _run_scenario(sqlite_database):
+    engine, session_factory = await sqlite_database(Proposal, Learning, AgentMetrics, Experiment)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    service = BlackLibrarySnapshotService()
+    service.invalidate()
+
+    async def custody():
+        return {"ai_specific_metrics": {"guardian": {"total_tests_given": 3, "pass_rate": 0.5}}}
+
+    async def growth():
+        return {"ai_growth_insights": {"Guardian": {"growth_score": 120.0}}}
+
+    service._load_custody = custody
+    service._load_growth = growth
+    try:
+        async with session_factory() as session:
+            for ai_type in ("imperium", "guardian", "sandbox", "conquest"):
+                for i in range(60):
+                    session.add(Learning(ai_type=ai_type, learning_type="pattern", learning_data={"i": i}))
+            session.add(Proposal(ai_type="Guardian", file_path="a.py", code_before="a", code_after="b",
+                                 status="approved", improvement_type="security"))
+            await session.commit()
+
+            statements.clear()
+            first = await service.get_snapshot(session, _assemble_live_data)
+            # Version probe plus a fixed number of batched loads, independent of AI type count
+            assert len(statements) <= 7
+            guardian = first["payload"]["ai_data"]["guardian"]
+            assert len(guardian["learning_nodes"]) == 50
+            assert guardian["learning_score"] == 120.0
+            assert guardian["recent_learnings"][0] == "Successfully implemented security"
+
+            statements.clear()
+            second = await service.get_snapshot(session, _assemble_live_data)
+            assert second["etag"] == first["etag"]
+            assert len(statements) == 1
+
+            session.add(Learning(ai_type="sandbox", learning_type="pattern", learning_data={}))
+            await session.commit()
+            third = await service.get_snapshot(session, _assemble_live_data)
+            assert third["etag"] != first["etag"]
+            assert service.get_stats()["builds"] == 2
+    finally:
+        del service._load_custody, service._load_growth
+        service.invalidate()
+        await engine.dispose()
+
+
+def test_snapshot_is_cached_by_source_version(sqlite_database):
+    asyncio.run(_run_scenario(sqlite_database))
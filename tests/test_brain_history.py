@@ -0,0 +1,72 @@
+"""
+Test Brain History
+Verifies bounded ring buffers with queryable on-disk spill, memory-governor
+throttling and relief, and flat memory for brain histories under sustained load
+"""
+
+import asyncio
+import tracemalloc
+
+from app.services import autonomous_ai_brain_service, brain_history
+from app.services.autonomous_ai_brain_service import AutonomousAIBrain
+from app.services.brain_history import HistoryBuffer, MemoryGovernor
+
+
+def test_history_spills_to_queryable_segments(tmp_path):
+    history = HistoryBuffer("milestones", capacity=10, spill_dir=str(tmp_path), segment_size=5, max_segments=3)
+    for i in range(40):
+        history.append({"step": i, "success": i % 2 == 0})
+
+    assert len(history) == 10 and history[-1]["step"] == 39 and [e["step"] for e in history[:2]] == [30, 31]
+    stats = history.get_stats()
+    assert stats["total"] == 40 and stats["segments"] == 3 and stats["spilled"] == 30 and stats["pruned"] == 15
+
+    # Newest first, through memory into the segments still on disk
+    assert [e["step"] for e in history.query(limit=12)] == list(range(39, 27, -1))
+    assert [e["step"] for e in history.query(lambda e: e["step"] < 20, limit=100)] == list(range(19, 14, -1))
+
+    # Segments from an earlier run stay queryable
+    reopened = HistoryBuffer("milestones", capacity=10, spill_dir=str(tmp_path), segment_size=5, max_segments=3)
+    assert reopened.query(limit=1)[0]["step"] == 29
+    reopened.append({"step": 40})
+    assert reopened.shrink_to(0) == 1 and reopened.query(limit=1)[0]["step"] == 40
+
+
+def test_governor_throttles_and_relieves(tmp_path):
+    governor = MemoryGovernor(budget_mb=100)
+    assert governor.slowdown(0.5) == 1.0
+    assert 1.0 < governor.slowdown(0.85) < governor.slowdown(1.0) == governor.max_slowdown
+
+    history = HistoryBuffer("thoughts", capacity=8, spill_dir=str(tmp_path))
+    governor.register(history)
+    history.extend({"n": i} for i in range(8))
+    assert governor.relieve() == 6 and len(history) == 2
+    assert history.get_stats()["spilled"] == 6
+
+
+def test_brain_histories_stay_flat_under_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(autonomous_ai_brain_service, "BRAIN_HISTORY_DIR", str(tmp_path))
+    brain = AutonomousAIBrain("Soak")
+    for history in brain.histories.values():
+        history.capacity, history.segment_size = 50, 25
+
+    def churn(count):
+        for i in range(count):
+            brain.learning_experiences.append({"experience": i, "payload": "x" * 200})
+            brain.improvement_milestones.append({"improvement": f"step-{i}", "success": True})
+
+    tracemalloc.start()
+    try:
+        churn(500)
+        warm, _ = tracemalloc.get_traced_memory()
+        churn(5000)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Ten times the entries, no matching growth in live memory
+    assert after - warm < 256 * 1024
+    status = asyncio.run(brain.get_brain_status())
+    assert status["learning_experiences_count"] == 5500
+    assert status["memory"]["histories"]["learning_experiences"]["in_memory"] == 50
+    assert brain_history.memory_governor.get_status()["histories"] >= len(brain.histories)
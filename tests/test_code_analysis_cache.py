@@ -0,0 +1,136 @@
+"""
+Test Code Analysis Cache
+Verifies content-addressed memoization of code analysis across the memory and
+disk tiers, versioned keys, LRU bounds, batched recency updates, and the cached
+service analysers
+"""
+
+import asyncio
+
+from app.services import ai_agent_service, ai_learning_service, sckipit_service
+from app.services.ai_agent_service import AIAgentService
+from app.services.ai_learning_service import AILearningService
+from app.services.code_analysis_cache import CodeAnalysisCache, CodeProfile
+from app.services.sckipit_service import SckipitService
+
+SAMPLE = '''"""Example"""
+import os
+from typing import List
+
+
+def load(paths):  # TODO: batch
+    results = []
+    for path in paths:
+        if os.path.exists(path):
+            results.append(open(path).read())
+    print("loaded {}".format(len(results)))
+    return results
+'''
+
+
+def test_results_are_memoized_across_tiers_and_versions(tmp_path):
+    calls = []
+
+    def analyser(profile):
+        calls.append(profile.code)
+        return {"lines": len(profile.stripped_lines), "defs": profile.count("def "), "tags": ["a"]}
+
+    cache = CodeAnalysisCache(directory=str(tmp_path), max_entries=2, max_disk_entries=100)
+    first = cache.get_or_compute("demo", 1, SAMPLE, analyser)
+    assert first == {"lines": 10, "defs": 1, "tags": ["a"]}
+    # Callers get their own copy
+    first["tags"].append("mutated")
+    assert cache.get_or_compute("demo", 1, SAMPLE, analyser)["tags"] == ["a"] and len(calls) == 1
+
+    # Another version, extra key or snippet is a different entry
+    cache.get_or_compute("demo", 2, SAMPLE, analyser)
+    cache.get_or_compute("demo", 1, SAMPLE, analyser, extra="other.py")
+    assert len(calls) == 3 and cache.get_status()["memory_entries"] == 2
+    assert cache.stats["memory_evictions"] == 1
+
+    # A fresh process reads from the disk tier without re-analysing
+    cache.close()
+    restarted = CodeAnalysisCache(directory=str(tmp_path), max_entries=2)
+    assert restarted.get_or_compute("demo", 1, SAMPLE, analyser) == {"lines": 10, "defs": 1, "tags": ["a"]}
+    assert len(calls) == 3 and restarted.stats["disk_hits"] == 1
+    assert restarted.get_status()["disk_entries"] == 3
+
+    # Disk hits queue their recency update instead of writing on every read
+    used_at = lambda: restarted._connection().execute("SELECT max(last_used_at) FROM analysis_results").fetchone()[0]
+    before = used_at()
+    assert restarted.get_status()["pending_touches"] == 1 and used_at() == before
+    restarted._flush_touched(restarted._connection())
+    assert used_at() > before and restarted.get_status()["pending_touches"] == 0
+
+    assert restarted._prune_disk(restarted._connection()) == 0
+    restarted._max_disk_entries = 1
+    assert restarted._prune_disk(restarted._connection()) == 2
+    restarted.close()
+
+
+def test_profile_tokenises_once():
+    profile = CodeProfile("a = 1\n\n  b = 2  \n")
+    assert profile.lines == ["a = 1", "", "  b = 2  ", ""] and profile.stripped_lines == ["a = 1", "b = 2"]
+    assert profile.lines is profile.lines and profile.count("=") == 2 and profile.contains("b")
+
+
+def test_service_analysers_use_the_shared_cache(tmp_path, monkeypatch):
+    cache = CodeAnalysisCache(directory=str(tmp_path))
+    for module in (ai_learning_service, sckipit_service, ai_agent_service):
+        monkeypatch.setattr(module, "code_analysis_cache", cache)
+
+    async def scenario():
+        learning = object.__new__(AILearningService)
+        assert learning._code_metrics(SAMPLE) == {
+            "complexity_score": 4 / 13, "readability_score": 9.8, "maintainability_score": 8.0,
+        }
+        assert await learning._calculate_readability_score(SAMPLE) == 9.8
+        assert await learning._calculate_code_complexity("") == 0.0
+
+        sckipit = object.__new__(SckipitService)
+        features = await sckipit._extract_code_quality_features(SAMPLE, "example.py")
+        assert features["function_count"] == 1 and features["import_count"] == 3
+        assert features["complexity_score"] == 0.2 and features["maintainability_score"] == 1.0
+        assert await sckipit._calculate_complexity_score(SAMPLE) == 0.2
+
+        agent = object.__new__(AIAgentService)
+        analysis = await agent._analyze_python_code(SAMPLE, "example.py")
+        again = await agent._analyze_python_code(SAMPLE, "example.py")
+        assert analysis["optimizations"] and again["optimizations"] == analysis["optimizations"]
+        assert again["optimized_code"] == analysis["optimized_code"] and "analysis_timestamp" in again
+        assert again["original_code"] == SAMPLE and again["optimized_code"] != SAMPLE and "fixes" not in again
+
+        # Only the optimizations are cached; the code is rebuilt from the recorded fixes
+        cached = cache._memory[cache.key("ai_agent.python", ai_agent_service.CODE_ANALYSIS_VERSION, SAMPLE, "example.py")]
+        assert cached["optimizations"] == analysis["optimizations"] and cached["fixes"]
+        assert "original_code" not in cached and "optimized_code" not in cached
+        cache.clear_memory()
+        from_disk = await agent._analyze_python_code(SAMPLE, "example.py")
+        assert from_disk["optimized_code"] == analysis["optimized_code"]
+        dart = await agent._analyze_dart_code("void main() { print('hi'); }", "main.dart")
+        assert dart["file_path"] == "main.dart" and dart["optimizations"]
+
+    asyncio.run(scenario())
+    status = cache.get_status()
+    assert status["misses"] == 5 and status["memory_hits"] == 3 and status["disk_hits"] == 1
+    cache.close()
+
+
+def test_cached_fixes_outside_the_allow_list_are_recomputed(tmp_path, monkeypatch):
+    cache = CodeAnalysisCache(directory=str(tmp_path))
+    monkeypatch.setattr(ai_agent_service, "code_analysis_cache", cache)
+    agent = object.__new__(AIAgentService)
+    expected = asyncio.run(agent._analyze_python_code(SAMPLE, "example.py"))
+
+    # A tampered disk entry must not reach getattr; it is treated as a miss and overwritten
+    key = cache.key("ai_agent.python", ai_agent_service.CODE_ANALYSIS_VERSION, SAMPLE, "example.py")
+    poisoned = dict(cache._memory[key], fixes=[["__init__", []]])
+    cache._disk_put(key, "ai_agent.python", poisoned)
+    cache.clear_memory()
+    analysis = asyncio.run(agent._analyze_python_code(SAMPLE, "example.py"))
+    assert analysis["optimized_code"] == expected["optimized_code"]
+    assert cache.get_status()["misses"] == 2 and cache.get_status()["disk_hits"] == 0
+    cache.clear_memory()
+    assert asyncio.run(agent._analyze_python_code(SAMPLE, "example.py"))["optimized_code"] == expected["optimized_code"]
+    assert cache.get_status()["disk_hits"] == 1
+    cache.close()
@@ -0,0 +1,85 @@
+"""
+Test Codex Log Store
+Verifies appends, tail reads, per-day chapter reads, the one-time legacy import and
+that Codex pages start with the newest chapters
+"""
+
+import asyncio
+import json
+from importlib import import_module
+
+
+from app.models.sql_models import Proposal
+from app.services.codex_log_store import CodexLogStore
+
+codex = import_module("app.routers.codex")  # app.routers re-exports the router object under this name
+
+
+def test_append_tail_and_days(tmp_path):
+    store = CodexLogStore(str(tmp_path / "codex.db"))
+    try:
+        for day in (1, 2, 3):
+            for hour in range(4):
+                store.append({"type": "audit", "message": f"{day}-{hour}",
+                              "timestamp": f"2024-01-0{day}T0{hour}:00:00"})
+        store.append({"message": "stamped"})
+
+        tail = store.tail(2)
+        assert tail[0]["message"] == "stamped"
+        assert tail[1]["message"] == "3-3"
+
+        counts = store.get_day_counts()
+        assert counts["2024-01-01"] == 4
+        events = store.get_events_for_days(["2024-01-02"])
+        assert [event["message"] for event in events["2024-01-02"]] == ["2-0", "2-1", "2-2", "2-3"]
+    finally:
+        store.close()
+
+
+def test_legacy_log_is_imported_once(tmp_path):
+    legacy = tmp_path / "codex_log.json"
+    legacy.write_text(json.dumps([
+        {"type": "feedback", "timestamp": "2024-02-01T10:00:00"},
+        {"type": "audit", "timestamp": "2024-02-02T10:00:00"},
+        {"type": "broken"},
+    ]))
+    store = CodexLogStore(str(tmp_path / "codex.db"))
+    try:
+        # Entries without a timestamp are kept, filed under the import time
+        assert store.import_legacy(str(legacy)) == 3
+        assert store.import_legacy(str(legacy)) == 0
+        assert store.count() == 3
+        assert store.tail(1)[0]["type"] == "broken" and store.tail(1)[0]["timestamp"] > "2024-02-02"
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT payload FROM codex_events ORDER BY timestamp DESC, id DESC LIMIT 1"
+        ).fetchall()
+        assert not any("TEMP B-TREE" in row["detail"] for row in plan)
+    finally:
+        store.close()
+
+
+def test_codex_pages_start_with_newest_days(tmp_path, monkeypatch, sqlite_database):
+    store = CodexLogStore(str(tmp_path / "codex.db"))
+    for day in range(1, 6):
+        store.append({"type": "audit", "message": f"day {day}", "timestamp": f"2024-01-0{day}T10:00:00"})
+    monkeypatch.setattr(codex, "get_codex_log_store", lambda: store)
+
+    async def scenario():
+        engine, session_factory = await sqlite_database(Proposal)
+        try:
+            async with session_factory() as session:
+                first = await codex.get_codex(page_size=2, db=session)
+                last = await codex.get_codex(page=3, page_size=2, db=session)
+        finally:
+            await engine.dispose()
+        return first, last
+
+    try:
+        first, last = asyncio.run(scenario())
+    finally:
+        store.close()
+    assert [(chapter["chapter"], chapter["date"]) for chapter in first["chapters"]] == [
+        ("IV", "2024-01-04"), ("V", "2024-01-05")
+    ]
+    assert first["has_more"] and first["total_chapters"] == 5
+    assert [chapter["chapter"] for chapter in last["chapters"]] == ["I"] and not last["has_more"]
@@ -0,0 +1,44 @@
+"""
+Test Database Engine Registry
+Verifies that repeated init_database() calls reuse one engine and one monitor pair,
+and that a configuration change disposes the old engine
+"""
+
+import asyncio
+
+from app.core import database
+from app.core.config import settings
+
+
+async def _run_scenario(tmp_path):
+    first_url = f"sqlite:///{tmp_path / 'first.db'}"
+    second_url = f"sqlite:///{tmp_path / 'second.db'}"
+    original_url = settings.database_url
+    try:
+        settings.database_url = first_url
+        for _ in range(5):
+            await database.init_database()
+        status = database.get_engine_registry_status()
+        assert status["live_engines"] == 1
+        assert status["running_monitor_tasks"] == 2
+        first_engine = database.engine
+
+        settings.database_url = second_url
+        await database.init_database()
+        await asyncio.sleep(0)
+        status = database.get_engine_registry_status()
+        assert status["live_engines"] == 1
+        assert status["running_monitor_tasks"] == 2
+        assert status["engines_disposed"] >= 1
+        assert database.engine is not first_engine
+        assert "second.db" in status["engines"][0]["url"]
+        assert status["engines"][0]["pool_checked_out"] in (0, None)
+    finally:
+        await database.close_database()
+        settings.database_url = original_url
+
+    assert database.get_engine_registry_status()["live_engines"] == 0
+
+
+def test_init_database_is_idempotent(tmp_path):
+    asyncio.run(_run_scenario(tmp_path))
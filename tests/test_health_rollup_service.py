@@ -0,0 +1,112 @@
+"""
+Test Health Rollup Service
+Verifies incremental integrity counters against SQLite, their
+persistence across restarts and re-evaluation of rules that read another table
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.models.sql_models import Proposal, Mission, MissionSubtask, Learning, ErrorLearning, HealthRollupState
+from app.services.health_rollup_service import HealthRollupService
+
+
+def _proposal(code_hash=None, status="pending", test_status="not-run"):
+    return Proposal(ai_type="guardian", file_path="app/x.py", code_before="a", code_after="b",
+                    code_hash=code_hash, status=status, test_status=test_status)
+
+
+async def _run_scenario(sqlite_database):
+    engine, session_factory = await sqlite_database(
+        Proposal, Learning, ErrorLearning, Mission, MissionSubtask, HealthRollupState
+    )
+
+    rollup = HealthRollupService()
+    rollup.reset()
+
+    try:
+        await _check_rollup(session_factory, rollup)
+        await _check_restart_and_dependencies(session_factory, rollup)
+    finally:
+        await engine.dispose()
+
+
+async def _check_rollup(session_factory, rollup):
+    async with session_factory() as session:
+        inconsistent = _proposal(status="tested")
+        session.add_all([inconsistent, _proposal("h1"), _proposal("h1"), _proposal("h2")])
+        session.add(Mission(title="m", mission_type="daily", notification_id=1,
+                            is_completed=True, has_failed=True))
+        session.add(MissionSubtask(mission_id=uuid.uuid4(), name="orphan"))
+        await session.commit()
+
+        first = await rollup.run_check(session)
+        await session.commit()
+        assert first["proposal"]["open_issues_by_rule"]["proposal_status_consistency"] == 1
+        assert first["proposal"]["open_issues_by_rule"]["proposal_duplicates"] == 1
+        assert first["mission"]["open_issues_by_rule"]["mission_status_consistency"] == 1
+        assert first["mission"]["open_issues_by_rule"]["orphaned_subtask"] == 1
+        assert len(first["new_issues"]) == 4
+
+        # Nothing changed: only rows tied with the high-water mark are re-read, nothing new
+        second = await rollup.run_check(session)
+        await session.commit()
+        assert second["proposal"]["rows_examined"] <= 1
+        assert second["proposal"]["issues_found"] == 2
+        assert second["new_issues"] == []
+
+        # Fixing a row clears its flag; a new duplicate of h2 raises a new group issue
+        await session.execute(
+            update(Proposal).where(Proposal.id == inconsistent.id)
+            .values(test_status="passed", updated_at=datetime.utcnow() + timedelta(seconds=1))
+        )
+        duplicate = _proposal("h2")
+        duplicate.updated_at = datetime.utcnow() + timedelta(seconds=1)
+        session.add(duplicate)
+        await session.commit()
+
+        third = await rollup.run_check(session)
+        await session.commit()
+        assert third["proposal"]["open_issues_by_rule"]["proposal_status_consistency"] == 0
+        assert third["proposal"]["open_issues_by_rule"]["proposal_duplicates"] == 2
+        assert third["proposal"]["rows_examined"] <= 3
+        assert [issue["item_id"] for issue in third["new_issues"]] == ["h2"]
+
+
+async def _check_restart_and_dependencies(session_factory, rollup):
+    # A restarted process continues from the persisted marks and open issues
+    rollup.reset()
+    async with session_factory() as session:
+        resumed = await rollup.run_check(session, ["proposal"])
+        await session.commit()
+    assert resumed["new_issues"] == [] and not resumed["full_check"]
+    assert resumed["proposal"]["rows_examined"] <= 2
+    assert resumed["proposal"]["open_issues_by_rule"]["proposal_duplicates"] == 2
+
+    async with session_factory() as session:
+        mission = Mission(title="with subtasks", mission_type="daily", notification_id=2,
+                          subtasks_data=[{"name": "step"}], updated_at=datetime.utcnow() + timedelta(seconds=2))
+        newer = Mission(title="newer", mission_type="daily", notification_id=3,
+                        updated_at=datetime.utcnow() + timedelta(seconds=3))
+        session.add_all([mission, newer])
+        await session.commit()
+        flagged = await rollup.run_check(session, ["mission"])
+        await session.commit()
+        assert flagged["mission"]["open_issues_by_rule"]["mission_subtask_consistency"] == 1
+
+        # Creating the subtask record changes only mission_subtasks, yet clears the mission's flag
+        session.add(MissionSubtask(mission_id=mission.id, name="step",
+                                   updated_at=datetime.utcnow() + timedelta(seconds=4)))
+        await session.commit()
+        cleared = await rollup.run_check(session, ["mission"])
+        await session.commit()
+        assert cleared["mission"]["open_issues_by_rule"]["mission_subtask_consistency"] == 0
+        assert cleared["mission"]["open_issues_by_rule"]["mission_status_consistency"] == 1
+        assert cleared["new_issues"] == []
+
+
+def test_incremental_health_rollup(sqlite_database):
+    asyncio.run(_run_scenario(sqlite_database))
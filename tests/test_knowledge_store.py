@@ -0,0 +1,120 @@
+"""
+Test Knowledge Store
+Verifies the SCKIPIT knowledge refresh against a local HTTP server: bounded
+concurrency, per-source refresh intervals, conditional requests and per-entry
+writes, plus the one-time import of the legacy JSON knowledge base
+"""
+
+import asyncio
+import json
+import time
+
+from aiohttp import web
+
+from app.core.config import settings
+from app.services import sckipit_service, trusted_sources
+from app.services.knowledge_store import KnowledgeStore, get_knowledge_store
+from app.services.sckipit_service import SckipitService
+
+
+class SourceServer:
+    """Local sources serving versioned pages with ETags"""
+
+    def __init__(self, count):
+        self.versions = {f"/s{i}": 1 for i in range(count)}
+        self.requests = []
+        self.conditional = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        self.requests.append(request.path)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+            etag = f'"{request.path}-v{self.versions[request.path]}"'
+            if request.headers.get("If-None-Match"):
+                self.conditional += 1
+                if request.headers["If-None-Match"] == etag:
+                    return web.Response(status=304, headers={"ETag": etag})
+            headers = {"ETag": etag}
+            if request.path == "/s0":
+                headers["Cache-Control"] = "public, max-age=60"
+            return web.Response(text=f"docs for {request.path} v{self.versions[request.path]} " + "x" * 2000,
+                                headers=headers)
+        finally:
+            self.in_flight -= 1
+
+
+async def _refresh_scenario(tmp_path, monkeypatch):
+    server = SourceServer(12)
+    app = web.Application()
+    app.router.add_get("/{name}", server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    urls = [f"http://127.0.0.1:{port}{path}" for path in server.versions]
+
+    monkeypatch.setattr(trusted_sources, "get_trusted_sources", lambda: list(urls))
+    monkeypatch.setattr(sckipit_service, "should_skip_external_requests", lambda: False)
+    monkeypatch.setattr(settings, "sckipit_refresh_concurrency", 3)
+    monkeypatch.setattr(settings, "sckipit_source_refresh_seconds", 1)
+    monkeypatch.setattr(settings, "sckipit_source_min_refresh_seconds", 30)
+    service = object.__new__(SckipitService)
+    service._models = {}
+    service._knowledge_base = KnowledgeStore(str(tmp_path / "knowledge.db"))
+    store = service._knowledge_base
+    try:
+        counts = await service._update_knowledge_from_sources()
+        assert counts == {"due": 12, "updated": 12, "unchanged": 0, "failed": 0}
+        assert 1 < server.max_in_flight <= 3
+        assert len(store) == 12 and len(store[urls[3]]["knowledge"]) == 1000
+
+        # Nothing is due yet, so a second refresh makes no requests
+        server.requests.clear()
+        assert (await service._update_knowledge_from_sources())["due"] == 0 and server.requests == []
+
+        # Once due, unchanged sources answer 304 and only the changed one is rewritten;
+        # /s0 sent Cache-Control max-age=60 and is not due yet
+        server.versions["/s5"] = 2
+        before = store[urls[4]]["last_updated"]
+        await asyncio.sleep(1.1)
+        counts = await service._update_knowledge_from_sources()
+        assert counts == {"due": 11, "updated": 1, "unchanged": 10, "failed": 0}
+        assert server.conditional == 11 and "/s0" not in server.requests
+        assert [entry["url"] for entry in store.get_due(urls, now=time.time() + 61)] == urls
+        assert "v2" in store[urls[5]]["knowledge"] and store[urls[4]]["last_updated"] == before
+        newest = max(store[url]["last_updated"] for url in urls)
+        assert (await service.get_sckipit_analytics())["recent_activity"]["last_knowledge_update"] == newest
+
+        # Plain-http sources score 0.5, below the suggestion threshold
+        assert len(store.iter_knowledge(min_quality=0.4)) == 12 and store.iter_knowledge(min_quality=0.7) == []
+        assert await service._get_knowledge_based_suggestions("app", ["docs"]) == []
+    finally:
+        store.close()
+        await runner.cleanup()
+
+
+def test_refresh_fetches_only_due_and_changed_sources(tmp_path, monkeypatch):
+    asyncio.run(_refresh_scenario(tmp_path, monkeypatch))
+
+
+def test_legacy_json_knowledge_base_is_imported_once(tmp_path):
+    legacy = {
+        "https://docs.python.org": {"knowledge": "python docs", "last_updated": "2024-01-01T00:00:00", "quality_score": 0.9},
+        "https://example.com": {"knowledge": "", "quality_score": 0.5},
+    }
+    (tmp_path / "sckipit_knowledge_base.json").write_text(json.dumps(legacy))
+    store = get_knowledge_store(str(tmp_path))
+    assert get_knowledge_store(str(tmp_path)) is store
+    assert dict(store) == {"https://docs.python.org": legacy["https://docs.python.org"]}
+    assert store.import_legacy(str(tmp_path / "sckipit_knowledge_base.json")) == 0
+    assert store.get_due(["https://docs.python.org"], now=0.0)[0]["etag"] is None
+
+    # Legacy rows without last_updated do not hide or break the newest update
+    store._execute("INSERT INTO knowledge_entries (url, knowledge) VALUES (?, ?)", ("https://old.example", "old"))
+    assert store.latest_update() == "2024-01-01T00:00:00"
+    store.close()
@@ -0,0 +1,139 @@
+"""
+Test Learning State Store
+Verifies atomic shared learning counters across workers, buffered counter
+deltas coalesced into one upsert per AI, cached O(1) level reads, and the
+bounded in-memory learning-event window
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from sqlalchemy import event, select
+
+from app.core.config import settings
+from app.models.sql_models import AILearningState
+from app.services import ai_learning_service, learning_state_store as store_module
+from app.services.ai_learning_service import AILearningService
+from app.services.learning_state_store import LearningStateStore, level_for_counters
+from app.services.write_buffer import WriteBuffer
+
+
+async def _database(sqlite_database, monkeypatch):
+    engine, session_factory = await sqlite_database(AILearningState)
+
+    @asynccontextmanager
+    async def get_session():
+        async with session_factory() as session:
+            yield session
+
+    monkeypatch.setattr(store_module, "get_session", get_session)
+    return engine, session_factory
+
+
+def test_level_thresholds():
+    assert level_for_counters({}) == 1
+    assert level_for_counters({"event_count": 10}) == 2
+    assert level_for_counters({"event_count": 10, "improvement_count": 10}) == 3
+    # Productivity counts as an average, not a total
+    assert level_for_counters({"productivity_score_sum": 30.0, "productivity_event_count": 3}) == 5
+    assert level_for_counters({"event_count": 1000}) == 10
+
+
+def test_counters_are_shared_across_workers(sqlite_database, monkeypatch):
+    async def scenario():
+        engine, session_factory = await _database(sqlite_database, monkeypatch)
+        try:
+            worker_a, worker_b = LearningStateStore(ttl=60), LearningStateStore(ttl=60)
+            await asyncio.gather(*[worker_a.record("imperium", improvements=2) for _ in range(10)],
+                                 *[worker_b.record("imperium", productivity_score=4.0) for _ in range(10)])
+            totals = await worker_a.record("imperium")
+            assert totals["event_count"] == 21 and totals["improvement_count"] == 20
+            assert totals["productivity_event_count"] == 10 and totals["productivity_score_sum"] == 40.0
+
+            # A fresh worker (or a restart) sees the same level once it has loaded
+            restarted = LearningStateStore(ttl=60)
+            assert restarted.get_level("imperium") == 1
+            await restarted._refresh_task
+            assert restarted.get_level("imperium") == worker_a.get_level("imperium") == level_for_counters(totals) == 5
+            assert restarted.get_status()["refreshes"] == 1
+
+            # Reads inside the TTL stay in memory
+            restarted.get_level("imperium")
+            assert restarted._refresh_task.done() and restarted.get_status()["refreshes"] == 1
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_failed_write_counts_locally(monkeypatch):
+    @asynccontextmanager
+    async def broken_session():
+        raise RuntimeError("database unavailable")
+        yield
+
+    monkeypatch.setattr(store_module, "get_session", broken_session)
+    store = LearningStateStore(ttl=60)
+    asyncio.run(store.record("guardian", improvements=5))
+    assert store.get_counters("guardian")["improvement_count"] == 5
+    assert store.get_status()["record_failures"] == 1
+
+
+def test_learning_updates_feed_level_and_keep_recent_window(sqlite_database, monkeypatch):
+    async def scenario():
+        engine, session_factory = await _database(sqlite_database, monkeypatch)
+        store = LearningStateStore(ttl=60)
+        monkeypatch.setattr(ai_learning_service, "learning_state_store", store)
+        monkeypatch.setattr(settings, "learning_state_recent_events", 5)
+        monkeypatch.setattr(AILearningService, "_learning_states", {})
+        service = object.__new__(AILearningService)
+        service.write_buffer = WriteBuffer("test", session_factory=session_factory, flush_interval=60)
+        try:
+            for i in range(12):
+                await service._update_ai_learning_state("sandbox", f"event_{i}", ["Fix a", "Add b"])
+            await service.write_buffer.stop()
+            state = service._learning_states["sandbox"]
+            assert [event["event"] for event in state["learning_events"]] == [f"event_{i}" for i in range(7, 12)]
+            assert len(state["improvements_learned"]) == 5
+            # 12 events and 24 improvements: 600 points
+            assert service.get_ai_level("sandbox") == 4
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_buffered_records_coalesce_into_one_upsert(sqlite_database, monkeypatch):
+    async def scenario():
+        engine, session_factory = await _database(sqlite_database, monkeypatch)
+        upserts = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: upserts.append(statement)
+                     if statement.startswith("INSERT INTO ai_learning_states") else None)
+        store = LearningStateStore(ttl=60)
+        buffer = WriteBuffer("test", session_factory=session_factory, flush_interval=60)
+        try:
+            for _ in range(30):
+                await store.record("guardian", improvements=1, write_buffer=buffer)
+            await store.record("imperium", productivity_score=2.0, write_buffer=buffer)
+            # The cache moves before anything is written
+            assert store.get_counters("guardian")["event_count"] == 30 and upserts == []
+
+            await buffer.stop()
+            assert len(upserts) == 2
+            async with session_factory() as session:
+                rows = dict((await session.execute(
+                    select(AILearningState.ai_type, AILearningState.improvement_count)
+                )).all())
+            assert rows == {"guardian": 30, "imperium": 0}
+
+            # Events after a flush form a new delta; nothing is written twice
+            await store.record("guardian", write_buffer=buffer)
+            await buffer.stop()
+            await store.refresh()
+            assert store.get_counters("guardian")["event_count"] == 31
+            assert store.get_status()["pending_ai_types"] == 0
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,100 @@
+"""
+Test Learning Stats
+Verifies the learning hot-field migration and backfill, write-time column sync,
+and cached single-aggregate learning stats against SQLite
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import migrate_learning_hot_fields
+from app.models.sql_models import Learning, Proposal
+from app.services import ai_learning_service
+from app.services.ai_learning_service import AILearningService
+
+
+async def _migrate_legacy_table(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE learning (id INTEGER PRIMARY KEY, ai_type VARCHAR(50), learning_data JSON)"))
+            for data in ({"applied_count": 3, "success_rate": 0.5}, {"pattern": "p"}, None):
+                await conn.execute(text("INSERT INTO learning (ai_type, learning_data) VALUES ('imperium', :data)"),
+                                   {"data": json.dumps(data) if data is not None else None})
+            assert await migrate_learning_hot_fields(conn) == 3
+            # Re-running finds nothing left to backfill
+            assert await migrate_learning_hot_fields(conn) == 0
+            rows = (await conn.execute(text("SELECT applied_count, success_rate FROM learning ORDER BY id"))).all()
+            assert [tuple(row) for row in rows] == [(3, 0.5), (0, 0.0), (0, 0.0)]
+    finally:
+        await engine.dispose()
+
+
+def test_migration_adds_and_backfills_hot_fields(tmp_path):
+    asyncio.run(_migrate_legacy_table(tmp_path))
+
+
+async def _stats_scenario(sqlite_database, monkeypatch):
+    engine, session_factory = await sqlite_database(Proposal, Learning)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    @asynccontextmanager
+    async def get_session():
+        async with session_factory() as session:
+            yield session
+
+    monkeypatch.setattr(ai_learning_service, "get_session", get_session)
+    service = object.__new__(AILearningService)
+    AILearningService.invalidate_learning_stats()
+    try:
+        async with session_factory() as session:
+            for i in range(20):
+                session.add(Learning(ai_type="imperium", learning_type="proposal_outcome",
+                                     learning_data={"pattern": f"p{i}", "applied_count": 2, "success_rate": 0.25}))
+            session.add(Learning(ai_type="guardian", learning_type="proposal_outcome", learning_data={"applied_count": 7}))
+            session.add(Proposal(ai_type="imperium", file_path="a.py", code_before="a", code_after="b",
+                                 status="test-passed", test_status="passed"))
+            await session.commit()
+            # A pre-migration row: hot columns empty, values only in the JSON
+            await session.execute(text(
+                "INSERT INTO learning (id, ai_type, learning_type, learning_data) "
+                "VALUES ('legacy', 'imperium', 'proposal_outcome', '{\"applied_count\": 10, \"success_rate\": 1.0}')"
+            ))
+            await session.commit()
+
+        statements.clear()
+        stats = await service.get_learning_stats("imperium")
+        assert stats["total_patterns"] == 21 and stats["total_applied"] == 50
+        assert abs(stats["average_success_rate"] - (20 * 0.25 + 1.0) / 21) < 1e-9
+        assert stats["total_proposals"] == 1 and stats["success_rate"] == 100.0
+        assert len(stats["recent_learning"]) == 10
+        assert sum(entry["pattern"].startswith("p") for entry in stats["recent_learning"]) >= 8
+        # One aggregate query and one recent-activity query; the JSON payload itself is never selected
+        assert len(statements) == 2
+        assert not any("AS learning_learning_data" in statement for statement in statements)
+
+        statements.clear()
+        assert await service.get_learning_stats("imperium") is stats
+        assert statements == []
+
+        async with session_factory() as session:
+            entry = (await session.execute(select(Learning).where(Learning.ai_type == "guardian"))).scalar_one()
+            entry.learning_data = {"applied_count": 9, "success_rate": 0.5}
+            await session.commit()
+            assert (entry.applied_count, entry.success_rate) == (9, 0.5)
+        # Only the written AI type was invalidated
+        assert await service.get_learning_stats("imperium") is stats
+        assert (await service.get_learning_stats("guardian"))["total_applied"] == 9
+    finally:
+        AILearningService.invalidate_learning_stats()
+        await engine.dispose()
+
+
+def test_learning_stats_aggregate_in_sql_and_cache_per_ai_type(sqlite_database, monkeypatch):
+    asyncio.run(_stats_scenario(sqlite_database, monkeypatch))
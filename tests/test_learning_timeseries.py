@@ -0,0 +1,118 @@
+"""
+Test Learning Time Series
+Verifies write-time maintenance and backfill of the hourly learning buckets,
+and windowed range, top-N, trend and cursor-paged queries over them
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+
+from app.core.database import backfill_learning_buckets
+from app.models.sql_models import Learning, LearningHourlyBucket, Proposal
+from app.services.learning_timeseries_service import LearningTimeseriesService, period_start
+
+NOW = datetime(2026, 3, 11, 15, 30)  # A Wednesday
+
+
+def _learning(ai_type, hours_ago, success_rate, applied_count=1):
+    return Learning(ai_type=ai_type, learning_type="proposal_feedback", created_at=NOW - timedelta(hours=hours_ago),
+                    learning_data={"success_rate": success_rate, "applied_count": applied_count})
+
+
+async def _buckets(session):
+    rows = (await session.execute(select(LearningHourlyBucket).order_by(
+        LearningHourlyBucket.ai_type, LearningHourlyBucket.bucket_start))).scalars().all()
+    return [(row.ai_type, row.bucket_start, row.event_count, row.success_count, row.applied_count_sum) for row in rows]
+
+
+def test_buckets_follow_learning_writes_and_backfill(sqlite_database):
+    async def scenario():
+        engine, session_factory = await sqlite_database(Proposal, Learning, LearningHourlyBucket)
+        hour = period_start(NOW, "hour")
+        try:
+            async with session_factory() as session:
+                rows = [_learning("imperium", 0, 0.9, 2), _learning("imperium", 0.2, 0.1), _learning("guardian", 2, 0.8)]
+                session.add_all(rows)
+                await session.commit()
+                assert await _buckets(session) == [
+                    ("guardian", hour - timedelta(hours=2), 1, 1, 1),
+                    ("imperium", hour, 2, 1, 3),
+                ]
+
+                # Updates move a row's contribution; deletes remove it
+                rows[1].learning_data = {"success_rate": 0.7, "applied_count": 4}
+                rows[1].sync_hot_fields()
+                await session.delete(rows[2])
+                await session.commit()
+                assert await _buckets(session) == [
+                    ("guardian", hour - timedelta(hours=2), 0, 0, 0),
+                    ("imperium", hour, 2, 2, 6),
+                ]
+
+            # An empty rollup is rebuilt from existing rows with the same keys the writes use
+            async with engine.begin() as conn:
+                await conn.execute(delete(LearningHourlyBucket))
+                assert await backfill_learning_buckets(conn) == 1
+                assert await backfill_learning_buckets(conn) == 0
+            async with session_factory() as session:
+                assert await _buckets(session) == [("imperium", hour, 2, 2, 6)]
+                session.add(_learning("imperium", 0.1, 0.2))
+                await session.commit()
+                assert await _buckets(session) == [("imperium", hour, 3, 2, 7)]
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_windowed_queries_with_top_trend_and_cursor(sqlite_database):
+    async def scenario():
+        engine, session_factory = await sqlite_database(Proposal, Learning, LearningHourlyBucket)
+        service = LearningTimeseriesService()
+        try:
+            async with session_factory() as session:
+                session.add_all([_learning("imperium", hours, 0.9) for hours in (1, 5, 30)])
+                session.add_all([_learning("guardian", hours, 0.2) for hours in (2, 50)])
+                session.add(_learning("sandbox", 60, 0.6))
+                await session.commit()
+
+                # Hourly, last 24h: zero-filled points with a per-AI breakdown
+                result = await service.query(session, start=NOW - timedelta(hours=24), end=NOW)
+                assert len(result["points"]) == 25 and result["next_cursor"] is None
+                assert sum(point["event_count"] for point in result["points"]) == 3
+                point = next(p for p in result["points"] if p["start"] == (period_start(NOW, "hour") - timedelta(hours=2)).isoformat())
+                assert point["by_ai"] == {"guardian": {"event_count": 1, "success_count": 0,
+                                                       "avg_success_rate": 0.2, "applied_count": 1}}
+                assert [entry["ai_type"] for entry in result["top_ai_types"]] == ["imperium", "guardian"]
+                assert result["totals"]["event_count"] == 3
+                assert result["trend"]["previous_event_count"] == 1 and result["trend"]["event_count_change"] == 2.0
+
+                # Daily rollup, filtered to one AI, top-N limited
+                result = await service.query(session, start=NOW - timedelta(days=3), end=NOW, resolution="day",
+                                             ai_type="imperium", top=1)
+                assert [point["event_count"] for point in result["points"]] == [0, 0, 1, 2]
+                assert result["top_ai_types"][0]["ai_type"] == "imperium" and len(result["top_ai_types"]) == 1
+
+                # Pages of 10 hours cover the window exactly once
+                seen, cursor, pages = 0, None, 0
+                while True:
+                    page = await service.query(session, start=NOW - timedelta(hours=72), end=NOW, limit=10, cursor=cursor)
+                    seen += sum(point["event_count"] for point in page["points"])
+                    pages += 1
+                    cursor = page["next_cursor"]
+                    if cursor is None:
+                        break
+                assert pages == 8 and seen == 6
+
+                for bad in ({"resolution": "minute"}, {"start": NOW, "end": NOW - timedelta(hours=1)}, {"cursor": "soon"}):
+                    try:
+                        await service.query(session, **bad)
+                    except ValueError:
+                        continue
+                    raise AssertionError(f"accepted {bad}")
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,59 @@
+"""
+Test Logging Pipeline
+Verifies bounded-queue drop accounting, per-subsystem sampling/rate limiting and
+that AI system loggers no longer reconfigure structlog
+"""
+
+import queue
+import logging
+
+from app.core import logging as logging_core
+from app.core.logging import BoundedQueueHandler, SubsystemSampler, configure_structlog, sampler
+from app.services.logging_service import AILoggingService, AISystemType, LogLevel
+
+
+def test_full_queue_drops_and_counts_instead_of_blocking():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=3))
+    for i in range(5):
+        handler.handle(logging.makeLogRecord({"msg": f"event {i}", "levelno": logging.INFO}))
+    assert handler.enqueued == 3
+    assert handler.dropped == 2
+    assert handler.queue.qsize() == 3
+
+
+def test_sampler_rate_limits_info_and_never_drops_warnings():
+    limited = SubsystemSampler(info_rate=0.001, info_burst=5, debug_sample_rate=0.0)
+    assert sum(limited.allow("training_ground", "info") for _ in range(20)) == 5
+    # Budgets are per subsystem
+    assert limited.allow("custody_protocol", "info")
+    assert not any(limited.allow("training_ground", "debug") for _ in range(20))
+    assert all(limited.allow("training_ground", "warning") for _ in range(20))
+    assert limited.stats["training_ground"] == {"kept": 5, "sampled_out": 20, "rate_limited": 15}
+
+    limited.configure("training_ground", debug_sample_rate=1.0)
+    assert limited.allow("training_ground", "debug")
+
+
+def test_logging_service_configures_structlog_once_and_skips_sampled_events(monkeypatch):
+    configure_structlog()
+    calls = []
+    monkeypatch.setattr(logging_core.structlog, "configure", lambda **kwargs: calls.append(kwargs))
+    service = AILoggingService()
+    AILoggingService()
+    assert calls == []
+
+    emitted = []
+
+    class _Recorder:
+        def info(self, event, **kwargs):
+            emitted.append(kwargs)
+
+    service.loggers[AISystemType.GENERAL] = _Recorder()
+    monkeypatch.setattr(sampler, "allow", lambda subsystem, level: subsystem != "general")
+    service.log_general("dropped", LogLevel.INFO)
+    assert emitted == []
+
+    monkeypatch.setattr(sampler, "allow", lambda subsystem, level: True)
+    service.log_test_execution("imperium", "other", 90.0, True, 1.5)
+    assert emitted[0]["system"] == "general"
+    assert emitted[0]["score"] == 90.0
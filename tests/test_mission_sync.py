@@ -0,0 +1,117 @@
+"""
+Test Mission Sync Service
+Verifies bulk upserts, subtask diffing and the version cursor against SQLite
+"""
+
+import asyncio
+import uuid
+
+from sqlalchemy import event, select, func
+
+from app.models.sql_models import Mission, MissionSubtask
+from app.services.mission_sync_service import MissionSyncService
+
+
+def _mission(i, mission_id=None, **overrides):
+    data = {"id": str(mission_id or uuid.uuid4()), "title": f"mission {i}", "mission_type": "daily",
+            "notification_id": i, "created_at": "2024-01-01T00:00:00Z"}
+    data.update(overrides)
+    return data
+
+
+async def _with_database(sqlite_database, scenario):
+    engine, session_factory = await sqlite_database(Mission, MissionSubtask)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    try:
+        await scenario(session_factory, statements)
+    finally:
+        await engine.dispose()
+
+
+def test_bulk_sync_uses_few_round_trips(sqlite_database):
+    async def scenario(session_factory, statements):
+        missions = [_mission(i) for i in range(3000)]
+        async with session_factory() as session:
+            result = await MissionSyncService().sync(session, missions)
+        assert result["synced_count"] == 3000
+        assert len(statements) <= 12
+
+        missions[0]["title"] = "renamed"
+        async with session_factory() as session:
+            result = await MissionSyncService().sync(session, missions[:10])
+            assert result["synced_count"] == 0
+            assert result["updated_count"] == 10
+            total = (await session.execute(select(func.count()).select_from(Mission))).scalar()
+            title = (await session.execute(
+                select(Mission.title).where(Mission.id == uuid.UUID(missions[0]["id"]))
+            )).scalar()
+        assert total == 3000
+        assert title == "renamed"
+
+    asyncio.run(_with_database(sqlite_database, scenario))
+
+
+def test_partial_update_of_existing_mission(sqlite_database):
+    async def scenario(session_factory, statements):
+        mission = _mission(1)
+        async with session_factory() as session:
+            await MissionSyncService().sync(session, [mission])
+            result = await MissionSyncService().sync(session, [
+                {"id": mission["id"], "is_completed": True, "created_at": "2030-01-01T00:00:00Z"}
+            ])
+            stored = (await session.execute(
+                select(Mission.title, Mission.is_completed, Mission.created_at)
+                .where(Mission.id == uuid.UUID(mission["id"]))
+            )).one()
+        assert result["synced_count"] == 0 and result["updated_count"] == 1
+        assert stored.title == "mission 1" and stored.is_completed is True
+        assert stored.created_at.year == 2024
+
+    asyncio.run(_with_database(sqlite_database, scenario))
+
+
+def test_subtasks_are_diffed(sqlite_database):
+    async def scenario(session_factory, statements):
+        mission = _mission(1, subtasks=[
+            {"name": "read", "required_completions": 1},
+            {"name": "write", "required_completions": 2},
+            {"name": "review", "required_completions": 1},
+        ])
+        async with session_factory() as session:
+            first = await MissionSyncService().sync(session, [mission])
+        assert first["subtasks"]["inserted"] == 3
+
+        mission["subtasks"] = [
+            {"name": "read", "required_completions": 1},
+            {"name": "write", "required_completions": 5},
+            {"name": "ship", "required_completions": 1},
+        ]
+        async with session_factory() as session:
+            second = await MissionSyncService().sync(session, [mission])
+            rows = (await session.execute(
+                select(MissionSubtask.name, MissionSubtask.required_completions)
+            )).all()
+        assert second["subtasks"] == {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+        assert sorted(rows) == [("read", 1), ("ship", 1), ("write", 5)]
+
+    asyncio.run(_with_database(sqlite_database, scenario))
+
+
+def test_version_cursor_reports_changes(sqlite_database):
+    async def scenario(session_factory, statements):
+        async with session_factory() as session:
+            first = await MissionSyncService().sync(session, [_mission(i) for i in range(5)])
+            assert (await MissionSyncService().get_changes(session, first["version"]))["count"] == 0
+
+            await asyncio.sleep(0.01)
+            changed = _mission(9)
+            second = await MissionSyncService().sync(session, [changed], since_version=first["version"])
+            assert second["server_changes"] == []
+
+            changes = await MissionSyncService().get_changes(session, first["version"])
+        assert [m["id"] for m in changes["missions"]] == [changed["id"]]
+        assert changes["version"] == second["version"]
+
+    asyncio.run(_with_database(sqlite_database, scenario))
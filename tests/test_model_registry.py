@@ -0,0 +1,100 @@
+"""
+Test Model Registry
+Verifies lazy, content-addressed, memory-mapped model loading with reference
+counting, copy-on-train handles and idle eviction
+"""
+
+import gc
+import pickle
+
+import numpy as np
+from sklearn.decomposition import PCA
+
+from app.services.model_registry import ModelRegistry
+
+
+def _save(model, path):
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
+    return str(path)
+
+
+def test_handles_share_one_lazily_mapped_model(tmp_path):
+    X = np.random.RandomState(0).rand(200, 64)
+    model = PCA(n_components=32, random_state=0).fit(X)
+    registry = ModelRegistry(idle_seconds=3600, use_mmap=True)
+    # Two services with their own copies of the same artifact
+    first = registry.handle(_save(model, tmp_path / "ai_feature_extractor.pkl"), "feature_extractor")
+    second = registry.handle(_save(model, tmp_path / "sckipit_feature_extractor.pkl"), "feature_extractor")
+    assert registry.handle(str(tmp_path / "missing.pkl")) is None
+
+    # Nothing is read until first use
+    assert not first.is_loaded and registry.get_status()["models"] == []
+    assert hasattr(first, "predict")
+    expected = model.transform(X[:5])
+    assert np.allclose(first.transform(X[:5]), expected) and np.allclose(second.transform(X[:5]), expected)
+
+    status = registry.get_status()
+    assert status["loads"] == 1 and len(status["models"]) == 1
+    entry = status["models"][0]
+    assert entry["references"] == 2 and entry["mmap"] and entry["resident"]
+    assert entry["mapped_bytes"] >= model.components_.nbytes
+    assert isinstance(first.components_, np.memmap)
+
+    # Saving through a handle writes the plain model
+    restored = pickle.loads(pickle.dumps(first))
+    assert type(restored) is PCA and np.allclose(restored.components_, model.components_)
+
+    # Training detaches onto a private copy; the shared model is untouched
+    second.fit(X[:, ::-1])
+    assert registry.get_status()["models"][0]["references"] == 1 and registry.stats["detached"] == 1
+    assert not np.allclose(second.components_, first.components_)
+    assert np.allclose(first.transform(X[:5]), expected)
+
+    # Idle models are unloaded and reload on the next predict
+    assert registry.evict_idle(idle_seconds=0) == 1 and not first.is_loaded
+    assert np.allclose(first.transform(X[:5]), expected) and registry.stats["loads"] == 2
+
+    # Once no handle refers to an artifact it is dropped entirely
+    del first
+    gc.collect()
+    registry.evict_idle(idle_seconds=0)
+    assert registry.get_status()["models"] == []
+
+
+def test_without_mmap_models_are_unpickled(tmp_path):
+    registry = ModelRegistry(idle_seconds=3600, use_mmap=False)
+    handle = registry.handle(_save(PCA(n_components=2).fit(np.eye(4)), tmp_path / "pca.pkl"))
+    handle.transform(np.eye(4))
+    entry = registry.get_status()["models"][0]
+    assert not entry["mmap"] and entry["mapped_bytes"] == 0 and entry["private_bytes"] > 0
+    assert not (tmp_path / ".registry").exists()
+
+
+def test_retrained_files_rekey_handles_and_drop_superseded_artifacts(tmp_path):
+    registry = ModelRegistry(idle_seconds=3600, use_mmap=True)
+    path = _save(PCA(n_components=2).fit(np.eye(4)), tmp_path / "pca.pkl")
+    handle = registry.handle(path)
+    # The estimator type is read from the pickle without loading it
+    assert handle.model_class == "PCA" and handle.loaded_model is None and not handle.is_loaded
+
+    handle.transform(np.eye(4))
+    old_artifacts = sorted(p.name for p in (tmp_path / ".registry").iterdir())
+    assert len(old_artifacts) == 1
+
+    # Retraining rewrites the file: the handle moves to the new content on next use
+    retrained = PCA(n_components=3).fit(np.eye(4))
+    _save(retrained, path)
+    assert handle.transform(np.eye(4)).shape == (4, 3)
+    assert registry.stats["rekeyed"] == 1 and len(registry.get_status()["models"]) == 1
+    new_artifacts = sorted(p.name for p in (tmp_path / ".registry").iterdir())
+    assert len(new_artifacts) == 1 and new_artifacts != old_artifacts
+
+    # Leftovers from earlier runs are pruned on the next sweep
+    (tmp_path / ".registry" / f"{'0' * 64}.joblib").write_bytes(b"stale")
+    assert registry.prune_artifacts() == 1
+
+    # An unreadable file yields no handle when validated, so callers can fall back
+    (tmp_path / "broken.pkl").write_bytes(b"not a pickle")
+    assert registry.handle(str(tmp_path / "broken.pkl"), validate=True) is None
+    assert registry.stats["invalid"] == 1
@@ -0,0 +1,82 @@
+"""
+Test Plugin Manager
+Verifies incremental reloads by content hash and isolated execution with
+timeouts in the subprocess worker pool
+"""
+
+import os
+
+from app.services.plugin_manager import PluginManager
+
+PLUGIN_TEMPLATE = '''
+import time
+
+class BasePlugin:
+    pass
+
+class {name}(BasePlugin):
+    def describe(self):
+        return "{description}"
+
+    def run(self, data):
+        time.sleep(data.get("sleep", 0))
+        return {{"echo": data, "pid": __import__("os").getpid()}}
+
+    def test(self):
+        return True
+'''
+
+
+def _write_plugin(directory, name, description="v1"):
+    path = os.path.join(directory, f"{name}.py")
+    with open(path, "w") as f:
+        f.write(PLUGIN_TEMPLATE.format(name=name.title(), description=description))
+    return path
+
+
+def test_reload_only_touches_changed_plugins(tmp_path):
+    _write_plugin(tmp_path, "alpha")
+    beta = _write_plugin(tmp_path, "beta")
+    (tmp_path / "broken.py").write_text("raise RuntimeError('boom')\n")
+    manager = PluginManager(str(tmp_path), workers=1, timeout=20)
+    try:
+        assert sorted(manager.list_plugins()) == ["alpha", "beta"]
+        assert "broken" in manager.get_stats()["failed_to_load"]
+
+        # Touch without changing content: no re-execution
+        os.utime(beta, ns=(0, 0))
+        assert manager.reload_plugins()["reloaded"] == []
+
+        _write_plugin(tmp_path, "beta", description="v2")
+        (tmp_path / "alpha.py").unlink()
+        summary = manager.reload_plugins()
+        assert summary["reloaded"] == ["beta"]
+        assert summary["removed"] == ["alpha"]
+        assert sorted(summary["unchanged"]) == ["broken"]
+        assert manager.describe_plugin("beta") == "v2"
+    finally:
+        manager.shutdown()
+
+
+def test_plugins_run_out_of_process_with_timeouts(tmp_path):
+    _write_plugin(tmp_path, "gamma")
+    manager = PluginManager(str(tmp_path), workers=1, timeout=20)
+    try:
+        result = manager.run_plugin("gamma", {"x": 1})
+        assert result["echo"] == {"x": 1}
+        assert result["pid"] != os.getpid()
+        assert manager.test_plugin("gamma") is True
+
+        manager.pool.timeout = 0.5
+        slow = manager.run_plugin("gamma", {"sleep": 5})
+        assert slow["timeout"] is True
+        assert manager.pool.replaced == 1
+
+        # The replacement worker serves the next call
+        manager.pool.timeout = 20
+        assert manager.run_plugin("gamma", {"x": 2})["echo"] == {"x": 2}
+        stats = manager.get_stats("gamma")["plugins"]["gamma"]
+        assert stats["calls"] == 4
+        assert stats["timeouts"] == 1
+    finally:
+        manager.shutdown()
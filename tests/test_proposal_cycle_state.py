@@ -0,0 +1,117 @@
+"""
+Test Proposal Cycle State
+Verifies that turn-taking follows proposal events without database queries, that
+reconciliation corrects drift from bulk updates and that a rolled-back savepoint only
+discards its own events
+"""
+
+import asyncio
+
+from sqlalchemy import update
+
+from app.core import database
+from app.core.config import settings
+from app.models.sql_models import Proposal
+from app.services.proposal_events import ProposalEvent, PROPOSAL_STATUS_CHANGED
+from app.services.proposal_cycle_service import ProposalCycleService, AIAgent
+
+
+def _proposal(ai_type):
+    return Proposal(ai_type=ai_type, file_path="lib/x.dart", code_before="a", code_after="b")
+
+
+async def _run_scenario(tmp_path):
+    original_url = settings.database_url
+    settings.database_url = f"sqlite:///{tmp_path / 'cycle.db'}"
+    try:
+        await database.init_database()
+        async with database.engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: database.Base.metadata.create_all(
+                sync_conn, tables=[Proposal.__table__]
+            ))
+
+        service = ProposalCycleService()
+        service.current_agent_index = 0
+        await service.reconcile()
+        assert await service.get_next_agent() == AIAgent.IMPERIUM
+
+        async with database.get_session() as session:
+            proposals = [_proposal("imperium") for _ in range(5)]
+            session.add_all(proposals)
+            await session.commit()
+
+        # Events moved imperium to its quota; no reconciliation needed
+        assert service._count("imperium", "pending") == 5
+        assert await service.get_next_agent() == AIAgent.GUARDIAN
+
+        async with database.get_session() as session:
+            proposals[0].status = "accepted"
+            session.add(proposals[0])
+            await session.commit()
+        progress = await service.get_agent_progress(AIAgent.IMPERIUM)
+        assert progress["status_counts"] == {"pending": 4, "accepted": 1}
+
+        # A bulk UPDATE bypasses events until the next reconciliation
+        async with database.get_session() as session:
+            await session.execute(update(Proposal).values(status="rejected"))
+            await session.commit()
+        assert service._count("imperium", "pending") == 4
+        await service.reconcile()
+        status = await service.get_cycle_status()
+        assert status["proposal_counts"] == {"imperium": {"rejected": 5}}
+        assert status["state"]["drift_corrections"] >= 1
+        assert await service.get_next_agent() == AIAgent.IMPERIUM
+    finally:
+        await database.close_database()
+        settings.database_url = original_url
+
+
+def test_cycle_state_follows_proposal_events(tmp_path):
+    asyncio.run(_run_scenario(tmp_path))
+
+
+async def _run_savepoint_scenario(tmp_path):
+    original_url = settings.database_url
+    settings.database_url = f"sqlite:///{tmp_path / 'savepoint.db'}"
+    try:
+        await database.init_database()
+        async with database.engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: database.Base.metadata.create_all(
+                sync_conn, tables=[Proposal.__table__]
+            ))
+
+        service = ProposalCycleService()
+        await service.reconcile()
+
+        async with database.get_session() as session:
+            session.add(_proposal("guardian"))
+            await session.flush()
+            savepoint = await session.begin_nested()
+            session.add(_proposal("sandbox"))
+            await session.flush()
+            await savepoint.rollback()
+            session.add(_proposal("conquest"))
+            await session.commit()
+
+        # The outer transaction's events survive the savepoint rollback
+        assert service._count("guardian", "pending") == 1
+        assert service._count("conquest", "pending") == 1
+        assert service._count("sandbox", "pending") == 0
+
+        # An event with an unknown previous status triggers a reconcile on the next read
+        reconciliations = service._state_stats["reconciliations"]
+        service._on_proposal_event(ProposalEvent(
+            PROPOSAL_STATUS_CHANGED, "x", "guardian", None, "accepted", "lib/x.dart"
+        ))
+        await service.get_agent_progress(AIAgent.GUARDIAN)
+        assert service._state_stats["reconciliations"] == reconciliations + 1
+        assert service._counts["guardian"] == {"pending": 1}
+        await service.get_agent_progress(AIAgent.GUARDIAN)
+        assert service._state_stats["reconciliations"] == reconciliations + 1
+    finally:
+        await database.close_database()
+        settings.database_url = original_url
+
+
+def test_savepoint_rollback_keeps_outer_events(tmp_path):
+    asyncio.run(_run_savepoint_scenario(tmp_path))
@@ -0,0 +1,88 @@
+"""
+Test Query Profiler
+Verifies statement accounting, N+1 detection and endpoint query budgets against SQLite
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.pool import NullPool
+
+from app.core.database import get_db
+from app.core.query_profiler import (
+    QueryBudgetExceeded, QueryProfilerMiddleware, normalize_statement, profile_queries, query_report
+)
+from app.models.sql_models import Proposal, Experiment
+from app.routers.learning import router as learning_router
+
+
+def _database(sqlite_database):
+    async def setup():
+        engine, session_factory = await sqlite_database(Proposal, Experiment, poolclass=NullPool)
+        async with session_factory() as session:
+            for ai_type in ("Imperium", "Guardian", "Sandbox", "Conquest"):
+                for i in range(10):
+                    session.add(Proposal(ai_type=ai_type, file_path=f"f{i}.py", code_before="a",
+                                         code_after="b", status="approved" if i % 2 else "pending"))
+                    session.add(Experiment(ai_type=ai_type, experiment_type="test", status="passed"))
+            await session.commit()
+        return engine, session_factory
+
+    return asyncio.run(setup())
+
+
+def test_normalize_statement_erases_literals_and_in_lists():
+    assert normalize_statement("SELECT * FROM t WHERE id IN (?, ?, ?) AND n = 5") == \
+        normalize_statement("SELECT * FROM t WHERE id IN (?)  AND n = 7")
+
+
+def test_n_plus_one_is_detected(sqlite_database):
+    engine, session_factory = _database(sqlite_database)
+
+    async def scenario():
+        async with session_factory() as session:
+            with pytest.raises(QueryBudgetExceeded, match="possible N\\+1"):
+                with profile_queries("n_plus_one", max_repeats=2):
+                    proposals = (await session.execute(select(Proposal))).scalars().all()
+                    for proposal in proposals[:5]:
+                        await session.execute(select(Experiment).where(Experiment.ai_type == proposal.ai_type))
+
+            with profile_queries("single_query", max_statements=1) as profile:
+                await session.execute(select(Proposal))
+            assert profile.statements == 1
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_learning_endpoints_stay_within_budgets(sqlite_database):
+    engine, session_factory = _database(sqlite_database)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(learning_router, prefix="/api/learning")
+    app.dependency_overrides[get_db] = override_get_db
+    app.add_middleware(QueryProfilerMiddleware, enforce=True)
+    query_report.reset()
+
+    with TestClient(app) as client:
+        status = client.get("/api/learning/status").json()
+        assert status["total_proposals"] == 40
+        assert status["total_experiments"] == 40
+        assert client.get("/api/learning/stats/Guardian").json()["data"]["approved_proposals"] == 5
+        metrics = client.get("/api/learning/metrics").json()
+        assert metrics["Sandbox"]["totalExperiments"] == 10
+        data = client.get("/api/learning/data").json()
+        assert len(data["Conquest"]["experiments"]) == 5
+
+    report = {entry["endpoint"]: entry for entry in query_report.worst_offenders()}
+    assert report["GET /api/learning/status"]["max_statements"] == 2
+    assert report["GET /api/learning/status"]["max_rows_loaded"] == 0
+    assert all(entry["budget_violations"] == 0 for entry in report.values())
+    asyncio.run(engine.dispose())
@@ -0,0 +1,77 @@
+"""
+Test Repository Snapshot
+Verifies once-per-cycle file reads shared across agents, and concurrent agent
+runs with per-agent deadlines and isolated failures
+"""
+
+import asyncio
+
+from app.core.config import settings
+from app.services.ai_agent_service import AIAgentService
+from app.services.repository_snapshot import RepositorySnapshot
+
+
+class FakeGitHubService:
+    def __init__(self):
+        self.listings = 0
+        self.fetches = []
+
+    async def get_repo_content(self):
+        self.listings += 1
+        return [{"path": "lib/main.dart", "type": "file"}, {"path": "app/api.py", "type": "file"}]
+
+    async def get_file_content(self, path):
+        self.fetches.append(path)
+        await asyncio.sleep(0.01)
+        return "def handler():\n    return 'TODO'\n" if path.endswith(".py") else None
+
+
+def test_files_are_fetched_once_per_snapshot():
+    async def scenario():
+        github = FakeGitHubService()
+        snapshot = await RepositorySnapshot.take(github)
+        first, second, missing = await asyncio.gather(
+            snapshot.get_file("app/api.py"), snapshot.get_file("app/api.py"), snapshot.get_file("lib/main.dart")
+        )
+        assert first is second and first.lines == ("def handler():", "    return 'TODO'")
+        assert "todo" in first.lower and missing is None
+        assert await snapshot.get_file_content("app/api.py") == first.content
+        assert github.fetches == ["app/api.py", "lib/main.dart"]
+        assert snapshot.get_stats()["hits"] == 2 and snapshot.get_stats()["failures"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_run_all_agents_runs_concurrently_with_isolated_deadlines(monkeypatch):
+    service = object.__new__(AIAgentService)
+    service.github_service = FakeGitHubService()
+    monkeypatch.setattr(settings, "agent_run_deadline_seconds", 0.5)
+    snapshots = []
+
+    async def reader(snapshot):
+        snapshots.append(snapshot)
+        await snapshot.get_file("app/api.py")
+        await asyncio.sleep(0.2)
+        return {"status": "success", "proposals_created": 1}
+
+    async def stuck(snapshot):
+        await asyncio.sleep(10)
+
+    async def broken(snapshot):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(service, "run_imperium_agent", reader, raising=False)
+    monkeypatch.setattr(service, "run_guardian_agent", reader, raising=False)
+    monkeypatch.setattr(service, "run_sandbox_agent", stuck, raising=False)
+    monkeypatch.setattr(service, "run_conquest_agent", broken, raising=False)
+
+    result = asyncio.run(service.run_all_agents())
+    assert result["status"] == "success"
+    assert result["results"]["imperium"]["status"] == "success"
+    assert result["results"]["sandbox"]["status"] == "timeout"
+    assert result["results"]["conquest"]["status"] == "error" and result["results"]["conquest"]["message"] == "boom"
+    assert result["total_proposals_created"] == 2
+    # Both readers ran alongside each other and the stuck agent only cost its own deadline
+    assert result["duration_seconds"] < 1.0
+    assert snapshots[0] is snapshots[1]
+    assert service.github_service.listings == 1 and service.github_service.fetches == ["app/api.py"]
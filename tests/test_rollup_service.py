@@ -0,0 +1,94 @@
+"""
+Test Rollup Service
+Verifies idempotent daily rollups, retention of rolled-up raw rows and reports
+read from the rollups, against SQLite
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, func, text
+
+from app.core.config import settings
+from app.models.sql_models import (
+    TokenUsageLog, TokenUsageDaily, LearningLog, AIAnswer, InternetLearningResult, ActivityDailyRollup
+)
+from app.services.rollup_service import RollupService
+
+
+async def _run_scenario(sqlite_database):
+    engine, session_factory = await sqlite_database(
+        TokenUsageLog, TokenUsageDaily, LearningLog, AIAnswer, InternetLearningResult, ActivityDailyRollup
+    )
+    service = RollupService()
+    now = datetime.utcnow()
+    today = now.date()
+    retention = settings.retention_token_usage_log_days
+    settings.retention_token_usage_log_days = 10
+    try:
+        async with session_factory() as session:
+            for days_ago in (40, 20, 1, 0):
+                created_at = datetime(today.year, today.month, today.day, 1) - timedelta(days=days_ago)
+                for ai_type in ("imperium", "guardian"):
+                    session.add(TokenUsageLog(ai_type=ai_type, month_year=created_at.strftime("%Y-%m"),
+                                              tokens_in=60, tokens_out=40, total_tokens=100,
+                                              success=ai_type == "imperium", created_at=created_at))
+                session.add(LearningLog(event_type="internet_learning", agent_type="guardian",
+                                        results_count=3, processing_time=1.5, created_at=created_at))
+            await session.commit()
+            # Rows without a usable timestamp belong to no day and must not break the run
+            session.add(LearningLog(event_type="internet_learning", agent_type="guardian", created_at=None))
+            session.add(LearningLog(event_type="internet_learning", agent_type="guardian", created_at=None))
+            await session.commit()
+            await session.execute(text(
+                "UPDATE learning_logs SET created_at = 'unknown' WHERE rowid = (SELECT max(rowid) FROM learning_logs)"
+            ))
+            await session.commit()
+
+            first = await service.run_once(session, today)
+            assert first["sources"]["token_usage_logs"]["days"] == 4
+            # Raw rows older than 10 days are gone, their totals survive in the rollups
+            assert first["sources"]["token_usage_logs"]["raw_rows_deleted"] == 4
+            assert (await session.execute(select(func.count()).select_from(TokenUsageLog))).scalar() == 4
+            assert first["sources"]["learning_logs"]["rows"] == 4
+            # Retention is opt-in: learning logs are kept without RETENTION_LEARNING_LOG_DAYS
+            assert first["sources"]["learning_logs"]["raw_rows_deleted"] == 0
+
+            # A second run recomputes only the newest day and changes nothing
+            second = await service.run_once(session, today)
+            assert second["sources"]["token_usage_logs"]["days"] == 1
+            rollup_total = (await session.execute(select(func.sum(TokenUsageDaily.total_tokens)))).scalar()
+            assert rollup_total == 800
+
+            # Today's rows written after the run still show up in reports
+            session.add(TokenUsageLog(ai_type="guardian", month_year=now.strftime("%Y-%m"), total_tokens=5,
+                                      created_at=now))
+            await session.commit()
+            report = await service.get_token_usage_by_day(session, today - timedelta(days=60), today)
+            by_day = {}
+            for row in report:
+                by_day[row["day"]] = by_day.get(row["day"], 0) + row["total_tokens"]
+            assert by_day[(today - timedelta(days=40)).isoformat()] == 200
+            assert by_day[today.isoformat()] == 205
+            guardian_old = [row for row in report if row["ai_type"] == "guardian" and row["day"] != today.isoformat()]
+            assert all(row["failed_requests"] == 1 for row in guardian_old)
+
+            sizes = await service.get_table_sizes(session)
+            assert sizes["token_usage_daily"] == 8
+            assert sizes["activity_daily_rollups"] == 4
+    finally:
+        settings.retention_token_usage_log_days = retention
+        await engine.dispose()
+
+
+def test_rollups_are_idempotent_and_retention_keeps_totals(sqlite_database):
+    asyncio.run(_run_scenario(sqlite_database))
+
+
+def test_retention_is_off_by_default():
+    from app.core.config import Settings
+    defaults = Settings.model_fields
+    assert all(defaults[name].default == 0 for name in (
+        "retention_token_usage_log_days", "retention_learning_log_days",
+        "retention_ai_answer_days", "retention_internet_learning_days",
+    ))
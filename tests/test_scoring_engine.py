@@ -0,0 +1,46 @@
+"""
+Test Compiled Scoring Engine
+Verifies the single-pass component extraction matches the per-pattern extraction
+"""
+
+import asyncio
+import random
+
+from app.services.scoring_engine import extract_components, extract_components_reference, SECTION_KEYWORDS
+from app.services.intelligent_scoring_system import IntelligentScoringSystem, DifficultyLevel
+
+
+def _random_response(rng: random.Random) -> str:
+    tokens = SECTION_KEYWORDS + [kw.upper() for kw in SECTION_KEYWORDS] + [
+        ":", ": ", " ", "\n", "\n\n", "\nNext", "\nlower", "text", "latest", "```python\ndef f(x):\n    return x\n```",
+        "# comment", "import os", "`code`", "ſecurity: ", "Ünicode"
+    ]
+    return "".join(rng.choice(tokens) for _ in range(rng.randint(0, 60)))
+
+
+def test_extraction_matches_reference():
+    rng = random.Random(1234)
+    for _ in range(2000):
+        response = _random_response(rng)
+        assert extract_components(response) == extract_components_reference(response), repr(response)
+
+
+def test_batch_matches_single_evaluation():
+    scoring = IntelligentScoringSystem()
+    responses = [
+        "Approach: cache results because reads dominate.\n\n```python\nclass Cache:\n    pass\n```",
+        "Security: input validation and authentication.\nPerformance: async throughput.",
+    ]
+
+    async def run():
+        batch = await scoring.evaluate_ai_responses_batch(responses, {}, DifficultyLevel.EXPERT, "guardian")
+        single = [
+            await scoring.evaluate_ai_response(response, {}, DifficultyLevel.EXPERT, "guardian")
+            for response in responses
+        ]
+        return batch, single
+
+    batch, single = asyncio.run(run())
+    # Final scores carry a small random jitter; dimension scores are deterministic
+    assert [r['dimension_scores'] for r in batch] == [r['dimension_scores'] for r in single]
+    assert all(abs(b['final_score'] - s['final_score']) <= 0.04 for b, s in zip(batch, single))
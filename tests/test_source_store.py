@@ -0,0 +1,77 @@
+"""
+Test Source Store
+Verifies per-event upserts, indexed ranking and compacted snapshots for trusted source analytics
+"""
+
+import json
+
+from app.services.source_store import SourceStore
+
+
+def test_metrics_upsert_and_ranking(tmp_path):
+    store = SourceStore(str(tmp_path / "sources.db"))
+    store.upsert_source_metrics("guardian", "https://a.example", {
+        "discovery_count": 2, "success_count": 2, "quality_score": 0.9, "learning_value": 0.8
+    })
+    store.upsert_source_metrics("guardian", "https://b.example", {
+        "discovery_count": 4, "success_count": 0, "quality_score": 0.1, "learning_value": 0.2
+    })
+    store.upsert_source_metrics("guardian", "https://b.example", {
+        "discovery_count": 5, "success_count": 5, "quality_score": 1.0, "learning_value": 1.0
+    })
+
+    assert store.get_top_sources("guardian", 1) == ["https://b.example"]
+    assert store.get_source_metrics("guardian")["guardian"]["https://b.example"]["discovery_count"] == 5
+    assert store.get_top_sources("imperium") == []
+
+
+def test_events_are_bounded(tmp_path):
+    store = SourceStore(str(tmp_path / "sources.db"), max_events=10)
+    for i in range(25):
+        store.append_event({"type": "source_discovered", "source": f"https://{i}.example",
+                            "ai_type": "sandbox", "timestamp": f"2025-01-01T00:00:{i:02d}"})
+
+    events = store.get_events()
+    assert len(events) == 10
+    assert events[-1]["source"] == "https://24.example"
+
+
+def test_legacy_import_and_snapshot(tmp_path):
+    store = SourceStore(str(tmp_path / "sources.db"))
+    assert store.is_empty()
+    store.import_legacy(
+        ["https://github.com"],
+        {"conquest": ["https://flutter.dev"]},
+        {"conquest": {"https://flutter.dev": {"discovery_count": 1, "quality_score": 0.5}}},
+        {"growth_metrics": {"conquest": {"total_sources": 1}}, "events": []},
+    )
+    assert not store.is_empty()
+
+    paths = {
+        "trusted_sources": str(tmp_path / "trusted_sources.json"),
+        "learning_sources": str(tmp_path / "learning_sources.json"),
+        "source_analytics": str(tmp_path / "source_analytics.json"),
+    }
+    store.snapshot(paths)
+
+    with open(paths["learning_sources"]) as f:
+        learning = json.load(f)
+    assert learning["learning_sources"] == {"conquest": ["https://flutter.dev"]}
+    with open(paths["source_analytics"]) as f:
+        assert json.load(f)["growth_metrics"]["conquest"]["total_sources"] == 1
+
+
+def test_increments_from_separate_writers_are_not_lost(tmp_path):
+    path = str(tmp_path / "sources.db")
+    first, second = SourceStore(path), SourceStore(path)
+    first.increment_source_metrics("sandbox", "https://c.example", discovery_count=1, success_count=1,
+                                   quality_delta=0.1, learning_value=0.8, last_used="2025-01-01T00:00:00")
+    second.increment_source_metrics("sandbox", "https://c.example", discovery_count=1, failure_count=1,
+                                    quality_delta=-0.05, learning_value=0.4)
+    row = first.increment_source_metrics("sandbox", "https://c.example", discovery_count=1, success_count=1,
+                                         quality_delta=0.1)
+
+    assert (row["discovery_count"], row["success_count"], row["failure_count"]) == (3, 2, 1)
+    assert abs(row["quality_score"] - 0.15) < 1e-9 and abs(row["learning_value"] - 0.4) < 1e-9
+    assert row["last_used"] == "2025-01-01T00:00:00"
+    assert second.get_source_metrics("sandbox")["sandbox"]["https://c.example"] == row
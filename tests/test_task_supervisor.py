@@ -0,0 +1,112 @@
+"""
+Test Task Supervisor
+Verifies supervised background tasks: per-task CPU and iteration accounting,
+restart policies with bounded restarts, visible crashes, and ordered shutdown
+within a deadline
+"""
+
+import asyncio
+import time
+
+from app.core import task_supervisor as supervisor_module
+from app.core.config import settings
+from app.core.task_supervisor import SupervisedTask, TaskSupervisor
+
+
+def test_loops_are_accounted_and_crashes_restart_until_bounded(monkeypatch):
+    monkeypatch.setattr(supervisor_module, "MAX_RESTART_BACKOFF_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "task_supervisor_slow_step_seconds", 0.05)
+
+    async def scenario():
+        supervisor = TaskSupervisor()
+        runs = []
+
+        async def busy_loop():
+            while True:
+                deadline = time.thread_time() + 0.002
+                while time.thread_time() < deadline:
+                    pass
+                supervisor.beat()
+                await asyncio.sleep(0)
+
+        async def crashing():
+            runs.append(1)
+            supervisor.beat(error=RuntimeError("flaky"))
+            raise RuntimeError("boom")
+
+        async def blocking():
+            time.sleep(0.06)
+            return "done"
+
+        busy = supervisor.spawn("busy", busy_loop, owner="tests", interval=60)
+        crash = supervisor.spawn("crash", crashing, owner="tests", restart="on_failure", max_restarts=2)
+        block = supervisor.spawn("block", blocking, owner="tests")
+        # Names stay unique while a task with that name is running
+        other = supervisor.spawn("busy", busy_loop, owner="tests")
+        assert other.get_name() == "busy#2"
+
+        assert await block is None
+        await crash  # Failures are recorded, not raised to the owner
+        await asyncio.sleep(0.05)
+
+        status = {task["name"]: task for task in supervisor.get_status()["tasks"]}
+        assert status["busy"]["state"] == "running" and status["busy"]["iterations"] > 3
+        assert status["busy"]["cpu_seconds"] >= 0.006 and status["busy"]["lag_seconds"] == 0.0
+        assert status["crash"]["state"] == "failed" and status["crash"]["restarts"] == 2 and len(runs) == 3
+        assert status["crash"]["last_error"] == "RuntimeError: boom" and status["crash"]["errors"] == 6
+        assert status["block"]["state"] == "finished" and status["block"]["slow_steps"] == 1
+        assert "crash" in supervisor.get_status()["failing"]
+
+        # An owner cancelling its own task is not treated as a crash
+        other.cancel()
+        await asyncio.gather(other, return_exceptions=True)
+        assert supervisor.get("busy#2").state == "cancelled" and supervisor.get("busy#2").restarts == 0
+
+        result = await supervisor.shutdown(timeout=1.0)
+        assert result == {"stopped": ["busy"], "abandoned": []}
+        assert busy.cancelled()
+
+    asyncio.run(scenario())
+
+
+def test_shutdown_cancels_newest_first_within_deadline():
+    async def scenario():
+        supervisor = TaskSupervisor()
+        order = []
+
+        async def loop(name):
+            try:
+                await asyncio.sleep(3600)
+            finally:
+                order.append(name)
+
+        async def stubborn():
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                order.append("stubborn")  # Ignores the first cancellation
+            await asyncio.sleep(3600)
+
+        supervisor.spawn("first", loop, "first", restart="always")
+        supervisor.spawn("stubborn", stubborn)
+        supervisor.spawn("last", loop, "last", restart="always")
+        await asyncio.sleep(0)
+
+        started = time.monotonic()
+        result = await supervisor.shutdown(timeout=0.2)
+        assert time.monotonic() - started < 1.0
+        assert result == {"stopped": ["last", "first"], "abandoned": ["stubborn"]}
+        assert order == ["last", "stubborn", "first"]
+        # Cancelled loops with restart="always" are not restarted
+        assert supervisor.get("first").state == "cancelled" and supervisor.get("first").restarts == 0
+        supervisor.get("stubborn").task.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_lag_allows_an_iteration_to_do_its_work():
+    record = SupervisedTask("cycle", "tests", lambda: None, "never", interval=100.0, max_restarts=0)
+    record.last_beat = 1000.0
+    # Beat, slept the interval, now 30s into the next iteration's work: late but healthy
+    assert record.lag_seconds(now=1130.0) == 30.0 and not record.is_lagging(now=1130.0)
+    assert record.is_lagging(now=1160.0) and record.to_dict()["interval_seconds"] == 100.0
@@ -0,0 +1,137 @@
+"""
+Test Webhook Job Queue
+Verifies 202 acknowledgement with signed synthetic payloads, delivery dedup,
+push coalescing, lease expiry and retries
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.routers.github_webhook import router as github_webhook_router
+from app.services.webhook_job_queue import WebhookJobQueue, webhook_job_service
+
+SECRET = "test-secret"
+
+
+def _signed_push(client, delivery, ref="refs/heads/main", message="fix"):
+    body = json.dumps({
+        "ref": ref,
+        "repository": {"full_name": "org/repo", "name": "repo"},
+        "commits": [{"message": message}],
+    }).encode()
+    signature = "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return client.post("/api/github/webhook", content=body, headers={
+        "X-GitHub-Event": "push", "X-GitHub-Delivery": delivery, "X-Hub-Signature-256": signature,
+    })
+
+
+def test_webhook_acknowledges_dedups_and_coalesces(tmp_path, monkeypatch):
+    queue = WebhookJobQueue(str(tmp_path / "jobs.db"))
+    previous_queue = webhook_job_service._queue
+    webhook_job_service.use_queue(queue)
+    monkeypatch.setattr(settings, "github_webhook_secret", SECRET)
+    runs = []
+
+    async def fake_push(payload):
+        runs.append([commit["message"] for commit in payload["commits"]])
+
+    monkeypatch.setitem(webhook_job_service._handlers, "push", fake_push)
+    # Workers are running elsewhere: deliveries stay queued
+    monkeypatch.setattr(webhook_job_service, "is_running", lambda: True)
+    app = FastAPI()
+    app.include_router(github_webhook_router, prefix="/api/github")
+    try:
+        client = TestClient(app)
+        first = _signed_push(client, "d-1", message="one")
+        assert first.status_code == 202
+        assert first.json()["status"] == "accepted" and first.json()["job_id"] == 1
+
+        assert _signed_push(client, "d-1", message="one").json()["queue_status"] == "duplicate"
+        assert _signed_push(client, "d-2", message="two").json()["queue_status"] == "coalesced"
+        assert _signed_push(client, "d-3", ref="refs/heads/dev").json()["queue_status"] == "enqueued"
+
+        bad = client.post("/api/github/webhook", content=b"{}", headers={
+            "X-GitHub-Event": "push", "X-GitHub-Delivery": "d-4", "X-Hub-Signature-256": "sha256=bad",
+        })
+        assert bad.status_code == 401
+
+        assert asyncio.run(webhook_job_service.run_pending()) == 2
+        assert runs == [["one", "two"], ["fix"]]
+        assert queue.stats() == {"done": 2, "coalesced": 1}
+        # A redelivery after completion is still recognised
+        assert _signed_push(client, "d-2").json()["queue_status"] == "duplicate"
+    finally:
+        webhook_job_service.use_queue(previous_queue)
+        queue.close()
+
+
+def test_expired_leases_are_reclaimed_and_failures_retried(tmp_path):
+    queue = WebhookJobQueue(str(tmp_path / "jobs.db"), max_attempts=2, retry_delay=0)
+    try:
+        queue.enqueue("a", "push", {"commits": []}, coalesce_key="push:repo:main")
+        job = queue.claim("w1", visibility_timeout=0.05)
+        assert job["delivery_id"] == "a"
+        # A running job is not coalesced into; the new push waits for it
+        assert queue.enqueue("b", "push", {"commits": []}, coalesce_key="push:repo:main")["status"] == "enqueued"
+        # Only one job per coalesce key runs at a time
+        assert queue.claim("w2", visibility_timeout=10) is None
+
+        time.sleep(0.1)
+        reclaimed = queue.claim("w2", visibility_timeout=10)
+        assert reclaimed["id"] == job["id"] and reclaimed["attempts"] == 2
+        # The crashed worker no longer owns the job
+        assert queue.complete(job["id"], "w1") is False
+
+        assert queue.fail(reclaimed["id"], "w2", "boom") == "failed"
+        second = queue.claim("w2", visibility_timeout=10)
+        assert queue.fail(second["id"], "w2", "boom") == "queued"
+        assert queue.claim("w3", visibility_timeout=10)["attempts"] == 2
+    finally:
+        queue.close()
+
+
+def test_exhausted_leases_fail_and_finished_jobs_are_purged(tmp_path):
+    queue = WebhookJobQueue(str(tmp_path / "jobs.db"), max_attempts=2)
+    try:
+        queue.enqueue("a", "issues", {})
+        for _ in range(2):
+            assert queue.claim("w", visibility_timeout=0.01) is not None
+            time.sleep(0.05)  # The worker dies holding the lease
+        # The final attempt's lease expired: failed instead of reclaimed forever
+        assert queue.claim("w", visibility_timeout=10) is None
+        job = queue.get(1)
+        assert job["status"] == "failed" and job["attempts"] == 2
+
+        assert queue.purge(older_than_seconds=3600) == 0
+        assert queue.purge(older_than_seconds=0) == 1 and queue.stats() == {}
+    finally:
+        queue.close()
+
+
+def test_webhooks_run_inline_without_workers(tmp_path, monkeypatch):
+    queue = WebhookJobQueue(str(tmp_path / "jobs.db"))
+    previous_queue = webhook_job_service._queue
+    webhook_job_service.use_queue(queue)
+    monkeypatch.setattr(settings, "github_webhook_secret", SECRET)
+    runs = []
+
+    async def fake_push(payload):
+        runs.append(payload["ref"])
+
+    monkeypatch.setitem(webhook_job_service._handlers, "push", fake_push)
+    app = FastAPI()
+    app.include_router(github_webhook_router, prefix="/api/github")
+    try:
+        response = _signed_push(TestClient(app), "inline-1")
+        assert response.status_code == 202 and response.json()["processing"] == "inline"
+        assert runs == ["refs/heads/main"] and queue.stats() == {"done": 1}
+    finally:
+        webhook_job_service.use_queue(previous_queue)
+        queue.close()
@@ -0,0 +1,128 @@
+"""
+Test Write Buffer
+Verifies batched inserts, coalesced latest-state writes, backpressure, flush on stop
+and that a failing batch only drops its bad rows, against SQLite
+"""
+
+import asyncio
+
+from sqlalchemy import select, func
+
+from app.models.sql_models import AIAnswer, ExplainabilityMetrics
+from app.core.task_supervisor import task_supervisor
+from app.services.write_buffer import WriteBuffer
+
+
+def _answer(i):
+    return {"ai_type": "guardian", "prompt": f"q{i}", "answer": f"a{i}", "prompt_length": 2, "answer_length": 2}
+
+
+async def _with_database(sqlite_database, scenario):
+    engine, session_factory = await sqlite_database(AIAnswer, ExplainabilityMetrics)
+    try:
+        await scenario(session_factory)
+    finally:
+        await engine.dispose()
+
+
+async def _count(session_factory, model):
+    async with session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(model))).scalar()
+
+
+def test_rows_are_batched_and_flushed_on_stop(sqlite_database):
+    async def scenario(session_factory):
+        buffer = WriteBuffer("test", session_factory=session_factory, max_batch=50, flush_interval=60)
+        for i in range(120):
+            await buffer.add(AIAnswer, _answer(i))
+        # Reaching max_batch triggers a flush long before the 60s timer, in chunks of max_batch rows
+        for _ in range(100):
+            if buffer.get_metrics()["rows_written"] >= 100:
+                break
+            await asyncio.sleep(0.05)
+        metrics = buffer.get_metrics()
+        assert metrics["rows_written"] >= 100
+        assert metrics["flushes"] <= 3
+
+        await buffer.stop()
+        assert await _count(session_factory, AIAnswer) == 120
+        assert buffer.get_metrics()["queue_depth"] == 0
+
+    asyncio.run(_with_database(sqlite_database, scenario))
+
+
+def test_latest_state_writes_are_coalesced(sqlite_database):
+    async def scenario(session_factory):
+        buffer = WriteBuffer("test", session_factory=session_factory, flush_interval=60)
+
+        def write_metrics(average):
+            async def write(session):
+                session.add(ExplainabilityMetrics(ai_type="guardian", average_confidence=average))
+            return write
+
+        for average in (10.0, 20.0, 30.0):
+            buffer.set_latest(("explainability_metrics", "guardian"), write_metrics(average))
+        await buffer.stop()
+
+        async with session_factory() as session:
+            rows = (await session.execute(select(ExplainabilityMetrics.average_confidence))).scalars().all()
+        assert rows == [30.0]
+        assert buffer.get_metrics()["coalesced_writes"] == 2
+
+    asyncio.run(_with_database(sqlite_database, scenario))
+
+
+def test_backpressure_when_buffer_is_full(sqlite_database):
+    async def scenario(session_factory):
+        buffer = WriteBuffer("test", session_factory=session_factory, max_batch=5,
+                             flush_interval=60, max_pending=5)
+        await asyncio.wait_for(
+            asyncio.gather(*(buffer.add(AIAnswer, _answer(i)) for i in range(30))), timeout=10
+        )
+        await buffer.stop()
+
+        assert buffer.get_metrics()["backpressure_waits"] > 0
+        assert await _count(session_factory, AIAnswer) == 30
+
+    asyncio.run(_with_database(sqlite_database, scenario))
+
+
+def test_failing_batch_only_drops_bad_rows(sqlite_database):
+    async def scenario(session_factory):
+        buffer = WriteBuffer("test", session_factory=session_factory, flush_interval=60, max_retries=1)
+
+        async def write_metrics(session):
+            session.add(ExplainabilityMetrics(ai_type="guardian", average_confidence=42.0))
+
+        async def broken_write(session):
+            raise ValueError("cannot serialise")
+
+        for i in range(10):
+            await buffer.add(AIAnswer, _answer(i) if i != 6 else {**_answer(i), "answer": None})
+        buffer.set_latest(("explainability_metrics", "guardian"), write_metrics)
+        buffer.set_latest(("explainability_metrics", "broken"), broken_write)
+        await buffer.stop()
+
+        metrics = buffer.get_metrics()
+        assert await _count(session_factory, AIAnswer) == 9
+        assert await _count(session_factory, ExplainabilityMetrics) == 1
+        assert metrics["rows_written"] == 9 and metrics["dropped_rows"] == 1
+        assert metrics["dropped_coalesced"] == 1
+
+    asyncio.run(_with_database(sqlite_database, scenario))
+
+
+def test_flusher_runs_under_the_task_supervisor(sqlite_database):
+    async def scenario(session_factory):
+        buffer = WriteBuffer("supervised", session_factory=session_factory, flush_interval=0.01)
+        await buffer.add(AIAnswer, _answer(0))
+        record = task_supervisor.get("write-buffer-supervised")
+        for _ in range(100):
+            if record.iterations:
+                break
+            await asyncio.sleep(0.01)
+        assert record.owner == "write_buffer" and record.iterations > 0
+        await buffer.stop()
+        assert await _count(session_factory, AIAnswer) == 1
+
+    asyncio.run(_with_database(sqlite_database, scenario))